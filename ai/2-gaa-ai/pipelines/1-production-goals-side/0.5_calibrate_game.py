@@ -2,25 +2,52 @@
 """
 Stage 0.5: Calibrate Game Profile
 Analyzes frames in parallel to identify teams, colors, halves, and attacking directions
+
+Frames are sent in batches (--batch-size, default 12) so the instructions are
+sent once per batch instead of once per frame; frames missing from a batch
+answer are retried one at a time. --batch-size 1 = one request per frame.
+
+Before the API calls, team jersey colours are measured locally (team_colors.py,
+k-means on player pixels); the result is stored in the profile and given to
+the synthesis prompt as a hint.
+
+If 0.1 wrote inputs/motion_timeline.json (motion_timeline.py, local frame
+differencing), its proposed start / half-time / 2nd-half / end are checked with
+a couple of targeted frames each; confirmed boundaries replace the synthesized
+ones (to the second) and frames outside the match are not sent to Gemini.
 """
 
 import os
+import re
 import json
 import argparse
+import subprocess
 import google.generativeai as genai
 from pathlib import Path
 from dotenv import load_dotenv
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
+try:
+    from team_colors import analyze_frames, color_hint
+    HAS_COLOR_ANALYSIS = True
+except ImportError:
+    HAS_COLOR_ANALYSIS = False  # team_colors needs numpy
+
 # Parse arguments
 parser = argparse.ArgumentParser(description='Calibrate game profile using frame analysis')
 parser.add_argument('--game', required=True, help='Game name (folder in games/)')
+parser.add_argument('--batch-size', type=int, default=12, help='Frames per Gemini request (1 = single-frame calls)')
+parser.add_argument('--color-confidence', type=float, default=0.5, help='Min local colour-analysis confidence to use it as a hint')
+parser.add_argument('--no-motion-timeline', action='store_true', help='Ignore inputs/motion_timeline.json (match times from frames only)')
 ARGS = parser.parse_args()
 
 # Setup paths
 PROD_ROOT = Path(__file__).parent.parent.parent
 GAME_ROOT = PROD_ROOT / "games" / ARGS.game
 FRAMES_DIR = GAME_ROOT / "inputs" / "calibration_frames"
+CLIPS_DIR = GAME_ROOT / "inputs" / "clips"
+TIMELINE_FILE = GAME_ROOT / "inputs" / "motion_timeline.json"
+BOUNDARY_FRAMES_DIR = GAME_ROOT / "inputs" / "boundary_frames"
 OUTPUT_FILE = GAME_ROOT / "inputs" / "game_profile.json"
 
 # Setup API
@@ -28,12 +55,8 @@ load_dotenv('/home/ubuntu/clann/CLANNAI/.env')
 api_key = os.getenv('GEMINI_API_KEY') or os.getenv('GOOGLE_API_KEY')
 genai.configure(api_key=api_key)
 
-def describe_single_frame(frame_path: Path, timestamp_seconds: int) -> dict:
-    """Describe a single frame using Flash"""
-    try:
-        prompt = f"""Frame at {timestamp_seconds}s. Report:
-
-1. Teams: [color] jerseys vs [color] jerseys (be specific: "White", "Black", "Dark Blue", etc.)
+# What to report for each frame (shared by single-frame and batched prompts)
+FRAME_REPORT = """1. Teams: [color] jerseys vs [color] jerseys (be specific: "White", "Black", "Dark Blue", etc.)
 
 2. ATTACKING ACTION (MOST VALUABLE - if visible):
    - Is a team shooting/attacking toward a goal? Which color team? Toward LEFT or RIGHT goal?
@@ -48,16 +71,23 @@ def describe_single_frame(frame_path: Path, timestamp_seconds: int) -> dict:
    - If BOTH keepers visible, report both (rare but valuable)
    - NEVER report same color for both keepers
 
-4. Game state: THROW-UP / IN-PLAY / HALFTIME / WARMUP / END
+4. Game state - write exactly "Game state: <STATE>" with ONE of THROW-UP / IN-PLAY / HALFTIME / WARMUP / END
 
 5. Frame usefulness:
    - "USEFUL" if attacking action visible or both keepers visible
    - "NOT USEFUL" if unclear/ambiguous/warmup
 
-Format example: "Black vs White. Black shooting toward RIGHT goal. IN-PLAY. USEFUL."
-Or: "White vs Black. Dark keeper LEFT, White keeper RIGHT. IN-PLAY. USEFUL."
-Or: "White vs Black. Ball midfield, no clear action. IN-PLAY. NOT USEFUL."
+Format example: "Black vs White. Black shooting toward RIGHT goal. Game state: IN-PLAY. USEFUL."
+Or: "White vs Black. Dark keeper LEFT, White keeper RIGHT. Game state: IN-PLAY. USEFUL."
+Or: "White vs Black. Ball midfield, no clear action. Game state: IN-PLAY. NOT USEFUL."
+"""
+
+def describe_single_frame(frame_path: Path, timestamp_seconds: int) -> dict:
+    """Describe a single frame using Flash"""
+    try:
+        prompt = f"""Frame at {timestamp_seconds}s. Report:
 
+{FRAME_REPORT}
 Be concise (2-3 lines). Prioritize reporting attacking action over keepers."""
 
         with open(frame_path, 'rb') as f:
@@ -86,6 +116,152 @@ Be concise (2-3 lines). Prioritize reporting attacking action over keepers."""
             'tokens_out': 0
         }
 
+def describe_frame_batch(batch: list) -> list:
+    """
+    Describe several frames in one Flash request
+    
+    Args:
+        batch: List of (frame_path, timestamp_seconds) tuples
+    
+    Returns:
+        List of result dicts (same shape as describe_single_frame), one per frame.
+        Frames the batch answer doesn't cover are retried with describe_single_frame.
+    """
+    if len(batch) == 1:
+        return [describe_single_frame(*batch[0])]
+    
+    contents = [f"""You are given {len(batch)} frames from a GAA match, each labelled FRAME <n> with its timestamp.
+For EACH frame report:
+
+{FRAME_REPORT}
+Be concise (2-3 lines per frame). Prioritize reporting attacking action over keepers.
+
+**OUTPUT FORMAT (JSON only, no markdown, no code blocks):**
+[{{"frame": 1, "description": "..."}}, {{"frame": 2, "description": "..."}}]
+
+Return exactly one entry per frame, in frame order."""]
+    
+    for idx, (frame_path, timestamp_seconds) in enumerate(batch, 1):
+        with open(frame_path, 'rb') as f:
+            contents.append(f"FRAME {idx} at {timestamp_seconds}s:")
+            contents.append({"mime_type": "image/jpeg", "data": f.read()})
+    
+    descriptions = {}
+    tokens_in = tokens_out = 0
+    try:
+        model = genai.GenerativeModel('gemini-2.5-flash', generation_config={"temperature": 0})
+        response = model.generate_content(contents)
+        tokens_in = response.usage_metadata.prompt_token_count
+        tokens_out = response.usage_metadata.candidates_token_count
+        
+        result_text = response.text.strip()
+        result_text = result_text[result_text.find('['):result_text.rfind(']') + 1]
+        for item in json.loads(result_text):
+            description = str(item.get('description', '')).strip()
+            if description:
+                descriptions[int(item['frame'])] = description
+    except Exception as e:
+        print(f"⚠️  Batch of {len(batch)} frames failed ({e}) - falling back to single-frame calls")
+    
+    results = []
+    for idx, (frame_path, timestamp_seconds) in enumerate(batch, 1):
+        if idx in descriptions:
+            results.append({
+                'timestamp': timestamp_seconds,
+                'frame': frame_path.name,
+                'description': descriptions[idx],
+                'tokens_in': 0,
+                'tokens_out': 0
+            })
+        else:
+            results.append(describe_single_frame(frame_path, timestamp_seconds))
+    
+    # Batch tokens are booked on the first frame so totals stay exact
+    results[0]['tokens_in'] += tokens_in
+    results[0]['tokens_out'] += tokens_out
+    return results
+
+# Targeted checks per proposed boundary: (offset from boundary, game should be in play?)
+BOUNDARY_CHECKS = {
+    'start': [(-30, False), (20, True)],
+    'half_time': [(-30, True), (30, False)],
+    'second_half_start': [(-30, False), (20, True)],
+    'end': [(-30, True), (30, False)],
+}
+
+def extract_boundary_frame(seconds: int):
+    """Extract the frame at an absolute time from its 60s clip (None if there is no clip)"""
+    clip_path = CLIPS_DIR / f"clip_{seconds // 60:03d}m00s.mp4"
+    if seconds < 0 or not clip_path.exists():
+        return None
+    
+    BOUNDARY_FRAMES_DIR.mkdir(parents=True, exist_ok=True)
+    output_path = BOUNDARY_FRAMES_DIR / f"frame_{seconds:05d}s.jpg"
+    if not output_path.exists():
+        cmd = [
+            'ffmpeg',
+            '-ss', str(seconds % 60),
+            '-i', str(clip_path),
+            '-vframes', '1',
+            '-q:v', '5',
+            '-y',
+            str(output_path)
+        ]
+        result = subprocess.run(cmd, capture_output=True, text=True)
+        if result.returncode != 0 or not output_path.exists():
+            return None
+    return output_path
+
+GAME_STATES = {'THROW-UP': True, 'IN-PLAY': True, 'HALFTIME': False, 'WARMUP': False, 'END': False}
+GAME_STATE_RE = re.compile(r'GAME STATE:\s*\**\s*([A-Z-]+)')
+
+def frame_in_play(description: str):
+    """Game state from a frame description's "Game state: <STATE>": True (in play), False (not), None (unclear)"""
+    # Only the explicit token counts - free text like "far end" or "end line" must not
+    match = GAME_STATE_RE.search(description.upper())
+    if not match:
+        return None
+    return GAME_STATES.get(match.group(1))
+
+def confirm_motion_boundaries(proposed: dict) -> tuple:
+    """
+    Check motion-timeline boundaries with a few targeted single-frame calls
+    
+    Args:
+        proposed: motion_timeline.json 'proposed_match_times'
+    
+    Returns:
+        (confirmed boundaries {name: seconds}, check results, tokens_in, tokens_out)
+    """
+    checks = []
+    for name, seconds in proposed.items():
+        for offset, expect_play in BOUNDARY_CHECKS.get(name, []):
+            frame_path = extract_boundary_frame(seconds + offset)
+            if frame_path:
+                checks.append((name, seconds + offset, expect_play, frame_path))
+    
+    with ThreadPoolExecutor(max_workers=10) as executor:
+        futures = [executor.submit(describe_single_frame, frame_path, timestamp)
+                   for _, timestamp, _, frame_path in checks]
+        descriptions = [future.result() for future in futures]
+    
+    results = []
+    passed = {name: True for name in proposed}
+    checked = set()
+    for (name, timestamp, expect_play, _), result in zip(checks, descriptions):
+        in_play = frame_in_play(result['description'])
+        ok = in_play == expect_play
+        passed[name] = passed[name] and ok
+        checked.add(name)
+        results.append({'boundary': name, 'timestamp': timestamp, 'expect_in_play': expect_play,
+                        'description': result['description'], 'passed': ok})
+    
+    # A boundary needs at least one frame check, and every check must agree
+    confirmed = {name: proposed[name] for name in proposed if name in checked and passed[name]}
+    tokens_in = sum(r.get('tokens_in', 0) for r in descriptions)
+    tokens_out = sum(r.get('tokens_out', 0) for r in descriptions)
+    return confirmed, results, tokens_in, tokens_out
+
 def calibrate_game():
     """Analyze frames in parallel, then synthesize profile"""
     
@@ -105,11 +281,65 @@ def calibrate_game():
         print(f"Run: python 0.1_generate_clips_and_frames.py --game {ARGS.game}")
         return False
     
+    batch_size = max(1, ARGS.batch_size)
+    num_requests = (len(frames) + batch_size - 1) // batch_size
+    
     print(f"📸 Found {len(frames)} calibration frames")
-    print(f"⚡ Analyzing in parallel with Gemini 2.5 Flash...")
+    print(f"⚡ Analyzing in parallel with Gemini 2.5 Flash ({num_requests} requests, {batch_size} frames each)...")
     print(f"💰 Estimated cost: ~${len(frames) * 300 * 0.30 / 1_000_000:.4f} (step 1) + $0.01 (step 2)")
     print()
     
+    # STEP 0: Local jersey colour clustering (no API calls)
+    color_analysis = None
+    if HAS_COLOR_ANALYSIS:
+        print("=" * 70)
+        print("STEP 0: LOCAL TEAM COLOUR ANALYSIS")
+        print("=" * 70)
+        try:
+            color_analysis = analyze_frames(frames)
+        except Exception as e:
+            print(f"⚠️  Colour analysis failed: {e}")
+        if color_analysis:
+            teams = color_analysis['teams']
+            print(f"🎨 {teams[0]['color_name']} ({teams[0]['hex']}) vs {teams[1]['color_name']} ({teams[1]['hex']}) "
+                  f"- confidence {color_analysis['confidence']:.2f}")
+        print()
+    else:
+        print("⚠️  numpy not installed - skipping local colour analysis")
+    
+    # STEP 0b: Confirm motion-timeline match times with targeted frames
+    motion_times = {}
+    motion_checks = []
+    boundary_tokens_in = boundary_tokens_out = 0
+    if TIMELINE_FILE.exists() and not ARGS.no_motion_timeline:
+        with open(TIMELINE_FILE, 'r') as f:
+            proposed = json.load(f).get('proposed_match_times')
+        if proposed:
+            print("=" * 70)
+            print("STEP 0b: CONFIRM MOTION-TIMELINE MATCH TIMES")
+            print("=" * 70)
+            motion_times, motion_checks, boundary_tokens_in, boundary_tokens_out = confirm_motion_boundaries(proposed)
+            for name, seconds in proposed.items():
+                status = "✅" if name in motion_times else "❌"
+                print(f"   {status} {name}: {seconds}s ({seconds//60}m{seconds%60:02d}s)")
+            print(f"   {len(motion_checks)} frame checks, {len(motion_times)}/{len(proposed)} boundaries confirmed")
+            print()
+    
+    # Match times already settled → frames outside the match only cost tokens
+    if 'start' in motion_times and 'end' in motion_times:
+        def in_match(frame_path):
+            t = int(frame_path.stem.split('_')[1].replace('s', ''))
+            if t < motion_times['start'] or t > motion_times['end']:
+                return False
+            if 'half_time' in motion_times and 'second_half_start' in motion_times:
+                return not (motion_times['half_time'] < t < motion_times['second_half_start'])
+            return True
+        
+        match_frames = [frame_path for frame_path in frames if in_match(frame_path)]
+        if match_frames:
+            print(f"⏭️  Skipping {len(frames) - len(match_frames)} frames outside confirmed play periods")
+            frames = match_frames
+    
     # STEP 1: Parallel frame descriptions
     print("=" * 70)
     print("STEP 1: PARALLEL FRAME ANALYSIS")
@@ -120,25 +350,25 @@ def calibrate_game():
     total_tokens_out = 0
     completed = 0
     
+    # Extract timestamp from filename (frame_00120s.jpg → 120)
+    timed_frames = [(frame_path, int(frame_path.stem.split('_')[1].replace('s', ''))) for frame_path in frames]
+    batches = [timed_frames[i:i + batch_size] for i in range(0, len(timed_frames), batch_size)]
+    
     with ThreadPoolExecutor(max_workers=30) as executor:
-        # Submit all frames for analysis
-        future_to_frame = {}
-        for frame_path in frames:
-            # Extract timestamp from filename (frame_00120s.jpg → 120)
-            timestamp_seconds = int(frame_path.stem.split('_')[1].replace('s', ''))
-            future_to_frame[executor.submit(describe_single_frame, frame_path, timestamp_seconds)] = frame_path
+        # Submit all batches for analysis
+        futures = [executor.submit(describe_frame_batch, batch) for batch in batches]
         
         # Process results as they complete
-        for future in as_completed(future_to_frame):
-            result = future.result()
-            frame_descriptions.append(result)
-            completed += 1
-            
-            total_tokens_in += result.get('tokens_in', 0)
-            total_tokens_out += result.get('tokens_out', 0)
-            
-            if completed % 20 == 0:
-                print(f"📊 Progress: {completed}/{len(frames)} frames")
+        for future in as_completed(futures):
+            for result in future.result():
+                frame_descriptions.append(result)
+                completed += 1
+                
+                total_tokens_in += result.get('tokens_in', 0)
+                total_tokens_out += result.get('tokens_out', 0)
+                
+                if completed % 20 == 0:
+                    print(f"📊 Progress: {completed}/{len(frames)} frames")
     
     # Sort by timestamp
     frame_descriptions.sort(key=lambda x: x['timestamp'])
@@ -149,6 +379,8 @@ def calibrate_game():
         for d in frame_descriptions:
             f.write(f"{d['timestamp']:05d}s ({d['timestamp']//60:02d}m{d['timestamp']%60:02d}s): {d['description']}\n")
     
+    total_tokens_in += boundary_tokens_in
+    total_tokens_out += boundary_tokens_out
     step1_cost = (total_tokens_in / 1_000_000) * 0.30 + (total_tokens_out / 1_000_000) * 2.50
     
     print(f"✅ Analyzed {len(frame_descriptions)} frames")
@@ -167,13 +399,19 @@ def calibrate_game():
         for d in frame_descriptions
     ])
     
+    # Confident local colours go into the prompt as a hint for naming the teams
+    color_block = ""
+    if color_analysis and color_analysis['confidence'] >= ARGS.color_confidence:
+        color_block = (f"{color_hint(color_analysis)}\n"
+                       f"Use these colours for the team jersey colours unless the descriptions clearly disagree.\n\n")
+    
     synthesis_prompt = f"""Based on these frame descriptions from a GAA (Gaelic Athletic Association) match, create a game profile.
 
 **FRAME DESCRIPTIONS WITH TIMESTAMPS:**
 
 {descriptions_text}
 
-**YOUR TASK:**
+{color_block}**YOUR TASK:**
 Extract the following information:
 
 1. **TEAM IDENTIFICATION:**
@@ -295,6 +533,17 @@ Provide ONLY the JSON object:"""
                 print(f"⚠️  Start time {mt['start']}s detected - adjusting to 0s to account for sampling interval")
                 mt['start'] = 0
         
+        # Confirmed motion-timeline boundaries are exact - they win over the frame sampling
+        if motion_times:
+            mt = game_profile.setdefault('match_times', {})
+            mt.update(motion_times)
+            game_profile['match_times_source'] = {
+                name: ('motion_timeline' if name in motion_times else 'frame_synthesis')
+                for name in ('start', 'half_time', 'second_half_start', 'end')
+            }
+            game_profile['motion_timeline_checks'] = motion_checks
+            print(f"⏱️  Using motion-timeline times for: {', '.join(motion_times)}")
+        
         # Add human-readable time formats
         def seconds_to_readable(seconds: int) -> str:
             """Convert seconds to mm:ss or hh:mm:ss format"""
@@ -315,6 +564,10 @@ Provide ONLY the JSON object:"""
                 'end': seconds_to_readable(mt['end'])
             }
         
+        # Keep the measured palettes (used for deterministic team colour matching)
+        if color_analysis:
+            game_profile['color_analysis'] = color_analysis
+        
         # Add video URL from video_source.json if available
         video_source_path = GAME_ROOT / "inputs" / "video_source.json"
         if video_source_path.exists():
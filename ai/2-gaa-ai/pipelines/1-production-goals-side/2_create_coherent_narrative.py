@@ -16,6 +16,8 @@ from pathlib import Path
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import google.generativeai as genai
 from dotenv import load_dotenv
+from prompt_registry import load_template
+from token_batcher import TokenEstimator, is_truncated, pack
 
 # Load environment
 load_dotenv('/home/ubuntu/clann/CLANNAI/.env')
@@ -23,14 +25,23 @@ load_dotenv('/home/ubuntu/clann/CLANNAI/.env')
 # Paths
 parser = argparse.ArgumentParser()
 parser.add_argument('--game', required=True, help='Game name (folder in games/)')
-ARGS = parser.parse_args()
+parser.add_argument('--run-folder', help='Explicit output folder under outputs/ (overrides .current_run.txt)')
+parser.add_argument('--prompt-file', help='Prompt template file (overrides --prompt-version)')
+parser.add_argument('--prompt-version', help='Prompt template version in prompts/{stage}/ (default: prompts/registry.json)')
+parser.add_argument('--window-tokens', type=int, default=6000,
+                    help='Observation tokens per narrative window (0 = fixed 10-minute windows)')
+parser.add_argument('--max-window-minutes', type=int, default=20, help='Longest narrative window when packing by tokens')
+ARGS = parser.parse_args(globals().get('STAGE_ARGV'))  # STAGE_ARGV set by stage_runner.py for in-process runs
 
 PROD_ROOT = Path(__file__).parent.parent.parent
 GAME_ROOT = PROD_ROOT / "games" / ARGS.game
 
 # Auto-detect output folder from Stage 1
 run_config = GAME_ROOT / "outputs" / ".current_run.txt"
-if run_config.exists():
+if ARGS.run_folder:
+    output_folder = ARGS.run_folder
+    print(f"📁 Using run folder: {output_folder}")
+elif run_config.exists():
     output_folder = run_config.read_text().strip()
     print(f"📁 Using output folder from Stage 1: {output_folder}")
 else:
@@ -52,7 +63,14 @@ if profile_path.exists():
         GAME_PROFILE = json.load(f)
     print(f"✅ Game profile loaded")
 
-SEGMENT_SECONDS = 10 * 60  # 10-minute windows
+SEGMENT_SECONDS = 10 * 60  # 10-minute windows (--window-tokens 0)
+CLIP_SECONDS = 60  # Span assumed for each [Ns] observation
+WINDOW_OUTPUT_TOKENS = 16000  # Expected narrative + thinking tokens per window, well under max output
+NARRATIVE_OUTPUT_RATIO = 1.5  # Expected output tokens per observation token (thinking included)
+
+# Prompt template from the registry (prompts/stage2/), loaded once per process
+PROMPT = load_template('stage2', ARGS.prompt_file or ARGS.prompt_version)
+print(f"📝 Prompt: stage2/{PROMPT.version} ({PROMPT.sha256[:8]})")
 
 
 def _format_clock(seconds: int) -> str:
@@ -128,140 +146,9 @@ SPATIAL CONTEXT ({current_half}):
             f"{time_context}"
         )
 
-    return f"""Hello! I need your help creating a coherent narrative from GAA (Gaelic Athletic Association) match observations.
-
-{team_info}
-
-**THE CHALLENGE:**
-We're using an AI system to analyze a GAA match. Stage 1 produces observations from continuous 60-second clips (one per minute, no overlap). Even with full context, the video+audio model still hallucinates around scoring action, so we rely on you to clean it up.
-
-However, the AI still sometimes "sees" things that didn't happen - especially scores. It might see:
-- A shot near the goal → incorrectly assumes it scored
-- Players walking to restart position → assumes it's post-score restart
-- Any celebration → assumes a score was made
-
-**YOUR CRITICAL TASK:**
-You're the validation layer. Read these clip observations chronologically and create a COHERENT, LOGICAL narrative of what actually happened. Your job is to:
-
-1. Confirm and KEEP real events that have clear evidence (especially scores with "ball goes over bar" or "ball goes into net" language)
-2. Remove obvious hallucinations that contradict the flow of play
-3. Use GAA logic to validate sequences
-4. Preserve all real, important details
-5. Infer missing events from outcomes (e.g., kickout = score before) only when the observation already hints at it
-6. Create a clean, chronological timeline of actual events
-
-**WHAT EVENTS ARE WE TRYING TO DETECT?**
-
-The next stage will try to identify GAA event types from your narrative:
-
-**Match Flow:** Half starts/ends, Throw-ups
-**Restarts:** Kickouts (after scores), Throw-ups (from referee)
-**Attacking:** Possession Own/Opp, Attacks, Shots (Points/Goals/Wides)
-**Defending:** Turnovers (Won/Lost), Fouls (Awarded/Conceded)
-**Other:** Ball in Play, Stoppages, Highlights, Referee decisions
-
-**CRITICAL - PRESERVE THESE DETAILS:**
-Your narrative feeds into the next stage, so you MUST preserve:
-- **Possession changes:** "intercepts", "wins the ball", "gains possession", "regains possession", "tackles" → These become "Turnover Won" events
-- **Attacks:** "attacks", "builds attack", "advances forward" → "Attack Own/Opp" events
-- **Shots:** any mention of shooting, striking toward goal → "Shot Own/Opp" events (with Point/Goal/Wide outcomes)
-- **Kickouts:** goalkeeper restarts after scores → "Kickout Own/Opp" events
-- **Throw-ups:** referee restarts → "Throw Up" events
-- **Fouls:** referee whistles, fouls, challenges → "Foul Awarded/Conceded" events
-
-DO NOT oversimplify or remove these - they're essential for the next stage to detect events!
-
-**HOW TO HANDLE SCORES:**
-
-Scores (Points and Goals) can appear multiple times in a short span, so focus on the strength of the evidence rather than an arbitrary cap:
-
-- KEEP the score if the observations clearly mention the ball going over the bar (point) or into the net (goal) **and** there is any supporting sign (celebration, scoreboard change, kickout restart, etc.).
-- REMOVE a score only if the narrative contradicts itself (e.g., immediate restart with a throw-up in the same spot) or if there is zero mention of the ball scoring.
-- Multiple kickouts in one segment are acceptable when they follow legitimate scores. Use kickouts as supporting evidence, not as a hard limit.
-
-Common false patterns to watch for:
-- "Players walking to restart position" without a prior score description.
-- Shots that never actually score (wide, saved, blocked).
-
-**YOUR VALIDATION TOOLKIT:**
-
-Use these GAA logic patterns to validate what you read:
-
-**Spatial validation (does the location make sense?):**
-- **Shots:** Check which goal the team is shooting toward - does it match their attack direction?
-  - Example: If observations say "Black shoots toward RIGHT goal" and Black attacks left-to-right → VALID ✓
-  - If "Black shoots toward LEFT goal" and Black attacks left-to-right → INVALID (hallucination or wrong team)
-- **Kickouts:** Check which goal the keeper is at - does it match their defending side?
-  - Example: "Black keeper kicks out from LEFT goal" and Black defends LEFT → VALID ✓
-  - If keeper location contradicts, it's likely a misidentification
-- **Use spatial info to verify team identity:** If you're unsure which team did something, check the goal side
-
-**Forward validation (cause must lead to effect):**
-- **Score (Point/Goal) → Kickout or celebration:** Real scores are usually followed by a kickout restart or clear celebratory language. If the score description is strong but the restart is missing, keep the score and simply note the restart is implied.
-- **Foul → Free kick/Scoreable foul:** Usually (but not always) follows within 5-30s. Keep both if you see them.
-
-**Backward validation (effect reveals cause):**
-- **Kickout → Score:** If you see a kickout, look 5-20s before. Did the observations mention a shot or score? If yes, connect them ("Shot at goal, scores a point"). If not mentioned, don't infer it.
-- **Throw-up → Stoppage:** Look 5-15s before. Was there a contested ball or stoppage? Connect them if explicitly mentioned.
-- **Free kick → Foul:** Look 5-30s before. Was a whistle/foul mentioned? Connect them if found.
-
-**Conservative inference principle:**
-Only infer missing events if there's explicit evidence in the observations. Don't add events that weren't mentioned - that's just more hallucination!
-
-**What to remove:**
-- Sequences that are chronologically impossible (e.g., kickout before game starts)
-- Scores that never mention the ball scoring and have no supporting cues
-- Duplicate descriptions of the same event when only one actually happened
-
-**OUTPUT FORMAT:**
-Keep the same format as the input observations - organized by clip with timestamps:
+    return PROMPT.render(team_info=team_info, observations_block=observations_block)
 
-[XXXs] clip_name: Brief summary of what happened.
-11:25 - [Team color] player [ACTION DESCRIPTION]
-11:33 - [Next event]
 
-Keep it detailed for important events AND preserve spatial info:
-✅ GOOD: "11:25 - White player intercepts the pass in midfield"
-✅ GOOD: "00:53 - Black shoots toward RIGHT goal from 20m - POINT scored"
-✅ GOOD: "01:42 - Black keeper kicks out from LEFT goal, SHORT to LEFT, won by Black"
-❌ BAD: "11:25 - Play continues in midfield" (too vague - we lose the interception!)
-❌ BAD: "00:53 - Black shoots - POINT" (loses spatial context for validation!)
-
-**FINAL CHECKLIST BEFORE YOU FINISH:**
-1. Did you keep every score (point/goal) that had clear "ball over bar" or "ball into net" language?
-2. For any score you removed, did you document the reason in the validation notes?
-3. Did you preserve possession changes? (intercepts, tackles, turnovers)
-4. Did you preserve restarts? (kickouts, throw-ups)
-5. Did you preserve attacks and shots?
-
-Remember: You're helping us filter out hallucinations, not add more. When in doubt, be skeptical of dramatic claims (especially scores).
-
-**Here are the observations from the video AI:**
-
-{observations_block}
-
-**Now create your coherent narrative:**
-
-**FORMAT YOUR RESPONSE:**
-1. Start immediately with the coherent narrative (same format as observations)
-2. At the very END, add a brief validation note explaining any goals/kickoffs you removed
-
-Example structure:
-```
-[680s] clip_name: Description
-11:20 - Event description
-11:25 - Event description
-...
-[rest of narrative]
-...
-
----
-VALIDATION NOTES:
-- Removed score at XX:XX (no kickout after)
-- Kept 1 throw-up total (at start of period)
-```
-
-Remember - count those kickouts! If you have many kickouts, verify they follow legitimate scores. Good luck!"""
 def _segment_observations(observations_text: str) -> list[dict]:
     segments: dict[int, dict] = {}
     order: list[int] = []
@@ -308,6 +195,62 @@ def _segment_observations(observations_text: str) -> list[dict]:
 
     return structured_segments
 
+def _clip_blocks(observations_text: str) -> list[dict]:
+    """Observation lines grouped per clip: [{'start': seconds or None, 'lines': [...]}]"""
+    blocks: list[dict] = []
+    for line in observations_text.splitlines():
+        timestamp_match = re.match(r"\[(\d+)s\]", line)
+        if timestamp_match or not blocks:
+            blocks.append({'start': int(timestamp_match.group(1)) if timestamp_match else None, 'lines': []})
+        blocks[-1]['lines'].append(line)
+    return blocks
+
+
+def _block_span(blocks: list[dict]) -> tuple[int, int]:
+    starts = [block['start'] for block in blocks if block['start'] is not None]
+    if not starts:
+        return 0, SEGMENT_SECONDS
+    return min(starts), max(starts) + CLIP_SECONDS
+
+
+def _pack_observations(observations_text: str, estimate: TokenEstimator) -> list[dict]:
+    """
+    Windows packed by token budget instead of wall-clock time
+
+    Whole clips are added in order until the window would exceed --window-tokens
+    of observations, WINDOW_OUTPUT_TOKENS of expected output, or
+    --max-window-minutes. Busy stretches get shorter windows, quiet ones longer.
+    """
+    max_window_seconds = ARGS.max_window_minutes * 60
+
+    def can_join(window: list[dict], block: dict) -> bool:
+        if block['start'] is None:
+            return True
+        start, _ = _block_span(window)
+        return block['start'] + CLIP_SECONDS - start <= max_window_seconds
+
+    block_tokens = lambda block: estimate("\n".join(block['lines']))
+    windows = pack(
+        _clip_blocks(observations_text),
+        input_tokens=block_tokens,
+        input_budget=ARGS.window_tokens,
+        output_tokens=lambda block: NARRATIVE_OUTPUT_RATIO * block_tokens(block),
+        output_budget=WINDOW_OUTPUT_TOKENS,
+        can_join=can_join,
+    )
+
+    structured_segments = []
+    for idx, window in enumerate(windows):
+        start_seconds, end_seconds = _block_span(window)
+        structured_segments.append({
+            'index': idx,
+            'start_seconds': start_seconds,
+            'end_seconds': end_seconds,
+            'lines': [line for block in window for line in block['lines']]
+        })
+
+    return structured_segments
+
 def create_narrative():
     """Create coherent narrative from visual observations in 20-minute segments."""
 
@@ -327,17 +270,24 @@ def create_narrative():
     observations = input_file.read_text()
     print(f"📖 Loaded observations: {len(observations)} characters")
 
-    segments = _segment_observations(observations)
-    if not segments:
-        raise ValueError("❌ Unable to segment observations into 10-minute windows")
-
-    print(f"📊 Segmented into {len(segments)} segment(s) (~10 minutes each)")
-    
     model = genai.GenerativeModel(
         'gemini-2.5-pro',
         generation_config={"temperature": 0, "top_p": 0.1}
     )
 
+    if ARGS.window_tokens > 0:
+        estimate = TokenEstimator()
+        estimate.calibrate(model, observations[:20000])
+        segments = _pack_observations(observations, estimate)
+        window_desc = f"≤{ARGS.window_tokens} observation tokens / {ARGS.max_window_minutes} min each"
+    else:
+        segments = _segment_observations(observations)
+        window_desc = "~10 minutes each"
+    if not segments:
+        raise ValueError("❌ Unable to segment observations into narrative windows")
+
+    print(f"📊 Segmented into {len(segments)} segment(s) ({window_desc})")
+
     combined_lines: list[str] = []
     segments_meta: list[dict] = []
     usage_segments: list[dict] = []
@@ -366,9 +316,7 @@ def create_narrative():
         end_seconds = segment['end_seconds'] or (start_seconds + SEGMENT_SECONDS)
         label = f"{_format_label(start_seconds)}-{_format_label(end_seconds)}"
 
-        prompt_text = _build_stage2_prompt(segment_text, start_seconds, end_seconds)
         prompt_file = prompt_dir / f"prompt_stage2_segment_{order_idx:02d}_{label}.txt"
-        prompt_file.write_text(prompt_text)
 
         # Create model instance per thread (thread-safe)
         thread_model = genai.GenerativeModel(
@@ -376,20 +324,36 @@ def create_narrative():
             generation_config={"temperature": 0, "top_p": 0.1}
         )
 
+        def generate(lines: list[str], start: int, end: int, suffix: str = '') -> tuple[str, list[int]]:
+            """Narrative for lines; a response cut off at max output tokens is redone as two halves"""
+            prompt_text = _build_stage2_prompt("\n".join(lines).strip(), start, end)
+            prompt_file.with_name(f"{prompt_file.stem}{suffix}.txt").write_text(prompt_text)
+            response = thread_model.generate_content(prompt_text)
+            usage = response.usage_metadata
+            counts = [usage.prompt_token_count, usage.candidates_token_count, usage.total_token_count]
+            blocks = _clip_blocks("\n".join(lines))
+            if is_truncated(response) and len(blocks) > 1:
+                half = len(blocks) // 2
+                print(f" ✂️  segment {order_idx}{suffix} hit max output tokens, splitting", end="", flush=True)
+                parts = []
+                for part_suffix, part in ((suffix + 'a', blocks[:half]), (suffix + 'b', blocks[half:])):
+                    part_text, part_counts = generate(
+                        [line for block in part for line in block['lines']], *_block_span(part), part_suffix
+                    )
+                    parts.append(part_text)
+                    counts = [total + extra for total, extra in zip(counts, part_counts)]
+                return "\n\n".join(parts), counts
+            return response.text.strip(), counts
+
         seg_start_time = time.time()
         print(f"   ⏱️  Processing segment {order_idx}/{len(segments)}...", end="", flush=True)
-        response = thread_model.generate_content(prompt_text)
+        narrative_text, (prompt_tokens, output_tokens, total_tokens) = generate(segment['lines'], start_seconds, end_seconds)
         seg_elapsed = time.time() - seg_start_time
         print(f" {seg_elapsed:.1f}s")
-        narrative_text = response.text.strip()
 
         segment_file = segments_dir / f"segment_{order_idx:02d}_{label}.txt"
         segment_file.write_text(narrative_text + "\n")
 
-        usage = response.usage_metadata
-        prompt_tokens = usage.prompt_token_count
-        output_tokens = usage.candidates_token_count
-        total_tokens = usage.total_token_count
         input_cost, output_cost, total_cost = _calc_segment_cost(prompt_tokens, output_tokens)
 
         return {
@@ -493,6 +457,8 @@ def create_narrative():
     
     usage_stats = {
         'stage': 'stage_2_narrative',
+        'prompt_version': PROMPT.version,
+        'prompt_sha256': PROMPT.sha256,
         'model': 'gemini-2.5-pro',
         'segments_processed': totals['count'],
         'total_time_seconds': round(total_elapsed, 2),
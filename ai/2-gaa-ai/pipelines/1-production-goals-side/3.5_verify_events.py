@@ -0,0 +1,382 @@
+#!/usr/bin/env python3
+"""
+Stage 3.5: Verify Events on Short Sub-clips
+Re-checks Stage 3 candidate events (shots and kickouts by default) one at a
+time on a ±8s sub-clip cut from the local source video
+
+For each candidate:
+  1. ffmpeg cuts [t - window, t + window] (480p proxy by default - small upload)
+  2. a small Gemini call confirms type, team and outcome (prompts/verify/)
+  3. the event is kept, corrected (team / outcome) or dropped
+
+Only confident rejections drop an event (--min-confidence), so recall is
+protected while the false positives from one pass over a whole minute go.
+Events of other types pass through unverified.
+
+Writes 3_events_verified.txt (same line format as 3_events_classified.txt),
+3_verification.json and usage_stats_verify.json, then regenerates the JSON
+and XML from the verified list.
+
+Usage: python3 3.5_verify_events.py --game {game-name}
+"""
+
+import os
+import re
+import json
+import time
+import argparse
+import subprocess
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dotenv import load_dotenv
+import google.generativeai as genai
+from prompt_registry import load_template
+from proxy_encoding import add_proxy_arguments, profile_from_args, encode_args, describe
+from model_cascade import token_cost
+
+# Parse arguments
+parser = argparse.ArgumentParser(description='Verify Stage 3 events on short sub-clips')
+parser.add_argument('--game', required=True, help='Game name (folder in games/)')
+parser.add_argument('--run-folder', help='Explicit output folder under outputs/ (overrides .current_run.txt)')
+parser.add_argument('--actions', default='Shot,Kickout', help='Event types to verify (default: Shot,Kickout)')
+parser.add_argument('--window', type=float, default=8, help='Seconds either side of the event (default: 8)')
+parser.add_argument('--min-confidence', type=float, default=0.6, help='Verifier confidence needed to drop or correct an event (default: 0.6)')
+parser.add_argument('--no-corrections', action='store_true', help='Only keep/drop events, never change team or outcome')
+parser.add_argument('--model', default='gemini-2.5-flash', help='Verification model (default: gemini-2.5-flash)')
+parser.add_argument('--workers', type=int, default=16, help='Parallel verifications (default: 16)')
+parser.add_argument('--prompt-file', help='Prompt template file (overrides --prompt-version)')
+parser.add_argument('--prompt-version', help='Prompt template version in prompts/{stage}/ (default: prompts/registry.json)')
+add_proxy_arguments(parser, default='480p')
+ARGS = parser.parse_args(globals().get('STAGE_ARGV'))  # STAGE_ARGV set by stage_runner.py for in-process runs
+
+# Setup paths
+PROD_ROOT = Path(__file__).parent.parent.parent
+GAME_ROOT = PROD_ROOT / "games" / ARGS.game
+INPUTS_DIR = GAME_ROOT / "inputs"
+
+# Auto-detect output folder from Stage 1
+run_config = GAME_ROOT / "outputs" / ".current_run.txt"
+if ARGS.run_folder:
+    output_folder = ARGS.run_folder
+    print(f"📁 Using run folder: {output_folder}")
+elif run_config.exists():
+    output_folder = run_config.read_text().strip()
+    print(f"📁 Using output folder: {output_folder}")
+else:
+    output_folder = "6-with-audio"
+    print(f"📁 Using default folder: {output_folder}")
+
+OUTPUT_DIR = GAME_ROOT / "outputs" / output_folder
+SUBCLIPS_DIR = OUTPUT_DIR / "3_verify_clips"
+VERIFY_ACTIONS = {a.strip() for a in ARGS.actions.split(',') if a.strip()}
+PROXY_PROFILE = profile_from_args(ARGS)
+
+# Setup API
+load_dotenv('/home/ubuntu/clann/CLANNAI/.env')
+api_key = os.getenv('GEMINI_API_KEY') or os.getenv('GOOGLE_API_KEY')
+genai.configure(api_key=api_key)
+model = genai.GenerativeModel(
+    ARGS.model,
+    generation_config={"temperature": 0, "top_p": 0.1, "response_mime_type": "application/json"}
+)
+
+# Prompt template from the registry (prompts/verify/), loaded once per process
+PROMPT = load_template('verify', ARGS.prompt_file or ARGS.prompt_version)
+print(f"📝 Prompt: verify/{PROMPT.version} ({PROMPT.sha256[:8]})")
+
+# Load game profile (REQUIRED)
+profile_path = INPUTS_DIR / "game_profile.json"
+if not profile_path.exists():
+    print("❌ ERROR: game_profile.json not found!")
+    print(f"   Expected at: {profile_path}")
+    print(f"   Run once: python3 pipelines/1-production-goals-side/0.5_calibrate_game.py --game {ARGS.game}")
+    exit(1)
+
+with open(profile_path, 'r') as f:
+    GAME_PROFILE = json.load(f)
+
+if GAME_PROFILE.get('home_team_assignment') not in {'team_a', 'team_b'}:
+    print("❌ FATAL ERROR: home_team_assignment not configured in game_profile.json")
+    exit(1)
+
+if GAME_PROFILE['home_team_assignment'] == 'team_a':
+    HOME_TEAM, AWAY_TEAM = GAME_PROFILE['team_a'], GAME_PROFILE['team_b']
+else:
+    HOME_TEAM, AWAY_TEAM = GAME_PROFILE['team_b'], GAME_PROFILE['team_a']
+
+OUTCOMES = {
+    'Shot': ['Point', 'Goal', 'Wide', 'Saved'],
+    'Kickout': ['Won', 'Lost'],
+}
+
+
+def find_video_file():
+    """Source video - video_source.json target first, then any .mp4 in inputs/"""
+    video_source_json = INPUTS_DIR / "video_source.json"
+    if video_source_json.exists():
+        try:
+            with open(video_source_json) as f:
+                downloads = json.load(f).get('downloads', [])
+            if downloads and downloads[0].get('target'):
+                video_path = INPUTS_DIR / downloads[0]['target']
+                if video_path.exists():
+                    return video_path
+        except (OSError, ValueError):
+            pass
+    videos = sorted(INPUTS_DIR.glob('*.mp4'))
+    return videos[0] if videos else None
+
+
+def _format_clock(seconds: float) -> str:
+    seconds = max(int(seconds), 0)
+    return f"{seconds // 60:02d}:{seconds % 60:02d}"
+
+
+def parse_event(line: str):
+    """
+    Action / team / outcome of a Stage 3 line (same rules as 4_json_extraction.py)
+
+    Returns:
+        Dict or None if the line is not an event
+    """
+    match = re.match(r'(\d+):(\d+)\s*-\s*([^\[:]+)(.*)$', line)
+    if not match:
+        return None
+    minutes, seconds, code, rest = match.groups()
+    tags = re.findall(r'\[([^\]]+)\]', rest)
+    action = next((a for a in ('Shot', 'Kickout', 'Turnover', 'Foul') if a in code), None)
+    if action is None and 'throw' in code.lower():
+        action = 'Throw-up'
+    if action is None:
+        return None
+    outcome = next((t.capitalize() for t in tags if t.capitalize() in OUTCOMES.get(action, [])), None)
+    return {
+        'time': int(minutes) * 60 + int(seconds),
+        'action': action,
+        'team': 'away' if 'Away' in code else 'home',
+        'outcome': outcome,
+        'line': line
+    }
+
+
+def team_from_color(color: str):
+    """'home' / 'away' for a jersey color named by the verifier (None if unclear)"""
+    color = (color or '').strip().lower()
+    home, away = HOME_TEAM['jersey_color'].lower(), AWAY_TEAM['jersey_color'].lower()
+    if not color or color == 'unknown':
+        return None
+    if color in home or home in color:
+        return None if (color in away or away in color) else 'home'
+    if color in away or away in color:
+        return 'away'
+    return None
+
+
+def team_context(event_time: float) -> str:
+    """Jersey colors and attack directions for the half the event is in"""
+    half_time = GAME_PROFILE.get('match_times', {}).get('half_time', 1800)
+    half = '1st' if event_time < half_time else '2nd'
+    return f"""CONTEXT: {half} half.
+
+TEAMS (refer to them ONLY by jersey color):
+- {HOME_TEAM['jersey_color']} ({HOME_TEAM['keeper_color']} keeper) - attacking {HOME_TEAM[f'attack_direction_{half}_half']}
+- {AWAY_TEAM['jersey_color']} ({AWAY_TEAM['keeper_color']} keeper) - attacking {AWAY_TEAM[f'attack_direction_{half}_half']}"""
+
+
+def cut_subclip(video_path: Path, event_time: float, output_path: Path) -> float:
+    """Cut [t - window, t + window] from the source video; returns the sub-clip start"""
+    start = max(0.0, event_time - ARGS.window)
+    if not output_path.exists():
+        cmd = ['ffmpeg', '-v', 'error', '-ss', f"{start:g}", '-i', str(video_path), '-t', f"{2 * ARGS.window:g}"]
+        cmd += encode_args(PROXY_PROFILE) if PROXY_PROFILE else ['-c', 'copy']
+        cmd += ['-y', str(output_path)]
+        subprocess.run(cmd, capture_output=True, text=True, check=True, timeout=120)
+    return start
+
+
+def parse_verdict(text: str):
+    """Verifier JSON → dict (None if unparseable)"""
+    match = re.search(r'\{.*\}', text or '', re.DOTALL)
+    if not match:
+        return None
+    try:
+        verdict = json.loads(match.group(0))
+        verdict['confidence'] = min(1.0, max(0.0, float(verdict.get('confidence', 0))))
+    except (ValueError, TypeError):
+        return None
+    return verdict
+
+
+def apply_verdict(event: dict, verdict: dict):
+    """
+    Keep, correct or drop one event
+
+    Returns:
+        (decision, line, reason) - decision is confirmed / corrected / dropped / unverified
+    """
+    if verdict is None:
+        return 'unverified', event['line'], 'no usable verifier answer'
+    confident = verdict['confidence'] >= ARGS.min_confidence
+    reason = verdict.get('reason', '')
+
+    same_action = str(verdict.get('action', '')).lower() == event['action'].lower()
+    if not verdict.get('present') or not same_action:
+        if confident:
+            return 'dropped', None, reason
+        return 'unverified', event['line'], f"low-confidence rejection: {reason}"
+
+    line = event['line']
+    changes = []
+    if confident and not ARGS.no_corrections and event['action'] in OUTCOMES:
+        team = team_from_color(verdict.get('team'))
+        code = re.match(r'\d+:\d+\s*-\s*([^\[:]+)', line)
+        if team and team != event['team'] and re.search(r'\b(Home|Away)\b', code.group(1)):
+            # Team is the Home/Away word in the event code (before the tags)
+            swapped = re.sub(r'\b(Home|Away)\b', 'Away' if team == 'away' else 'Home', code.group(1), count=1)
+            line = line[:code.start(1)] + swapped + line[code.end(1):]
+            changes.append(f"team {event['team']}→{team}")
+        outcome = str(verdict.get('outcome', '')).capitalize()
+        if event['outcome'] and outcome in OUTCOMES.get(event['action'], []) and outcome != event['outcome']:
+            line = re.sub(rf"\[{event['outcome']}\]", f"[{outcome}]", line, count=1, flags=re.IGNORECASE)
+            changes.append(f"outcome {event['outcome']}→{outcome}")
+    if changes:
+        return 'corrected', line, ', '.join(changes)
+    return 'confirmed', line, reason
+
+
+def verify_single_event(index: int, event: dict, video_path: Path) -> dict:
+    """Cut the sub-clip, ask the verifier, apply its verdict"""
+    started = time.time()
+    usage = {'prompt_tokens': 0, 'output_tokens': 0, 'total_tokens': 0}
+    verdict = None
+    try:
+        subclip = SUBCLIPS_DIR / f"event_{index:03d}_{_format_clock(event['time']).replace(':', 'm')}s.mp4"
+        start = cut_subclip(video_path, event['time'], subclip)
+        prompt = PROMPT.render(
+            team_context=team_context(event['time']),
+            event_line=event['line'],
+            window_start=_format_clock(start),
+            window_end=_format_clock(start + 2 * ARGS.window),
+            event_time=_format_clock(event['time']),
+            event_offset=f"{event['time'] - start:.0f}"
+        )
+        response = model.generate_content([{"mime_type": "video/mp4", "data": subclip.read_bytes()}, prompt])
+        usage = {
+            'prompt_tokens': response.usage_metadata.prompt_token_count,
+            'output_tokens': response.usage_metadata.candidates_token_count,
+            'total_tokens': response.usage_metadata.total_token_count,
+        }
+        verdict = parse_verdict(response.text)
+    except Exception as e:
+        print(f"   ⚠️  {_format_clock(event['time'])} {event['action']}: verification failed ({e})")
+
+    decision, line, reason = apply_verdict(event, verdict)
+    return {
+        'index': index,
+        'time': event['time'],
+        'action': event['action'],
+        'original': event['line'],
+        'line': line,
+        'decision': decision,
+        'reason': reason,
+        'verdict': verdict,
+        'usage': usage,
+        'seconds': round(time.time() - started, 2)
+    }
+
+
+def verify_events():
+    """Verify Stage 3 events and write the precision-filtered list"""
+    input_file = OUTPUT_DIR / "3_events_classified.txt"
+    output_file = OUTPUT_DIR / "3_events_verified.txt"
+    details_file = OUTPUT_DIR / "3_verification.json"
+    usage_file = OUTPUT_DIR / "usage_stats_verify.json"
+
+    if not input_file.exists():
+        raise FileNotFoundError(f"❌ Input file not found: {input_file} - run Stage 3 first")
+    video_path = find_video_file()
+    if not video_path:
+        raise FileNotFoundError(f"❌ Source video not found in {INPUTS_DIR}")
+
+    lines = [l.strip() for l in input_file.read_text().splitlines() if l.strip()]
+    events = [(i, parse_event(line)) for i, line in enumerate(lines)]
+    candidates = [(i, e) for i, e in events if e and e['action'] in VERIFY_ACTIONS]
+
+    print(f"📖 {len(lines)} Stage 3 lines, {len(candidates)} to verify ({', '.join(sorted(VERIFY_ACTIONS))})")
+    print(f"🎞️  Sub-clips: ±{ARGS.window:g}s from {video_path.name}, {describe(PROXY_PROFILE)}")
+    print(f"🚀 {ARGS.model}, {ARGS.workers} workers")
+    SUBCLIPS_DIR.mkdir(parents=True, exist_ok=True)
+
+    stage_start = time.time()
+    results = {}
+    with ThreadPoolExecutor(max_workers=ARGS.workers) as executor:
+        futures = {executor.submit(verify_single_event, i, e, video_path): i for i, e in candidates}
+        for completed, future in enumerate(as_completed(futures), 1):
+            result = future.result()
+            results[result['index']] = result
+            icon = {'confirmed': '✅', 'corrected': '✏️ ', 'dropped': '🗑️ ', 'unverified': '❔'}[result['decision']]
+            print(f"   {icon} {_format_clock(result['time'])} {result['action']}: {result['decision']} - {result['reason'][:70]}")
+            if completed % 10 == 0:
+                print(f"📊 Progress: {completed}/{len(candidates)} events")
+
+    # Verified list in the original order; other event types pass through
+    kept = []
+    for i, line in enumerate(lines):
+        if i in results:
+            if results[i]['line']:
+                kept.append(results[i]['line'])
+        else:
+            kept.append(line)
+    output_file.write_text("\n".join(kept))
+
+    details = [results[i] for i in sorted(results)]
+    with open(details_file, 'w') as f:
+        json.dump(details, f, indent=2)
+
+    counts = {d: sum(1 for r in details if r['decision'] == d) for d in ('confirmed', 'corrected', 'dropped', 'unverified')}
+    tokens = {key: sum(r['usage'][key] for r in details) for key in ('prompt_tokens', 'output_tokens', 'total_tokens')}
+    input_cost, output_cost = token_cost(ARGS.model, tokens['prompt_tokens'], tokens['output_tokens'])
+    usage_stats = {
+        'stage': 'stage_3_5_verification',
+        'model': ARGS.model,
+        'prompt_version': PROMPT.version,
+        'prompt_sha256': PROMPT.sha256,
+        'actions': sorted(VERIFY_ACTIONS),
+        'window_seconds': ARGS.window,
+        'min_confidence': ARGS.min_confidence,
+        'encoding': PROXY_PROFILE or {'name': 'source'},
+        'events_in': len(lines),
+        'events_out': len(kept),
+        'decisions': counts,
+        'api_calls': len(details),
+        'tokens': tokens,
+        'cost': {
+            'input': round(input_cost, 6),
+            'output': round(output_cost, 6),
+            'total': round(input_cost + output_cost, 6)
+        },
+        'total_time_seconds': round(time.time() - stage_start, 2)
+    }
+    with open(usage_file, 'w') as f:
+        json.dump(usage_stats, f, indent=2)
+
+    print(f"\n✅ Verified {len(details)} events: {counts['confirmed']} confirmed, {counts['corrected']} corrected, "
+          f"{counts['dropped']} dropped, {counts['unverified']} unverified")
+    print(f"📉 {len(lines)} → {len(kept)} events")
+    print(f"💰 ${usage_stats['cost']['total']:.4f} ({tokens['prompt_tokens']:,} in / {tokens['output_tokens']:,} out)")
+    print(f"💾 Saved to: {output_file}")
+
+
+if __name__ == "__main__":
+    print(f"🔎 STAGE 3.5: VERIFY EVENTS ON SUB-CLIPS")
+    print(f"Game: {ARGS.game}")
+    print("=" * 50)
+    verify_events()
+
+    # Regenerate JSON and XML from the verified list (in-process)
+    print("\n🔧 Regenerating JSON and XML from verified events...")
+    from stage_runner import run_stage
+    run_folder_args = ["--run-folder", ARGS.run_folder] if ARGS.run_folder else []
+    run_stage("4_json_extraction.py", ["--game", ARGS.game, "--verified"] + run_folder_args)
+    run_stage("5_export_to_anadi_xml.py", ["--game", ARGS.game] + run_folder_args)
+    print("✅ JSON and XML generated from verified events!")
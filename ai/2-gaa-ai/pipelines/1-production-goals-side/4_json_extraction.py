@@ -30,7 +30,9 @@ from typing import Dict, List, Optional
 # Parse arguments
 parser = argparse.ArgumentParser()
 parser.add_argument('--game', required=True)
-ARGS = parser.parse_args()
+parser.add_argument('--verified', action='store_true', help='Read 3_events_verified.txt (Stage 3.5) instead of 3_events_classified.txt')
+parser.add_argument('--run-folder', help='Explicit output folder under outputs/ (overrides .current_run.txt)')
+ARGS = parser.parse_args(globals().get('STAGE_ARGV'))  # STAGE_ARGV set by stage_runner.py for in-process runs
 
 # Paths
 PROD_ROOT = Path(__file__).parent.parent.parent
@@ -38,7 +40,10 @@ GAME_ROOT = PROD_ROOT / "games" / ARGS.game
 
 # Auto-detect output folder from Stage 1
 run_config = GAME_ROOT / "outputs" / ".current_run.txt"
-if run_config.exists():
+if ARGS.run_folder:
+    output_folder = ARGS.run_folder
+    print(f"📁 Using run folder: {output_folder}")
+elif run_config.exists():
     output_folder = run_config.read_text().strip()
     print(f"📁 Using output folder: {output_folder}")
 else:
@@ -221,7 +226,7 @@ def parse_event_line(line: str, event_id: int) -> Optional[Dict]:
 def extract_json():
     """Extract structured JSON events from text narrative using regex parsing"""
     
-    input_file = OUTPUT_DIR / "3_events_classified.txt"
+    input_file = OUTPUT_DIR / ("3_events_verified.txt" if ARGS.verified else "3_events_classified.txt")
     output_file = OUTPUT_DIR / "4_events.json"
     
     if not input_file.exists():
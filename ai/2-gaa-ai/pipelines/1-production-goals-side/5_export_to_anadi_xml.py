@@ -19,7 +19,8 @@ from xml.dom import minidom
 # Parse arguments
 parser = argparse.ArgumentParser()
 parser.add_argument('--game', required=True, help='Game name (folder in games/)')
-ARGS = parser.parse_args()
+parser.add_argument('--run-folder', help='Explicit output folder under outputs/ (overrides .current_run.txt)')
+ARGS = parser.parse_args(globals().get('STAGE_ARGV'))  # STAGE_ARGV set by stage_runner.py for in-process runs
 
 # Setup paths
 PROD_ROOT = Path(__file__).parent.parent.parent
@@ -27,7 +28,10 @@ GAME_ROOT = PROD_ROOT / "games" / ARGS.game
 
 # Auto-detect output folder
 run_config = GAME_ROOT / "outputs" / ".current_run.txt"
-if run_config.exists():
+if ARGS.run_folder:
+    output_folder = ARGS.run_folder
+    print(f"📁 Using run folder: {output_folder}")
+elif run_config.exists():
     output_folder = run_config.read_text().strip()
     print(f"📁 Using output folder: {output_folder}")
 else:
@@ -18,7 +18,10 @@ from typing import Dict, List, Tuple
 parser = argparse.ArgumentParser()
 parser.add_argument('--game', required=True, help='Game name (folder in games/)')
 parser.add_argument('--time-limit', type=float, help='Only evaluate events up to this time in seconds (e.g., 600 for 10 min)')
-ARGS = parser.parse_args()
+parser.add_argument('--time-start', type=float, help='Only evaluate events after this time in seconds (e.g., 180 when clips 3+ were analyzed)')
+parser.add_argument('--run-folder', help='Explicit output folder under outputs/ (overrides .current_run.txt)')
+parser.add_argument('--baseline-run', help='Run folder to compare F1 and upload size against (e.g. a source-quality run)')
+ARGS = parser.parse_args(globals().get('STAGE_ARGV'))  # STAGE_ARGV set by stage_runner.py for in-process runs
 
 # Setup paths
 PROD_ROOT = Path(__file__).parent.parent.parent
@@ -27,7 +30,10 @@ INPUT_DIR = GAME_ROOT / "inputs"
 
 # Auto-detect output folder from Stage 1
 run_config = GAME_ROOT / "outputs" / ".current_run.txt"
-if run_config.exists():
+if ARGS.run_folder:
+    output_folder = ARGS.run_folder
+    print(f"📁 Using run folder: {output_folder}")
+elif run_config.exists():
     output_folder = run_config.read_text().strip()
     print(f"📁 Using output folder: {output_folder}")
 else:
@@ -65,14 +71,32 @@ TIMELINE_FILE = OUTPUT_DIR / "7_evaluation_timeline.txt"
 
 TOLERANCE = 20.0  # seconds
 
-def load_events(json_path: Path, time_limit: float = None) -> List[Dict]:
-    """Load events from EVENT_SCHEMA JSON file"""
-    with open(json_path, 'r') as f:
-        events = json.load(f)
+def load_events(json_path: Path, time_limit: float = None, cache: Dict = None,
+                time_start: float = None) -> List[Dict]:
+    """
+    Load events from EVENT_SCHEMA JSON file
+    
+    Args:
+        json_path: EVENT_SCHEMA JSON file
+        time_limit: Only keep events up to this time (seconds)
+        time_start: Only keep events after this time (seconds)
+        cache: Optional dict (path -> parsed events) shared between runs, so
+               ground truth is read once per process (see fitness_evaluator.py)
+    """
+    key = str(json_path)
+    if cache is not None and key in cache:
+        events = cache[key]
+    else:
+        with open(json_path, 'r') as f:
+            events = json.load(f)
+        if cache is not None:
+            cache[key] = events
     
     # Filter by time limit if specified
     if time_limit:
         events = [e for e in events if e['time'] <= time_limit]
+    if time_start:
+        events = [e for e in events if e['time'] > time_start]
     
     return events
 
@@ -272,6 +296,16 @@ def generate_timeline(matches: List[Dict], overall_metrics: Dict, total_ai: int,
         total_input_tokens += tokens_in
         total_output_tokens += tokens_out
         lines.append(f"Stage 1 (Clip Descriptions):  ${cost:.4f}  ({tokens_in:,} in / {tokens_out:,} out)")
+        if stage1.get('upload'):
+            upload = stage1['upload']
+            lines.append(f"   Upload: {upload['bytes_per_clip'] / 1_000_000:.2f} MB per clip, "
+                         f"{upload['bytes_total'] / 1_000_000:.1f} MB total ({upload['encoding'].get('name', 'source')} encoding)")
+        if stage1.get('cascade', {}).get('enabled'):
+            cascade = stage1['cascade']
+            lines.append(f"   Cascade: {cascade['triaged']} triaged by {cascade['triage_model']} (${cascade['triage_cost']:.4f}), "
+                         f"{cascade['escalated']} escalated to Pro (${cascade['pro_cost']:.4f}), threshold {cascade['threshold']}")
+        if stage1.get('latency'):
+            lines.append(f"   Latency: p50 {stage1['latency']['p50_seconds']:.1f}s, p95 {stage1['latency']['p95_seconds']:.1f}s per clip")
     
     # Stage 2
     stage2_file = output_dir / "usage_stats_stage2.json"
@@ -299,6 +333,22 @@ def generate_timeline(matches: List[Dict], overall_metrics: Dict, total_ai: int,
         total_output_tokens += tokens_out
         lines.append(f"Stage 3 (Classification):     ${cost:.4f}  ({tokens_in:,} in / {tokens_out:,} out)")
     
+    # Stage 3.5 (optional)
+    verify_file = output_dir / "usage_stats_verify.json"
+    if verify_file.exists():
+        with open(verify_file, 'r') as f:
+            verify = json.load(f)
+        cost = verify['cost']['total']
+        tokens_in = verify['tokens']['prompt_tokens']
+        tokens_out = verify['tokens']['output_tokens']
+        total_cost += cost
+        total_input_tokens += tokens_in
+        total_output_tokens += tokens_out
+        lines.append(f"Stage 3.5 (Verification):     ${cost:.4f}  ({tokens_in:,} in / {tokens_out:,} out)")
+        decisions = verify['decisions']
+        lines.append(f"   {verify['events_in']} → {verify['events_out']} events: {decisions['confirmed']} confirmed, "
+                     f"{decisions['corrected']} corrected, {decisions['dropped']} dropped, {decisions['unverified']} unverified")
+    
     lines.append(f"Stages 4-7:                   $0.0000  (regex/JSON only)")
     lines.append("-" * 100)
     lines.append(f"TOTAL THIS RUN:               ${total_cost:.4f}  ({total_input_tokens:,} in / {total_output_tokens:,} out)")
@@ -382,6 +432,68 @@ def generate_timeline(matches: List[Dict], overall_metrics: Dict, total_ai: int,
     return "\n".join(lines)
 
 
+def input_encoding_summary(output_dir: Path, f1: float) -> dict:
+    """Clip encoding and upload size of a run, with F1/size deltas against --baseline-run"""
+    stage1_file = output_dir / "usage_stats_stage1.json"
+    if not stage1_file.exists():
+        return {}
+    with open(stage1_file, 'r') as f:
+        upload = json.load(f).get('upload')
+    if not upload:
+        return {}
+    
+    summary = {
+        'encoding': upload['encoding'],
+        'bytes_per_clip': upload['bytes_per_clip'],
+        'bytes_total': upload['bytes_total']
+    }
+    if ARGS.baseline_run:
+        baseline_dir = GAME_ROOT / "outputs" / ARGS.baseline_run
+        baseline_metrics = baseline_dir / OUT_FILE.name
+        if baseline_metrics.exists():
+            with open(baseline_metrics, 'r') as f:
+                baseline = json.load(f)
+            baseline_f1 = baseline['micro']['f1']
+            summary.update({'baseline_run': ARGS.baseline_run, 'baseline_f1': baseline_f1,
+                            'f1_delta': round(f1 - baseline_f1, 4)})
+            baseline_bytes = baseline.get('input_encoding', {}).get('bytes_per_clip')
+            if baseline_bytes:
+                summary['bytes_ratio'] = round(upload['bytes_per_clip'] / baseline_bytes, 3)
+        else:
+            print(f"⚠️  Baseline metrics not found: {baseline_metrics}")
+    return summary
+
+def stage1_summary(output_dir: Path, event_stats: Dict) -> dict:
+    """Stage 1 cost, p95 clip latency and shot recall, with ratios/deltas against --baseline-run (cascade tuning)"""
+    stage1_file = output_dir / "usage_stats_stage1.json"
+    if not stage1_file.exists():
+        return {}
+    with open(stage1_file, 'r') as f:
+        stage1 = json.load(f)
+    
+    shots = event_stats.get('Shot', {'TP': 0, 'FN': 0})
+    summary = {
+        'cascade': stage1.get('cascade', {'enabled': False}),
+        'cost_total': stage1['cost']['total'],
+        'p95_seconds': stage1.get('latency', {}).get('p95_seconds'),
+        'shot_recall': round(shots['TP'] / (shots['TP'] + shots['FN']), 4) if shots['TP'] + shots['FN'] else None
+    }
+    if ARGS.baseline_run:
+        baseline_metrics = GAME_ROOT / "outputs" / ARGS.baseline_run / OUT_FILE.name
+        baseline = {}
+        if baseline_metrics.exists():
+            with open(baseline_metrics, 'r') as f:
+                baseline = json.load(f).get('stage1', {})
+        if baseline:
+            summary['baseline_run'] = ARGS.baseline_run
+            if baseline.get('cost_total'):
+                summary['cost_ratio'] = round(summary['cost_total'] / baseline['cost_total'], 3)
+            if baseline.get('p95_seconds') and summary['p95_seconds'] is not None:
+                summary['p95_ratio'] = round(summary['p95_seconds'] / baseline['p95_seconds'], 3)
+            if baseline.get('shot_recall') is not None and summary['shot_recall'] is not None:
+                summary['shot_recall_delta'] = round(summary['shot_recall'] - baseline['shot_recall'], 4)
+    return summary
+
 def main():
     """Main evaluation pipeline"""
     
@@ -390,15 +502,18 @@ def main():
     print(f"   GT JSON:  {GT_JSON_FILE.name}")
     if ARGS.time_limit:
         print(f"   Time Limit: {ARGS.time_limit}s ({ARGS.time_limit/60:.1f} min)")
+    if ARGS.time_start:
+        print(f"   Time Start: {ARGS.time_start}s ({ARGS.time_start/60:.1f} min)")
     print()
     
     # Load events
     print(f"🔍 Loading AI events...")
-    ai_events = load_events(AI_JSON_FILE, time_limit=ARGS.time_limit)
+    ai_events = load_events(AI_JSON_FILE, time_limit=ARGS.time_limit, time_start=ARGS.time_start)
     print(f"   Found {len(ai_events)} AI events")
     
     print(f"🔍 Loading ground truth events...")
-    gt_events = load_events(GT_JSON_FILE, time_limit=ARGS.time_limit)
+    gt_events = load_events(GT_JSON_FILE, time_limit=ARGS.time_limit, time_start=ARGS.time_start,
+                            cache=globals().get('GT_CACHE'))  # GT_CACHE injected by in-process callers
     print(f"   Found {len(gt_events)} ground truth events")
     print()
     
@@ -426,6 +541,16 @@ def main():
         }
     }
     
+    # Clip encoding / upload size (and accuracy delta vs a baseline run)
+    input_encoding = input_encoding_summary(OUTPUT_DIR, overall_metrics['f1'])
+    if input_encoding:
+        output['input_encoding'] = input_encoding
+    
+    # Stage 1 cost / latency / shot recall (measures the cascade threshold against a baseline run)
+    stage1 = stage1_summary(OUTPUT_DIR, event_stats)
+    if stage1:
+        output['stage1'] = stage1
+    
     # Save metrics
     with open(OUT_FILE, 'w') as f:
         json.dump(output, f, indent=2)
@@ -442,6 +567,20 @@ def main():
     print(f"   True Positives: {overall_metrics['TP']}")
     print(f"   False Positives: {overall_metrics['FP']}")
     print(f"   False Negatives: {overall_metrics['FN']}")
+    if input_encoding:
+        print(f"   Upload: {input_encoding['bytes_per_clip'] / 1_000_000:.2f} MB per clip "
+              f"({input_encoding['encoding'].get('name', 'source')} encoding)")
+    if 'f1_delta' in input_encoding:
+        ratio = f", {input_encoding['bytes_ratio']:.2f}× the bytes" if 'bytes_ratio' in input_encoding else ""
+        print(f"   vs {input_encoding['baseline_run']}: F1 {input_encoding['f1_delta']:+.1%}{ratio}")
+    if stage1:
+        recall = f"{stage1['shot_recall']:.1%}" if stage1['shot_recall'] is not None else "n/a"
+        print(f"   Stage 1: ${stage1['cost_total']:.4f}, p95 {stage1['p95_seconds'] or 0:.1f}s per clip, shot recall {recall}"
+              f"{' (cascade)' if stage1['cascade'].get('enabled') else ''}")
+    if 'cost_ratio' in stage1:
+        p95 = f", p95 {stage1['p95_ratio']:.2f}×" if 'p95_ratio' in stage1 else ""
+        recall_delta = f", shot recall {stage1['shot_recall_delta']:+.1%}" if 'shot_recall_delta' in stage1 else ""
+        print(f"   vs {stage1['baseline_run']}: cost {stage1['cost_ratio']:.2f}×{p95}{recall_delta}")
     print()
     print(f"✅ Saved metrics: {OUT_FILE.name}")
     print(f"✅ Saved timeline: {TIMELINE_FILE.name}")
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Audio Events - Local whistle / crowd-noise pre-pass (no LLM calls)
+
+ffmpeg decodes the match audio ONCE to mono 16 kHz PCM and NumPy computes
+short-time spectra while the stream is read (memory stays flat):
+  whistle  - tonal burst in the 2-4 kHz band (referee pea whistle): most of
+             the frame energy in the band AND one dominant spectral peak
+  crowd    - broadband loudness spike well above the local (rolling) level
+             (scores, near misses, contested frees)
+
+The candidates are hints, not events: Stage 1 and Stage 3 add them to the
+prompt ("confirm visually"), and 0.6_select_clips.py uses them to rank clips
+(and to keep full video for quiet-looking clips that have a whistle).
+
+Usage:
+    python3 audio_events.py --game {game-name}   # writes inputs/audio_events.json
+"""
+
+import json
+import argparse
+import subprocess
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+SAMPLE_RATE = 16000
+FRAME_SIZE = 1024               # 64 ms analysis frames
+WHISTLE_BAND = (2000, 4000)     # Hz
+CLIP_SECONDS = 60
+
+
+def stream_audio_features(video_path: Path, sample_rate: int = SAMPLE_RATE, frame_size: int = FRAME_SIZE,
+                          chunk_frames: int = 1024) -> Dict:
+    """
+    Per-frame spectral features from a single ffmpeg audio decode
+
+    Args:
+        video_path: Source video (or audio) file
+        sample_rate: Decode rate (must be > 2x the top of WHISTLE_BAND)
+        frame_size: Samples per analysis frame
+        chunk_frames: Frames read from ffmpeg per NumPy batch
+
+    Returns:
+        Dict of arrays (one value per frame): power, band_ratio, tonality, peak_freq
+        plus frame_seconds
+    """
+    cmd = [
+        'ffmpeg', '-v', 'error',
+        '-i', str(video_path),
+        '-vn', '-ac', '1', '-ar', str(sample_rate),
+        '-f', 's16le', 'pipe:1'
+    ]
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+
+    window = np.hanning(frame_size).astype(np.float32)
+    freqs = np.fft.rfftfreq(frame_size, 1.0 / sample_rate)
+    band = (freqs >= WHISTLE_BAND[0]) & (freqs <= WHISTLE_BAND[1])
+    band_freqs = freqs[band]
+    frame_bytes = frame_size * 2
+
+    features = {'power': [], 'band_ratio': [], 'tonality': [], 'peak_freq': []}
+    while True:
+        buffer = proc.stdout.read(frame_bytes * chunk_frames)
+        count = len(buffer) // frame_bytes
+        if count == 0:
+            break
+        samples = np.frombuffer(buffer[:count * frame_bytes], dtype='<i2').astype(np.float32) / 32768.0
+        frames = samples.reshape(count, frame_size)
+
+        spectrum = np.abs(np.fft.rfft(frames * window, axis=1)) ** 2
+        total = spectrum.sum(axis=1) + 1e-12
+        band_power = spectrum[:, band]
+
+        features['power'].append((frames ** 2).mean(axis=1))
+        features['band_ratio'].append(band_power.sum(axis=1) / total)
+        # Strongest bin vs the band average: ~1 for noise, large for a whistle tone
+        features['tonality'].append(band_power.max(axis=1) / (band_power.mean(axis=1) + 1e-12))
+        features['peak_freq'].append(band_freqs[band_power.argmax(axis=1)])
+
+    _, stderr = proc.communicate()
+    if proc.returncode != 0:
+        raise RuntimeError(f"ffmpeg failed: {stderr.decode(errors='ignore').strip()[:300]}")
+
+    result = {key: np.concatenate(values) if values else np.zeros(0) for key, values in features.items()}
+    result['frame_seconds'] = frame_size / sample_rate
+    return result
+
+
+def _runs(mask: np.ndarray) -> List[Tuple[int, int, bool]]:
+    """(start, end, value) runs of a boolean array"""
+    if len(mask) == 0:
+        return []
+    edges = np.flatnonzero(np.diff(mask.astype(np.int8))) + 1
+    starts = np.r_[0, edges]
+    ends = np.r_[edges, len(mask)]
+    return [(int(s), int(e), bool(mask[s])) for s, e in zip(starts, ends)]
+
+
+def detect_whistles(features: Dict, min_band_ratio: float = 0.35, min_tonality: float = 8.0,
+                    min_seconds: float = 0.2, merge_gap_seconds: float = 0.25) -> List[Dict]:
+    """Tonal 2-4 kHz bursts loud enough to stand out from the background"""
+    frame_seconds = features['frame_seconds']
+    power = features['power']
+    if len(power) == 0:
+        return []
+
+    # Quiet frames (e.g. muted stretches) can look tonal - require some level
+    loud_enough = power >= np.percentile(power, 30)
+    mask = (features['band_ratio'] >= min_band_ratio) & (features['tonality'] >= min_tonality) & loud_enough
+
+    # Bridge short dropouts inside one blast
+    max_gap = int(round(merge_gap_seconds / frame_seconds))
+    runs = _runs(mask)
+    for i, (start, end, value) in enumerate(runs):
+        if not value and 0 < i < len(runs) - 1 and end - start <= max_gap:
+            mask[start:end] = True
+
+    whistles = []
+    for start, end, value in _runs(mask):
+        duration = (end - start) * frame_seconds
+        if not value or duration < min_seconds:
+            continue
+        whistles.append({
+            'time': round(start * frame_seconds, 1),
+            'type': 'whistle',
+            'duration': round(duration, 2),
+            'peak_freq': int(np.median(features['peak_freq'][start:end])),
+            'strength': round(float(np.median(features['tonality'][start:end])), 1)
+        })
+    return whistles
+
+
+def detect_crowd_spikes(features: Dict, min_excess_db: float = 6.0, min_seconds: int = 2,
+                        baseline_seconds: int = 61) -> List[Dict]:
+    """Seconds whose loudness is well above the rolling median of the surrounding minute"""
+    frame_seconds = features['frame_seconds']
+    power = features['power']
+    if len(power) == 0:
+        return []
+
+    # Per-second loudness (dB)
+    second_index = (np.arange(len(power)) * frame_seconds).astype(int)
+    seconds = np.bincount(second_index)
+    loudness = 10 * np.log10(np.bincount(second_index, weights=power) / np.maximum(seconds, 1) + 1e-12)
+
+    half = baseline_seconds // 2
+    padded = np.pad(loudness, half, mode='edge')
+    baseline = np.median(np.lib.stride_tricks.sliding_window_view(padded, baseline_seconds), axis=1)
+    excess = loudness - baseline
+
+    spikes = []
+    for start, end, value in _runs(excess >= min_excess_db):
+        if value and end - start >= min_seconds:
+            spikes.append({
+                'time': float(start),
+                'type': 'crowd',
+                'duration': float(end - start),
+                'strength': round(float(excess[start:end].max()), 1)  # dB above local level
+            })
+    return spikes
+
+
+def events_between(events: List[Dict], start: float, end: float) -> List[Dict]:
+    """Events starting inside [start, end)"""
+    return [e for e in events if start <= e['time'] < end]
+
+
+def clip_summary(events: List[Dict], start: float, end: float) -> Dict:
+    """Audio evidence for one clip and the priority it implies"""
+    clip_events = events_between(events, start, end)
+    whistles = sum(1 for e in clip_events if e['type'] == 'whistle')
+    crowd = sum(1 for e in clip_events if e['type'] == 'crowd')
+    if crowd or whistles >= 2:
+        priority = 'high'
+    elif whistles:
+        priority = 'normal'
+    else:
+        priority = 'low'
+    return {'whistles': whistles, 'crowd': crowd, 'score': whistles + 2 * crowd, 'priority': priority}
+
+
+def format_hints(events: List[Dict], start: float, end: float) -> str:
+    """Prompt block listing the candidates in [start, end) ('' if none)"""
+    clip_events = events_between(events, start, end)
+    if not clip_events:
+        return ""
+    lines = ["AUDIO HINTS (local whistle/crowd detector - may include false positives, confirm visually):"]
+    for event in clip_events:
+        ts = int(event['time'])
+        if event['type'] == 'whistle':
+            lines.append(f"- {ts//60}:{ts%60:02d} referee whistle ({event['duration']:.1f}s)")
+        else:
+            lines.append(f"- {ts//60}:{ts%60:02d} crowd noise spike (+{event['strength']:.0f} dB, {event['duration']:.0f}s)")
+    return "\n".join(lines)
+
+
+def detect_audio_events(video_path: Path) -> Dict:
+    """Full analysis for one video (what audio_events.json holds)"""
+    features = stream_audio_features(video_path)
+    events = sorted(detect_whistles(features) + detect_crowd_spikes(features), key=lambda e: e['time'])
+    duration = len(features['power']) * features['frame_seconds']
+    clips = {
+        f"clip_{start // 60:03d}m00s.mp4": clip_summary(events, start, start + CLIP_SECONDS)
+        for start in range(0, int(duration), CLIP_SECONDS)
+    }
+    return {
+        'video': Path(video_path).name,
+        'sample_rate': SAMPLE_RATE,
+        'whistle_band': list(WHISTLE_BAND),
+        'duration': round(duration, 1),
+        'summary': {
+            'whistles': sum(1 for e in events if e['type'] == 'whistle'),
+            'crowd': sum(1 for e in events if e['type'] == 'crowd')
+        },
+        'events': events,
+        'clips': clips
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Detect whistle / crowd-noise candidates in a game video')
+    parser.add_argument('--game', required=True, help='Game name (folder in games/)')
+    parser.add_argument('--video', help='Video path (default: first .mp4 in inputs/)')
+    args = parser.parse_args()
+
+    inputs_dir = Path(__file__).parent.parent.parent / "games" / args.game / "inputs"
+    video = Path(args.video) if args.video else next(iter(sorted(inputs_dir.glob('*.mp4'))), None)
+    if not video or not video.exists():
+        raise SystemExit(f"❌ Video not found in: {inputs_dir}")
+
+    print(f"🔊 Detecting audio events in {video.name}...")
+    result = detect_audio_events(video)
+    output_file = inputs_dir / "audio_events.json"
+    with open(output_file, 'w') as f:
+        json.dump(result, f, indent=2)
+    print(f"✅ {result['summary']['whistles']} whistle and {result['summary']['crowd']} crowd candidates")
+    print(f"💾 Saved to: {output_file}")
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Model Cascade - Cheap Flash triage of every clip, Pro only where events are likely
+
+Stage 1 normally sends every clip to the Pro model. In cascade mode each clip
+first goes to gemini-2.5-flash with a short triage prompt
+(prompts/stage1_triage/) that returns JSON:
+
+    {"event_likelihood": 0.0-1.0, "events": ["shot", "kickout", ...], "summary": "..."}
+
+A clip is re-analysed with Pro (the normal Stage 1 prompt) when
+  - event_likelihood >= threshold, or
+  - the triage saw any of the escalation events (scores, shots, kickouts), or
+  - the clip's audio priority (0.6 / audio_events.py) is 'high', or
+  - the triage response could not be parsed (fail safe).
+Other clips keep Flash's coarse summary as their observation line.
+
+Usage:
+    from model_cascade import add_cascade_arguments, parse_triage, should_escalate
+    add_cascade_arguments(parser)
+    triage = parse_triage(flash_response.text)
+    escalate, reason = should_escalate(triage, ARGS.cascade_threshold, ARGS.cascade_events)
+"""
+
+import re
+import json
+import math
+from typing import Dict, Iterable, Optional, Tuple
+
+TRIAGE_MODEL = 'gemini-2.5-flash'
+DEFAULT_THRESHOLD = 0.4
+ESCALATE_EVENTS = ('score', 'shot', 'kickout')
+
+# USD per 1M tokens (input, output), prompts under 200k tokens
+PRICING = {
+    'gemini-2.5-pro': (1.25, 10.00),
+    'gemini-2.5-flash': (0.30, 2.50),
+    'gemini-3-pro-preview': (2.00, 12.00),
+}
+
+
+def add_cascade_arguments(parser):
+    """Add --cascade and its tuning options to a stage's argument parser"""
+    parser.add_argument('--cascade', action='store_true', help=f'Triage every clip with {TRIAGE_MODEL}, send only likely-event clips to Pro')
+    parser.add_argument('--cascade-threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help=f'Event likelihood at or above which a clip goes to Pro (default: {DEFAULT_THRESHOLD})')
+    parser.add_argument('--cascade-events', default=','.join(ESCALATE_EVENTS),
+                        help=f"Triage event types that always go to Pro (default: {','.join(ESCALATE_EVENTS)})")
+    parser.add_argument('--triage-model', default=TRIAGE_MODEL, help=f'Triage model (default: {TRIAGE_MODEL})')
+
+
+def parse_events(value: str) -> Tuple[str, ...]:
+    """'score,shot' → ('score', 'shot')"""
+    return tuple(e.strip().lower() for e in value.split(',') if e.strip())
+
+
+def parse_triage(text: str) -> Optional[Dict]:
+    """
+    Parse the triage model's JSON answer
+
+    Returns:
+        {'event_likelihood': float, 'events': [str], 'summary': str}, or None if unparseable
+    """
+    match = re.search(r'\{.*\}', text or '', re.DOTALL)  # Tolerates ```json fences and chatter
+    if not match:
+        return None
+    try:
+        data = json.loads(match.group(0))
+        likelihood = min(1.0, max(0.0, float(data.get('event_likelihood', 1.0))))
+    except (ValueError, TypeError):
+        return None
+    events = data.get('events') or []
+    if isinstance(events, str):
+        events = [events]
+    return {
+        'event_likelihood': likelihood,
+        'events': [str(e).strip().lower() for e in events],
+        'summary': str(data.get('summary', '')).strip()
+    }
+
+
+def should_escalate(triage: Optional[Dict], threshold: float = DEFAULT_THRESHOLD,
+                    escalate_events: Iterable[str] = ESCALATE_EVENTS,
+                    priority: Optional[str] = None) -> Tuple[bool, str]:
+    """
+    Decide whether a clip is re-analysed with Pro
+
+    Returns:
+        (escalate, reason)
+    """
+    if triage is None:
+        return True, 'triage unparseable'
+    if priority == 'high':
+        return True, 'audio priority high'
+    seen = [e for e in triage['events'] if any(key in e for key in escalate_events)]
+    if seen:
+        return True, f"triage saw {', '.join(sorted(set(seen)))}"
+    if triage['event_likelihood'] >= threshold:
+        return True, f"likelihood {triage['event_likelihood']:.2f} >= {threshold:.2f}"
+    return False, f"likelihood {triage['event_likelihood']:.2f} < {threshold:.2f}"
+
+
+def token_cost(model: str, prompt_tokens: int, output_tokens: int) -> Tuple[float, float]:
+    """(input_cost, output_cost) in USD"""
+    input_price, output_price = PRICING.get(model, PRICING['gemini-2.5-pro'])
+    return (prompt_tokens / 1_000_000) * input_price, (output_tokens / 1_000_000) * output_price
+
+
+def percentile(values, pct: float) -> float:
+    """Nearest-rank percentile (0 for an empty list)"""
+    values = sorted(values)
+    if not values:
+        return 0.0
+    rank = max(0, min(len(values) - 1, math.ceil(pct / 100 * len(values)) - 1))
+    return values[rank]
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Motion Timeline - Local play / stoppage / break segmentation (no LLM calls)
+
+ffmpeg decodes a tiny grayscale proxy of the match (160px wide, 2 fps) and
+NumPy computes frame-difference "motion energy" while the stream is read,
+so memory stays flat for a 2-hour recording. The smoothed energy is split
+into:
+  play      - sustained activity
+  stoppage  - short quiet spells (frees, wides, injuries)
+  break     - long quiet spells (warm-up end, half-time, full-time)
+
+The two longest play periods are proposed as the two halves:
+  start / half_time / second_half_start / end  (to the second)
+
+0.5_calibrate_game.py confirms each proposed boundary with a couple of
+targeted frame checks before using it.
+
+Usage:
+    python3 motion_timeline.py --game {game-name}   # writes inputs/motion_timeline.json
+"""
+
+import json
+import argparse
+import subprocess
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+PROXY_WIDTH = 160
+PROXY_FPS = 2
+
+
+def probe_dimensions(video_path: Path) -> Tuple[int, int]:
+    """Video width/height via ffprobe"""
+    cmd = [
+        'ffprobe', '-v', 'quiet',
+        '-select_streams', 'v:0',
+        '-show_entries', 'stream=width,height',
+        '-print_format', 'json',
+        str(video_path)
+    ]
+    result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+    stream = json.loads(result.stdout)['streams'][0]
+    return int(stream['width']), int(stream['height'])
+
+
+def stream_motion_energy(video_path: Path, width: int = PROXY_WIDTH, fps: float = PROXY_FPS,
+                         chunk_frames: int = 256) -> np.ndarray:
+    """
+    Mean absolute frame difference (0-1) between consecutive proxy frames
+
+    Args:
+        video_path: Source video
+        width: Proxy width (height keeps the aspect ratio)
+        fps: Proxy frame rate
+        chunk_frames: Frames read from ffmpeg per NumPy batch
+
+    Returns:
+        energy[i] = change between proxy frames i and i+1 (time ≈ (i + 1) / fps)
+    """
+    src_w, src_h = probe_dimensions(video_path)
+    height = max(2, int(round(width * src_h / src_w / 2)) * 2)
+    frame_size = width * height
+
+    cmd = [
+        'ffmpeg', '-v', 'error',
+        '-i', str(video_path),
+        '-an',
+        '-vf', f'scale={width}:{height},fps={fps},format=gray',
+        '-f', 'rawvideo', '-pix_fmt', 'gray',
+        'pipe:1'
+    ]
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+
+    energies = []
+    previous = None
+    while True:
+        buffer = proc.stdout.read(frame_size * chunk_frames)
+        count = len(buffer) // frame_size
+        if count == 0:
+            break
+        frames = np.frombuffer(buffer[:count * frame_size], dtype=np.uint8).reshape(count, frame_size)
+        frames = frames.astype(np.int16)
+        if previous is not None:
+            frames = np.vstack([previous[None], frames])
+        if len(frames) > 1:
+            energies.append(np.abs(np.diff(frames, axis=0)).mean(axis=1) / 255.0)
+        previous = frames[-1]
+
+    _, stderr = proc.communicate()
+    if proc.returncode != 0:
+        raise RuntimeError(f"ffmpeg failed: {stderr.decode(errors='ignore').strip()[:300]}")
+
+    return np.concatenate(energies) if energies else np.zeros(0)
+
+
+def _runs(mask: np.ndarray) -> List[Tuple[int, int, bool]]:
+    """(start, end, value) runs of a boolean array"""
+    if len(mask) == 0:
+        return []
+    edges = np.flatnonzero(np.diff(mask.astype(np.int8))) + 1
+    starts = np.r_[0, edges]
+    ends = np.r_[edges, len(mask)]
+    return [(int(s), int(e), bool(mask[s])) for s, e in zip(starts, ends)]
+
+
+def segment_timeline(energy: np.ndarray, fps: float = PROXY_FPS, smooth_seconds: float = 10,
+                     min_play_seconds: float = 60, min_break_seconds: float = 180) -> Dict:
+    """
+    Split motion energy into play / stoppage / break segments
+
+    Args:
+        energy: Output of stream_motion_energy
+        fps: Proxy frame rate
+        smooth_seconds: Moving-average window
+        min_play_seconds: Shorter bursts of activity count as stoppage
+        min_break_seconds: Quiet spells at least this long are breaks
+
+    Returns:
+        Dict with threshold and segments [{'start', 'end', 'state', 'energy'}] (seconds)
+    """
+    window = max(1, int(smooth_seconds * fps))
+    smooth = np.convolve(energy, np.ones(window) / window, mode='same')
+
+    # Adaptive threshold between the quiet and busy levels of this recording
+    low, high = np.percentile(smooth, [20, 80])
+    threshold = low + 0.35 * (high - low)
+    active = smooth >= threshold
+
+    # Short bursts (e.g. players jogging at half-time) don't make a play period
+    for start, end, value in _runs(active):
+        if value and (end - start) / fps < min_play_seconds:
+            active[start:end] = False
+
+    segments = []
+    for start, end, value in _runs(active):
+        duration = (end - start) / fps
+        state = 'play' if value else ('break' if duration >= min_break_seconds else 'stoppage')
+        segments.append({
+            'start': round(start / fps, 1),
+            'end': round(end / fps, 1),
+            'state': state,
+            'energy': round(float(smooth[start:end].mean()), 4)
+        })
+
+    return {'threshold': round(float(threshold), 4), 'segments': segments}
+
+
+def find_periods(segments: List[Dict], min_period_seconds: float = 600) -> List[Dict]:
+    """Spans of play/stoppage between breaks (trimmed to start and end on play)"""
+    periods = []
+    current = []
+    for segment in segments + [{'state': 'break'}]:
+        if segment['state'] != 'break':
+            current.append(segment)
+            continue
+        plays = [s for s in current if s['state'] == 'play']
+        if plays and plays[-1]['end'] - plays[0]['start'] >= min_period_seconds:
+            periods.append({'start': plays[0]['start'], 'end': plays[-1]['end']})
+        current = []
+    return periods
+
+
+def propose_match_times(periods: List[Dict]) -> Optional[Dict]:
+    """Two longest periods (in time order) = the two halves"""
+    if not periods:
+        return None
+    halves = sorted(sorted(periods, key=lambda p: p['end'] - p['start'], reverse=True)[:2],
+                    key=lambda p: p['start'])
+    if len(halves) == 1:
+        return {'start': int(halves[0]['start']), 'end': int(halves[0]['end'])}
+    return {
+        'start': int(halves[0]['start']),
+        'half_time': int(halves[0]['end']),
+        'second_half_start': int(halves[1]['start']),
+        'end': int(halves[1]['end'])
+    }
+
+
+def build_timeline(video_path: Path) -> Dict:
+    """Full analysis for one video (what motion_timeline.json holds)"""
+    energy = stream_motion_energy(video_path)
+    timeline = segment_timeline(energy)
+    periods = find_periods(timeline['segments'])
+    return {
+        'video': Path(video_path).name,
+        'proxy': {'width': PROXY_WIDTH, 'fps': PROXY_FPS},
+        'duration': round(len(energy) / PROXY_FPS, 1),
+        'threshold': timeline['threshold'],
+        'segments': timeline['segments'],
+        'periods': periods,
+        'proposed_match_times': propose_match_times(periods)
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Build a motion-energy timeline for a game video')
+    parser.add_argument('--game', required=True, help='Game name (folder in games/)')
+    parser.add_argument('--video', help='Video path (default: first .mp4 in inputs/)')
+    args = parser.parse_args()
+
+    inputs_dir = Path(__file__).parent.parent.parent / "games" / args.game / "inputs"
+    video = Path(args.video) if args.video else next(iter(sorted(inputs_dir.glob('*.mp4'))), None)
+    if not video or not video.exists():
+        raise SystemExit(f"❌ Video not found in: {inputs_dir}")
+
+    print(f"📈 Building motion timeline for {video.name}...")
+    result = build_timeline(video)
+    output_file = inputs_dir / "motion_timeline.json"
+    with open(output_file, 'w') as f:
+        json.dump(result, f, indent=2)
+    print(f"✅ {len(result['segments'])} segments, {len(result['periods'])} periods")
+    print(f"   Proposed match times: {result['proposed_match_times']}")
+    print(f"💾 Saved to: {output_file}")
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Prompt Registry - Versioned prompt templates for the pipeline stages
+
+Prompts live in files instead of f-strings inside the stage scripts:
+
+  prompts/registry.json               default version per stage
+  prompts/{stage}/{version}.txt       template text (str.format placeholders)
+  prompts/{stage}/{version}_meta.json declared variables + description
+
+Placeholders use the same syntax as the f-strings they replaced
+({team_context}, literal braces doubled as {{ }}), so genetic-optimizer
+variants can be passed straight in as template files.
+
+Templates are loaded and parsed once per process (cached).
+
+Usage:
+    from prompt_registry import load_template
+    PROMPT = load_template('stage1', ARGS.prompt_version)
+    prompt = PROMPT.render(team_context=..., clip_start_time=...)
+"""
+
+import json
+import re
+import hashlib
+import string
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional, Tuple
+
+PROMPTS_DIR = Path(__file__).parent / "prompts"
+REGISTRY_FILE = PROMPTS_DIR / "registry.json"
+
+
+def _placeholders(text: str) -> set:
+    """Return the variable names referenced by a str.format template"""
+    names = set()
+    for _, field_name, _, _ in string.Formatter().parse(text):
+        if field_name:
+            names.add(re.split(r'[.\[]', field_name, maxsplit=1)[0])
+    return names
+
+
+class PromptTemplate:
+    """A loaded prompt template with its declared variables"""
+
+    def __init__(self, stage: str, version: str, text: str, variables: Tuple[str, ...]):
+        self.stage = stage
+        self.version = version
+        self.text = text
+        self.variables = tuple(variables)
+        self.sha256 = hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+        # Fail at load time (not mid-run) if the template uses something the stage doesn't provide
+        self._placeholders = _placeholders(text)
+        undeclared = self._placeholders - set(self.variables)
+        if undeclared:
+            raise ValueError(f"Prompt {stage}/{version} uses undeclared variables: {sorted(undeclared)}")
+
+    def render(self, **values) -> str:
+        """Fill the template; extra values are ignored, missing ones raise"""
+        missing = self._placeholders - set(values)
+        if missing:
+            raise ValueError(f"Prompt {self.stage}/{self.version} missing variables: {sorted(missing)}")
+        return self.text.format(**values)
+
+
+@lru_cache(maxsize=None)
+def default_version(stage: str) -> str:
+    """Default template version for a stage (from prompts/registry.json)"""
+    with open(REGISTRY_FILE, 'r') as f:
+        registry = json.load(f)
+    if stage not in registry:
+        raise KeyError(f"Stage '{stage}' not in {REGISTRY_FILE}")
+    return registry[stage]['default']
+
+
+@lru_cache(maxsize=None)
+def load_template(stage: str, version: Optional[str] = None) -> PromptTemplate:
+    """
+    Load a prompt template (cached per process)
+
+    Args:
+        stage: Stage key, e.g. 'stage1'
+        version: Version name in prompts/{stage}/, a path to a .txt template
+                 (e.g. a genetic-optimizer variant), or None for the default
+
+    Returns:
+        PromptTemplate
+    """
+    if version is None:
+        version = default_version(stage)
+
+    if version.endswith('.txt'):
+        template_path = Path(version)
+        version = template_path.stem
+    else:
+        template_path = PROMPTS_DIR / stage / f"{version}.txt"
+
+    if not template_path.exists():
+        raise FileNotFoundError(f"Prompt template not found: {template_path}")
+
+    variables = None
+    meta_path = template_path.with_name(f"{template_path.stem}_meta.json")
+    if meta_path.exists():
+        with open(meta_path, 'r') as f:
+            variables = json.load(f).get('variables')
+    if variables is None:
+        # Ad-hoc template file: it may use any variable the stage's default template declares
+        variables = load_template(stage).variables
+
+    return PromptTemplate(stage, version, template_path.read_text(), tuple(variables))
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Proxy Encoding - Clip encoding profiles purpose-built for model upload
+
+Gemini samples video at ~1 fps, so source-resolution 25/50 fps clips mostly
+upload frames that are thrown away. A proxy profile re-encodes clips in the
+same ffmpeg pass that cuts them:
+  - scaled to a fixed height (720p / 480p / 360p)
+  - reduced frame rate
+  - fixed keyframe interval (GOP) so segment boundaries land on keyframes
+  - mono AAC at a low bitrate (whistles and crowd stay audible)
+  - libx264 with a CPU-friendly preset
+
+The chosen profile is written next to the clips (proxy_profile.json) so
+Stage 1 and the evaluation can report which encoding the results came from.
+
+Usage:
+    from proxy_encoding import add_proxy_arguments, profile_from_args, encode_args
+    add_proxy_arguments(parser)
+    profile = profile_from_args(ARGS)           # None = source quality
+    cmd += encode_args(profile)
+"""
+
+import json
+from pathlib import Path
+from typing import Dict, List, Optional
+
+PROXY_PROFILES = {
+    '720p': {'height': 720, 'fps': 4, 'gop_seconds': 2, 'crf': 28, 'audio_bitrate': '48k', 'preset': 'veryfast'},
+    '480p': {'height': 480, 'fps': 2, 'gop_seconds': 2, 'crf': 30, 'audio_bitrate': '32k', 'preset': 'veryfast'},
+    '360p': {'height': 360, 'fps': 1, 'gop_seconds': 2, 'crf': 30, 'audio_bitrate': '32k', 'preset': 'veryfast'},
+}
+
+PROFILE_FILENAME = "proxy_profile.json"
+
+
+def add_proxy_arguments(parser, default: Optional[str] = None):
+    """Add --proxy and per-setting overrides to a stage's argument parser"""
+    parser.add_argument('--proxy', default=default, choices=sorted(PROXY_PROFILES) + ['source'],
+                        help=f"Encode clips with a model-upload proxy profile (default: {default or 'source'})")
+    parser.add_argument('--proxy-height', type=int, help='Override proxy height in pixels')
+    parser.add_argument('--proxy-fps', type=float, help='Override proxy frame rate')
+    parser.add_argument('--proxy-gop', type=float, help='Override proxy keyframe interval in seconds')
+    parser.add_argument('--proxy-audio-bitrate', help='Override proxy audio bitrate (e.g. 32k)')
+
+
+def get_profile(name: Optional[str], **overrides) -> Optional[Dict]:
+    """
+    Resolve a profile name plus overrides
+
+    Returns:
+        Profile dict (with 'name'), or None for source quality
+    """
+    if not name or name == 'source':
+        return None
+    if name not in PROXY_PROFILES:
+        raise ValueError(f"Unknown proxy profile: {name} (choose from {', '.join(sorted(PROXY_PROFILES))})")
+    profile = dict(PROXY_PROFILES[name], name=name)
+    profile.update({key: value for key, value in overrides.items() if value is not None})
+    return profile
+
+
+def profile_from_args(args) -> Optional[Dict]:
+    """Profile from the arguments added by add_proxy_arguments"""
+    return get_profile(
+        args.proxy,
+        height=args.proxy_height,
+        fps=args.proxy_fps,
+        gop_seconds=args.proxy_gop,
+        audio_bitrate=args.proxy_audio_bitrate
+    )
+
+
+def encode_args(profile: Dict, segment_seconds: Optional[float] = None,
+                keyframe_times: Optional[List[float]] = None) -> List[str]:
+    """
+    ffmpeg output arguments for a proxy profile
+
+    Args:
+        profile: Output of get_profile
+        segment_seconds: When cutting with the segment muxer, force a keyframe at every boundary
+        keyframe_times: Explicit keyframe times (segment muxer with -segment_times, any container)
+
+    Returns:
+        Arguments to place after the input(s) and before the output
+    """
+    gop_frames = max(1, int(round(profile['gop_seconds'] * profile['fps'])))
+    args = [
+        '-vf', f"scale=-2:{profile['height']},fps={profile['fps']}",
+        '-c:v', 'libx264',
+        '-preset', profile['preset'],
+        '-crf', str(profile['crf']),
+        '-pix_fmt', 'yuv420p',
+        '-g', str(gop_frames),
+        '-keyint_min', str(gop_frames),
+        '-sc_threshold', '0',
+        '-c:a', 'aac',
+        '-ac', '1',
+        '-b:a', profile['audio_bitrate']
+    ]
+    if keyframe_times:
+        args += ['-force_key_frames', ','.join(f"{t:g}" for t in keyframe_times)]
+    elif segment_seconds:
+        args += ['-force_key_frames', f"expr:gte(t,n_forced*{segment_seconds})",
+                 '-segment_format_options', 'movflags=+faststart']
+    else:
+        args += ['-movflags', '+faststart']
+    return args
+
+
+def describe(profile: Optional[Dict]) -> str:
+    """One-line summary for logs"""
+    if not profile or profile.get('name') == 'source':
+        return "source quality (no proxy)"
+    return (f"{profile['name']} proxy: {profile['height']}p @ {profile['fps']} fps, "
+            f"GOP {profile['gop_seconds']}s, CRF {profile['crf']}, audio {profile['audio_bitrate']} mono")
+
+
+def write_profile(clips_dir: Path, profile: Optional[Dict]):
+    """Record how the clips in a folder were encoded"""
+    with open(Path(clips_dir) / PROFILE_FILENAME, 'w') as f:
+        json.dump(profile or {'name': 'source'}, f, indent=2)
+
+
+def read_profile(clips_dir: Path) -> Dict:
+    """Encoding of the clips in a folder ({'name': 'source'} if unknown)"""
+    profile_file = Path(clips_dir) / PROFILE_FILENAME
+    if not profile_file.exists():
+        return {'name': 'source'}
+    with open(profile_file, 'r') as f:
+        return json.load(f)
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Stage Runner - Run pipeline stage scripts in-process
+
+The stage scripts parse their arguments and load config at module level.
+run_stage() executes a script in a fresh namespace with STAGE_ARGV injected
+(the scripts call parser.parse_args(STAGE_ARGV)), then calls the stage's
+entry function. No Python subprocess per stage, and several runs can share
+one process as long as each uses its own --run-folder.
+
+In-process runs are serialised: runpy swaps sys.argv[0] and the stage scripts
+share module state (sys.modules, imported helpers), so two threads must not
+execute scripts at the same time. Callers that want concurrent stages should
+run them as subprocesses.
+
+Usage:
+    from stage_runner import run_stage
+    run_stage("3_event_classification.py", ["--game", game, "--run-folder", folder])
+"""
+
+import sys
+import uuid
+import runpy
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+PIPELINE_ROOT = Path(__file__).parent
+
+# Function each script runs under `if __name__ == "__main__"`
+STAGE_ENTRYPOINTS = {
+    "1_clips_to_descriptions.py": "analyze_clips",
+    "2_create_coherent_narrative.py": "create_narrative",
+    "3_event_classification.py": "classify_events",
+    "3.5_verify_events.py": "verify_events",
+    "4_json_extraction.py": "extract_json",
+    "5_export_to_anadi_xml.py": "main",
+    "7_evaluate.py": "main",
+}
+
+# Stage scripts import helpers (prompt_registry) from this folder
+if str(PIPELINE_ROOT) not in sys.path:
+    sys.path.insert(0, str(PIPELINE_ROOT))
+
+# Reentrant: Stage 3 runs Stages 4 and 5 through run_stage from its entry function
+_RUN_LOCK = threading.RLock()
+
+
+def run_stage(script: str, argv: List[str], overrides: Optional[Dict] = None) -> Dict:
+    """
+    Run one stage script in-process
+
+    Args:
+        script: Script filename in this folder (key of STAGE_ENTRYPOINTS)
+        argv: Command-line arguments for the stage (without the script name)
+        overrides: Extra module globals to inject before the script runs
+
+    Returns:
+        The script's module namespace after the entry function returned
+    """
+    if script not in STAGE_ENTRYPOINTS:
+        raise ValueError(f"Unknown stage script: {script}")
+
+    init_globals = dict(overrides or {})
+    init_globals['STAGE_ARGV'] = list(argv)
+
+    try:
+        with _RUN_LOCK:
+            # Unique run_name: runpy registers it in sys.modules while the script runs
+            namespace = runpy.run_path(
+                str(PIPELINE_ROOT / script),
+                init_globals=init_globals,
+                run_name=f"gaa_stage_{uuid.uuid4().hex}"
+            )
+            namespace[STAGE_ENTRYPOINTS[script]]()
+    except SystemExit as e:
+        # Stages exit(1) on bad config - don't let that take down the caller
+        raise RuntimeError(f"{script} exited with status {e.code}")
+
+    return namespace
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Stage 0.6: Select Clips for Stage 1
+Drops or down-samples non-play clips before they are sent to Gemini Pro
+
+Each 60s clip gets an action in inputs/clip_manifest.json:
+  analyze  - full video to Stage 1 (normal)
+  frames   - inside the match but mostly stoppage: Stage 1 sends a few
+             still frames instead of the video
+  skip     - pre-match warm-up, half-time or post-match (no overlap with the
+             calibrated match_times)
+
+Activity per clip comes from inputs/motion_timeline.json (0.1) when present,
+otherwise from a quick motion-energy pass over the clip itself (numpy).
+Whistle / crowd candidates from inputs/audio_events.json (0.1) set each clip's
+priority (high / normal / low), and a low-motion clip with an audio event
+keeps its full video - frees and fouls happen at stoppages.
+Clip names (and therefore timestamps) are unchanged - Stage 1 writes a
+placeholder line for skipped clips so the observations still line up.
+
+Usage: python3 0.6_select_clips.py --game {game-name}
+"""
+
+import re
+import sys
+import json
+import argparse
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    from motion_timeline import stream_motion_energy
+    HAS_MOTION_ENERGY = True
+except ImportError:
+    HAS_MOTION_ENERGY = False  # motion_timeline needs numpy
+
+# Parse arguments
+parser = argparse.ArgumentParser(description='Select which clips Stage 1 sends to Gemini')
+parser.add_argument('--game', required=True, help='Game name (folder in games/)')
+parser.add_argument('--margin', type=int, default=30, help='Seconds kept either side of each half (default: 30)')
+parser.add_argument('--min-play-fraction', type=float, default=0.2, help='In-match clips with less play are sent as frames (default: 0.2)')
+parser.add_argument('--no-downsample', action='store_true', help='Only skip clips outside the match, never send frames')
+parser.add_argument('--no-audio-events', action='store_true', help='Ignore inputs/audio_events.json')
+ARGS = parser.parse_args()
+
+# Setup paths
+PROD_ROOT = Path(__file__).parent.parent.parent
+GAME_ROOT = PROD_ROOT / "games" / ARGS.game
+INPUTS_DIR = GAME_ROOT / "inputs"
+CLIPS_DIR = INPUTS_DIR / "clips"
+PROFILE_FILE = INPUTS_DIR / "game_profile.json"
+TIMELINE_FILE = INPUTS_DIR / "motion_timeline.json"
+MANIFEST_FILE = INPUTS_DIR / "clip_manifest.json"
+AUDIO_EVENTS_FILE = INPUTS_DIR / "audio_events.json"
+
+CLIP_SECONDS = 60
+
+
+def overlap(start: float, end: float, window_start: float, window_end: float) -> float:
+    """Seconds of [start, end) inside [window_start, window_end)"""
+    return max(0.0, min(end, window_end) - max(start, window_start))
+
+
+def play_fraction_from_timeline(segments: list, start: int, end: int) -> float:
+    """Share of a clip covered by 'play' segments of the motion timeline"""
+    played = sum(overlap(start, end, s['start'], s['end']) for s in segments if s['state'] == 'play')
+    return played / (end - start)
+
+
+def clip_activity(clip_path: Path) -> float:
+    """Mean motion energy of one clip (fallback when there is no motion timeline)"""
+    energy = stream_motion_energy(clip_path)
+    return float(energy.mean()) if len(energy) else 0.0
+
+
+def select_clips():
+    """Build inputs/clip_manifest.json"""
+    print(f"✂️  STAGE 0.6: SELECT CLIPS FOR STAGE 1")
+    print(f"Game: {ARGS.game}")
+    print("=" * 70)
+
+    if not PROFILE_FILE.exists():
+        print(f"❌ game_profile.json not found - run 0.5_calibrate_game.py first")
+        return False
+    with open(PROFILE_FILE, 'r') as f:
+        match_times = json.load(f)['match_times']
+
+    clip_pattern = re.compile(r'^clip_(\d{3})m00s\.mp4$')
+    clips = [(c, int(clip_pattern.match(c.name).group(1)) * 60)
+             for c in sorted(CLIPS_DIR.glob('clip_*m00s.mp4')) if clip_pattern.match(c.name)]
+    if not clips:
+        print(f"❌ No clips found in {CLIPS_DIR}")
+        return False
+
+    # Play windows (the two halves) with a safety margin
+    windows = [
+        ('1st half', match_times['start'] - ARGS.margin, match_times['half_time'] + ARGS.margin),
+        ('2nd half', match_times['second_half_start'] - ARGS.margin, match_times['end'] + ARGS.margin),
+    ]
+
+    # Activity: timeline play fraction, or per-clip motion energy relative to the busiest in-match clips
+    segments = None
+    if TIMELINE_FILE.exists():
+        with open(TIMELINE_FILE, 'r') as f:
+            segments = json.load(f)['segments']
+        activity_source = 'motion_timeline'
+    elif HAS_MOTION_ENERGY and not ARGS.no_downsample:
+        activity_source = 'clip_motion_energy'
+    else:
+        activity_source = None
+    print(f"📊 {len(clips)} clips, activity source: {activity_source or 'none (match_times only)'}")
+
+    entries = []
+    for clip_path, start in clips:
+        end = start + CLIP_SECONDS
+        in_match = sum(overlap(start, end, w_start, w_end) for _, w_start, w_end in windows)
+        entry = {'clip': clip_path.name, 'start': start, 'end': end, 'action': 'analyze', 'reason': 'in play'}
+        if in_match == 0:
+            if end <= windows[0][1]:
+                reason = 'pre-match'
+            elif start >= windows[1][2]:
+                reason = 'post-match'
+            else:
+                reason = 'half-time'
+            entry.update({'action': 'skip', 'reason': reason})
+        entries.append(entry)
+
+    in_match_entries = [e for e in entries if e['action'] == 'analyze']
+    if activity_source == 'motion_timeline':
+        for entry in in_match_entries:
+            entry['play_fraction'] = round(play_fraction_from_timeline(segments, entry['start'], entry['end']), 3)
+    elif activity_source == 'clip_motion_energy':
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            energies = list(executor.map(lambda e: clip_activity(CLIPS_DIR / e['clip']), in_match_entries))
+        # Relative to the busiest clips of this recording (camera/light differ per game)
+        reference = sorted(energies)[int(len(energies) * 0.75)] if energies else 0.0
+        for entry, energy in zip(in_match_entries, energies):
+            entry['activity'] = round(energy, 5)
+            entry['play_fraction'] = round(min(1.0, energy / reference), 3) if reference else 1.0
+
+    # Audio evidence (whistles / crowd spikes) per clip
+    audio_clips = {}
+    if AUDIO_EVENTS_FILE.exists() and not ARGS.no_audio_events:
+        with open(AUDIO_EVENTS_FILE, 'r') as f:
+            audio_clips = json.load(f)['clips']
+        for entry in in_match_entries:
+            if entry['clip'] in audio_clips:
+                entry['audio'] = audio_clips[entry['clip']]
+                entry['priority'] = entry['audio']['priority']
+    
+    if not ARGS.no_downsample:
+        for entry in in_match_entries:
+            if entry.get('play_fraction', 1.0) < ARGS.min_play_fraction:
+                audio = entry.get('audio', {})
+                if audio.get('whistles') or audio.get('crowd'):
+                    entry['reason'] = 'low motion, audio event'  # Keep the video (and its audio)
+                    continue
+                entry.update({'action': 'frames', 'reason': 'mostly stoppage'})
+
+    counts = {action: sum(1 for e in entries if e['action'] == action) for action in ('analyze', 'frames', 'skip')}
+    manifest = {
+        'game': ARGS.game,
+        'clip_seconds': CLIP_SECONDS,
+        'match_times': match_times,
+        'margin': ARGS.margin,
+        'min_play_fraction': None if ARGS.no_downsample else ARGS.min_play_fraction,
+        'activity_source': activity_source,
+        'audio_events': bool(audio_clips),
+        'summary': counts,
+        'clips': entries
+    }
+    with open(MANIFEST_FILE, 'w') as f:
+        json.dump(manifest, f, indent=2)
+
+    for entry in entries:
+        if entry['action'] != 'analyze':
+            print(f"   {'⏭️ ' if entry['action'] == 'skip' else '🖼️ '} {entry['clip']}: {entry['action']} ({entry['reason']})")
+    print(f"\n✅ Analyze: {counts['analyze']}  Frames only: {counts['frames']}  Skip: {counts['skip']}")
+    if audio_clips:
+        priorities = [e.get('priority', 'normal') for e in entries if e['action'] != 'skip']
+        print(f"🔊 Audio priority: {priorities.count('high')} high, {priorities.count('normal')} normal, "
+              f"{priorities.count('low')} low")
+    print(f"   Full-video Pro calls saved: {counts['frames'] + counts['skip']}/{len(entries)} "
+          f"({(counts['frames'] + counts['skip']) * CLIP_SECONDS / 60:.0f} minutes of footage)")
+    print(f"💾 Saved to: {MANIFEST_FILE}")
+    print(f"\nNext: python3 1_clips_to_descriptions.py --game {ARGS.game}")
+    return True
+
+
+if __name__ == "__main__":
+    success = select_clips()
+    sys.exit(0 if success else 1)
@@ -11,8 +11,18 @@ import google.generativeai as genai
 from pathlib import Path
 import time
 import re
+import subprocess
 from datetime import datetime
 from concurrent.futures import ThreadPoolExecutor, as_completed
+from prompt_registry import load_template
+from proxy_encoding import read_profile
+from model_cascade import add_cascade_arguments, parse_events, parse_triage, should_escalate, token_cost, percentile
+
+try:
+    from audio_events import events_between, format_hints
+    HAS_AUDIO_EVENTS = True
+except ImportError:
+    HAS_AUDIO_EVENTS = False  # audio_events needs numpy
 
 # Parse arguments
 parser = argparse.ArgumentParser(description='Generate descriptions from SILENT video clips')
@@ -20,6 +30,10 @@ parser.add_argument('--game', required=True, help='Game name (folder in games/)'
 parser.add_argument('--output-suffix', default='', help='Output folder suffix (default: timestamp)')
 parser.add_argument('--start-clip', type=int, help='Start clip number (e.g., 11 for clip_011m00s.mp4)')
 parser.add_argument('--end-clip', type=int, help='End clip number (e.g., 15 for clip_015m00s.mp4, inclusive)')
+parser.add_argument('--all-clips', action='store_true', help='Ignore inputs/clip_manifest.json (0.6) and send every clip as video')
+parser.add_argument('--no-audio-hints', action='store_true', help='Do not add whistle/crowd candidates (inputs/audio_events.json) to the prompt')
+add_cascade_arguments(parser)
+parser.add_argument('--prompt-version', help='Prompt template version in prompts/{stage}/ (default: prompts/registry.json)')
 ARGS = parser.parse_args()
 
 # Setup paths
@@ -45,6 +59,10 @@ print(f"📁 Output folder: {output_folder}")
 print(f"💾 Subsequent stages will use: {output_folder}")
 print()
 
+# Prompt template from the registry (prompts/stage1/), loaded once per process
+PROMPT = load_template('stage1', ARGS.prompt_version)
+print(f"📝 Prompt: stage1/{PROMPT.version} ({PROMPT.sha256[:8]})")
+
 # Setup API
 from dotenv import load_dotenv
 load_dotenv('/home/ubuntu/clann/CLANNAI/.env')
@@ -57,6 +75,17 @@ model = genai.GenerativeModel(
     generation_config={"temperature": 0, "top_p": 0.1}  # Deterministic output
 )
 
+# Cascade mode: cheap triage model first, Pro only for clips likely to contain events (model_cascade.py)
+CASCADE_EVENTS = parse_events(ARGS.cascade_events)
+if ARGS.cascade:
+    TRIAGE_PROMPT = load_template('stage1_triage')
+    triage_model = genai.GenerativeModel(
+        ARGS.triage_model,
+        generation_config={"temperature": 0, "top_p": 0.1, "response_mime_type": "application/json"}
+    )
+    print(f"🪜 Cascade: {ARGS.triage_model} triage → Pro if likelihood ≥ {ARGS.cascade_threshold} "
+          f"or {', '.join(CASCADE_EVENTS)} seen (stage1_triage/{TRIAGE_PROMPT.version})")
+
 # Load game profile (REQUIRED)
 profile_path = GAME_ROOT / "inputs" / "game_profile.json"
 if not profile_path.exists():
@@ -113,8 +142,73 @@ print(f"   Away: {AWAY_TEAM['jersey_color']} ({AWAY_TEAM['keeper_color']} keeper
 print(f"   📌 Locked configuration - DO NOT re-run calibration!")
 print()
 
+# Clip selection from 0.6_select_clips.py: clip name → {'action': analyze|frames|skip, 'reason', ...}
+CLIP_MANIFEST = {}
+manifest_path = GAME_ROOT / "inputs" / "clip_manifest.json"
+if manifest_path.exists() and not ARGS.all_clips:
+    with open(manifest_path, 'r') as f:
+        CLIP_MANIFEST = {entry['clip']: entry for entry in json.load(f)['clips']}
+    print(f"✅ Loaded clip manifest ({sum(1 for e in CLIP_MANIFEST.values() if e['action'] != 'analyze')} clips skipped or down-sampled)")
+    print()
+
+# Whistle / crowd-noise candidates from 0.1 (audio_events.py), added to each clip's prompt as hints
+AUDIO_EVENTS = []
+audio_events_path = GAME_ROOT / "inputs" / "audio_events.json"
+if audio_events_path.exists() and HAS_AUDIO_EVENTS and not ARGS.no_audio_hints:
+    with open(audio_events_path, 'r') as f:
+        AUDIO_EVENTS = json.load(f)['events']
+    print(f"🔊 Loaded {len(AUDIO_EVENTS)} audio event candidates (whistles / crowd noise)")
+    print()
+
+# Still frames sent instead of the video for low-activity ('frames') clips
+FRAME_OFFSETS = [5, 20, 35, 50]
+FRAMES_CACHE_DIR = GAME_ROOT / "inputs" / "clip_frames"
+
+def extract_clip_frames(clip_path: Path) -> list:
+    """Extract FRAME_OFFSETS stills from a clip (cached in inputs/clip_frames/)"""
+    FRAMES_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    frames = []
+    for offset in FRAME_OFFSETS:
+        frame_path = FRAMES_CACHE_DIR / f"{clip_path.stem}_{offset:02d}s.jpg"
+        if not frame_path.exists():
+            cmd = ['ffmpeg', '-ss', str(offset), '-i', str(clip_path), '-vframes', '1', '-q:v', '3', '-y', str(frame_path)]
+            subprocess.run(cmd, capture_output=True, text=True, check=True)
+        frames.append((offset, frame_path))
+    return frames
+
+def triage_clip(contents: list, team_context: str, clip_start_time: str, clip_end_time: str, priority: str = None) -> dict:
+    """Cascade step 1: coarse event likelihood from the triage model (same video + hints, short prompt)"""
+    try:
+        triage_prompt = TRIAGE_PROMPT.render(
+            team_context=team_context,
+            clip_start_time=clip_start_time,
+            clip_end_time=clip_end_time
+        )
+        response = triage_model.generate_content(contents[:-1] + [triage_prompt])
+        triage = parse_triage(response.text)
+        escalate, reason = should_escalate(triage, ARGS.cascade_threshold, CASCADE_EVENTS, priority)
+        return {
+            'event_likelihood': triage['event_likelihood'] if triage else None,
+            'events': triage['events'] if triage else [],
+            'summary': triage['summary'] if triage else '',
+            'escalated': escalate,
+            'reason': reason,
+            'usage': {
+                'prompt_tokens': response.usage_metadata.prompt_token_count,
+                'output_tokens': response.usage_metadata.candidates_token_count,
+                'total_tokens': response.usage_metadata.total_token_count,
+            }
+        }
+    except Exception as e:
+        # A failed triage must not drop the clip: send it to the full model
+        print(f"⚠️  Triage failed ({e}), escalating")
+        return {'event_likelihood': None, 'events': [], 'summary': '', 'escalated': True, 'reason': 'triage failed',
+                'usage': {'prompt_tokens': 0, 'output_tokens': 0, 'total_tokens': 0}}
+
 def analyze_single_clip(clip_path: Path) -> dict:
     """Analyze a single clip (with audio) and return timestamp + description + usage stats"""
+    clip_started = time.time()
+    triage = None
     try:
         # Extract timestamp from filename
         match = re.search(r'clip_(\d+)m(\d{2})s\.mp4', clip_path.name)
@@ -158,82 +252,52 @@ TEAMS (refer to them ONLY by jersey color):
         clip_end_time = f"{clip_end_ts//60}:{clip_end_ts%60:02d}"
         example_mid_time = f"{(timestamp + 30)//60}:{(timestamp + 30)%60:02d}"
 
-        prompt = f"""You are analyzing a GAA (Gaelic Athletic Association) match clip.
-
-{team_context}
-
-**CLIP TIMING:**
-This clip shows {clip_start_time} to {clip_end_time}.
-
-**YOUR TASK:**
-First understand WHERE and WHAT'S HAPPENING, then describe SPECIFIC EVENTS.
-
-**STEP 1: UNDERSTAND THE CONTEXT**
-- WHERE on pitch: Near LEFT goal / Near RIGHT goal / Midfield / Attacking area
-- WHAT'S HAPPENING: Are teams passing around? Attacking? Defending? Contesting ball?
-
-**CRITICAL: ALWAYS specify which goal (LEFT or RIGHT) when events happen near a goal**
-
-**STEP 2: DETECT THESE EVENTS (be selective - don't over-report):**
-
-1. **SHOTS** - Clear scoring attempts ONLY:
-   - ⚠️ Only report if you SEE the actual shot/kick toward goal
-   - Don't report "attempts" or "attacks" - must see the shot
-   - WHO shoots, WHICH GOAL they're shooting toward, WHERE from, OUTCOME (Point/Goal/Wide/Saved)
-   - Example: "{example_mid_time} - White shoots toward LEFT goal from 25m center - POINT scored"
-   - Example: "{clip_start_time} - Black shoots toward RIGHT goal from 20m right - WIDE"
-
-2. **KICKOUTS** - Goalkeeper restarts (be selective):
-   - ⚠️ Don't report EVERY kickout - only if significant or clearly visible
-   - After a score, many kickouts are routine - skip if nothing notable
-   - WHO kicks, FROM WHICH GOAL, DISTANCE (Long/Mid/Short), DIRECTION (Left/Centre/Right), OUTCOME (Won/Lost)
-   - Example: "{clip_start_time} - Black keeper kicks out from LEFT goal, LONG to CENTRE, White WINS in midfield"
-   - Example: "{example_mid_time} - White keeper kicks out from RIGHT goal, SHORT to RIGHT, Black WINS"
-
-3. **FOULS** - Look for CLEAR SIGNS:
-   - 🚩 Referee arm raised / signaling
-   - 🚩 Play STOPS suddenly (ball dead, players waiting)
-   - 🚩 Players clustered around stoppage
-   - 🚩 Player on ground after contact
-   - 🔊 Whistle heard (if audible)
-   - DESCRIBE: Which team fouled (conceded), where it happened (specify goal side if near a goal)
-   - Example: "{clip_end_time} - Play stops near LEFT goal, Black fouls White - SCOREABLE free awarded"
-   - Example: "{example_mid_time} - White fouls Black in midfield - free awarded"
-
-4. **TURNOVERS** - VERY RARE, strict criteria:
-   - ONLY if: Ball clearly DROPPED / Pass INTERCEPTED mid-flight / Clean TACKLE causes loss
-   - Don't report normal ball contests or possession changes
-   - Example: "{example_mid_time} - White player DROPS ball in midfield, Black recovers"
-
-**Important:**
-- Use absolute timestamps like {clip_start_time} (NOT 0:05)
-- ALWAYS specify which goal (LEFT or RIGHT) for events near goals
-- Include WHERE events happen: "near LEFT goal", "toward RIGHT goal", "midfield", etc.
-- Only describe KEY events you're CONFIDENT about
-- Refer to teams ONLY by jersey color
-- FOULS: Look for play stoppages, referee signals, player contact
-- ⚠️ BE SELECTIVE: Don't report every single action - only clear, significant events
-- Skip routine play, vague "possession", and normal game flow
-
-**Example output format (be selective, not everything):**
-{clip_start_time} - Black shoots toward RIGHT goal from 20m center - POINT scored
-{example_mid_time} - White fouls Black in midfield - free awarded
-{clip_end_time} - Play stops near LEFT goal, Black fouls White - SCOREABLE free awarded
-{clip_start_time} - White keeper kicks out from RIGHT goal, SHORT to LEFT, Black WINS
-
-(Note: If a clip has routine play with no clear events, that's OK - only report what's significant)
-
-Describe the detectable events:"""
-
-        # Read video data
-        with open(clip_path, 'rb') as f:
-            video_data = f.read()
+        prompt = PROMPT.render(
+            team_context=team_context,
+            clip_start_time=clip_start_time,
+            clip_end_time=clip_end_time,
+            example_mid_time=example_mid_time
+        )
+
+        if CLIP_MANIFEST.get(clip_path.name, {}).get('action') == 'frames':
+            # Mostly stoppage (0.6): a few stills cost a fraction of the video tokens
+            contents = [f"NOTE: This clip was mostly stoppage, so instead of the video you get {len(FRAME_OFFSETS)} "
+                        f"still frames (no audio). Only report what the frames show."]
+            for offset, frame_path in extract_clip_frames(clip_path):
+                frame_ts = timestamp + offset
+                contents.append(f"Frame at {frame_ts//60}:{frame_ts%60:02d}:")
+                contents.append({"mime_type": "image/jpeg", "data": frame_path.read_bytes()})
+            contents.append(prompt)
+        else:
+            # Read video data
+            with open(clip_path, 'rb') as f:
+                video_data = f.read()
+            contents = [{"mime_type": "video/mp4", "data": video_data}, prompt]
+        
+        # Local audio detector hints go right before the prompt
+        clip_hints = events_between(AUDIO_EVENTS, timestamp, timestamp + 60) if AUDIO_EVENTS else []
+        if clip_hints:
+            contents.insert(len(contents) - 1, format_hints(clip_hints, timestamp, timestamp + 60))
+        
+        # Cascade: triage first (frames-only clips are already cheap and go straight to Pro)
+        manifest_entry = CLIP_MANIFEST.get(clip_path.name, {})
+        if ARGS.cascade and manifest_entry.get('action') != 'frames':
+            triage = triage_clip(contents, team_context, clip_start_time, clip_end_time, manifest_entry.get('priority'))
+            if not triage['escalated']:
+                description = f"TRIAGE ONLY ({ARGS.triage_model}, {triage['reason']}): {triage['summary'] or 'no notable events'}"
+                print(f"🪶 {timestamp}s: triage only - {triage['reason']}")
+                return {
+                    'timestamp': timestamp,
+                    'clip_name': clip_path.name,
+                    'description': description,
+                    'usage': {'prompt_tokens': 0, 'output_tokens': 0, 'total_tokens': 0},
+                    'audio_hints': len(clip_hints),
+                    'triage': triage,
+                    'seconds': round(time.time() - clip_started, 2)
+                }
         
         # Send to Gemini
-        response = model.generate_content([
-            {"mime_type": "video/mp4", "data": video_data},
-            prompt
-        ])
+        response = model.generate_content(contents)
         
         description = response.text.strip()
         
@@ -251,7 +315,10 @@ Describe the detectable events:"""
             'timestamp': timestamp,
             'clip_name': clip_path.name,
             'description': description,
-            'usage': usage
+            'usage': usage,
+            'audio_hints': len(clip_hints),
+            'triage': triage,
+            'seconds': round(time.time() - clip_started, 2)
         }
         
     except Exception as e:
@@ -260,7 +327,9 @@ Describe the detectable events:"""
             'timestamp': timestamp,
             'clip_name': clip_path.name,
             'description': f"Error: {str(e)}",
-            'usage': {'prompt_tokens': 0, 'output_tokens': 0, 'total_tokens': 0}
+            'usage': {'prompt_tokens': 0, 'output_tokens': 0, 'total_tokens': 0},
+            'triage': triage,
+            'seconds': round(time.time() - clip_started, 2)
         }
 
 def analyze_clips():
@@ -287,7 +356,14 @@ def analyze_clips():
         all_clips = [c for c in all_clips if c.name in clip_names]
         print(f"🎯 Processing clips {ARGS.start_clip}-{ARGS.end_clip} ({len(all_clips)} clips)")
     
-    if not all_clips:
+    # Clips 0.6 marked as skip (warm-up, half-time, post-match) are not sent at all
+    skipped_clips = [c for c in all_clips if CLIP_MANIFEST.get(c.name, {}).get('action') == 'skip']
+    if skipped_clips:
+        all_clips = [c for c in all_clips if c not in skipped_clips]
+        frames_only = sum(1 for c in all_clips if CLIP_MANIFEST.get(c.name, {}).get('action') == 'frames')
+        print(f"⏭️  Skipping {len(skipped_clips)} non-play clips, {frames_only} sent as frames (clip_manifest.json)")
+    
+    if not all_clips and not skipped_clips:
         print(f"❌ No clips found in {INPUT_DIR}")
         print(f"Run 0_strip_audio.py first!")
         return
@@ -306,6 +382,7 @@ def analyze_clips():
         'total_tokens': 0,
         'api_calls': 0
     }
+    triage_usage = {'prompt_tokens': 0, 'output_tokens': 0, 'total_tokens': 0, 'api_calls': 0}
     
     # Process all clips in parallel
     with ThreadPoolExecutor(max_workers=30) as executor:
@@ -322,7 +399,12 @@ def analyze_clips():
                 total_usage['prompt_tokens'] += result['usage']['prompt_tokens']
                 total_usage['output_tokens'] += result['usage']['output_tokens']
                 total_usage['total_tokens'] += result['usage']['total_tokens']
-                total_usage['api_calls'] += 1
+                if not result.get('triage') or result['triage']['escalated']:
+                    total_usage['api_calls'] += 1
+                if result.get('triage'):
+                    for key in ('prompt_tokens', 'output_tokens', 'total_tokens'):
+                        triage_usage[key] += result['triage']['usage'][key]
+                    triage_usage['api_calls'] += 1
                 
                 # Write progress file immediately
                 with open(output_file, 'a') as f:
@@ -334,6 +416,17 @@ def analyze_clips():
             except Exception as e:
                 print(f"❌ Failed to process {clip_path.name}: {str(e)}")
     
+    # Placeholder lines keep the observation timeline continuous for Stage 2
+    for clip_path in skipped_clips:
+        entry = CLIP_MANIFEST[clip_path.name]
+        results.append({
+            'timestamp': entry['start'],
+            'clip_name': clip_path.name,
+            'description': f"SKIPPED - {entry['reason']} (no play, not analyzed)",
+            'usage': {'prompt_tokens': 0, 'output_tokens': 0, 'total_tokens': 0},
+            'skipped': True
+        })
+    
     # Sort by timestamp and rewrite
     results.sort(key=lambda x: x['timestamp'])
     
@@ -347,14 +440,63 @@ def analyze_clips():
     # Input: $1.25/1M, Output: $10.00/1M
     input_cost = (total_usage['prompt_tokens'] / 1_000_000) * 1.25
     output_cost = (total_usage['output_tokens'] / 1_000_000) * 10.00
+    pro_cost = input_cost + output_cost
+    
+    # Cascade triage calls (cheap model pricing)
+    triage_input_cost, triage_output_cost = token_cost(ARGS.triage_model, triage_usage['prompt_tokens'], triage_usage['output_tokens'])
+    input_cost += triage_input_cost
+    output_cost += triage_output_cost
     total_cost = input_cost + output_cost
     
+    # Wall time per analyzed clip (triage + Pro)
+    clip_seconds = [r['seconds'] for r in results if 'seconds' in r]
+    triaged = [r for r in results if r.get('triage')]
+    
+    # Upload size per clip (compare proxy profiles against source quality)
+    video_clips = [c for c in all_clips if CLIP_MANIFEST.get(c.name, {}).get('action') != 'frames']
+    upload_bytes = sum(c.stat().st_size for c in video_clips)
+    
     # Save usage stats
     usage_stats = {
         'stage': 'stage_1_clip_descriptions',
         'model': MODEL_NAME,
         'test_type': 'audio_and_visual',
-        'clips_analyzed': len(results),
+        'prompt_version': PROMPT.version,
+        'prompt_sha256': PROMPT.sha256,
+        'clips_analyzed': len(results) - len(skipped_clips),
+        'upload': {
+            'encoding': read_profile(INPUT_DIR),
+            'video_clips': len(video_clips),
+            'bytes_total': upload_bytes,
+            'bytes_per_clip': upload_bytes // len(video_clips) if video_clips else 0
+        },
+        'clip_selection': {
+            'manifest': bool(CLIP_MANIFEST),
+            'skipped': len(skipped_clips),
+            'frames_only': sum(1 for c in all_clips if CLIP_MANIFEST.get(c.name, {}).get('action') == 'frames')
+        },
+        'audio_hints': {
+            'events_loaded': len(AUDIO_EVENTS),
+            'clips_with_hints': sum(1 for r in results if r.get('audio_hints')),
+            'hints_sent': sum(r.get('audio_hints', 0) for r in results)
+        },
+        'cascade': {
+            'enabled': ARGS.cascade,
+            'triage_model': ARGS.triage_model if ARGS.cascade else None,
+            'threshold': ARGS.cascade_threshold if ARGS.cascade else None,
+            'escalate_events': list(CASCADE_EVENTS) if ARGS.cascade else None,
+            'triaged': len(triaged),
+            'escalated': sum(1 for r in triaged if r['triage']['escalated']),
+            'triage_only': sum(1 for r in triaged if not r['triage']['escalated']),
+            'triage_tokens': triage_usage,
+            'triage_cost': round(triage_input_cost + triage_output_cost, 4),
+            'pro_cost': round(pro_cost, 4)
+        },
+        'latency': {
+            'p50_seconds': round(percentile(clip_seconds, 50), 2),
+            'p95_seconds': round(percentile(clip_seconds, 95), 2),
+            'max_seconds': round(max(clip_seconds), 2) if clip_seconds else 0
+        },
         'api_calls': total_usage['api_calls'],
         'tokens': total_usage,
         'cost': {
@@ -363,10 +505,10 @@ def analyze_clips():
             'total': round(total_cost, 4)
         },
         'per_clip_avg': {
-            'prompt_tokens': total_usage['prompt_tokens'] // len(results) if results else 0,
-            'output_tokens': total_usage['output_tokens'] // len(results) if results else 0,
-            'total_tokens': total_usage['total_tokens'] // len(results) if results else 0,
-            'cost': round(total_cost / len(results), 4) if results else 0
+            'prompt_tokens': total_usage['prompt_tokens'] // total_usage['api_calls'] if total_usage['api_calls'] else 0,
+            'output_tokens': total_usage['output_tokens'] // total_usage['api_calls'] if total_usage['api_calls'] else 0,
+            'total_tokens': total_usage['total_tokens'] // total_usage['api_calls'] if total_usage['api_calls'] else 0,
+            'cost': round(pro_cost / total_usage['api_calls'], 4) if total_usage['api_calls'] else 0
         }
     }
     
@@ -377,7 +519,7 @@ def analyze_clips():
     print(f"\n{'='*70}")
     print(f"✅ AUDIO + VISUAL ANALYSIS COMPLETE!")
     print(f"{'='*70}")
-    print(f"📊 Analyzed: {len(results)} clips (with audio)")
+    print(f"📊 Analyzed: {len(results) - len(skipped_clips)} clips (with audio), skipped {len(skipped_clips)}")
     print(f"💾 Saved to: {output_file}")
     print()
     print(f"📈 TOKEN USAGE:")
@@ -391,6 +533,14 @@ def analyze_clips():
     print(f"   Output: ${output_cost:.4f}")
     print(f"   Total:  ${total_cost:.4f}")
     print()
+    if ARGS.cascade:
+        cascade = usage_stats['cascade']
+        print(f"🪜 CASCADE ({ARGS.triage_model} → Pro):")
+        print(f"   Triaged: {cascade['triaged']}  Escalated to Pro: {cascade['escalated']}  Triage only: {cascade['triage_only']}")
+        print(f"   Triage cost: ${cascade['triage_cost']:.4f}  Pro cost: ${cascade['pro_cost']:.4f}")
+        print()
+    print(f"⏱️  Per-clip latency: p50 {usage_stats['latency']['p50_seconds']:.1f}s, p95 {usage_stats['latency']['p95_seconds']:.1f}s")
+    print()
     print(f"📊 PER CLIP AVERAGE:")
     print(f"   {usage_stats['per_clip_avg']['prompt_tokens']:,} prompt tokens")
     print(f"   {usage_stats['per_clip_avg']['output_tokens']:,} output tokens")
@@ -15,10 +15,19 @@ from pathlib import Path
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from dotenv import load_dotenv
 import google.generativeai as genai
+from prompt_registry import load_template
+
+try:
+    from audio_events import events_between, format_hints
+    HAS_AUDIO_EVENTS = True
+except ImportError:
+    HAS_AUDIO_EVENTS = False  # audio_events needs numpy
 
 # Parse arguments
 parser = argparse.ArgumentParser(description='Extract event narrative from descriptions')
 parser.add_argument('--game', required=True, help='Game name (folder in games/)')
+parser.add_argument('--no-audio-hints', action='store_true', help='Do not add whistle/crowd candidates (inputs/audio_events.json) to the prompt')
+parser.add_argument('--prompt-version', help='Prompt template version in prompts/{stage}/ (default: prompts/registry.json)')
 ARGS = parser.parse_args()
 
 # Setup paths
@@ -93,6 +102,18 @@ print(f"   📌 Locked configuration - DO NOT re-run calibration!")
 
 SEGMENT_SECONDS = 10 * 60  # 10-minute windows
 
+# Whistle / crowd-noise candidates from 0.1 (audio_events.py): help place fouls, frees and scores
+AUDIO_EVENTS = []
+audio_events_path = GAME_ROOT / "inputs" / "audio_events.json"
+if audio_events_path.exists() and HAS_AUDIO_EVENTS and not ARGS.no_audio_hints:
+    with open(audio_events_path, 'r') as f:
+        AUDIO_EVENTS = json.load(f)['events']
+    print(f"🔊 Loaded {len(AUDIO_EVENTS)} audio event candidates (whistles / crowd noise)")
+
+# Prompt template from the registry (prompts/stage3/), loaded once per process
+PROMPT = load_template('stage3', ARGS.prompt_version)
+print(f"📝 Prompt: stage3/{PROMPT.version} ({PROMPT.sha256[:8]})")
+
 
 def _format_clock(seconds: int) -> str:
     minutes = max(seconds, 0) // 60
@@ -123,71 +144,13 @@ def _build_stage3_prompt(narrative_block: str, team_mapping: str, start_seconds:
         f"SEGMENT: {_format_clock(start_seconds)} to {_format_clock(end_seconds)} (~{duration_minutes:.0f} minutes)"
     )
 
-    return f"""Hello! You're the final step in our GAA (Gaelic Athletic Association) event detection pipeline.
-
-{segment_context}
-
-**WHAT YOU'RE WORKING WITH:**
-You have a coherent narrative describing a GAA match. Your job is to extract DETECTABLE EVENTS ONLY.
-
-{team_mapping}
-
-**DETECTABLE EVENTS (these can be seen on video):**
-1. **Shot Home/Away** - Any shot at goal → Add tags: [From Play/From Free/From 45m/From Penalty] + [Point/Wide/Goal/Saved]
-2. **Kickout Home/Away** - Goalkeeper restart → Add tags: [Long/Mid/Short] + [Left/Right/Centre] + [Won/Lost]
-3. **Turnover Won/Lost Home** - Possession change → Add tags: [Forced/Unforced] + [D1/D2/D3/M1/M2/M3/A1/A2/A3]
-4. **Foul Awarded/Conceded Home** - Free kick → Add tag: [Scoreable] if applicable
-5. **Throw-up** - Referee restarts play → Add tag: [Won Home/Won Away]
-
-**NON-DETECTABLE (don't extract these):**
-- Possession phases
-- Attack phases  
-- Ball in Play / Stoppage states
-- Highlights, Hot Ball
-- Generic "Referee" events
-
-**TEAM LABELING:**
-- Use "Home" for home team, "Away" for away/opponent team
-- Convert colors using the mapping above
-
-**CRITICAL PERSPECTIVE RULES:**
-
-**Turnover Perspective:**
-- "Turnover Won Home" = Home team GAINS possession (good for home)
-- "Turnover Lost Home" = Home team LOSES possession (bad for home)
-- If narrative says "{AWAY_TEAM['jersey_color']} forces turnover" → "Turnover Lost Home"
-
-**Foul Perspective:**
-- "Foul Awarded Home" = Free TO home (opponent fouled them)
-- "Foul Conceded Home" = Free BY home (home fouled opponent)
-
-**OUTPUT FORMAT:**
-MM:SS - Event Code [Tag1] [Tag2]: Brief description
-
-**EXTRACTION EXAMPLES:**
-- Narrative: "11:41 - Blue intercepts in midfield" = YOU: "11:41 - Turnover Won Away [Forced] [M2]: Blue intercepts"
-- Narrative: "17:15 - Blue shoots, scores a point" = YOU: "17:15 - Shot Away [From Play] [Point]: Blue scores"
-- Narrative: "14:20 - Blue keeper takes long kickout toward center, lost" = YOU: "14:20 - Kickout Away [Long] [Centre] [Lost]: Blue restarts"
-- Narrative: "18:45 - White commits foul in scoreable area" = YOU: "18:45 - Foul Conceded Home [Scoreable]: White fouls"
-- Narrative: "16:30 - Referee throws up ball, White wins" = YOU: "16:30 - Throw-up [Won Home]: Referee restart"
-
-**KEY RULES:**
-1. **Timestamps:** Use MM:SS format from narrative
-2. **Team colors → Home/Away:** Convert using mapping above
-3. **Only what's mentioned:** Don't invent events
-4. **Merge shot outcomes:** If "shot" + "point" → ONE event with both tags
-5. **Required tags:** 
-   - Shots: [From X] + [Outcome]
-   - Kickouts: [Length] + [Direction] + [Won/Lost]
-   - Turnovers: [Forced/Unforced] + [Zone]
-   - Fouls: [Scoreable] if applicable
-
-**Here is the validated narrative segment:**
-
-{narrative_block}
+    return PROMPT.render(
+        segment_context=segment_context,
+        team_mapping=team_mapping,
+        away_color=AWAY_TEAM['jersey_color'],
+        narrative_block=narrative_block
+    )
 
-**Now extract all detectable events:**
-Output one event per line in format: MM:SS - Event Code [Tags]: Description"""
 
 def _parse_segment_narrative(narrative_text: str) -> str:
     """Extract actual narrative content, skipping segment headers."""
@@ -324,13 +287,17 @@ USE THIS TO UNDERSTAND:
             print(f"   ⏱️  Processing segment {seg_idx}/{len(segment_files)}: {_format_clock(start_seconds)}-{_format_clock(end_seconds)}...", end="", flush=True)
             
             prompt_text = _build_stage3_prompt(segment_narrative, team_mapping, start_seconds, end_seconds)
+            contents = [prompt_text]
+            segment_hints = events_between(AUDIO_EVENTS, start_seconds, end_seconds) if AUDIO_EVENTS else []
+            if segment_hints:
+                contents.append(format_hints(segment_hints, start_seconds, end_seconds))
             
             # Create model instance per thread (thread-safe)
             thread_model = genai.GenerativeModel('gemini-3-pro-preview', generation_config={"temperature": 0, "top_p": 0.1})
             
             try:
                 seg_start_time = time.time()
-                response = thread_model.generate_content(prompt_text)
+                response = thread_model.generate_content(contents)
                 seg_elapsed = time.time() - seg_start_time
                 print(f" {seg_elapsed:.1f}s")
                 events_text = response.text.strip()
@@ -363,7 +330,8 @@ USE THIS TO UNDERSTAND:
                     'input_cost': input_cost,
                     'output_cost': output_cost,
                     'total_cost': total_cost,
-                    'time_seconds': seg_elapsed
+                    'time_seconds': seg_elapsed,
+                    'audio_hints': len(segment_hints)
                 }
                 
             except Exception as e:
@@ -412,7 +380,8 @@ USE THIS TO UNDERSTAND:
                 'input_cost': round(result['input_cost'], 6),
                 'output_cost': round(result['output_cost'], 6),
                 'total_cost': round(result['total_cost'], 6),
-                'time_seconds': round(result['time_seconds'], 2)
+                'time_seconds': round(result['time_seconds'], 2),
+                'audio_hints': result['audio_hints']
             })
         
         # Write combined events as text (one per line)
@@ -432,10 +401,13 @@ USE THIS TO UNDERSTAND:
     usage_file = OUTPUT_DIR / 'usage_stats_stage3.json'
     usage_stats = {
         'stage': 'stage_3_classification',
+        'prompt_version': PROMPT.version,
+        'prompt_sha256': PROMPT.sha256,
         'model': 'gemini-3-pro-preview',
         'segments_processed': len(segment_files) if segment_files else 1,
         'total_time_seconds': round(total_elapsed, 2),
         'segments': segment_stats if segment_stats else None,
+        'audio_events_loaded': len(AUDIO_EVENTS),
         'api_calls': totals['api_calls'],
         'tokens': {
             'prompt_tokens': totals['prompt_tokens'],
@@ -30,6 +30,7 @@ from typing import Dict, List, Optional
 # Parse arguments
 parser = argparse.ArgumentParser()
 parser.add_argument('--game', required=True)
+parser.add_argument('--verified', action='store_true', help='Read 3_events_verified.txt (Stage 3.5) instead of 3_events_classified.txt')
 ARGS = parser.parse_args()
 
 # Paths
@@ -221,7 +222,7 @@ def parse_event_line(line: str, event_id: int) -> Optional[Dict]:
 def extract_json():
     """Extract structured JSON events from text narrative using regex parsing"""
     
-    input_file = OUTPUT_DIR / "3_events_classified.txt"
+    input_file = OUTPUT_DIR / ("3_events_verified.txt" if ARGS.verified else "3_events_classified.txt")
     output_file = OUTPUT_DIR / "4_events.json"
     
     if not input_file.exists():
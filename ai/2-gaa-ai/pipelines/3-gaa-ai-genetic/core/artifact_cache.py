@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Artifact Cache - Reuse stage outputs across variant evaluations
+
+Each stage's outputs are stored under a key built from:
+  (CACHE_VERSION, stage, prompt sha256, hash of the upstream artifacts,
+   hash of the stage script + the helpers it imports, stage arguments)
+
+The cache lives on disk across runs, so the code hash and arguments are
+part of the key: editing a stage script, its helpers or its model name
+(hard-coded in the scripts), or running with other flags, is a miss
+rather than a stale hit. Bump CACHE_VERSION for changes the hash cannot
+see (e.g. a new dependency version).
+
+Stage 1's upstream is the game inputs (clips + game profile); stage N's
+upstream is the content hash of stage N-1's outputs. A Stage 3 variant
+therefore finds the baseline Stage 1/2 outputs in the cache and only
+runs Stage 3 → 4 → 7, and an unchanged elite re-evaluated in the next
+generation restores all three LLM stages.
+
+Callers hold key_lock(key) around restore-or-run-then-store, so variants
+evaluated in parallel that share a key (the baseline upstream stages) run
+it once and the rest restore the stored result.
+
+Layout:
+  {cache_dir}/{key}/            copied stage outputs
+  {cache_dir}/{key}/manifest.json
+"""
+
+import json
+import shutil
+import hashlib
+import threading
+import uuid
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+# Bump to invalidate every stored entry
+CACHE_VERSION = 2
+
+# Files/folders each stage writes into the run folder (what later stages read)
+STAGE_ARTIFACTS = {
+    1: ["1_observations.txt", "usage_stats_stage1.json"],
+    2: ["2_narrative.txt", "2_narrative_segments", "usage_stats_stage2.json"],
+    3: ["3_events_classified.txt", "usage_stats_stage3.json"],
+}
+
+# Usage stats hold timings/token counts that differ run to run - not part of the content hash
+HASH_EXCLUDE = {"usage_stats_stage1.json", "usage_stats_stage2.json", "usage_stats_stage3.json"}
+
+
+def hash_paths(paths: List[Path], metadata_only: bool = False) -> str:
+    """
+    Hash a list of files/folders (recursively, in a stable order)
+
+    Args:
+        paths: Files or folders to hash (missing ones are skipped)
+        metadata_only: Hash name + size instead of content (for large videos)
+    """
+    digest = hashlib.sha256()
+    for path in paths:
+        files = sorted(p for p in path.rglob('*') if p.is_file()) if path.is_dir() else [path]
+        for file_path in files:
+            if not file_path.exists() or file_path.name in HASH_EXCLUDE:
+                continue
+            digest.update(file_path.name.encode('utf-8'))
+            if metadata_only:
+                digest.update(str(file_path.stat().st_size).encode('utf-8'))
+            else:
+                digest.update(file_path.read_bytes())
+    return digest.hexdigest()
+
+
+class ArtifactCache:
+    """Content-addressed store of stage outputs, safe to share between threads"""
+
+    def __init__(self, cache_dir: Path):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._key_locks: Dict[str, threading.Lock] = {}
+
+    @staticmethod
+    def key(stage: int, prompt_sha256: str, upstream_hash: str, code_hash: str = "",
+            argv: Sequence[str] = ()) -> str:
+        """Cache key for one stage run (code_hash: hash_paths of the script and its helpers)"""
+        raw = f"v{CACHE_VERSION}:stage{stage}:{prompt_sha256}:{upstream_hash}:{code_hash}:{json.dumps(list(argv))}"
+        return f"stage{stage}-{hashlib.sha256(raw.encode('utf-8')).hexdigest()[:24]}"
+
+    @staticmethod
+    def artifact_hash(stage: int, run_dir: Path) -> str:
+        """Content hash of a stage's outputs in a run folder (upstream hash for the next stage)"""
+        return hash_paths([run_dir / name for name in STAGE_ARTIFACTS[stage]])
+
+    def key_lock(self, key: str) -> threading.Lock:
+        """Lock for one key (single-flight: one thread runs a missing stage, the others wait)"""
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    def restore(self, key: str, stage: int, run_dir: Path) -> Optional[Dict]:
+        """
+        Copy cached outputs into a run folder
+
+        Returns:
+            The entry's manifest, or None on a cache miss
+        """
+        entry_dir = self.cache_dir / key
+        manifest_file = entry_dir / "manifest.json"
+        if not manifest_file.exists():
+            with self._lock:
+                self.misses += 1
+            return None
+
+        for name in STAGE_ARTIFACTS[stage]:
+            source = entry_dir / name
+            if source.is_dir():
+                shutil.copytree(source, run_dir / name, dirs_exist_ok=True)
+            elif source.exists():
+                shutil.copy2(source, run_dir / name)
+
+        with self._lock:
+            self.hits += 1
+        with open(manifest_file, 'r') as f:
+            return json.load(f)
+
+    def store(self, key: str, stage: int, run_dir: Path, metadata: Optional[Dict] = None):
+        """Copy a stage's outputs from a run folder into the cache"""
+        entry_dir = self.cache_dir / key
+        if (entry_dir / "manifest.json").exists():
+            return
+
+        # Build the entry in a temp folder and rename, so readers never see half an entry
+        tmp_dir = self.cache_dir / f".tmp-{key}-{uuid.uuid4().hex[:8]}"
+        tmp_dir.mkdir(parents=True)
+        for name in STAGE_ARTIFACTS[stage]:
+            source = run_dir / name
+            if source.is_dir():
+                shutil.copytree(source, tmp_dir / name)
+            elif source.exists():
+                shutil.copy2(source, tmp_dir / name)
+
+        manifest = {
+            'key': key,
+            'stage': stage,
+            'source_run': run_dir.name,
+            'artifact_hash': self.artifact_hash(stage, run_dir),
+            **(metadata or {})
+        }
+        with open(tmp_dir / "manifest.json", 'w') as f:
+            json.dump(manifest, f, indent=2)
+
+        try:
+            tmp_dir.rename(entry_dir)
+        except OSError:
+            # Another variant stored the same key first
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    def summary(self) -> str:
+        """One-line hit/miss summary"""
+        total = self.hits + self.misses
+        rate = self.hits / total * 100 if total else 0.0
+        return f"{self.hits}/{total} stage runs served from cache ({rate:.0f}%)"
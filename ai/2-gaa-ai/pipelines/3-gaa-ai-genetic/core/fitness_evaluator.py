@@ -3,56 +3,105 @@
 Fitness Evaluator - Runs REAL pipeline and calculates fitness metrics
 
 This connects to the actual 2-gaa-ai pipeline:
-1. Injects prompt variants into stage files
-2. Runs the pipeline stages
+1. Creates an isolated workspace per variant (own run folder + prompt file)
+2. Restores cached upstream stage outputs, runs only the stages that changed
+   (in-process when variants run one at a time, otherwise as subprocesses) and
+   caches what it produced
 3. Loads real evaluation metrics
 4. Returns real F1 scores
+
+Stage files are never modified, so a whole population can run concurrently.
+With several games, each variant runs on every game at the same time and
+fitness is the micro F1 over all games (macro F1 and per-game metrics are
+reported alongside). A Stage 3 variant only runs Stage 3 → 4 → 7 on top of the cached baseline
+Stage 1/2 outputs (see artifact_cache.py).
 """
 
+import sys
 import subprocess
 import json
-import re
-import shutil
+import uuid
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import nullcontext
 import xml.etree.ElementTree as ET
 from datetime import datetime
 
+# Stage scripts live in the sibling 1-production-goals-side pipeline
+PIPELINE_ROOT = Path(__file__).parent.parent.parent / "1-production-goals-side"
+sys.path.insert(0, str(PIPELINE_ROOT))
+sys.path.insert(0, str(Path(__file__).parent))
+
+# Pipeline modules the LLM stages import - part of every stage's code hash in the cache key
+STAGE_HELPERS = ["prompt_registry.py", "token_batcher.py", "model_cascade.py", "proxy_encoding.py"]
+# Arguments that don't change a stage's outputs (paths, concurrency) - left out of the cache key
+UNKEYED_ARGS = {"--run-folder", "--prompt-file", "--workers"}
+
+from stage_runner import run_stage
+from prompt_registry import load_template
+from artifact_cache import ArtifactCache, hash_paths
+
 
 class FitnessEvaluator:
     """Evaluates prompt fitness by running REAL pipeline and comparing results"""
     
-    def __init__(self, game_name: str = "kilmeena-vs-cill-chomain", num_clips: int = 10):
+    def __init__(self, game_name: str = "kilmeena-vs-cill-chomain", num_clips: int = 10,
+                 max_parallel: int = 5, api_concurrency: int = 30, in_process: Optional[bool] = None,
+                 use_cache: bool = True, games: Optional[List[str]] = None, average: str = 'micro',
+                 start_clip: int = 0):
         """
         Initialize evaluator
         
         Args:
             game_name: Name of game to test on (must have ground truth)
-            num_clips: Number of clips to process (10 = first 10 minutes)
+            num_clips: Number of clips to process per game (10 = first 10 minutes)
+            max_parallel: Max variants evaluated at the same time
+            api_concurrency: Parallel Gemini requests per game, shared by all running variants
+            in_process: Run stage scripts in this process (stage_runner) instead of subprocesses.
+                In-process runs are serialised, so the default is True only when max_parallel == 1
+            use_cache: Reuse stage outputs keyed by (stage, prompt hash, upstream hash, code hash, arguments)
+            games: Games to evaluate on (overrides game_name); all run concurrently
+            average: 'micro' (pooled TP/FP/FN) or 'macro' (mean per-game F1) fitness
+            start_clip: First clip to process; clips start_clip..num_clips-1 are analyzed and
+                only events in that window are evaluated (extends an earlier 0..start_clip-1 run)
         """
-        self.game_name = game_name
+        self.games = list(games) if games else [game_name]
+        self.game_name = self.games[0]
         self.num_clips = num_clips
+        self.start_clip = start_clip
+        self.max_parallel = max_parallel
+        self.api_concurrency = api_concurrency
+        self.in_process = max_parallel <= 1 if in_process is None else in_process
+        self.average = average
         
         # Use relative paths (3-gaa-ai-genetic and 1-production-goals-side are siblings)
         pipelines_dir = Path(__file__).parent.parent.parent  # Up to /pipelines/
-        self.pipeline_root = pipelines_dir / "1-production-goals-side"
-        self.game_root = pipelines_dir.parent / "games" / game_name
-        self.ground_truth_path = self.game_root / "inputs" / "ground_truth_detectable_first_10min.xml"
-        
-        # Stage file paths
-        self.stage_files = {
-            1: self.pipeline_root / "1_clips_to_descriptions.py",
-            2: self.pipeline_root / "2_create_coherent_narrative.py",
-            3: self.pipeline_root / "3_event_classification.py"
-        }
-        
-        # Backup originals
-        self.backup_dir = Path("/tmp/gaa_ai_backups")
-        self.backup_dir.mkdir(exist_ok=True)
+        self.pipeline_root = PIPELINE_ROOT
+        self.games_root = pipelines_dir.parent / "games"
+        self.game_root = self.games_root / self.game_name
+        self.outputs_dir = self.game_root / "outputs"
+        
+        for game in self.games:
+            inputs_dir = self.games_root / game / "inputs"
+            if not any((inputs_dir / name).exists() for name in ("web_schema.json", "web_schema_first_10min.json")):
+                raise FileNotFoundError(f"No ground truth (web_schema*.json) for game '{game}' in {inputs_dir}")
+        
+        # Stage outputs shared by all variants (and all runs) on each game
+        self.caches = {
+            game: ArtifactCache(self.games_root / game / "outputs" / "genetic-cache")
+            for game in self.games
+        } if use_cache else {}
+        
+        # Parsed ground truth per file, shared with every in-process 7_evaluate run
+        self.gt_cache = {}
+        
+        # Stage 1 workers per variant (set by evaluate_population from the shared quota)
+        self.stage1_workers = api_concurrency
     
     def evaluate_variant(self, stage: int, prompt: str, variant_id: str) -> Dict:
         """
-        Evaluate a single prompt variant by running REAL pipeline
+        Evaluate a single prompt variant by running REAL pipeline on every game
         
         Args:
             stage: Which stage (1, 2, or 3)
@@ -65,42 +114,42 @@ class FitnessEvaluator:
         print(f"  🧪 Testing {variant_id}...", flush=True)
         
         try:
-            # 1. Backup original file
-            self._backup_stage_file(stage)
-            
-            # 2. Inject prompt into stage file
-            self._inject_prompt(stage, prompt)
-            
-            # 3. Run pipeline (stages based on what changed)
-            cost = self._run_pipeline(stage)
-            
-            # 4. Load evaluation metrics from real output
-            metrics = self._load_real_metrics()
+            # Per-game pipeline runs are independent, so they all run at once
+            if len(self.games) == 1:
+                per_game = {self.game_name: self._evaluate_game(stage, prompt, variant_id, self.game_name)}
+            else:
+                per_game = {}
+                with ThreadPoolExecutor(max_workers=len(self.games)) as executor:
+                    future_to_game = {
+                        executor.submit(self._evaluate_game, stage, prompt, variant_id, game): game
+                        for game in self.games
+                    }
+                    for future in as_completed(future_to_game):
+                        game = future_to_game[future]
+                        try:
+                            per_game[game] = future.result()
+                        except Exception as e:
+                            raise RuntimeError(f"{game}: {e}")
             
-            # 5. Calculate fitness
+            metrics = self._aggregate_metrics({game: run['metrics'] for game, run in per_game.items()})
             fitness = self._calculate_fitness(metrics)
             
-            # 6. Restore original file
-            self._restore_stage_file(stage)
-            
-            print(f"    ✅ F1={fitness:.3f} (P={metrics['precision']:.2f}, R={metrics['recall']:.2f})")
+            print(f"    ✅ {variant_id}: F1={fitness:.3f} (P={metrics['precision']:.2f}, R={metrics['recall']:.2f}"
+                  + (f", macro F1={metrics['macro_f1']:.3f} over {len(per_game)} games)" if len(per_game) > 1 else ")"))
             
             return {
                 'variant_id': variant_id,
                 'stage': stage,
                 'fitness': fitness,
                 'metrics': metrics,
-                'cost': cost,
+                'cost': sum(run['cost'] for run in per_game.values()),
+                'run_folder': per_game[self.game_name]['run_folder'],
+                'run_folders': {game: run['run_folder'] for game, run in per_game.items()},
                 'success': True
             }
         
         except Exception as e:
-            print(f"    ❌ Error: {e}")
-            # Make sure we restore the file even on error
-            try:
-                self._restore_stage_file(stage)
-            except:
-                pass
+            print(f"    ❌ {variant_id} error: {e}")
             
             return {
                 'variant_id': variant_id,
@@ -112,172 +161,189 @@ class FitnessEvaluator:
                 'error': str(e)
             }
     
-    def _backup_stage_file(self, stage: int):
-        """Backup the original stage file"""
-        original = self.stage_files[stage]
-        backup = self.backup_dir / f"stage{stage}_backup.py"
-        shutil.copy2(original, backup)
-    
-    def _restore_stage_file(self, stage: int):
-        """Restore the original stage file from backup"""
-        backup = self.backup_dir / f"stage{stage}_backup.py"
-        original = self.stage_files[stage]
-        if backup.exists():
-            shutil.copy2(backup, original)
+    def _evaluate_game(self, stage: int, prompt: str, variant_id: str, game: str) -> Dict:
+        """Run one variant on one game; returns metrics, cost and run folder"""
+        # 1. Create private workspace (run folder + prompt file)
+        workspace = self._create_workspace(stage, prompt, variant_id, game)
+        
+        # 2. Run pipeline (stages based on what changed) inside the workspace
+        cost = self._run_pipeline(stage, workspace)
+        
+        # 3. Load evaluation metrics from the workspace output
+        metrics = self._load_real_metrics(workspace['run_dir'])
+        
+        return {'metrics': metrics, 'cost': cost, 'run_folder': workspace['run_folder']}
     
-    def _inject_prompt(self, stage: int, prompt: str):
+    def _create_workspace(self, stage: int, prompt: str, variant_id: str, game: str) -> Dict:
         """
-        Inject prompt into the appropriate stage file
+        Create an isolated run folder for one variant
         
-        This modifies the Python file to use the new prompt.
+        The prompt is written as a template file and passed to the stage via
+        --prompt-file (loaded by the stage's prompt registry); every stage gets
+        --run-folder so nothing reads or writes the shared .current_run.txt.
         """
-        stage_file = self.stage_files[stage]
+        run_folder = f"genetic-{variant_id}-{uuid.uuid4().hex[:8]}"
+        run_dir = self.games_root / game / "outputs" / run_folder
+        run_dir.mkdir(parents=True, exist_ok=True)
         
-        # Read the file
-        with open(stage_file, 'r') as f:
-            content = f.read()
+        prompt_file = run_dir / f"prompt_stage{stage}_template.txt"
+        prompt_file.write_text(prompt)
         
-        # The prompt is embedded in the Python code as a string
-        # We need to replace it carefully
+        return {
+            'game': game,
+            'run_folder': run_folder,
+            'run_dir': run_dir,
+            'prompt_file': prompt_file
+        }
+    
+    def _inputs_hash(self, game: str) -> str:
+        """Hash of everything Stage 1 reads (clips, game profile, clip manifest, audio hints, schema) - root of the cache chain"""
+        inputs_dir = self.games_root / game / "inputs"
+        clips_hash = hash_paths([inputs_dir / "clips"], metadata_only=True)
+        config_hash = hash_paths([inputs_dir / "game_profile.json",
+                                  inputs_dir / "clip_manifest.json",
+                                  inputs_dir / "audio_events.json",
+                                  self.pipeline_root / "schemas" / "constraints.json"])
+        return f"{game}:{self.start_clip}-{self.num_clips}:{clips_hash}:{config_hash}"
+    
+    def _stage_argv(self, stage_num: int, workspace: Dict) -> List[str]:
+        """Command-line arguments for one stage in a workspace"""
+        argv = ["--game", workspace['game'], "--run-folder", workspace['run_folder']]
+        if stage_num == 1:
+            argv += ["--start-clip", str(self.start_clip), "--end-clip", str(self.num_clips - 1),
+                     "--workers", str(self.stage1_workers)]
+        elif stage_num == 7:
+            argv += ["--time-limit", str(self.num_clips * 60)]
+            if self.start_clip:
+                argv += ["--time-start", str(self.start_clip * 60)]
+        if stage_num == workspace['stage']:
+            argv += ["--prompt-file", str(workspace['prompt_file'])]
+        return argv
+    
+    def _code_hash(self, script: str) -> str:
+        """Hash of a stage script and the pipeline helpers it imports (the model name is set in the script)"""
+        return hash_paths([self.pipeline_root / script] + [self.pipeline_root / name for name in STAGE_HELPERS])
+    
+    def _cache_argv(self, stage_num: int, workspace: Dict) -> List[str]:
+        """_stage_argv without the per-workspace paths and concurrency flags"""
+        argv = self._stage_argv(stage_num, workspace)
+        keyed = []
+        for i, arg in enumerate(argv):
+            if arg in UNKEYED_ARGS or (i and argv[i - 1] in UNKEYED_ARGS):
+                continue
+            keyed.append(arg)
+        return keyed
+    
+    def _run_stage(self, stage_num: int, script: str, workspace: Dict):
+        """Run one stage script (in-process or as a subprocess)"""
+        argv = self._stage_argv(stage_num, workspace)
         
-        if stage == 1:
-            # Stage 1: prompt is in the analyze_single_clip function
-            # Look for: prompt = f"""..."""
-            # We need to preserve the f-string variables
-            
-            # Find the prompt assignment
-            pattern = r'(prompt = f""")(.*?)(""")'
-            match = re.search(pattern, content, re.DOTALL)
-            
-            if match:
-                # Replace the prompt content while keeping f-string wrapper
-                new_content = content[:match.start(2)] + prompt + content[match.end(2):]
-                
-                with open(stage_file, 'w') as f:
-                    f.write(new_content)
-            else:
-                raise ValueError(f"Could not find prompt in stage {stage} file")
+        if self.in_process:
+            # Evaluation reuses the ground truth parsed by earlier runs
+            overrides = {'GT_CACHE': self.gt_cache} if stage_num == 7 else None
+            try:
+                run_stage(script, argv, overrides)
+            except Exception as e:
+                raise RuntimeError(f"Stage {stage_num} failed: {e}")
+            return
         
-        elif stage == 2:
-            # Stage 2: prompt is in _build_stage2_prompt function
-            pattern = r'(return f""")(.*?)(""")'
-            match = re.search(pattern, content, re.DOTALL)
+        try:
+            result = subprocess.run(
+                ["python3", script, *argv],
+                cwd=self.pipeline_root,
+                capture_output=True,
+                text=True,
+                timeout=600  # 10 min timeout
+            )
             
-            if match:
-                new_content = content[:match.start(2)] + prompt + content[match.end(2):]
-                with open(stage_file, 'w') as f:
-                    f.write(new_content)
-            else:
-                raise ValueError(f"Could not find prompt in stage {stage} file")
-        
-        elif stage == 3:
-            # Stage 3: prompt is in _build_stage3_prompt function
-            pattern = r'(return f""")(.*?)(""")'
-            match = re.search(pattern, content, re.DOTALL)
+            if result.returncode != 0:
+                print(f"      ⚠️  Stage {stage_num} warning in {workspace['run_folder']} (continuing...)")
+                # Don't fail - some warnings are ok
             
-            if match:
-                new_content = content[:match.start(2)] + prompt + content[match.end(2):]
-                with open(stage_file, 'w') as f:
-                    f.write(new_content)
-            else:
-                raise ValueError(f"Could not find prompt in stage {stage} file")
+        except subprocess.TimeoutExpired:
+            raise RuntimeError(f"Stage {stage_num} timed out")
+        except Exception as e:
+            raise RuntimeError(f"Stage {stage_num} failed: {e}")
     
-    def _run_pipeline(self, stage: int) -> float:
+    def _is_cacheable(self, stage_num: int, run_dir: Path) -> bool:
+        """Don't cache outputs that contain failed API calls"""
+        if stage_num == 1:
+            observations = run_dir / "1_observations.txt"
+            return observations.exists() and ".mp4: Error:" not in observations.read_text()
+        return (run_dir / f"usage_stats_stage{stage_num}.json").exists()
+    
+    def _run_pipeline(self, stage: int, workspace: Dict) -> float:
         """
         Run the pipeline stages
         
+        Stages 1-3 are looked up in the artifact cache first (baseline prompts
+        for every stage except the modified one); only misses call Gemini.
+        Stage 4 (JSON extraction) and 7 (evaluation) are local and always run.
+        
         Args:
-            stage: Which stage was modified (determines what to run)
+            stage: Which stage was modified (its prompt is the variant)
+            workspace: Workspace dict from _create_workspace
         
         Returns:
-            Cost in dollars
+            Cost in dollars (stages actually run)
         """
-        print(f"    🚀 Running pipeline...", flush=True)
-        
-        # Determine which stages to run
-        if stage == 1:
-            # Modified stage 1: run 1-7
-            stages_to_run = [
-                (1, f"python3 1_clips_to_descriptions.py --game {self.game_name} --start-clip 0 --end-clip {self.num_clips - 1}"),
-                (2, f"python3 2_create_coherent_narrative.py --game {self.game_name}"),
-                (3, f"python3 3_event_classification.py --game {self.game_name}"),
-                (4, None),  # Auto-runs from stage 3
-                (5, None),  # Auto-runs from stage 3
-                (7, f"python3 7_evaluate.py --game {self.game_name} --time-range 0-600")
-            ]
-        elif stage == 2:
-            # Modified stage 2: run 2-7 (assume 1 output exists)
-            stages_to_run = [
-                (2, f"python3 2_create_coherent_narrative.py --game {self.game_name}"),
-                (3, f"python3 3_event_classification.py --game {self.game_name}"),
-                (4, None),
-                (5, None),
-                (7, f"python3 7_evaluate.py --game {self.game_name} --time-range 0-600")
-            ]
-        else:
-            # Modified stage 3: run 3-7
-            stages_to_run = [
-                (3, f"python3 3_event_classification.py --game {self.game_name}"),
-                (4, None),
-                (5, None),
-                (7, f"python3 7_evaluate.py --game {self.game_name} --time-range 0-600")
-            ]
-        
-        # Run each stage
-        for stage_num, cmd in stages_to_run:
-            if cmd is None:
-                continue  # Auto-run stages
-            
-            try:
-                result = subprocess.run(
-                    cmd,
-                    shell=True,
-                    cwd=self.pipeline_root,
-                    capture_output=True,
-                    text=True,
-                    timeout=600  # 10 min timeout
-                )
-                
-                if result.returncode != 0:
-                    print(f"      ⚠️  Stage {stage_num} warning (continuing...)")
-                    # Don't fail - some warnings are ok
-                
-            except subprocess.TimeoutExpired:
-                raise RuntimeError(f"Stage {stage_num} timed out")
-            except Exception as e:
-                raise RuntimeError(f"Stage {stage_num} failed: {e}")
+        print(f"    🚀 Running pipeline ({workspace['run_folder']})...", flush=True)
+        workspace['stage'] = stage
+        run_dir = workspace['run_dir']
+        cache = self.caches.get(workspace['game'])
+        
+        llm_stages = [
+            (1, "1_clips_to_descriptions.py"),
+            (2, "2_create_coherent_narrative.py"),
+            (3, "3_event_classification.py")
+        ]
         
-        # Calculate cost
         stage_costs = {
-            1: 0.26,  # 10 clips × $0.026
+            1: 0.026 * (self.num_clips - self.start_clip),  # $0.026 per clip
             2: 0.02,
-            3: 0.02,
-            4: 0.0,
-            5: 0.0,
-            7: 0.0
+            3: 0.02
         }
         
-        total_cost = sum(stage_costs.get(s[0], 0) for s in stages_to_run if s[1] is not None)
+        total_cost = 0.0
+        stages_run = []
+        upstream_hash = self._inputs_hash(workspace['game'])
+        
+        for stage_num, script in llm_stages:
+            if stage_num == stage:
+                prompt_sha = load_template(f"stage{stage_num}", str(workspace['prompt_file'])).sha256
+            else:
+                prompt_sha = load_template(f"stage{stage_num}").sha256
+            key = ArtifactCache.key(stage_num, prompt_sha, upstream_hash,
+                                    self._code_hash(script), self._cache_argv(stage_num, workspace))
+            
+            # Single-flight: parallel variants needing the same baseline stage wait for one run
+            with cache.key_lock(key) if cache else nullcontext():
+                if cache and cache.restore(key, stage_num, run_dir):
+                    print(f"      ♻️  Stage {stage_num} from cache ({key})", flush=True)
+                else:
+                    # Subprocess stage 3 auto-runs 4 and 5 from its __main__; in-process doesn't
+                    self._run_stage(stage_num, script, workspace)
+                    total_cost += stage_costs[stage_num]
+                    stages_run.append(stage_num)
+                    if cache and self._is_cacheable(stage_num, run_dir):
+                        cache.store(key, stage_num, run_dir, {
+                            'game': workspace['game'],
+                            'num_clips': self.num_clips,
+                            'prompt_sha256': prompt_sha
+                        })
+            
+            upstream_hash = ArtifactCache.artifact_hash(stage_num, run_dir)
+        
+        # Local stages: 4 (JSON) feeds 7 (evaluation); the XML export (5) isn't needed for fitness
+        if self.in_process or 3 not in stages_run:
+            self._run_stage(4, "4_json_extraction.py", workspace)
+        self._run_stage(7, "7_evaluate.py", workspace)
+        
+        print(f"    📦 Ran stages {stages_run + [4, 7]} (${total_cost:.2f})", flush=True)
         return total_cost
     
-    def _load_real_metrics(self) -> Dict:
-        """Load evaluation metrics from the most recent pipeline run"""
-        
-        # Find the most recent output folder
-        outputs_dir = self.game_root / "outputs"
-        
-        # Look for .current_run.txt to find active run
-        current_run_file = outputs_dir / ".current_run.txt"
-        if current_run_file.exists():
-            run_folder = current_run_file.read_text().strip()
-            run_dir = outputs_dir / run_folder
-        else:
-            # Find most recent folder
-            run_dirs = sorted([d for d in outputs_dir.iterdir() if d.is_dir()], 
-                            key=lambda x: x.stat().st_mtime, reverse=True)
-            if not run_dirs:
-                raise FileNotFoundError("No output folders found")
-            run_dir = run_dirs[0]
+    def _load_real_metrics(self, run_dir: Path) -> Dict:
+        """Load evaluation metrics from a workspace run folder"""
         
         # Look for evaluation metrics
         eval_file = run_dir / "7_evaluation_metrics.json"
@@ -311,6 +377,13 @@ class FitnessEvaluator:
         fp = sum(event_data.get('FP', 0) for event_data in per_event.values())
         fn = sum(event_data.get('FN', 0) for event_data in per_event.values())
         
+        # Per-clip (minute) counts, so variants scored on the same clips can be compared pairwise
+        per_clip = {}
+        for match in metrics.get('detailed_matches', []):
+            event = match['ai_event'] if match['ai_event'] else match['gt_event']
+            counts = per_clip.setdefault(str(int(event['time'] // 60)), [0, 0, 0])
+            counts[('TP', 'FP', 'FN').index(match['match_type'])] += 1
+        
         return {
             'precision': precision,
             'recall': recall,
@@ -318,7 +391,37 @@ class FitnessEvaluator:
             'true_positives': tp,
             'false_positives': fp,
             'false_negatives': fn,
-            'ground_truth_count': summary.get('total_pro_events', 20)
+            'ground_truth_count': summary.get('total_gt_events', tp + fn),
+            'per_clip': per_clip
+        }
+    
+    def _aggregate_metrics(self, per_game: Dict[str, Dict]) -> Dict:
+        """
+        Combine per-game metrics
+        
+        Micro = precision/recall/F1 from TP/FP/FN pooled over all games;
+        macro = mean of the per-game F1 scores (every game weighs the same).
+        """
+        tp = sum(m['true_positives'] for m in per_game.values())
+        fp = sum(m['false_positives'] for m in per_game.values())
+        fn = sum(m['false_negatives'] for m in per_game.values())
+        
+        precision = tp / (tp + fp) if tp + fp else 0.0
+        recall = tp / (tp + fn) if tp + fn else 0.0
+        f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+        
+        return {
+            'precision': precision,
+            'recall': recall,
+            'f1': f1,
+            'macro_f1': sum(m['f1'] for m in per_game.values()) / len(per_game),
+            'true_positives': tp,
+            'false_positives': fp,
+            'false_negatives': fn,
+            'ground_truth_count': sum(m['ground_truth_count'] for m in per_game.values()),
+            'per_clip': {f"{game}:{clip}": counts for game, m in per_game.items()
+                         for clip, counts in m.get('per_clip', {}).items()},
+            'per_game': per_game
         }
     
     def _calculate_fitness(self, metrics: Dict) -> float:
@@ -331,8 +434,8 @@ class FitnessEvaluator:
         Returns:
             Fitness score (0.0 - 1.0)
         """
-        # Primary fitness = F1 score
-        f1 = metrics.get('f1', 0.0)
+        # Primary fitness = F1 score (pooled over games, or mean per-game F1)
+        f1 = metrics.get('macro_f1' if self.average == 'macro' else 'f1', 0.0)
         
         # Could also use weighted combination:
         # precision = metrics.get('precision', 0.0)
@@ -354,21 +457,37 @@ class FitnessEvaluator:
         """
         results = []
         
-        for i, variant in enumerate(variants, 1):
-            print(f"\n  [{i}/{len(variants)}] Evaluating {variant['id']}...")
+        # Each variant runs in its own workspace, so they can all run at once.
+        # The shared API quota is split between the variants running together.
+        parallel = max(1, min(self.max_parallel, len(variants)))
+        self.stage1_workers = max(1, self.api_concurrency // parallel)
+        print(f"\n  ⚡ Evaluating {len(variants)} variants on {len(self.games)} game(s) "
+              f"({parallel} in parallel, {self.stage1_workers} API workers each per game)...")
+        
+        with ThreadPoolExecutor(max_workers=parallel) as executor:
+            future_to_variant = {
+                executor.submit(
+                    self.evaluate_variant,
+                    stage=stage,
+                    prompt=variant['prompt'],
+                    variant_id=variant['id']
+                ): variant
+                for variant in variants
+            }
             
-            result = self.evaluate_variant(
-                stage=stage,
-                prompt=variant['prompt'],
-                variant_id=variant['id']
-            )
-            result['variant'] = variant  # Keep original variant info
-            results.append(result)
+            for future in as_completed(future_to_variant):
+                variant = future_to_variant[future]
+                result = future.result()
+                result['variant'] = variant  # Keep original variant info
+                results.append(result)
+                print(f"  [{len(results)}/{len(variants)}] {variant['id']} done")
         
         # Sort by fitness (descending)
         results.sort(key=lambda x: x['fitness'], reverse=True)
         
         # Print summary
+        for game, cache in self.caches.items():
+            print(f"\n  ♻️  Artifact cache ({game}): {cache.summary()}")
         print(f"\n  📊 Population Results:")
         for i, result in enumerate(results, 1):
             status = "✅" if result['success'] else "❌"
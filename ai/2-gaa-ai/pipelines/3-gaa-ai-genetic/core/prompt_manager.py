@@ -5,11 +5,17 @@ Prompt Manager - Load, save, and track prompt variants
 Handles all prompt file I/O and genealogy tracking.
 """
 
+import sys
 import json
 from pathlib import Path
 from typing import Dict, List, Optional
 from datetime import datetime
 
+# Baseline prompts come from the pipeline's prompt registry (prompts/stageN/)
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "1-production-goals-side"))
+
+from prompt_registry import load_template
+
 
 class PromptManager:
     """Manages prompt storage, retrieval, and genealogy tracking"""
@@ -35,44 +41,15 @@ class PromptManager:
             dir_path.mkdir(parents=True, exist_ok=True)
     
     def extract_baselines(self):
-        """Extract baseline prompts from 1-production-goals-side pipeline scripts"""
-        print("🔍 Extracting baseline prompts from pipeline...")
-        
-        # Use relative path (3-gaa-ai-genetic and 1-production-goals-side are siblings)
-        pipelines_dir = Path(__file__).parent.parent.parent  # Up to /pipelines/
-        pipeline_root = pipelines_dir / "1-production-goals-side"
-        
-        # Extract Stage 1 prompt (lines 149-207 in 1_clips_to_descriptions.py)
-        stage1_file = pipeline_root / "1_clips_to_descriptions.py"
-        stage1_prompt = self._extract_prompt_from_file(stage1_file, 149, 207)
-        self.save_baseline(1, stage1_prompt)
-        print(f"  ✅ Stage 1 baseline extracted ({len(stage1_prompt)} chars)")
-        
-        # Extract Stage 2 prompt (lines 103-224 in 2_create_coherent_narrative.py)
-        stage2_file = pipeline_root / "2_create_coherent_narrative.py"
-        stage2_prompt = self._extract_prompt_from_file(stage2_file, 103, 224)
-        self.save_baseline(2, stage2_prompt)
-        print(f"  ✅ Stage 2 baseline extracted ({len(stage2_prompt)} chars)")
-        
-        # Extract Stage 3 prompt (lines 110-206 in 3_event_classification.py)
-        stage3_file = pipeline_root / "3_event_classification.py"
-        stage3_prompt = self._extract_prompt_from_file(stage3_file, 110, 206)
-        self.save_baseline(3, stage3_prompt)
-        print(f"  ✅ Stage 3 baseline extracted ({len(stage3_prompt)} chars)")
-        
-        print(f"\n💾 Baselines saved to: {self.baselines_dir}")
-    
-    def _extract_prompt_from_file(self, file_path: Path, start_line: int, end_line: int) -> str:
-        """Extract prompt text from specific lines of a Python file"""
-        with open(file_path, 'r') as f:
-            lines = f.readlines()
+        """Copy the default stage prompts from the 1-production-goals-side prompt registry"""
+        print("🔍 Extracting baseline prompts from pipeline prompt registry...")
         
-        # Extract the relevant lines (convert to 0-indexed)
-        prompt_lines = lines[start_line-1:end_line]
+        for stage in (1, 2, 3):
+            template = load_template(f"stage{stage}")
+            self.save_baseline(stage, template.text)
+            print(f"  ✅ Stage {stage} baseline: stage{stage}/{template.version} ({len(template.text)} chars)")
         
-        # TODO: Parse the actual prompt string from the Python code
-        # For now, just join the lines
-        return ''.join(prompt_lines)
+        print(f"\n💾 Baselines saved to: {self.baselines_dir}")
     
     def save_baseline(self, stage: int, prompt: str):
         """Save a baseline prompt for a stage"""
@@ -168,12 +145,18 @@ class PromptManager:
         }
         
         for variant, result in zip(variants, results):
-            gen_entry['variants'].append({
+            entry = {
                 'id': variant['id'],
                 'strategy': variant.get('strategy', 'unknown'),
                 'fitness': result['fitness'],
                 'metrics': result.get('metrics', {})
-            })
+            }
+            # Racing evaluator: fitness interval and how far the variant got
+            if result.get('confidence_interval'):
+                entry['confidence_interval'] = result['confidence_interval']
+            if result.get('racing'):
+                entry['racing'] = result['racing']
+            gen_entry['variants'].append(entry)
         
         genealogy['generations'].append(gen_entry)
         
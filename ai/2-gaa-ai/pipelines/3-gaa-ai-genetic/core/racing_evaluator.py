@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+Racing Evaluator - Successive halving + paired racing for prompt variants
+
+Instead of one full 10-clip evaluation per variant:
+1. Rung 0: score every variant on the first few clips (cheap)
+2. Drop variants that are clearly worse than the leader on the same clips
+   and keep at most 1/eta of the rest (successive halving)
+3. Rung 1: survivors are extended over the remaining clips only; their
+   counts are pooled with rung 0, so no clip is analyzed twice
+4. Rung 2: remaining survivors are also scored on the other games
+
+F1 = 2TP / (2TP + FP + FN) is a ratio of sums over clips, so its variance
+comes from the per-clip (minute) counts (delta method). Every variant in a
+rung sees the same clips, so elimination compares each one to the leader
+with a paired interval on the per-clip differences - the clip-to-clip
+variation both variants share cancels out.
+
+Results have the same shape as FitnessEvaluator.evaluate_population (plus
+'confidence_interval' and 'racing'), so the optimizers can use either.
+"""
+
+import math
+from statistics import NormalDist
+from typing import Dict, List, Optional, Tuple
+
+from core.fitness_evaluator import FitnessEvaluator
+
+# {clip key: [tp, fp, fn]} - keys are "game:minute", shared by every variant in a rung
+ClipCounts = Dict[str, List[int]]
+
+
+def _ratio_residuals(per_clip: ClipCounts, clips: List[str]) -> Tuple[float, List[float]]:
+    """Micro F1 over clips and each clip's linearized contribution (a_c - F1 * b_c) / sum(b)"""
+    a = [2 * per_clip.get(c, [0, 0, 0])[0] for c in clips]
+    b = [2 * tp + fp + fn for tp, fp, fn in (per_clip.get(c, [0, 0, 0]) for c in clips)]
+    total = sum(b)
+    if total == 0:
+        return 0.0, [0.0] * len(clips)
+    f1 = sum(a) / total
+    return f1, [(a_c - f1 * b_c) / total for a_c, b_c in zip(a, b)]
+
+
+def _half_width(residuals: List[float], delta: float) -> float:
+    """Normal-approximation half-width from per-clip residuals (inf with fewer than 2 clips)"""
+    m = len(residuals)
+    if m < 2:
+        return math.inf
+    variance = m / (m - 1) * sum(r * r for r in residuals)
+    return NormalDist().inv_cdf(1 - delta / 2) * math.sqrt(variance)
+
+
+def f1_confidence_interval(per_clip: ClipCounts, delta: float = 0.05) -> Tuple[float, float]:
+    """
+    Confidence interval for micro F1 from per-clip event counts (delta method)
+
+    Args:
+        per_clip: {clip: [tp, fp, fn]}
+        delta: 1 - confidence level (0.05 = 95%)
+
+    Returns:
+        (lower, upper) bounds, clipped to [0, 1]
+    """
+    clips = sorted(per_clip)
+    f1, residuals = _ratio_residuals(per_clip, clips)
+    eps = _half_width(residuals, delta)
+    return (max(0.0, f1 - eps), min(1.0, f1 + eps))
+
+
+def paired_f1_difference(per_clip: ClipCounts, other: ClipCounts,
+                         delta: float = 0.05) -> Tuple[float, float, float]:
+    """
+    F1(per_clip) - F1(other) on the same clips, with a paired confidence interval
+
+    Both variants are scored on the same clips, so the interval is built from
+    the per-clip differences of their linearized F1 contributions.
+
+    Returns:
+        (difference, lower, upper)
+    """
+    clips = sorted(set(per_clip) | set(other))
+    f1, residuals = _ratio_residuals(per_clip, clips)
+    other_f1, other_residuals = _ratio_residuals(other, clips)
+    diff = f1 - other_f1
+    eps = _half_width([r - o for r, o in zip(residuals, other_residuals)], delta)
+    return (diff, diff - eps, diff + eps)
+
+
+def pool_counts(*per_clips: ClipCounts) -> ClipCounts:
+    """Sum per-clip counts from several rungs (clips seen twice are added)"""
+    pooled: ClipCounts = {}
+    for per_clip in per_clips:
+        for clip, counts in per_clip.items():
+            pooled[clip] = [x + y for x, y in zip(pooled.get(clip, [0, 0, 0]), counts)]
+    return pooled
+
+
+class RacingEvaluator:
+    """Evaluates a population in rungs of increasing fidelity, dropping losers early"""
+
+    def __init__(self, games: Optional[List[str]] = None, num_clips: int = 10, screening_clips: int = 3,
+                 eta: int = 2, delta: float = 0.05, max_parallel: int = 5, api_concurrency: int = 30):
+        """
+        Initialize racing evaluator
+
+        Args:
+            games: Games with ground truth; the first is used for the cheap rungs
+            num_clips: Full clip set per game
+            screening_clips: Clips used in the first rung
+            eta: Keep at most 1/eta of the variants after each rung
+            delta: 1 - confidence level for the paired intervals
+            max_parallel: Max variants evaluated at the same time
+            api_concurrency: Parallel Gemini requests per game, shared by all running variants
+        """
+        self.games = games or ["kilmeena-vs-cill-chomain"]
+        self.num_clips = num_clips
+        self.eta = eta
+        self.delta = delta
+        self.max_parallel = max_parallel
+        self.api_concurrency = api_concurrency
+
+        # (first clip, end clip, games) per rung - each rung only adds what earlier rungs didn't see
+        screening_clips = min(screening_clips, num_clips)
+        self.rungs = [(0, screening_clips, self.games[:1])]
+        if screening_clips < num_clips:
+            self.rungs.append((screening_clips, num_clips, self.games[:1]))
+        if len(self.games) > 1:
+            self.rungs.append((0, num_clips, self.games[1:]))
+
+        self._evaluators = {}
+
+    def _evaluator(self, games: List[str], start_clip: int, num_clips: int) -> FitnessEvaluator:
+        """One FitnessEvaluator (and artifact caches) per game set and clip window"""
+        key = (tuple(games), start_clip, num_clips)
+        if key not in self._evaluators:
+            self._evaluators[key] = FitnessEvaluator(
+                games=games,
+                num_clips=num_clips,
+                start_clip=start_clip,
+                max_parallel=self.max_parallel,
+                api_concurrency=self.api_concurrency
+            )
+        return self._evaluators[key]
+
+    def _run_rung(self, stage: int, variants: List[Dict], start_clip: int, num_clips: int,
+                  games: List[str]) -> Dict[str, Dict]:
+        """Evaluate variants on one rung (games run concurrently); returns per-clip counts per variant id"""
+        evaluator = self._evaluator(games, start_clip, num_clips)
+        rung = {}
+        for result in evaluator.evaluate_population(stage=stage, variants=variants):
+            rung[result['variant_id']] = {
+                'per_clip': result.get('metrics', {}).get('per_clip', {}),
+                'cost': result.get('cost', 0.0),
+                'success': result['success'],
+                'error': result.get('error')
+            }
+        return rung
+
+    @staticmethod
+    def _metrics(per_clip: ClipCounts) -> Dict:
+        """Micro/macro metrics from pooled per-clip counts (clip keys are "game:minute")"""
+        per_game = {}
+        for clip, counts in per_clip.items():
+            game = clip.rsplit(':', 1)[0]
+            per_game[game] = [x + y for x, y in zip(per_game.get(game, [0, 0, 0]), counts)]
+
+        def f1_of(tp, fp, fn):
+            return 2 * tp / (2 * tp + fp + fn) if tp or fp or fn else 0.0
+
+        tp, fp, fn = (sum(counts[i] for counts in per_game.values()) for i in range(3))
+        f1 = f1_of(tp, fp, fn)
+        return {
+            'precision': tp / (tp + fp) if tp + fp else 0.0,
+            'recall': tp / (tp + fn) if tp + fn else 0.0,
+            'f1': f1,
+            'macro_f1': sum(f1_of(*c) for c in per_game.values()) / len(per_game) if per_game else f1,
+            'true_positives': tp,
+            'false_positives': fp,
+            'false_negatives': fn,
+            'per_clip': per_clip,
+            'per_game': {game: {'f1': f1_of(*c), 'true_positives': c[0], 'false_positives': c[1],
+                                'false_negatives': c[2]} for game, c in per_game.items()}
+        }
+
+    def evaluate_population(self, stage: int, variants: List[Dict]) -> List[Dict]:
+        """
+        Race a population through the rungs
+
+        Args:
+            stage: Which stage (1, 2, or 3)
+            variants: List of variant dicts with 'prompt' and 'id'
+
+        Returns:
+            List of results, survivors of the last rung first, then by fitness
+        """
+        results = {v['id']: {'variant_id': v['id'], 'stage': stage, 'variant': v, 'fitness': 0.0,
+                             'metrics': {}, 'cost': 0.0, 'success': False, 'confidence_interval': None,
+                             'racing': {'rung': -1, 'history': [], 'eliminated_at': None}}
+                   for v in variants}
+        pooled: Dict[str, ClipCounts] = {v['id']: {} for v in variants}
+        alive = list(variants)
+
+        for rung, (start_clip, num_clips, games) in enumerate(self.rungs):
+            print(f"\n  🏁 Rung {rung + 1}/{len(self.rungs)}: {len(alive)} variants × "
+                  f"clips {start_clip}-{num_clips - 1} × {len(games)} game(s)")
+            entries = self._run_rung(stage, alive, start_clip, num_clips, games)
+
+            for variant in alive:
+                entry = entries[variant['id']]
+                result = results[variant['id']]
+                result['cost'] += entry['cost']
+                result['racing']['rung'] = rung
+                history = {'rung': rung, 'clips': [start_clip, num_clips], 'games': games}
+
+                if not entry['success']:
+                    result.update({'fitness': 0.0, 'success': False, 'error': entry.get('error')})
+                    result['racing']['history'].append({**history, 'error': entry.get('error')})
+                    continue
+
+                # Extend the variant's counts with the clips this rung added
+                pooled[variant['id']] = pool_counts(pooled[variant['id']], entry['per_clip'])
+                metrics = self._metrics(pooled[variant['id']])
+                ci = f1_confidence_interval(pooled[variant['id']], self.delta)
+                result.update({
+                    'fitness': metrics['f1'],
+                    'success': True,
+                    'confidence_interval': [round(ci[0], 4), round(ci[1], 4)],
+                    'metrics': metrics
+                })
+                result['racing']['history'].append({**history, 'f1': round(metrics['f1'], 4),
+                                                    'ci': result['confidence_interval']})
+
+            if rung == len(self.rungs) - 1:
+                break
+
+            alive = self._select(alive, results, pooled, rung)
+            if not alive:
+                break
+
+        ranked = sorted(results.values(), key=lambda r: (r['racing']['rung'], r['fitness']), reverse=True)
+
+        print(f"\n  📊 Racing Results:")
+        for i, result in enumerate(ranked, 1):
+            status = "✅" if result['success'] else "❌"
+            ci = result['confidence_interval']
+            ci_text = f" [{ci[0]:.3f}, {ci[1]:.3f}]" if ci else ""
+            print(f"    {i}. {status} {result['variant_id']}: F1={result['fitness']:.3f}{ci_text} "
+                  f"(rung {result['racing']['rung'] + 1})")
+
+        return ranked
+
+    def _select(self, alive: List[Dict], results: Dict[str, Dict], pooled: Dict[str, ClipCounts],
+                rung: int) -> List[Dict]:
+        """Survivors of a rung: not clearly worse than the leader (paired), then the top 1/eta"""
+        scored = [results[v['id']] for v in alive if results[v['id']]['success']]
+        if not scored:
+            print("  ❌ No variant survived this rung")
+            return []
+
+        # Racing: drop anything whose paired difference to the leader is clearly negative
+        leader = max(scored, key=lambda r: r['fitness'])
+        contenders = []
+        for result in scored:
+            _, _, upper = paired_f1_difference(pooled[result['variant_id']], pooled[leader['variant_id']],
+                                               self.delta)
+            if result is leader or upper >= 0:
+                contenders.append(result)
+
+        # Successive halving: keep the top 1/eta of the contenders
+        contenders.sort(key=lambda r: r['fitness'], reverse=True)
+        keep = max(1, math.ceil(len(alive) / self.eta))
+        survivors = {r['variant_id'] for r in contenders[:keep]}
+
+        for variant in alive:
+            if variant['id'] not in survivors:
+                results[variant['id']]['racing']['eliminated_at'] = rung
+        print(f"  ✂️  Kept {len(survivors)}/{len(alive)} "
+              f"({len(contenders)} not clearly behind {leader['variant_id']}, halving to {keep})")
+        return [v for v in alive if v['id'] in survivors]
@@ -7,6 +7,7 @@ Keeps Stage 2 & 3 frozen while optimizing Stage 1 only.
 Usage:
     python optimizers/optimize_stage1.py --generations 5 --population 5
     python optimizers/optimize_stage1.py --test  # Quick test mode
+    python optimizers/optimize_stage1.py --games game-a game-b  # Race survivors on more games
 """
 
 import sys
@@ -19,9 +20,11 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from core.mutation_engine import MutationEngine
 from core.fitness_evaluator import FitnessEvaluator
 from core.prompt_manager import PromptManager
+from core.racing_evaluator import RacingEvaluator
 
 
-def optimize_stage1(generations: int = 5, population: int = 5, test_mode: bool = False):
+def optimize_stage1(generations: int = 5, population: int = 5, test_mode: bool = False,
+                    racing: bool = True, games: list = None, patience: int = 2):
     """
     Optimize Stage 1 prompts using genetic algorithm
     
@@ -29,9 +32,12 @@ def optimize_stage1(generations: int = 5, population: int = 5, test_mode: bool =
         generations: Number of generations to evolve
         population: Number of variants per generation
         test_mode: If True, use Flash and simulated evaluation (fast/cheap)
+        racing: Screen variants on a few clips and only fully evaluate survivors
+        games: Games with ground truth (first = screening game); survivors are scored on all
+        patience: Stop after this many generations without a better F1 than the best so far
     
     Returns:
-        Dict with best_f1, top_3 winners, and cost
+        Dict with best_f1, best_ci, top_3 winners, cost and whether it stopped early
     """
     print("=" * 80)
     print("🧬 OPTIMIZING STAGE 1: VIDEO CLIP DESCRIPTIONS")
@@ -39,12 +45,16 @@ def optimize_stage1(generations: int = 5, population: int = 5, test_mode: bool =
     print(f"Generations: {generations}")
     print(f"Population: {population}")
     print(f"Mode: {'TEST (Flash + simulated)' if test_mode else 'PRODUCTION (Pro + real pipeline)'}")
+    print(f"Evaluation: {'racing (successive halving)' if racing else 'full evaluation per variant'}")
     print()
     
     # Initialize components
     model = 'gemini-2.5-flash' if test_mode else 'gemini-2.5-pro'
     engine = MutationEngine(model_name=model)
-    evaluator = FitnessEvaluator()
+    if racing:
+        evaluator = RacingEvaluator(games=games)
+    else:
+        evaluator = FitnessEvaluator(games=games)
     manager = PromptManager()
     
     # Load baseline or current winner
@@ -59,14 +69,19 @@ def optimize_stage1(generations: int = 5, population: int = 5, test_mode: bool =
             print("❌ No baseline found! Run: python core/prompt_manager.py --extract-baselines")
             return {
                 'best_f1': 0.0,
+                'best_ci': None,
                 'top_3': [],
-                'cost': 0.0
+                'cost': 0.0,
+                'stopped_early': False
             }
     
     total_cost = 0.0
     best_fitness = 0.0
+    best_ci = None
     best_variant = None
     all_top_variants = []
+    stale_generations = 0
+    stopped_early = False
     
     # Evolution loop
     for gen in range(generations):
@@ -94,19 +109,19 @@ def optimize_stage1(generations: int = 5, population: int = 5, test_mode: bool =
         total_cost += gen_cost
         print(f"💰 Generation cost: ${gen_cost:.2f}")
         
-        # Track genealogy
+        # Track genealogy (results come back sorted by fitness, so pair by result)
         manager.track_genealogy(
             generation=gen + 1,
             stage=1,
-            variants=variants,
+            variants=[r['variant'] for r in results],
             results=results
         )
         
         # Save all variants
-        for variant, result in zip(variants, results):
+        for result in results:
             manager.save_variant(
                 stage=1,
-                variant=variant,
+                variant=result['variant'],
                 fitness=result['fitness']
             )
         
@@ -117,9 +132,18 @@ def optimize_stage1(generations: int = 5, population: int = 5, test_mode: bool =
         # Track top 3 from this generation
         all_top_variants.extend(results[:3])
         
+        # Early stopping: count generations whose winner doesn't beat the best so far
+        gen_ci = gen_best.get('confidence_interval')
+        if best_variant is None or gen_best['fitness'] > best_fitness:
+            stale_generations = 0
+        else:
+            stale_generations += 1
+            print(f"   📉 No improvement (F1 {gen_best['fitness']:.3f} vs best {best_fitness:.3f})")
+        
         # Update best overall
         if gen_best['fitness'] > best_fitness:
             best_fitness = gen_best['fitness']
+            best_ci = gen_ci
             best_variant = gen_best['variant']
             print(f"   🎉 NEW BEST! F1: {best_fitness:.3f}")
             
@@ -132,6 +156,11 @@ def optimize_stage1(generations: int = 5, population: int = 5, test_mode: bool =
         
         # Use best from this generation as base for next
         base_prompt = gen_best['variant']['prompt']
+        
+        if stale_generations >= patience:
+            print(f"\n⏸️  EARLY STOP: {stale_generations} generations without an improvement")
+            stopped_early = True
+            break
     
     # Get top 3 overall
     all_top_variants.sort(key=lambda x: x['fitness'], reverse=True)
@@ -154,9 +183,11 @@ def optimize_stage1(generations: int = 5, population: int = 5, test_mode: bool =
     
     return {
         'best_f1': best_fitness,
+        'best_ci': best_ci,
         'top_3': top_3,
         'cost': total_cost,
-        'best_variant': best_variant
+        'best_variant': best_variant,
+        'stopped_early': stopped_early
     }
 
 
@@ -165,12 +196,18 @@ def main():
     parser.add_argument('--generations', type=int, default=5, help='Number of generations')
     parser.add_argument('--population', type=int, default=5, help='Population size')
     parser.add_argument('--test', action='store_true', help='Test mode (Flash + simulated)')
+    parser.add_argument('--no-racing', action='store_true', help='Fully evaluate every variant (no early elimination)')
+    parser.add_argument('--games', nargs='+', help='Games with ground truth (first one is used for screening)')
+    parser.add_argument('--patience', type=int, default=2, help='Generations without a better F1 before stopping')
     args = parser.parse_args()
     
     result = optimize_stage1(
         generations=args.generations,
         population=args.population,
-        test_mode=args.test
+        test_mode=args.test,
+        racing=not args.no_racing,
+        games=args.games,
+        patience=args.patience
     )
     
     if result['best_f1'] > 0:
@@ -34,6 +34,8 @@ def main():
     parser.add_argument('--generations-per-stage', type=int, default=5, help='Generations per stage before recombination')
     parser.add_argument('--target-f1', type=float, default=0.70, help='Target F1 score to achieve')
     parser.add_argument('--max-cost', type=float, default=100.0, help='Maximum cost budget ($)')
+    parser.add_argument('--no-racing', action='store_true', help='Fully evaluate every variant (no early elimination)')
+    parser.add_argument('--games', nargs='+', help='Games with ground truth (first one is used for screening)')
     args = parser.parse_args()
     
     print("=" * 80)
@@ -58,7 +60,9 @@ def main():
         print(f"📹 PHASE 1: Optimizing Stage 1 (Video Descriptions)...")
         stage1_result = optimize_stage1(
             generations=args.generations_per_stage,
-            population=args.population
+            population=args.population,
+            racing=not args.no_racing,
+            games=args.games
         )
         total_cost += stage1_result['cost']
         print(f"✅ Stage 1 Best F1: {stage1_result['best_f1']:.3f}")
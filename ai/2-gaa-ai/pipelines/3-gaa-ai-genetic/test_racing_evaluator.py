@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the racing evaluator (intervals and rung logic)
+No Gemini calls: the rungs are fed synthetic per-clip counts
+"""
+
+import sys
+from pathlib import Path
+
+# Add project to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from core.racing_evaluator import (RacingEvaluator, f1_confidence_interval, paired_f1_difference,
+                                   pool_counts)
+
+
+def clip_counts(game, start, rows):
+    """{"game:minute": [tp, fp, fn]} for consecutive clips starting at start"""
+    return {f"{game}:{start + i}": list(row) for i, row in enumerate(rows)}
+
+
+# Clip difficulty varies a lot; the better variant gains one TP per clip everywhere
+EASY_HARD = [(6, 1, 1), (1, 2, 5), (5, 1, 2), (2, 3, 4), (6, 0, 1), (1, 2, 5)]
+BETTER = [(tp + 1, fp, fn - 1) for tp, fp, fn in EASY_HARD]
+
+
+class FakeRacingEvaluator(RacingEvaluator):
+    """Serves rungs from a {variant_id: {clip: counts}} table and records what was run"""
+
+    def __init__(self, table, **kwargs):
+        super().__init__(**kwargs)
+        self.table = table
+        self.calls = []
+
+    def _run_rung(self, stage, variants, start_clip, num_clips, games):
+        self.calls.append((start_clip, num_clips, tuple(games), [v['id'] for v in variants]))
+        rung = {}
+        for variant in variants:
+            per_clip = {clip: counts for clip, counts in self.table[variant['id']].items()
+                        if clip.rsplit(':', 1)[0] in games and start_clip <= int(clip.rsplit(':', 1)[1]) < num_clips}
+            rung[variant['id']] = {'per_clip': per_clip, 'cost': 0.01 * len(per_clip),
+                                   'success': True, 'error': None}
+        return rung
+
+
+def test_interval_contains_estimate():
+    per_clip = clip_counts("g", 0, EASY_HARD)
+    tp, fp, fn = (sum(c[i] for c in per_clip.values()) for i in range(3))
+    f1 = 2 * tp / (2 * tp + fp + fn)
+    lower, upper = f1_confidence_interval(per_clip)
+    assert lower < f1 < upper
+    assert f1_confidence_interval(clip_counts("g", 0, EASY_HARD[:1])) == (0.0, 1.0)
+
+
+def test_paired_difference_is_tighter_than_unpaired():
+    better = clip_counts("g", 0, BETTER)
+    base = clip_counts("g", 0, EASY_HARD)
+    diff, lower, upper = paired_f1_difference(better, base)
+    assert diff > 0 and lower > 0  # Consistent gain on every clip is detected
+
+    # Unpaired intervals overlap - the old lower-vs-upper rule could not separate them
+    assert f1_confidence_interval(better)[0] < f1_confidence_interval(base)[1]
+
+    same = paired_f1_difference(base, dict(base))
+    assert same == (0.0, 0.0, 0.0)
+
+
+def test_pool_counts_adds_rungs():
+    pooled = pool_counts(clip_counts("g", 0, [(1, 0, 0)]), clip_counts("g", 0, [(2, 1, 1)]),
+                         clip_counts("g", 1, [(3, 0, 0)]))
+    assert pooled == {"g:0": [3, 1, 1], "g:1": [3, 0, 0]}
+
+
+def test_rungs_extend_survivors_without_rework():
+    table = {
+        "best": clip_counts("a", 0, (BETTER * 2)[:10]),
+        "base": clip_counts("a", 0, (EASY_HARD * 2)[:10]),
+        "bad1": clip_counts("a", 0, [(0, 4, 8)] * 10),
+        "bad2": clip_counts("a", 0, [(0, 5, 7)] * 10),
+    }
+    for variant_id in list(table):
+        table[variant_id].update(clip_counts("b", 0, [(3, 1, 1)] * 10))
+
+    evaluator = FakeRacingEvaluator(table, games=["a", "b"], num_clips=10, screening_clips=3, eta=2)
+    results = evaluator.evaluate_population(stage=1, variants=[{'id': v} for v in table])
+
+    # Rung 0 screens everyone on clips 0-2; later rungs only add clips / games
+    assert evaluator.calls[0] == (0, 3, ("a",), ["best", "base", "bad1", "bad2"])
+    assert evaluator.calls[1][:3] == (3, 10, ("a",))
+    assert evaluator.calls[2][:3] == (0, 10, ("b",))
+    # The paired interval already separates best from base after 3 clips
+    assert evaluator.calls[1][3] == ["best"]
+
+    clip_evaluations = sum((end - start) * len(ids) for start, end, _, ids in evaluator.calls)
+    assert clip_evaluations == 4 * 3 + 1 * 7 + 1 * 10  # vs 4*3 + 1*10 + 1*20 re-running from scratch
+
+    winner = results[0]
+    assert winner['variant_id'] == "best"
+    assert len(winner['metrics']['per_clip']) == 20  # 10 clips on each game, each counted once
+    assert set(winner['metrics']['per_game']) == {"a", "b"}
+    tp = sum(c[0] for c in table["best"].values())
+    assert winner['metrics']['true_positives'] == tp
+    assert all(r['racing']['eliminated_at'] == 0 for r in results[1:])
+
+
+def main():
+    """Run all tests"""
+    tests = [test_interval_contains_estimate, test_paired_difference_is_tighter_than_unpaired,
+             test_pool_counts_adds_rungs, test_rungs_extend_survivors_without_rework]
+    for test in tests:
+        test()
+        print(f"✅ {test.__name__}")
+    return True
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -12,10 +12,13 @@ import time
 import argparse
 from pathlib import Path
 from concurrent.futures import ThreadPoolExecutor, as_completed
+from frame_sampler import sample_frames
 
 # Parse arguments
 parser = argparse.ArgumentParser(description='Generate clips and calibration frames from raw video')
 parser.add_argument('--game', required=True, help='Game name (folder in games/)')
+parser.add_argument('--frame-mode', default='keyframes', choices=['keyframes', 'select', 'clips'],
+                    help='Calibration frames: nearest keyframe from the source (fast), exact frame from the source, or per-clip ffmpeg calls (default: keyframes)')
 ARGS = parser.parse_args()
 
 # Setup paths
@@ -233,6 +236,26 @@ def extract_calibration_frames_from_clips(clips_dir, frames_dir):
         print(f"❌ Frame extraction failed: {str(e)}")
         return 0
 
+def extract_calibration_frames_from_video(video_path, frames_dir, video_duration, interval=30):
+    """Sample a frame every 30s straight from the source video - ONE ffmpeg process"""
+    timestamps = list(range(0, int(video_duration), interval))
+    print(f"\n📸 Sampling {len(timestamps)} calibration frames from the source video "
+          f"(every {interval}s, {ARGS.frame_mode} mode, single ffmpeg process)...")
+    
+    try:
+        start_time = time.time()
+        frames = sample_frames(video_path, timestamps, frames_dir,
+                               filename="frame_{seconds:05d}s.jpg", mode=ARGS.frame_mode)
+        elapsed = time.time() - start_time
+        
+        print(f"✅ Extracted {len(frames)} frames in {elapsed:.1f} seconds ({len(frames)/max(elapsed, 0.1):.1f} frames/sec)")
+        print(f"📁 Saved to: {frames_dir}")
+        
+        return len(frames)
+    except Exception as e:
+        print(f"❌ Frame sampling failed: {str(e)[-300:]}")
+        return 0
+
 def main():
     """Generate clips and calibration frames"""
     print(f"🎬 STAGE 0.1: GENERATE CLIPS & CALIBRATION FRAMES")
@@ -275,9 +298,9 @@ def main():
     print(f"\n✅ Created {clip_count} clips")
     print(f"📁 Saved to: {CLIPS_DIR}")
     
-    # 2. Extract calibration frames from clips (skip if they exist)
+    # 2. Extract calibration frames from the source video (skip if they exist)
     print("\n" + "=" * 70)
-    print("STEP 2: EXTRACTING CALIBRATION FRAMES FROM CLIPS")
+    print("STEP 2: EXTRACTING CALIBRATION FRAMES")
     print("=" * 70)
     
     existing_frames = list(FRAMES_DIR.glob('frame_*s.jpg'))
@@ -285,8 +308,14 @@ def main():
         print(f"✅ Found {len(existing_frames)} existing frames - skipping extraction")
         print(f"📁 Frames already exist in: {FRAMES_DIR}")
         frame_count = len(existing_frames)
-    else:
+    elif ARGS.frame_mode == 'clips':
         frame_count = extract_calibration_frames_from_clips(CLIPS_DIR, FRAMES_DIR)
+    else:
+        # Source frames stay at full quality even when the clips are proxies
+        frame_count = extract_calibration_frames_from_video(VIDEO_PATH, FRAMES_DIR, video_duration)
+        if frame_count == 0:
+            print("🔄 Falling back to per-clip frame extraction...")
+            frame_count = extract_calibration_frames_from_clips(CLIPS_DIR, FRAMES_DIR)
     
     if frame_count == 0:
         print("❌ Frame extraction failed")
@@ -297,8 +326,8 @@ def main():
     print("✅ PREPROCESSING COMPLETE!")
     print("=" * 70)
     print(f"📊 Clips: {clip_count} clips (60s each)")
-    print(f"📸 Frames: {frame_count} frames (2 per clip at 0s and 30s)")
-    print(f"⚡ Speed: Extracted from clips (ultra-fast)")
+    print(f"📸 Frames: {frame_count} frames (every 30s)")
+    print(f"⚡ Speed: {'Extracted from clips' if ARGS.frame_mode == 'clips' else 'Single ffmpeg pass over the source'}")
     print()
     print(f"Next step: python3 0.5_calibrate_game.py --game {ARGS.game}")
     
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Frame Sampler - Extract a list of timestamps with ONE ffmpeg process
+
+Modes:
+  seek       one process, one input per timestamp (-ss before each -i):
+             exact frames, nothing decoded between them. Best for a handful
+             of timestamps or a remote URL (no full download).
+  keyframes  one input decoded keyframes-only (-skip_frame nokey) with a
+             select filter: each timestamp gets the first keyframe at or after
+             it. Very cheap for a whole match (one frame every ~30s).
+  select     like keyframes but decodes every frame, so timestamps are exact
+  auto       seek for <= SEEK_MAX_TIMESTAMPS timestamps or URLs, else keyframes
+
+Frames are written as JPEGs, or returned as NumPy arrays when no output
+folder is given (needs numpy).
+
+Usage:
+    from frame_sampler import sample_frames
+    frames = sample_frames(video_path, range(0, 5400, 30), FRAMES_DIR)        # {30: Path, ...}
+    arrays = sample_frames(video_path, [600, 1200], size=(320, 180))          # {600: ndarray, ...}
+"""
+
+import re
+import json
+import shutil
+import tempfile
+import subprocess
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple, Union
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+SEEK_MAX_TIMESTAMPS = 24  # Each -i opens its own demuxer/decoder
+
+
+def probe_video(source: Union[str, Path]) -> Tuple[int, int, float]:
+    """(width, height, duration seconds) via ffprobe"""
+    cmd = [
+        'ffprobe', '-v', 'quiet',
+        '-select_streams', 'v:0',
+        '-show_entries', 'stream=width,height:format=duration',
+        '-print_format', 'json',
+        str(source)
+    ]
+    result = subprocess.run(cmd, capture_output=True, text=True, check=True, timeout=60)
+    data = json.loads(result.stdout)
+    stream = data['streams'][0]
+    return int(stream['width']), int(stream['height']), float(data.get('format', {}).get('duration', 0) or 0)
+
+
+def _is_url(source) -> bool:
+    return str(source).startswith(('http://', 'https://', 's3://'))
+
+
+def _run(cmd, timeout):
+    """Run ffmpeg, raising CalledProcessError with stderr on failure"""
+    return subprocess.run(cmd, capture_output=True, text=True, check=True, timeout=timeout)
+
+
+def _seek(source, timestamps, out_dir: Path, ext: str, size, quality, timeout) -> Dict[float, Path]:
+    """One process, one input per timestamp → one output file per timestamp"""
+    cmd = ['ffmpeg', '-v', 'error']
+    for t in timestamps:
+        cmd += ['-ss', f"{t:g}", '-i', str(source)]
+    outputs = {}
+    for i, t in enumerate(timestamps):
+        output_path = out_dir / f"{i:05d}.{ext}"
+        cmd += ['-map', f'{i}:v:0', '-frames:v', '1']
+        if size:
+            cmd += ['-vf', f'scale={size[0]}:{size[1]}']
+        cmd += ['-f', 'rawvideo', '-pix_fmt', 'rgb24'] if ext == 'rgb' else ['-q:v', str(quality)]
+        cmd += ['-y', str(output_path)]
+        outputs[t] = output_path
+    _run(cmd, timeout)
+    return {t: path for t, path in outputs.items() if path.exists() and path.stat().st_size > 0}
+
+
+def _select(source, timestamps, out_dir: Path, ext: str, size, quality, keyframes_only, timeout) -> Dict[float, Path]:
+    """One input, select filter picks the first (key)frame at/after each timestamp"""
+    # gte(t,T)*lt(prev_t,T): the frame that crosses T (prev_t is NAN on the first frame)
+    terms = '+'.join(f"gte(t\\,{t:g})*(lt(prev_t\\,{t:g})+isnan(prev_t))" for t in timestamps)
+    filters = [f"select='{terms}'"]
+    if size:
+        filters.append(f'scale={size[0]}:{size[1]}')
+    filters.append('showinfo')  # Logs pts_time of every selected frame
+
+    cmd = ['ffmpeg', '-v', 'info']
+    if keyframes_only:
+        cmd += ['-skip_frame', 'nokey']
+    cmd += ['-i', str(source), '-an', '-vf', ','.join(filters), '-vsync', '0']
+    if ext == 'rgb':
+        cmd += ['-f', 'image2', '-c:v', 'rawvideo', '-pix_fmt', 'rgb24']
+    else:
+        cmd += ['-q:v', str(quality)]
+    cmd += ['-y', str(out_dir / f'%05d.{ext}')]
+    result = _run(cmd, timeout)
+
+    frame_times = [float(m) for m in re.findall(r'pts_time:\s*([\d.]+)', result.stderr)]
+    files = sorted(out_dir.glob(f'*.{ext}'))
+    frames = list(zip(frame_times, files))
+
+    # Timestamps sharing a (key)frame get the same file
+    outputs = {}
+    for t in timestamps:
+        match = next((path for frame_t, path in frames if frame_t >= t - 1e-3), None)
+        if match is not None:
+            outputs[t] = match
+    return outputs
+
+
+def sample_frames(source: Union[str, Path], timestamps: Iterable[float], output_dir: Optional[Path] = None,
+                  filename: str = "frame_{seconds:05d}s.jpg", mode: str = 'auto',
+                  size: Optional[Tuple[int, int]] = None, quality: int = 5,
+                  timeout: Optional[float] = None) -> Dict:
+    """
+    Extract frames at the given timestamps in a single ffmpeg invocation
+
+    Args:
+        source: Video path or URL
+        timestamps: Seconds (duplicates dropped; timestamps past the end yield no frame)
+        output_dir: Where to write JPEGs; None = return (H, W, 3) uint8 arrays
+        filename: JPEG name pattern ({seconds} = int timestamp, {index})
+        mode: 'seek', 'keyframes', 'select' or 'auto' (see module docstring)
+        size: Optional (width, height) to scale to (arrays default to source size)
+        quality: JPEG quality (-q:v, 2 = best)
+        timeout: Seconds before the ffmpeg process is killed
+
+    Returns:
+        {timestamp: Path} or {timestamp: ndarray}, only for frames that were extracted
+    """
+    timestamps = sorted({float(t) for t in timestamps if t >= 0})
+    as_arrays = output_dir is None
+    if as_arrays and not HAS_NUMPY:
+        raise ImportError("numpy is required to return frames as arrays")
+
+    if not timestamps:
+        return {}
+    if as_arrays and not size:
+        # Raw frames need known dimensions (timestamps past the end simply yield no frame)
+        width, height, _ = probe_video(source)
+        size = (width, height)
+
+    if mode == 'auto':
+        mode = 'seek' if _is_url(source) or len(timestamps) <= SEEK_MAX_TIMESTAMPS else 'keyframes'
+    if mode not in ('seek', 'keyframes', 'select'):
+        raise ValueError(f"Unknown frame sampling mode: {mode}")
+
+    ext = 'rgb' if as_arrays else 'jpg'
+    tmp_dir = Path(tempfile.mkdtemp(prefix='frames-'))
+    try:
+        if mode == 'seek':
+            try:
+                extracted = _seek(source, timestamps, tmp_dir, ext, size, quality, timeout)
+            except (subprocess.CalledProcessError, subprocess.TimeoutExpired):
+                if len(timestamps) == 1:
+                    raise
+                # One bad timestamp fails the whole process - retry them one by one
+                extracted = {}
+                for i, t in enumerate(timestamps):
+                    single_dir = tmp_dir / f"single_{i:05d}"
+                    single_dir.mkdir()
+                    try:
+                        extracted.update(_seek(source, [t], single_dir, ext, size, quality, timeout))
+                    except (subprocess.CalledProcessError, subprocess.TimeoutExpired) as e:
+                        print(f"⚠️  No frame at {t:g}s: {e}")
+        else:
+            extracted = _select(source, timestamps, tmp_dir, ext, size, quality, mode == 'keyframes', timeout)
+
+        results = {}
+        for index, t in enumerate(timestamps):
+            if t not in extracted:
+                continue
+            key = int(t) if t.is_integer() else t
+            if as_arrays:
+                results[key] = np.fromfile(extracted[t], dtype=np.uint8).reshape(size[1], size[0], 3)
+            else:
+                output_dir = Path(output_dir)
+                output_dir.mkdir(parents=True, exist_ok=True)
+                output_path = output_dir / filename.format(seconds=int(t), index=index)
+                shutil.copyfile(extracted[t], output_path)
+                results[key] = output_path
+        return results
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
@@ -12,10 +12,15 @@ import time
 import argparse
 from pathlib import Path
 from concurrent.futures import ThreadPoolExecutor, as_completed
+from frame_sampler import sample_frames
+from proxy_encoding import add_proxy_arguments, profile_from_args, encode_args, describe, write_profile, read_profile
 
 # Parse arguments
 parser = argparse.ArgumentParser(description='Generate clips and calibration frames from raw video')
 parser.add_argument('--game', required=True, help='Game name (folder in games/)')
+parser.add_argument('--frame-mode', default='keyframes', choices=['keyframes', 'select', 'clips'],
+                    help='Calibration frames: nearest keyframe from the source (fast), exact frame from the source, or per-clip ffmpeg calls (default: keyframes)')
+add_proxy_arguments(parser)
 ARGS = parser.parse_args()
 
 # Setup paths
@@ -25,6 +30,9 @@ INPUTS_DIR = GAME_ROOT / "inputs"
 CLIPS_DIR = INPUTS_DIR / "clips"
 FRAMES_DIR = INPUTS_DIR / "calibration_frames"
 
+# Encoding for model upload (None = stream copy at source quality)
+PROXY_PROFILE = profile_from_args(ARGS)
+
 def find_video_file():
     """Find the video file - check video_source.json first, then look for any .mp4"""
     # First, try to get target from video_source.json
@@ -77,6 +85,10 @@ def get_video_duration(video_path):
 def generate_clips_ultra_fast(video_path, clips_dir, clip_duration=60):
     """ULTRA FAST: Single ffmpeg command to generate all clips at once"""
     print(f"🚀 ULTRA FAST MODE: Generating {clip_duration}s clips using ffmpeg segment")
+    print(f"🎞️  Encoding: {describe(PROXY_PROFILE)}")
+    
+    # Proxy clips are cut and re-encoded in the same pass (keyframes forced on clip boundaries)
+    codec_args = encode_args(PROXY_PROFILE, segment_seconds=clip_duration) if PROXY_PROFILE else ['-c', 'copy']
     
     try:
         # Single GPU-accelerated command to create ALL clips
@@ -87,7 +99,7 @@ def generate_clips_ultra_fast(video_path, clips_dir, clip_duration=60):
             '-f', 'segment',
             '-segment_time', str(clip_duration),
             '-segment_format', 'mp4',
-            '-c', 'copy',  # Stream copy - no re-encoding
+            *codec_args,  # Stream copy unless a proxy profile is set
             '-reset_timestamps', '1',
             '-segment_start_number', '0',
             '-y',
@@ -123,6 +135,7 @@ def generate_clips_ultra_fast(video_path, clips_dir, clip_duration=60):
         rename_time = time.time() - rename_start
         total_time = time.time() - start_time
         
+        write_profile(clips_dir, PROXY_PROFILE)
         print(f"✅ Renamed {renamed_count} clips in {rename_time:.1f} seconds")
         print(f"🚀 TOTAL TIME: {total_time:.1f} seconds ({renamed_count/total_time:.1f} clips/sec)")
         
@@ -139,7 +152,7 @@ def generate_clips_ultra_fast(video_path, clips_dir, clip_duration=60):
             '-f', 'segment',
             '-segment_time', str(clip_duration),
             '-segment_format', 'mp4',
-            '-c', 'copy',
+            *codec_args,
             '-reset_timestamps', '1',
             '-segment_start_number', '0',
             '-y',
@@ -157,6 +170,7 @@ def generate_clips_ultra_fast(video_path, clips_dir, clip_duration=60):
                 seconds = int(start_seconds % 60)
                 new_name = f"clip_{minutes:03d}m{seconds:02d}s.mp4"
                 temp_clip.rename(clips_dir / new_name)
+            write_profile(clips_dir, PROXY_PROFILE)
             
             return len(temp_clips)
         except subprocess.CalledProcessError as e2:
@@ -233,6 +247,26 @@ def extract_calibration_frames_from_clips(clips_dir, frames_dir):
         print(f"❌ Frame extraction failed: {str(e)}")
         return 0
 
+def extract_calibration_frames_from_video(video_path, frames_dir, video_duration, interval=30):
+    """Sample a frame every 30s straight from the source video - ONE ffmpeg process"""
+    timestamps = list(range(0, int(video_duration), interval))
+    print(f"\n📸 Sampling {len(timestamps)} calibration frames from the source video "
+          f"(every {interval}s, {ARGS.frame_mode} mode, single ffmpeg process)...")
+    
+    try:
+        start_time = time.time()
+        frames = sample_frames(video_path, timestamps, frames_dir,
+                               filename="frame_{seconds:05d}s.jpg", mode=ARGS.frame_mode)
+        elapsed = time.time() - start_time
+        
+        print(f"✅ Extracted {len(frames)} frames in {elapsed:.1f} seconds ({len(frames)/max(elapsed, 0.1):.1f} frames/sec)")
+        print(f"📁 Saved to: {frames_dir}")
+        
+        return len(frames)
+    except Exception as e:
+        print(f"❌ Frame sampling failed: {str(e)[-300:]}")
+        return 0
+
 def main():
     """Generate clips and calibration frames"""
     print(f"🎬 STAGE 0.1: GENERATE CLIPS & CALIBRATION FRAMES")
@@ -264,6 +298,9 @@ def main():
     if existing_clips:
         print(f"✅ Found {len(existing_clips)} existing clips - skipping generation")
         print(f"📁 Clips already exist in: {CLIPS_DIR}")
+        existing_profile = read_profile(CLIPS_DIR)
+        if existing_profile.get('name') != (PROXY_PROFILE or {}).get('name', 'source'):
+            print(f"⚠️  Existing clips were encoded as '{existing_profile.get('name')}' - delete clips/ to re-encode")
         clip_count = len(existing_clips)
     else:
         clip_count = generate_clips_ultra_fast(VIDEO_PATH, CLIPS_DIR, clip_duration=60)
@@ -273,11 +310,13 @@ def main():
         return False
     
     print(f"\n✅ Created {clip_count} clips")
+    clips_mb = sum(c.stat().st_size for c in CLIPS_DIR.glob('clip_*m*s.mp4')) / 1_000_000
+    print(f"📦 {clips_mb:.1f} MB total, {clips_mb / clip_count:.2f} MB per clip ({describe(read_profile(CLIPS_DIR))})")
     print(f"📁 Saved to: {CLIPS_DIR}")
     
-    # 2. Extract calibration frames from clips (skip if they exist)
+    # 2. Extract calibration frames from the source video (skip if they exist)
     print("\n" + "=" * 70)
-    print("STEP 2: EXTRACTING CALIBRATION FRAMES FROM CLIPS")
+    print("STEP 2: EXTRACTING CALIBRATION FRAMES")
     print("=" * 70)
     
     existing_frames = list(FRAMES_DIR.glob('frame_*s.jpg'))
@@ -285,8 +324,14 @@ def main():
         print(f"✅ Found {len(existing_frames)} existing frames - skipping extraction")
         print(f"📁 Frames already exist in: {FRAMES_DIR}")
         frame_count = len(existing_frames)
-    else:
+    elif ARGS.frame_mode == 'clips':
         frame_count = extract_calibration_frames_from_clips(CLIPS_DIR, FRAMES_DIR)
+    else:
+        # Source frames stay at full quality even when the clips are proxies
+        frame_count = extract_calibration_frames_from_video(VIDEO_PATH, FRAMES_DIR, video_duration)
+        if frame_count == 0:
+            print("🔄 Falling back to per-clip frame extraction...")
+            frame_count = extract_calibration_frames_from_clips(CLIPS_DIR, FRAMES_DIR)
     
     if frame_count == 0:
         print("❌ Frame extraction failed")
@@ -297,8 +342,8 @@ def main():
     print("✅ PREPROCESSING COMPLETE!")
     print("=" * 70)
     print(f"📊 Clips: {clip_count} clips (60s each)")
-    print(f"📸 Frames: {frame_count} frames (2 per clip at 0s and 30s)")
-    print(f"⚡ Speed: Extracted from clips (ultra-fast)")
+    print(f"📸 Frames: {frame_count} frames (every 30s)")
+    print(f"⚡ Speed: {'Extracted from clips' if ARGS.frame_mode == 'clips' else 'Single ffmpeg pass over the source'}")
     print()
     print(f"Next step: python3 0.3_calibrate_game.py --game {ARGS.game}")
     
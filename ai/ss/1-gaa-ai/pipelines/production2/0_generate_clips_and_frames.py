@@ -7,19 +7,35 @@ NEW APPROACH: 30-second clips with 5-second overlap
 - Clips overlap by 10s (5s on each side)
 - Better context, less hallucination
 - Narrative can see events that span clip boundaries
+
+Clips keep source quality by default, like the other pipelines; --proxy 720p
+(proxy_encoding.py) encodes a model-upload proxy instead. Make it the default
+only once 7_evaluate --baseline-run shows no F1 loss against source clips.
+
+Engine (--engine):
+- segments (default): decode + encode the source ONCE into base segments
+  split at every clip boundary (keyframes forced there), then build each 40s
+  clip by stream-copying its segments (concat demuxer). Overlap frames are
+  encoded once instead of twice, and the source is opened once.
+- per-clip: one ffmpeg per clip (-ss/-t, full re-encode), 8 in parallel
 """
 
+import shutil
 import subprocess
 import argparse
 import time
 import json
 from pathlib import Path
 from concurrent.futures import ThreadPoolExecutor, as_completed
+from proxy_encoding import add_proxy_arguments, profile_from_args, encode_args, describe, write_profile, read_profile
 
 # Parse arguments
 parser = argparse.ArgumentParser()
 parser.add_argument('--game', required=True, help='Game name (folder in games/)')
 parser.add_argument('--duration', type=int, help='Duration in minutes to process from game start (e.g., 15 for first 15 min)')
+add_proxy_arguments(parser)
+parser.add_argument('--engine', choices=['segments', 'per-clip'], default='segments',
+                    help='segments: encode once + stream-copy overlapping clips; per-clip: one encode per clip')
 ARGS = parser.parse_args()
 
 # Paths
@@ -34,6 +50,9 @@ CLIP_INTERVAL = 30  # 30 seconds of "focus" content per clip
 OVERLAP = 5         # 5 seconds of overlap on each side
 CLIP_DURATION = CLIP_INTERVAL + (2 * OVERLAP)  # 40 seconds total per clip
 
+# Encoding for model upload (None = source quality)
+PROXY_PROFILE = profile_from_args(ARGS)
+
 def get_video_duration(video_path):
     """Get video duration in seconds"""
     cmd = [
@@ -51,6 +70,94 @@ def get_video_duration(video_path):
         print("⚠️  Could not get duration")
         return None
 
+def clip_filename(clip_start, clip_end):
+    """Name shows ACTUAL clip time (with overlap): clip_010m55s-011m35s.mp4"""
+    return f"clip_{clip_start // 60:03d}m{clip_start % 60:02d}s-{clip_end // 60:03d}m{clip_end % 60:02d}s.mp4"
+
+def generate_clips_from_base_segments(video_path, clips_dir, clip_times):
+    """
+    Single decode: encode base segments between all clip boundaries, then
+    assemble each overlapping clip from its segments with stream copy
+    
+    Clip starts are 30s apart and clips are 40s long, so the boundaries
+    alternate 10s (overlap) and 20s (middle) apart - each base segment is
+    encoded once, however many clips it appears in.
+    """
+    boundaries = sorted({t for info in clip_times for t in (info['clip_start'], info['clip_end'])})
+    origin, end = boundaries[0], boundaries[-1]
+    split_times = [b - origin for b in boundaries[1:-1]]  # Relative to the -ss origin
+    
+    segments_dir = clips_dir / ".base_segments"
+    shutil.rmtree(segments_dir, ignore_errors=True)
+    segments_dir.mkdir(parents=True)
+    
+    if PROXY_PROFILE:
+        codec_args = encode_args(PROXY_PROFILE, keyframe_times=split_times)
+    else:
+        codec_args = ['-c:v', 'libx264', '-preset', 'veryfast', '-crf', '23',
+                      '-force_key_frames', ','.join(str(t) for t in split_times),
+                      '-c:a', 'aac', '-b:a', '128k']
+    
+    # 1. One decode/encode pass → base_0000.ts, base_0001.ts, ... (MPEG-TS concatenates cleanly)
+    print(f"⚡ Encoding {len(boundaries) - 1} base segments in one ffmpeg pass...")
+    encode_start = time.time()
+    cmd = [
+        'ffmpeg',
+        '-ss', str(origin),
+        '-i', str(video_path),
+        '-t', str(end - origin),
+        *codec_args,
+        '-f', 'segment',
+        '-segment_times', ','.join(str(t) for t in split_times),
+        '-segment_format', 'mpegts',
+        '-reset_timestamps', '1',
+        '-y',
+        str(segments_dir / 'base_%04d.ts')
+    ]
+    subprocess.run(cmd, capture_output=True, text=True, check=True)
+    
+    segment_files = sorted(segments_dir.glob('base_*.ts'))
+    if len(segment_files) != len(boundaries) - 1:
+        raise RuntimeError(f"expected {len(boundaries) - 1} base segments, got {len(segment_files)}")
+    print(f"✅ Base segments encoded in {time.time() - encode_start:.1f} seconds")
+    
+    # Segment i covers [boundaries[i], boundaries[i + 1])
+    first_segment = {b: i for i, b in enumerate(boundaries)}
+    
+    def assemble_clip(clip_info):
+        """Stream-copy one overlapping clip from its base segments"""
+        clip_name = clip_filename(clip_info['clip_start'], clip_info['clip_end'])
+        list_file = segments_dir / f"{Path(clip_name).stem}.txt"
+        parts = range(first_segment[clip_info['clip_start']], first_segment[clip_info['clip_end']])
+        list_file.write_text(''.join(f"file '{segment_files[i].name}'\n" for i in parts))
+        
+        cmd = [
+            'ffmpeg',
+            '-f', 'concat',
+            '-safe', '0',
+            '-i', str(list_file),
+            '-c', 'copy',
+            '-bsf:a', 'aac_adtstoasc',
+            '-movflags', '+faststart',
+            '-y',
+            str(clips_dir / clip_name)
+        ]
+        subprocess.run(cmd, capture_output=True, text=True, check=True)
+        return clip_name
+    
+    # 2. Stream copy only - cheap, so plenty of parallel workers
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        futures = [executor.submit(assemble_clip, info) for info in clip_times]
+        
+        completed = 0
+        for future in as_completed(futures):
+            future.result()
+            completed += 1
+            if completed % 20 == 0:
+                print(f"📊 Progress: {completed}/{len(clip_times)} clips assembled")
+    
+    shutil.rmtree(segments_dir, ignore_errors=True)
+
 def generate_overlapping_clips(video_path, clips_dir, video_duration, game_start=0, game_end=None):
     """
     Generate 30s clips with 5s overlap using GPU
@@ -72,6 +179,9 @@ def generate_overlapping_clips(video_path, clips_dir, video_duration, game_start
     existing = list(clips_dir.glob('clip_*m*s-*m*s.mp4'))
     if existing:
         print(f"✅ Found {len(existing)} existing clips - skipping generation")
+        existing_profile = read_profile(clips_dir)
+        if existing_profile.get('name') != (PROXY_PROFILE or {}).get('name', 'source'):
+            print(f"⚠️  Existing clips were encoded as '{existing_profile.get('name')}' - delete {clips_dir.name}/ to re-encode")
         return len(existing)
     
     # Calculate all clip times starting from game start
@@ -98,6 +208,7 @@ def generate_overlapping_clips(video_path, clips_dir, video_duration, game_start
         current_time += CLIP_INTERVAL
     
     print(f"📊 Creating {len(clip_times)} clips (30s content + 10s overlap each)")
+    print(f"🎞️  Encoding: {describe(PROXY_PROFILE)}")
     
     def create_clip(clip_info):
         """Create single clip with GPU"""
@@ -106,17 +217,25 @@ def generate_overlapping_clips(video_path, clips_dir, video_duration, game_start
         clip_start = clip_info['clip_start']
         clip_end = clip_info['clip_end']
         
-        # Name shows ACTUAL clip time (with overlap): clip_010m55s-011m35s.mp4
-        start_min = clip_start // 60
-        start_sec = clip_start % 60
-        end_min = clip_end // 60
-        end_sec = clip_end % 60
-        
-        clip_name = f"clip_{start_min:03d}m{start_sec:02d}s-{end_min:03d}m{end_sec:02d}s.mp4"
+        clip_name = clip_filename(clip_start, clip_end)
         output_path = clips_dir / clip_name
         
         duration = clip_end - clip_start
         
+        if PROXY_PROFILE:
+            # Proxy: small CPU encode (scale + fps + GOP + mono audio in one pass)
+            cmd = [
+                'ffmpeg',
+                '-ss', str(clip_start),
+                '-i', str(video_path),
+                '-t', str(duration),
+                *encode_args(PROXY_PROFILE),
+                '-y',
+                str(output_path)
+            ]
+            subprocess.run(cmd, capture_output=True, text=True, check=True)
+            return clip_name
+        
         try:
             cmd = [
                 'ffmpeg',
@@ -149,24 +268,38 @@ def generate_overlapping_clips(video_path, clips_dir, video_duration, game_start
             subprocess.run(cmd_cpu, capture_output=True, text=True, check=True)
             return clip_name
     
-    # Generate clips in parallel
-    print("⚡ Generating clips in parallel with GPU...")
     start_time = time.time()
+    engine = ARGS.engine
     
-    with ThreadPoolExecutor(max_workers=8) as executor:
-        futures = [executor.submit(create_clip, info) for info in clip_times]
+    if engine == 'segments':
+        try:
+            generate_clips_from_base_segments(video_path, clips_dir, clip_times)
+        except (subprocess.CalledProcessError, RuntimeError) as e:
+            error = e.stderr[-300:] if getattr(e, 'stderr', None) else str(e)
+            print(f"⚠️  Segment engine failed ({error}) - falling back to per-clip encodes")
+            engine = 'per-clip'
+    
+    if engine == 'per-clip':
+        # Generate clips in parallel
+        print("⚡ Generating clips in parallel with GPU...")
         
-        completed = 0
-        for future in as_completed(futures):
-            future.result()
-            completed += 1
-            if completed % 20 == 0:
-                print(f"📊 Progress: {completed}/{len(clip_times)} clips")
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            futures = [executor.submit(create_clip, info) for info in clip_times]
+            
+            completed = 0
+            for future in as_completed(futures):
+                future.result()
+                completed += 1
+                if completed % 20 == 0:
+                    print(f"📊 Progress: {completed}/{len(clip_times)} clips")
     
     elapsed = time.time() - start_time
     clips = sorted(clips_dir.glob('clip_*m*s-*m*s.mp4'))
+    write_profile(clips_dir, PROXY_PROFILE)
     
+    total_mb = sum(c.stat().st_size for c in clips) / 1_000_000
     print(f"✅ Created {len(clips)} clips in {elapsed:.1f} seconds ({len(clips)/elapsed:.1f} clips/sec)")
+    print(f"📦 {total_mb:.1f} MB total, {total_mb / max(1, len(clips)):.2f} MB per clip")
     print(f"📁 Saved to: {clips_dir}")
     
     return len(clips)
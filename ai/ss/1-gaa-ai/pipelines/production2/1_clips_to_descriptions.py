@@ -17,6 +17,7 @@ from datetime import datetime
 
 import google.generativeai as genai
 from dotenv import load_dotenv
+from proxy_encoding import read_profile
 
 # Load environment
 load_dotenv('/home/ubuntu/clann/CLANNAI/.env')
@@ -371,6 +372,10 @@ def analyze_clips():
     
     total_cost = input_cost + output_cost
     
+    # Upload size per clip (compare proxy profiles against source quality)
+    video_clips = all_clips
+    upload_bytes = sum(c.stat().st_size for c in video_clips)
+    
     # Save usage stats
     usage_stats = {
         'stage': 'stage_1_clip_descriptions',
@@ -378,6 +383,12 @@ def analyze_clips():
         'test_type': 'audio_and_visual',
         'clip_format': '30s_content_with_5s_overlap',
         'clips_analyzed': len(results),
+        'upload': {
+            'encoding': read_profile(INPUT_DIR),
+            'video_clips': len(video_clips),
+            'bytes_total': upload_bytes,
+            'bytes_per_clip': upload_bytes // len(video_clips) if video_clips else 0
+        },
         'api_calls': len(results),
         'tokens': {
             'prompt_tokens': total_prompt,
@@ -18,6 +18,7 @@ from collections import defaultdict
 parser = argparse.ArgumentParser()
 parser.add_argument('--game', required=True, help='Game name (folder in games/)')
 parser.add_argument('--time-range', help='Time range to filter professional events (e.g., "660-960" for 11:00-16:00)', default=None)
+parser.add_argument('--baseline-run', help='Run folder to compare F1 and upload size against (e.g. a source-quality run)')
 ARGS = parser.parse_args()
 
 # Setup paths
@@ -311,6 +312,10 @@ def generate_timeline(matches, overall_metrics, total_ai, total_pro, output_dir,
         total_input_tokens += tokens_in
         total_output_tokens += tokens_out
         lines.append(f"Stage 1 (Clip Descriptions):  ${cost:.4f}  ({tokens_in:,} in / {tokens_out:,} out)")
+        if stage1.get('upload'):
+            upload = stage1['upload']
+            lines.append(f"   Upload: {upload['bytes_per_clip'] / 1_000_000:.2f} MB per clip, "
+                         f"{upload['bytes_total'] / 1_000_000:.1f} MB total ({upload['encoding'].get('name', 'source')} encoding)")
     
     # Stage 2
     stage2_file = output_dir / "usage_stats_stage2.json"
@@ -455,6 +460,37 @@ def generate_timeline(matches, overall_metrics, total_ai, total_pro, output_dir,
     return "\n".join(lines)
 
 
+def input_encoding_summary(output_dir: Path, f1: float) -> dict:
+    """Clip encoding and upload size of a run, with F1/size deltas against --baseline-run"""
+    stage1_file = output_dir / "usage_stats_stage1.json"
+    if not stage1_file.exists():
+        return {}
+    with open(stage1_file, 'r') as f:
+        upload = json.load(f).get('upload')
+    if not upload:
+        return {}
+    
+    summary = {
+        'encoding': upload['encoding'],
+        'bytes_per_clip': upload['bytes_per_clip'],
+        'bytes_total': upload['bytes_total']
+    }
+    if ARGS.baseline_run:
+        baseline_dir = GAME_ROOT / "outputs" / ARGS.baseline_run
+        baseline_metrics = baseline_dir / OUT_FILE.name
+        if baseline_metrics.exists():
+            with open(baseline_metrics, 'r') as f:
+                baseline = json.load(f)
+            baseline_f1 = baseline['micro']['f1']
+            summary.update({'baseline_run': ARGS.baseline_run, 'baseline_f1': baseline_f1,
+                            'f1_delta': round(f1 - baseline_f1, 4)})
+            baseline_bytes = baseline.get('input_encoding', {}).get('bytes_per_clip')
+            if baseline_bytes:
+                summary['bytes_ratio'] = round(upload['bytes_per_clip'] / baseline_bytes, 3)
+        else:
+            print(f"⚠️  Baseline metrics not found: {baseline_metrics}")
+    return summary
+
 def main():
     """Main comparison pipeline"""
     
@@ -526,6 +562,11 @@ def main():
         }
     }
     
+    # Clip encoding / upload size (and accuracy delta vs a baseline run)
+    input_encoding = input_encoding_summary(OUTPUT_DIR, overall_metrics['f1'])
+    if input_encoding:
+        output['input_encoding'] = input_encoding
+    
     # Save metrics
     OUT_FILE.parent.mkdir(exist_ok=True)
     with open(OUT_FILE, 'w') as f:
@@ -543,6 +584,12 @@ def main():
     print(f"   True Positives: {overall_metrics['TP']}")
     print(f"   False Positives: {overall_metrics['FP']}")
     print(f"   False Negatives: {overall_metrics['FN']}")
+    if input_encoding:
+        print(f"   Upload: {input_encoding['bytes_per_clip'] / 1_000_000:.2f} MB per clip "
+              f"({input_encoding['encoding'].get('name', 'source')} encoding)")
+    if 'f1_delta' in input_encoding:
+        ratio = f", {input_encoding['bytes_ratio']:.2f}× the bytes" if 'bytes_ratio' in input_encoding else ""
+        print(f"   vs {input_encoding['baseline_run']}: F1 {input_encoding['f1_delta']:+.1%}{ratio}")
     print()
     print(f"✅ Saved metrics: {OUT_FILE.name}")
     print(f"✅ Saved timeline: {TIMELINE_FILE.name}")
@@ -1,12 +1,42 @@
 #!/usr/bin/env python3
 """
 Create Hero Video - Combine multiple videos into a single hero video for the landing page
+
+Build modes (--mode):
+  cached       (default) each source is normalized and encoded straight to the
+               final web settings in parallel (one ffmpeg per core), cached by
+               source hash + encoding params, then joined with a stream copy.
+               Every frame is encoded once; unchanged sources are skipped.
+  single-pass  one ffmpeg run: a filter graph normalizes every source and
+               concatenates them, encoded once. No cache.
+  legacy       the original path: transcode each source one after another,
+               concat, then re-encode the whole video for the web.
 """
 
+import argparse
+import hashlib
+import json
 import os
 import subprocess
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 import sys
+import time
+
+# Final web encoding - every build mode except legacy encodes with exactly these settings
+WEB_ENCODING = {
+    'width': 1920,
+    'height': 1080,
+    'fps': 30,
+    'crf': 28,  # More compression for web
+    'preset': 'slow',  # Better compression
+    'profile': 'main',
+    'level': '4.0',
+    'gop': 60,  # Keyframe every 2s (clean joins, seekable)
+    'audio_bitrate': '128k',
+    'sample_rate': 44100,
+}
+CACHE_VERSION = 1  # Bump to invalidate cached clips when the encode command changes
 
 def get_video_files(source_dir):
     """Get all video files from source directory"""
@@ -44,6 +74,169 @@ def get_video_files(source_dir):
     return priority_videos + other_videos
 
 
+def probe(video_file):
+    """(has_audio, duration_seconds) via ffprobe"""
+    cmd = [
+        'ffprobe', '-v', 'error',
+        '-show_entries', 'stream=codec_type:format=duration',
+        '-of', 'json',
+        str(video_file)
+    ]
+    info = json.loads(subprocess.run(cmd, check=True, capture_output=True).stdout)
+    has_audio = any(stream.get('codec_type') == 'audio' for stream in info.get('streams', []))
+    return has_audio, float(info.get('format', {}).get('duration') or 0)
+
+
+def video_filter(enc):
+    """Normalize any source to the target size / fps / pixel format (letterboxed, never stretched)"""
+    w, h = enc['width'], enc['height']
+    return (f"fps={enc['fps']},scale={w}:{h}:force_original_aspect_ratio=decrease,"
+            f"pad={w}:{h}:(ow-iw)/2:(oh-ih)/2,setsar=1,format=yuv420p")
+
+
+def audio_filter(enc):
+    return f"aresample={enc['sample_rate']},aformat=sample_fmts=fltp:channel_layouts=stereo"
+
+
+def silence_source(enc, duration):
+    """Silent stereo track for sources without audio (concat needs audio on every segment)"""
+    return f"anullsrc=r={enc['sample_rate']}:cl=stereo,atrim=duration={duration:.3f}"
+
+
+def web_encode_args(enc, threads=0):
+    return [
+        '-c:v', 'libx264',
+        '-crf', str(enc['crf']),
+        '-preset', enc['preset'],
+        '-profile:v', enc['profile'],
+        '-level', enc['level'],
+        '-pix_fmt', 'yuv420p',
+        '-g', str(enc['gop']),
+        '-threads', str(threads),
+        '-c:a', 'aac',
+        '-b:a', enc['audio_bitrate'],
+        '-ar', str(enc['sample_rate']),
+        '-ac', '2',
+    ]
+
+
+def file_sha256(video_file, hash_index):
+    """Content hash, reused from hash_index while size and mtime are unchanged"""
+    stat = video_file.stat()
+    entry = hash_index.get(str(video_file))
+    if entry and entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns:
+        return entry['sha256']
+    digest = hashlib.sha256()
+    with open(video_file, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    hash_index[str(video_file)] = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'sha256': digest.hexdigest()}
+    return digest.hexdigest()
+
+
+def cache_key(source_sha, enc):
+    """Cache file name for one source under one encoding"""
+    params = json.dumps({'encoding': enc, 'vf': video_filter(enc), 'af': audio_filter(enc), 'version': CACHE_VERSION},
+                        sort_keys=True)
+    return hashlib.sha256(f"{source_sha}\n{params}".encode()).hexdigest()[:24]
+
+
+def encode_clip(input_file, output_file, enc, threads):
+    """Normalize + encode one source to the final web settings (runs in a worker process)"""
+    has_audio, duration = probe(input_file)
+    cmd = ['ffmpeg', '-i', str(input_file)]
+    if has_audio:
+        cmd += ['-filter_complex', f"[0:v]{video_filter(enc)}[v];[0:a]{audio_filter(enc)}[a]"]
+    else:
+        cmd += ['-filter_complex', f"[0:v]{video_filter(enc)}[v];{silence_source(enc, duration)}[a]"]
+    tmp_file = output_file.with_suffix('.tmp.mp4')
+    cmd += ['-map', '[v]', '-map', '[a]'] + web_encode_args(enc, threads) + [
+        '-video_track_timescale', '15360',  # Same timebase in every clip for the stream-copy concat
+        '-y',
+        str(tmp_file)
+    ]
+    subprocess.run(cmd, check=True, capture_output=True)
+    os.replace(tmp_file, output_file)
+    return output_file
+
+
+def build_cached(video_files, cache_dir, output_file, jobs=None, enc=WEB_ENCODING):
+    """Parallel cached per-source encodes, joined without re-encoding"""
+    cache_dir.mkdir(exist_ok=True)
+    index_file = cache_dir / 'hashes.json'
+    hash_index = json.loads(index_file.read_text()) if index_file.exists() else {}
+
+    print(f"\n📝 Step 1: Hashing sources...")
+    clips = [cache_dir / f"{cache_key(file_sha256(vf, hash_index), enc)}.mp4" for vf in video_files]
+    index_file.write_text(json.dumps(hash_index, indent=2))
+
+    pending = [(vf, clip) for vf, clip in zip(video_files, clips) if not clip.exists()]
+    reused = len(video_files) - len(pending)
+    cores = os.cpu_count() or 1
+    jobs = max(1, min(jobs or cores, len(pending) or 1))
+    threads = max(1, cores // jobs)  # x264 threads per clip so the pool fills the cores without oversubscribing
+
+    print(f"\n📝 Step 2: Encoding {len(pending)} source(s) ({reused} cached) "
+          f"with {jobs} worker(s) x {threads} thread(s)...")
+    if pending:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            futures = {executor.submit(encode_clip, vf, clip, enc, threads): vf for vf, clip in pending}
+            for future in as_completed(futures):
+                future.result()
+                print(f"  Encoded: {futures[future].name}")
+    print(f"✅ Encoding complete")
+
+    concat_list_file = cache_dir / 'concat_list.txt'
+    with open(concat_list_file, 'w') as f:
+        for clip in clips:
+            f.write(f"file '{clip.absolute()}'\n")
+
+    print(f"\n🔗 Joining {len(clips)} clips (stream copy)...")
+    tmp_output = output_file.with_suffix('.tmp.mp4')
+    cmd = [
+        'ffmpeg',
+        '-f', 'concat',
+        '-safe', '0',
+        '-i', str(concat_list_file),
+        '-c', 'copy',
+        '-movflags', '+faststart',  # Enable streaming
+        '-y',
+        str(tmp_output)
+    ]
+    subprocess.run(cmd, check=True, capture_output=True)
+    os.replace(tmp_output, output_file)
+
+    # Drop cached clips no longer used by any source
+    keep = {clip.name for clip in clips}
+    for stale in cache_dir.glob('*.mp4'):
+        if stale.name not in keep:
+            stale.unlink()
+
+
+def build_single_pass(video_files, output_file, enc=WEB_ENCODING):
+    """One ffmpeg run: normalize + concat in a filter graph, encoded once"""
+    cmd = ['ffmpeg']
+    for vf in video_files:
+        cmd += ['-i', str(vf)]
+    graph = []
+    for i, vf in enumerate(video_files):
+        has_audio, duration = probe(vf)
+        graph.append(f"[{i}:v]{video_filter(enc)}[v{i}]")
+        graph.append(f"[{i}:a]{audio_filter(enc)}[a{i}]" if has_audio else f"{silence_source(enc, duration)}[a{i}]")
+    joined = ''.join(f"[v{i}][a{i}]" for i in range(len(video_files)))
+    graph.append(f"{joined}concat=n={len(video_files)}:v=1:a=1[v][a]")
+
+    tmp_output = output_file.with_suffix('.tmp.mp4')
+    cmd += ['-filter_complex', ';'.join(graph), '-map', '[v]', '-map', '[a]'] + web_encode_args(enc) + [
+        '-movflags', '+faststart',
+        '-y',
+        str(tmp_output)
+    ]
+    print(f"\n🎬 Normalizing, joining and encoding {len(video_files)} video(s) in one pass...")
+    subprocess.run(cmd, check=True, capture_output=True)
+    os.replace(tmp_output, output_file)
+
+
 def transcode_to_common_format(input_file, output_file, fps=30):
     """Transcode video to common format (h264, 30fps)"""
     cmd = [
@@ -102,7 +295,49 @@ def optimize_for_web(input_file, output_file):
     subprocess.run(cmd, check=True, capture_output=True)
 
 
+def build_legacy(video_files, cache_dir, output_file):
+    """Original path: sequential transcode, concat, full web re-encode"""
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    
+    # Step 1: Transcode all videos to common format
+    print(f"\n📝 Step 1: Transcoding to common format (30fps, h264)...")
+    transcoded_files = []
+    
+    for i, video_file in enumerate(video_files):
+        transcoded_file = cache_dir / f"transcoded_{i}.mp4"
+        transcode_to_common_format(video_file, transcoded_file)
+        transcoded_files.append(transcoded_file)
+    
+    print(f"✅ Transcoding complete")
+    
+    # Step 2: Create concat list
+    concat_list_file = cache_dir / 'concat_list.txt'
+    with open(concat_list_file, 'w') as f:
+        for tf in transcoded_files:
+            f.write(f"file '{tf.absolute()}'\n")
+    
+    # Step 3: Concatenate videos
+    temp_output = cache_dir / 'concatenated.mp4'
+    concatenate_videos(concat_list_file, temp_output)
+    print(f"✅ Concatenation complete")
+    
+    # Step 4: Optimize for web
+    optimize_for_web(temp_output, output_file)
+    print(f"✅ Optimization complete")
+    
+    # Cleanup cache
+    print(f"🧹 Cleaning up cache...")
+    import shutil
+    shutil.rmtree(cache_dir)
+
+
 def main():
+    parser = argparse.ArgumentParser(description='Combine hero-video-source/ into the landing page hero video')
+    parser.add_argument('--mode', choices=['cached', 'single-pass', 'legacy'], default='cached',
+                        help='Build mode (default: cached)')
+    parser.add_argument('--jobs', type=int, help='Parallel encodes in cached mode (default: CPU cores)')
+    args = parser.parse_args()
+    
     # Paths
     script_dir = Path(__file__).parent
     source_dir = script_dir / 'hero-video-source'
@@ -113,6 +348,7 @@ def main():
     print(f"=" * 60)
     print(f"Source directory: {source_dir}")
     print(f"Output file: {output_file}")
+    print(f"Mode: {args.mode}")
     print(f"=" * 60 + "\n")
     
     # Check if source directory exists
@@ -135,49 +371,23 @@ def main():
         size_mb = vf.stat().st_size / (1024 * 1024)
         print(f"  - {vf.name} ({size_mb:.1f} MB)")
     
-    # Create cache directory
-    cache_dir.mkdir(exist_ok=True)
-    
-    # Step 1: Transcode all videos to common format
-    print(f"\n📝 Step 1: Transcoding to common format (30fps, h264)...")
-    transcoded_files = []
-    
-    for i, video_file in enumerate(video_files):
-        transcoded_file = cache_dir / f"transcoded_{i}.mp4"
-        transcode_to_common_format(video_file, transcoded_file)
-        transcoded_files.append(transcoded_file)
-    
-    print(f"✅ Transcoding complete")
-    
-    # Step 2: Create concat list
-    concat_list_file = cache_dir / 'concat_list.txt'
-    with open(concat_list_file, 'w') as f:
-        for tf in transcoded_files:
-            f.write(f"file '{tf.absolute()}'\n")
-    
-    # Step 3: Concatenate videos
-    temp_output = cache_dir / 'concatenated.mp4'
-    concatenate_videos(concat_list_file, temp_output)
-    print(f"✅ Concatenation complete")
-    
-    # Step 4: Optimize for web
-    optimize_for_web(temp_output, output_file)
+    start_time = time.time()
+    if args.mode == 'cached':
+        build_cached(video_files, cache_dir, output_file, jobs=args.jobs)
+    elif args.mode == 'single-pass':
+        build_single_pass(video_files, output_file)
+    else:
+        build_legacy(video_files, cache_dir / 'legacy', output_file)
     
     # Get final file size
     final_size_mb = output_file.stat().st_size / (1024 * 1024)
-    print(f"✅ Optimization complete")
     
     print(f"\n{'=' * 60}")
     print(f"✨ SUCCESS! Hero video created:")
     print(f"   {output_file}")
     print(f"   Size: {final_size_mb:.1f} MB")
+    print(f"   Built in {time.time() - start_time:.1f}s")
     print(f"{'=' * 60}\n")
-    
-    # Cleanup cache
-    print(f"🧹 Cleaning up cache...")
-    import shutil
-    shutil.rmtree(cache_dir)
-    print(f"✅ Done!\n")
 
 
 if __name__ == '__main__':
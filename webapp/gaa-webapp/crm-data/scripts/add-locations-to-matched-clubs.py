@@ -7,6 +7,10 @@ import csv
 import sys
 from pathlib import Path
 
+from club_locations import ClubLocations
+from club_matcher import ClubMatcher
+from club_store import ClubStore
+
 # Fix Windows console encoding
 if sys.platform == 'win32':
     sys.stdout.reconfigure(encoding='utf-8')
@@ -17,6 +21,9 @@ DATA_DIR = SCRIPT_DIR.parent / 'veo'
 MATCHED_CSV = DATA_DIR / 'irish_veo_clubs_matched.csv'
 REFERENCE_CSV = DATA_DIR / 'clubs_not_using_veo.csv'
 OUTPUT_CSV = DATA_DIR / 'irish_veo_clubs_matched_with_locations.csv'
+STORE_PATH = DATA_DIR / 'club_store.sqlite'  # Indexed SQLite mirror of the CSVs (club_store.py)
+LOCATIONS_NPZ = DATA_DIR / 'club_locations.npz'  # Lat/long arrays for find-nearby-clubs.py
+FUZZY_SCORE = 90  # Minimum club_matcher score for a 'Fuzzy' location match
 
 
 def normalize_name(name: str) -> str:
@@ -30,23 +37,24 @@ def normalize_name(name: str) -> str:
     return name.strip()
 
 
-def load_reference_clubs():
+REFERENCE_COLUMNS = ['Club Name', 'County', 'Province', 'Country', 'Latitude', 'Longitude']
+
+
+def load_reference_clubs(store: ClubStore):
     """Load reference clubs with location data"""
     clubs = {}
-    with open(REFERENCE_CSV, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            club_name = row.get('Club Name', '').strip()
-            if club_name:
-                normalized = normalize_name(club_name)
-                clubs[normalized] = {
-                    'original_name': club_name,
-                    'county': row.get('County', ''),
-                    'province': row.get('Province', ''),
-                    'country': row.get('Country', ''),
-                    'latitude': row.get('Latitude', ''),
-                    'longitude': row.get('Longitude', ''),
-                }
+    for row in store.rows(REFERENCE_CSV, columns=REFERENCE_COLUMNS):
+        club_name = row.get('Club Name', '').strip()
+        if club_name:
+            normalized = normalize_name(club_name)
+            clubs[normalized] = {
+                'original_name': club_name,
+                'county': row.get('County', ''),
+                'province': row.get('Province', ''),
+                'country': row.get('Country', ''),
+                'latitude': row.get('Latitude', ''),
+                'longitude': row.get('Longitude', ''),
+            }
     return clubs
 
 
@@ -54,19 +62,19 @@ def match_clubs():
     """Match clubs and add location data"""
     # Load reference clubs
     print("Loading reference clubs with location data...")
-    reference_clubs = load_reference_clubs()
+    store = ClubStore(STORE_PATH)
+    reference_clubs = load_reference_clubs(store)
     print(f"✅ Loaded {len(reference_clubs)} reference clubs")
+    matcher = ClubMatcher.from_rows(store.rows(REFERENCE_CSV, columns=REFERENCE_COLUMNS))
     
     # Load matched clubs
     print("\nLoading matched clubs...")
     matched_clubs = []
-    with open(MATCHED_CSV, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            matched_clubs.append({
-                'name': row['Club Name'].strip(),
-                'videos': row['Number of Videos'].strip()
-            })
+    for row in store.rows(MATCHED_CSV, columns=['Club Name', 'Number of Videos']):
+        matched_clubs.append({
+            'name': row['Club Name'].strip(),
+            'videos': row['Number of Videos'].strip()
+        })
     print(f"✅ Loaded {len(matched_clubs)} matched clubs")
     
     # Match and add location data
@@ -90,32 +98,28 @@ def match_clubs():
                 'Country': ref['country'],
                 'Latitude': ref['latitude'],
                 'Longitude': ref['longitude'],
+                'Reference Club': ref['original_name'],
                 'Matched': 'Yes'
             })
             matched_count += 1
         else:
-            # Try fuzzy matching - check if any part matches
+            # Fuzzy match through the trigram index (club_matcher.py)
             matched = False
-            for ref_normalized, ref_data in reference_clubs.items():
-                # Check if normalized names overlap significantly
-                if normalized in ref_normalized or ref_normalized in normalized:
-                    # Check if they share significant words
-                    normalized_words = set(normalized.split())
-                    ref_words = set(ref_normalized.split())
-                    if len(normalized_words & ref_words) >= 2:  # At least 2 words match
-                        results.append({
-                            'Club Name': club_name,
-                            'Number of Videos': club['videos'],
-                            'County': ref_data['county'],
-                            'Province': ref_data['province'],
-                            'Country': ref_data['country'],
-                            'Latitude': ref_data['latitude'],
-                            'Longitude': ref_data['longitude'],
-                            'Matched': 'Fuzzy'
-                        })
-                        matched_count += 1
-                        matched = True
-                        break
+            ref_data, match_score = matcher.best_match(club_name)
+            if ref_data and match_score >= FUZZY_SCORE:
+                results.append({
+                    'Club Name': club_name,
+                    'Number of Videos': club['videos'],
+                    'County': ref_data['county'],
+                    'Province': ref_data['province'],
+                    'Country': ref_data['country'],
+                    'Latitude': ref_data['latitude'],
+                    'Longitude': ref_data['longitude'],
+                    'Reference Club': ref_data['name'],
+                    'Matched': 'Fuzzy'
+                })
+                matched_count += 1
+                matched = True
             
             if not matched:
                 results.append({
@@ -126,6 +130,7 @@ def match_clubs():
                     'Country': 'Ireland',  # Assume Ireland since they're GAA clubs
                     'Latitude': '',
                     'Longitude': '',
+                    'Reference Club': '',
                     'Matched': 'No'
                 })
                 unmatched_count += 1
@@ -137,13 +142,22 @@ def match_clubs():
     
     with open(OUTPUT_CSV, 'w', newline='', encoding='utf-8') as f:
         fieldnames = ['Club Name', 'Number of Videos', 'County', 'Province', 'Country', 
-                     'Latitude', 'Longitude', 'Matched']
+                     'Latitude', 'Longitude', 'Reference Club', 'Matched']
         writer = csv.DictWriter(f, fieldnames=fieldnames)
         writer.writeheader()
         writer.writerows(results)
     
     print(f"\n✅ Saved {len(results)} clubs to: {OUTPUT_CSV}")
     
+    # Binary location arrays (reference + VEO clubs) for radius / nearest queries;
+    # each VEO club replaces the reference club it was located from
+    locations = ClubLocations.from_rows(
+        store.rows(REFERENCE_CSV, columns=REFERENCE_COLUMNS + ['Uses VEO', 'VEO Recordings']),
+        store.rows(OUTPUT_CSV, columns=REFERENCE_COLUMNS + ['Number of Videos', 'Reference Club']),
+    )
+    locations.save(LOCATIONS_NPZ)
+    print(f"✅ Saved {len(locations)} club locations to: {LOCATIONS_NPZ}")
+    
     # Show summary by province
     print("\n📍 Summary by Province:")
     province_counts = {}
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Per-batch result ledger for the Gemini club matchers
+
+Every LLM batch is keyed by a hash of (model, prompt). When a batch
+finishes, its parsed result is written to {ledger_dir}/{key}.json (atomically).
+A batch whose output was truncated is recorded as 'split' (answered by its
+sub-batches); a failed batch is recorded with status 'failed' and its error. A re-run
+reuses every completed batch and only calls the API for missing or failed
+ones, so a crash or quota error part-way through costs nothing already done.
+
+Usage:
+    ledger = BatchLedger(SCRIPT_DIR / '.match-ledger')
+    key = ledger.key(prompt, model_name)
+    matches = ledger.get(key)
+    if matches is None:
+        matches = call_api(...)
+        ledger.put(key, matches, label='3', size=len(batch))
+"""
+
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+class BatchLedger:
+    """Directory of completed / failed batch results keyed by content hash"""
+
+    def __init__(self, ledger_dir: Path):
+        self.dir = Path(ledger_dir)
+        self.dir.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def key(prompt: str, model_name: str = '') -> str:
+        return hashlib.sha256(f"{model_name}\n{prompt}".encode('utf-8')).hexdigest()[:24]
+
+    def _path(self, key: str) -> Path:
+        return self.dir / f"{key}.json"
+
+    def _read(self, key: str) -> Optional[Dict]:
+        try:
+            with open(self._path(key), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write(self, key: str, entry: Dict):
+        tmp = self._path(key).with_suffix('.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(entry, f, ensure_ascii=False)
+        os.replace(tmp, self._path(key))
+
+    def get(self, key: str) -> Optional[List[Dict]]:
+        """Result of a completed batch, or None if it has not completed"""
+        entry = self._read(key)
+        if entry and entry.get('status') == 'done':
+            return entry.get('result', [])
+        return None
+
+    def put(self, key: str, result: List[Dict], **meta):
+        self._write(key, {'status': 'done', 'result': result, 'completed_at': time.time(), **meta})
+
+    def mark_split(self, key: str, reason: str, **meta):
+        """Batch is answered by its sub-batches; re-runs go straight to them"""
+        self._write(key, {'status': 'split', 'reason': reason, 'split_at': time.time(), **meta})
+
+    def is_split(self, key: str) -> bool:
+        entry = self._read(key)
+        return bool(entry and entry.get('status') == 'split')
+
+    def mark_failed(self, key: str, error: str, **meta):
+        self._write(key, {'status': 'failed', 'error': error, 'failed_at': time.time(), **meta})
+
+    def summary(self) -> Dict[str, int]:
+        """{'done': n, 'split': n, 'failed': n} over every batch ever recorded"""
+        counts = {'done': 0, 'split': 0, 'failed': 0}
+        for path in self.dir.glob('*.json'):
+            entry = self._read(path.stem)
+            if entry and entry.get('status') in counts:
+                counts[entry['status']] += 1
+        return counts
@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+Club locations as NumPy arrays with a spatial index
+
+Loads the reference GAA clubs (clubs_not_using_veo.csv) and the VEO-using
+matched clubs (irish_veo_clubs_matched_with_locations.csv) into parallel
+arrays - latitude / longitude in degrees plus name, county, province,
+uses_veo and video count; a VEO club replaces the reference club it was
+located from, so customers never show up as prospects - and answers:
+  within(lat, lon, radius_km)  - every club inside a radius, nearest first
+  nearest(lat, lon, k)         - k nearest clubs
+Both take uses_veo=True/False to restrict to VEO users / prospects.
+
+Index: a scipy cKDTree over unit-sphere xyz vectors (chord distance is
+monotonic in great-circle distance, so the tree is exact) when scipy is
+installed; otherwise clubs sorted by latitude, where a radius query only scans
+the latitude band it can touch. Distances are always vectorized haversine.
+
+save() / load() keep a compact binary artifact (.npz, or .parquet when
+pandas + pyarrow are installed) so tools don't re-parse the CSVs.
+
+Usage:
+    locations = ClubLocations.from_csvs(REFERENCE_CSV, MATCHED_LOCATIONS_CSV)
+    idx, km = locations.within(53.35, -6.26, 25, uses_veo=False)  # Prospects near Dublin
+    locations.rows(idx, km)
+    locations.save(DATA_DIR / 'club_locations.npz')
+"""
+
+import csv
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from club_matcher import normalize_name
+
+try:
+    from scipy.spatial import cKDTree
+    HAS_SCIPY = True
+except ImportError:
+    HAS_SCIPY = False  # pip install scipy (latitude-band scan fallback, same results)
+
+try:
+    import pandas as pd
+    import pyarrow  # noqa: F401 - parquet engine for pandas
+    HAS_PARQUET = True
+except ImportError:
+    HAS_PARQUET = False  # pip install pandas pyarrow (.npz export still works)
+
+EARTH_RADIUS_KM = 6371.0088
+FIELDS = ('name', 'county', 'province', 'country', 'latitude', 'longitude', 'uses_veo', 'videos')
+
+
+def haversine_km(lat: float, lon: float, lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+    """Great-circle distance in km from one point to arrays of points (degrees)"""
+    lat1, lon1 = np.radians(lat), np.radians(lon)
+    lat2, lon2 = np.radians(lats), np.radians(lons)
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def unit_vectors(lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+    lat, lon = np.radians(lats), np.radians(lons)
+    return np.column_stack((np.cos(lat) * np.cos(lon), np.cos(lat) * np.sin(lon), np.sin(lat)))
+
+
+def _float(value) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return float('nan')
+
+
+def _int(value) -> int:
+    try:
+        return int(float(value))
+    except (TypeError, ValueError):
+        return 0
+
+
+class _Index:
+    """Spatial index over one subset of clubs (positions into the full arrays)"""
+
+    def __init__(self, positions: np.ndarray, lats: np.ndarray, lons: np.ndarray):
+        self.positions = positions
+        self.lats = lats[positions]
+        self.lons = lons[positions]
+        if HAS_SCIPY:
+            self.tree = cKDTree(unit_vectors(self.lats, self.lons)) if len(positions) else None
+        else:
+            order = np.argsort(self.lats, kind='stable')
+            self.positions, self.lats, self.lons = self.positions[order], self.lats[order], self.lons[order]
+
+    def within(self, lat: float, lon: float, radius_km: float) -> Tuple[np.ndarray, np.ndarray]:
+        if not len(self.positions):
+            return self.positions, np.empty(0)
+        if HAS_SCIPY:
+            chord = 2 * np.sin(min(radius_km / EARTH_RADIUS_KM, np.pi) / 2)
+            local = np.asarray(self.tree.query_ball_point(unit_vectors(np.array([lat]), np.array([lon]))[0], chord), dtype=int)
+        else:
+            band = np.degrees(radius_km / EARTH_RADIUS_KM)  # Latitude span a radius can reach
+            lo = np.searchsorted(self.lats, lat - band, side='left')
+            hi = np.searchsorted(self.lats, lat + band, side='right')
+            local = np.arange(lo, hi)
+        km = haversine_km(lat, lon, self.lats[local], self.lons[local])
+        keep = km <= radius_km
+        local, km = local[keep], km[keep]
+        order = np.argsort(km, kind='stable')
+        return self.positions[local[order]], km[order]
+
+    def nearest(self, lat: float, lon: float, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        k = min(k, len(self.positions))
+        if k <= 0:
+            return self.positions[:0], np.empty(0)
+        if HAS_SCIPY:
+            _, local = self.tree.query(unit_vectors(np.array([lat]), np.array([lon]))[0], k=k)
+            local = np.atleast_1d(local)
+        else:
+            km = haversine_km(lat, lon, self.lats, self.lons)
+            local = np.argpartition(km, k - 1)[:k] if k < len(km) else np.arange(len(km))
+        km = haversine_km(lat, lon, self.lats[local], self.lons[local])
+        order = np.argsort(km, kind='stable')
+        return self.positions[local[order]], km[order]
+
+
+class ClubLocations:
+    """Column arrays of club locations with radius / kNN queries"""
+
+    def __init__(self, columns: Dict[str, np.ndarray]):
+        has_coords = ~(np.isnan(columns['latitude']) | np.isnan(columns['longitude']))
+        self.columns = {field: np.asarray(columns[field])[has_coords] for field in FIELDS}
+        self.lats = self.columns['latitude'].astype(np.float64)
+        self.lons = self.columns['longitude'].astype(np.float64)
+        self._indexes: Dict[Optional[bool], _Index] = {}
+
+    def __len__(self) -> int:
+        return len(self.lats)
+
+    @classmethod
+    def from_records(cls, records: List[Dict]) -> 'ClubLocations':
+        columns = {
+            'name': np.array([r['name'] for r in records], dtype=object),
+            'county': np.array([r.get('county', '') for r in records], dtype=object),
+            'province': np.array([r.get('province', '') for r in records], dtype=object),
+            'country': np.array([r.get('country', '') for r in records], dtype=object),
+            'latitude': np.array([_float(r.get('latitude')) for r in records], dtype=np.float64),
+            'longitude': np.array([_float(r.get('longitude')) for r in records], dtype=np.float64),
+            'uses_veo': np.array([bool(r.get('uses_veo')) for r in records], dtype=bool),
+            'videos': np.array([_int(r.get('videos')) for r in records], dtype=np.int32),
+        }
+        return cls(columns)
+
+    @classmethod
+    def from_rows(cls, reference_rows: Iterable[Dict], veo_rows: Iterable[Dict] = ()) -> 'ClubLocations':
+        """
+        Reference clubs plus VEO-using matched clubs (rows keyed by CSV header)
+
+        A matched club replaces the reference club it was located from
+        (uses_veo=True, its name and video count): the one named in its
+        'Reference Club' column, or else the reference club with the same
+        normalize_name() at the same coordinates. Other matched clubs are added.
+        """
+        def record(row: Dict, name: str, uses_veo: bool) -> Dict:
+            return {
+                'name': name,
+                'county': row.get('County', ''),
+                'province': row.get('Province', ''),
+                'country': row.get('Country', ''),
+                'latitude': row.get('Latitude', ''),
+                'longitude': row.get('Longitude', ''),
+                'uses_veo': uses_veo or (row.get('Uses VEO') or '').strip().lower() == 'true',
+                'videos': row.get('Number of Videos') if uses_veo else row.get('VEO Recordings', 0),
+            }
+
+        def place_key(name: str, row: Dict) -> Tuple:
+            return (normalize_name(name), row.get('Latitude', '').strip(), row.get('Longitude', '').strip())
+
+        records: Dict[str, Dict] = {}
+        by_place: Dict[Tuple, str] = {}
+        for row in reference_rows:
+            name = (row.get('Club Name') or '').strip()
+            if name:
+                records[name] = record(row, name, False)
+                by_place.setdefault(place_key(name, row), name)
+
+        for row in veo_rows:
+            name = (row.get('Club Name') or '').strip()
+            if not name:
+                continue
+            reference = (row.get('Reference Club') or '').strip()
+            key = reference if reference in records else by_place.get(place_key(name, row), name)
+            if key in records and records[key]['uses_veo'] and key != name:
+                key = name  # Reference club already taken by another matched club
+            records[key] = record(row, name, True)
+        return cls.from_records(list(records.values()))
+
+    @classmethod
+    def from_csvs(cls, reference_csv: Path, veo_locations_csv: Optional[Path] = None) -> 'ClubLocations':
+        with open(reference_csv, 'r', encoding='utf-8') as f:
+            reference_rows = list(csv.DictReader(f))
+        veo_rows = []
+        if veo_locations_csv and Path(veo_locations_csv).exists():
+            with open(veo_locations_csv, 'r', encoding='utf-8') as f:
+                veo_rows = list(csv.DictReader(f))
+        return cls.from_rows(reference_rows, veo_rows)
+
+    def _index(self, uses_veo: Optional[bool]) -> _Index:
+        if uses_veo not in self._indexes:
+            if uses_veo is None:
+                positions = np.arange(len(self))
+            else:
+                positions = np.flatnonzero(self.columns['uses_veo'] == uses_veo)
+            self._indexes[uses_veo] = _Index(positions, self.lats, self.lons)
+        return self._indexes[uses_veo]
+
+    def within(self, lat: float, lon: float, radius_km: float,
+               uses_veo: Optional[bool] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """(positions, km) of clubs within radius_km of (lat, lon), nearest first"""
+        return self._index(uses_veo).within(lat, lon, radius_km)
+
+    def nearest(self, lat: float, lon: float, k: int,
+                uses_veo: Optional[bool] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """(positions, km) of the k nearest clubs to (lat, lon), nearest first"""
+        return self._index(uses_veo).nearest(lat, lon, k)
+
+    def find(self, name: str) -> Optional[int]:
+        """Position of a club by exact (case-insensitive) name, or None"""
+        matches = np.flatnonzero(np.char.lower(self.columns['name'].astype(str)) == name.strip().lower())
+        return int(matches[0]) if len(matches) else None
+
+    def rows(self, positions: np.ndarray, km: Optional[np.ndarray] = None) -> List[Dict]:
+        """Plain dicts for positions (with 'distance_km' when km is given)"""
+        result = []
+        for n, i in enumerate(positions):
+            row = {field: self.columns[field][i] for field in FIELDS}
+            row.update(latitude=float(row['latitude']), longitude=float(row['longitude']),
+                       uses_veo=bool(row['uses_veo']), videos=int(row['videos']))
+            if km is not None:
+                row['distance_km'] = round(float(km[n]), 2)
+            result.append(row)
+        return result
+
+    def save(self, path: Path):
+        """Write a .parquet (pandas + pyarrow) or .npz artifact"""
+        path = Path(path)
+        if path.suffix == '.parquet':
+            if not HAS_PARQUET:
+                raise RuntimeError("pandas + pyarrow not installed (pip install pandas pyarrow) - use a .npz path")
+            pd.DataFrame(self.columns).to_parquet(path, index=False)
+            return
+        arrays = {field: self.columns[field] for field in FIELDS}
+        for field in ('name', 'county', 'province', 'country'):
+            arrays[field] = arrays[field].astype(str)  # Fixed-width unicode, no pickle needed to load
+        np.savez_compressed(path, **arrays)
+
+    @classmethod
+    def load(cls, path: Path) -> 'ClubLocations':
+        path = Path(path)
+        if path.suffix == '.parquet':
+            if not HAS_PARQUET:
+                raise RuntimeError("pandas + pyarrow not installed (pip install pandas pyarrow)")
+            frame = pd.read_parquet(path)
+            return cls({field: frame[field].to_numpy() for field in FIELDS})
+        with np.load(path, allow_pickle=False) as data:
+            return cls({field: data[field].astype(object) if data[field].dtype.kind == 'U' else data[field]
+                        for field in FIELDS})
@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+Local VEO -> GAA club matcher (no API calls)
+
+Matches VEO club names against the reference list of Irish GAA clubs
+(clubs_not_using_veo.csv, ~1,670 clubs with county/location data):
+  1. normalize_name() - lowercase, strip accents/punctuation, drop filler words
+     (GAA, GAC, GFC, CLG, club, hurling, ...)
+  2. a character-trigram inverted index over the reference names gives a
+     shortlist of candidates for each VEO name
+  3. candidates are scored 0-100 (rapidfuzz token_sort_ratio when installed,
+     difflib otherwise)
+  4. identifier / name heuristics decide:
+       GAA signal      - gaa / gac / gfc / clg / hurling / camogie / cumann ... in name or identifier
+       Irish signal    - an Irish-language word (naomh / gleann / colaiste / bhaile ...)
+       non-GAA signal  - soccer / rugby / fc / basketball / ... without a GAA signal
+                         (hard: another sport's name; soft: fc / school / united / football-club ...)
+       gazetteer hit   - a county, reference club town or known area ('innyboys') is in the name
+     Hard non-GAA tokens reject at any score; soft ones reject below ACCEPT_SCORE
+     unless a place backs the name up, and below REVIEW_SCORE regardless; no signal
+     at all rejects below REVIEW_SCORE. GAA and Irish signals skip these rejects. Names like 'GlynnBarntown' are also matched with the
+     spaces dropped. The rest goes to Gemini (a few hundred clubs).
+
+Every VEO club comes back as 'accept' (confident Irish GAA match), 'reject'
+(confidently not one) or 'ambiguous' (send to Gemini). Results are
+deterministic, so reruns give the same split.
+
+Usage:
+    matcher = ClubMatcher.from_csv(DATA_DIR / 'clubs_not_using_veo.csv')
+    accepted, ambiguous, rejected = matcher.partition(veo_clubs)
+    ref, score = matcher.best_match('Dunshaughlin & Royal Gaels GAA')
+"""
+
+import csv
+import heapq
+import re
+import unicodedata
+from collections import Counter, defaultdict
+from difflib import SequenceMatcher
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+try:
+    from rapidfuzz import fuzz
+    HAS_RAPIDFUZZ = True
+except ImportError:
+    HAS_RAPIDFUZZ = False  # pip install rapidfuzz (difflib fallback is slower, same scale)
+
+ACCEPT_SCORE = 92  # Name match at or above this (plus a GAA or place signal) is accepted locally
+REVIEW_SCORE = 75  # Below this, clubs without any GAA / Irish signal (or with a soft non-GAA token) are rejected locally
+SHORTLIST = 10  # Candidates scored per VEO name
+
+# Words that say nothing about which club it is
+FILLER_WORDS = {
+    'gaa', 'gac', 'gfc', 'hc', 'clg', 'cumann', 'club', 'the', 'ireland', 'irish',
+    'hurling', 'camogie', 'football', 'gaelic', 'ladies', 'lgfa', 'and', 'of', 'g', 'a',
+    'juvenile', 'juveniles', 'minor', 'minors', 'underage', 'senior', 'seniors', 'team',
+}
+
+GAA_TOKENS = {'gaa', 'gac', 'gfc', 'clg', 'cumann', 'hurling', 'camogie', 'gaelic', 'gaels', 'lgfa', 'peile', 'iomana'}
+# Hard tokens name another sport and reject at any score; soft ones (GAA clubs get '-fc' slugs,
+# schools play GAA) only reject without a close reference name or place
+HARD_NON_GAA_TOKENS = {
+    'soccer', 'rugby', 'rfc', 'afc', 'basketball', 'hockey', 'cricket', 'lacrosse', 'netball', 'volleyball',
+    'futsal', 'ssc', 'fk', 'sk', 'sv', 'tsv', 'vfb', 'vfl',
+}
+NON_GAA_TOKENS = HARD_NON_GAA_TOKENS | {
+    'fc', 'cf', 'sc', 'united', 'utd', 'city', 'athletic', 'handball', 'academy', 'youth',
+    'boys', 'girls', 'school', 'college', 'university', 'high',
+}
+
+# Irish-language words: a club or school named in Irish is almost always GAA, whatever else the name says
+IRISH_TOKENS = {
+    'naomh', 'naomha', 'gleann', 'colaiste', 'scoil', 'baile', 'bhaile', 'cill', 'chill', 'carraig', 'droim',
+    'cnoc', 'cluain', 'sliabh', 'mhuire', 'piarsaigh', 'gaeil', 'eireann', 'clann', 'laoch', 'ogra', 'rua',
+    'phadraig', 'bhride', 'chiarain', 'chonaill', 'eoghain', 'eoghan',
+}
+
+# Places missing from the reference club names: areas whose club is registered under its Irish
+# name (Gweedore = Gaoth Dobhair) and rivers / regions clubs are named after (Innyboys)
+EXTRA_PLACES = {
+    'gweedore', 'rosses', 'fanad', 'inishowen', 'connemara', 'iveragh', 'beara', 'achill', 'erris',
+    'inny', 'boyne', 'liffey', 'slaney', 'shannonside', 'suir', 'nore', 'erne',
+}
+# Glued-on endings split off before the gazetteer lookup ('innyboys' -> 'inny')
+COMPOUND_SUFFIXES = ('boys', 'vale', 'side', 'rovers', 'gaels')
+
+IRISH_COUNTIES = {
+    'antrim', 'armagh', 'carlow', 'cavan', 'clare', 'cork', 'derry', 'donegal', 'down', 'dublin', 'fermanagh',
+    'galway', 'kerry', 'kildare', 'kilkenny', 'laois', 'leitrim', 'limerick', 'longford', 'louth', 'mayo',
+    'meath', 'monaghan', 'offaly', 'roscommon', 'sligo', 'tipperary', 'tyrone', 'waterford', 'westmeath',
+    'wexford', 'wicklow',
+}
+
+
+def strip_accents(text: str) -> str:
+    return ''.join(c for c in unicodedata.normalize('NFKD', text) if not unicodedata.combining(c))
+
+
+def tokens(text: str) -> List[str]:
+    """Lowercase ASCII word tokens ('G.A.A' -> 'gaa', 'St.Johns' -> 'st', 'johns')"""
+    text = strip_accents(text or '').lower().replace('&', ' and ')
+    text = re.sub(r"(?<=\b[a-z])\.(?=[a-z]\b)", '', text)  # g.a.a -> gaa
+    text = text.replace("'", '').replace('’', '')
+    return re.findall(r'[a-z0-9]+', text)
+
+
+def normalize_name(name: str) -> str:
+    """Comparable club name: tokens without filler words ('St. John's GAA Club' -> 'st johns')"""
+    words = [w for w in tokens(name) if w not in FILLER_WORDS]
+    return ' '.join(words)
+
+
+def trigrams(text: str) -> List[str]:
+    padded = f'  {text} '
+    return [padded[i:i + 3] for i in range(len(padded) - 2)]
+
+
+def score(a: str, b: str, floor: float = 0.0) -> float:
+    """0-100 similarity of two normalized names (word order insensitive); may return 0 below floor"""
+    if not a or not b:
+        return 0.0
+    if HAS_RAPIDFUZZ:
+        return fuzz.token_sort_ratio(a, b)
+    matcher = SequenceMatcher(None, ' '.join(sorted(a.split())), ' '.join(sorted(b.split())))
+    if matcher.real_quick_ratio() * 100 < floor or matcher.quick_ratio() * 100 < floor:
+        return 0.0  # Upper bound already below what the caller needs
+    return 100.0 * matcher.ratio()
+
+
+class ClubMatcher:
+    """Trigram-indexed fuzzy matcher over the reference GAA club list"""
+
+    def __init__(self, reference: List[Dict]):
+        self.reference = reference
+        self.names = [normalize_name(club['name']) for club in reference]
+        self.index: Dict[str, List[int]] = defaultdict(list)
+        for i, name in enumerate(self.names):
+            for gram in set(trigrams(name)):
+                self.index[gram].append(i)
+        self.exact = {name: i for i, name in enumerate(self.names) if name}
+        # Same names with the spaces dropped: 'GlynnBarntown' is the reference 'Glynn-Barntown'
+        self.compact = {name.replace(' ', ''): i for i, name in enumerate(self.names) if name}
+        # Gazetteer: counties, every single-word reference name (mostly towns / parishes) and the
+        # town in 'Club, Town' reference names ("Sean McDermott's GAA, Maghery")
+        self.places = set(IRISH_COUNTIES) | EXTRA_PLACES
+        for club in reference:
+            self.places.update(tokens(club.get('county', '')))
+            if ',' in club['name']:
+                self.places.update(w for w in normalize_name(club['name'].rsplit(',', 1)[1]).split() if len(w) >= 5)
+        self.places.update(name for name in self.names if name and ' ' not in name and len(name) >= 5)
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Dict]) -> 'ClubMatcher':
+        """Build from reference rows (Club Name / County / Province / Country / Latitude / Longitude)"""
+        reference = []
+        for row in rows:
+            name = (row.get('Club Name') or '').strip()
+            if name:
+                reference.append({
+                    'name': name,
+                    'county': row.get('County', ''),
+                    'province': row.get('Province', ''),
+                    'country': row.get('Country', ''),
+                    'latitude': row.get('Latitude', ''),
+                    'longitude': row.get('Longitude', ''),
+                })
+        return cls(reference)
+
+    @classmethod
+    def from_csv(cls, path: Path) -> 'ClubMatcher':
+        """Load the reference list from clubs_not_using_veo.csv"""
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls.from_rows(csv.DictReader(f))
+
+    def candidates(self, normalized: str, limit: int = SHORTLIST) -> List[int]:
+        """Reference indexes sharing the most trigrams with a normalized name"""
+        counts = Counter()
+        for gram in set(trigrams(normalized)):
+            for i in self.index.get(gram, ()):
+                counts[i] += 1
+        # Ties broken by index: set() order varies with the string hash seed, results must not
+        return [i for i, _ in heapq.nsmallest(limit, counts.items(), key=lambda item: (-item[1], item[0]))]
+
+    def best_match(self, name: str) -> Tuple[Optional[Dict], float]:
+        """(reference club, score) for the closest reference name, or (None, 0)"""
+        normalized = normalize_name(name)
+        if not normalized:
+            return None, 0.0
+        if normalized in self.exact:
+            return self.reference[self.exact[normalized]], 100.0
+        if normalized.replace(' ', '') in self.compact:
+            return self.reference[self.compact[normalized.replace(' ', '')]], 100.0
+        best, best_score = None, 0.0
+        for i in self.candidates(normalized):
+            s = score(normalized, self.names[i], floor=best_score)
+            if s > best_score:
+                best, best_score = i, s
+        return (self.reference[best], best_score) if best is not None else (None, 0.0)
+
+    def contained_in_reference(self, name: str) -> bool:
+        """True if every distinctive word of name appears in one reference name ('Kickhams' in 'Cooley Kickhams')"""
+        words = {w for w in normalize_name(name).split() if len(w) >= 5}
+        if not words:
+            return False
+        return any(words <= set(self.names[i].split()) for i in self.candidates(' '.join(sorted(words))))
+
+    def is_place(self, word: str) -> bool:
+        """Gazetteer lookup, also trying the word with a glued-on ending removed ('innyboys')"""
+        if word in self.places:
+            return True
+        return any(word.endswith(suffix) and word[:-len(suffix)] in self.places for suffix in COMPOUND_SUFFIXES)
+
+    def signals(self, club: Dict) -> Dict[str, bool]:
+        words = set(tokens(club.get('name', ''))) | set(tokens(club.get('identifier', '')))
+        gaa = bool(words & GAA_TOKENS)
+        return {
+            'gaa': gaa,
+            'irish': bool(words & IRISH_TOKENS),
+            'non_gaa': bool(words & NON_GAA_TOKENS) and not gaa,
+            'hard_non_gaa': bool(words & HARD_NON_GAA_TOKENS) and not gaa,
+            'football': 'football' in words and not gaa,  # "X Football Club" is as often soccer as GAA
+            'place': any(self.is_place(w) for w in words),
+        }
+
+    def classify(self, club: Dict) -> Dict:
+        """
+        Decide one VEO club {'name', 'recordings', 'identifier'}
+
+        Returns:
+            {'decision': 'accept'|'reject'|'ambiguous', 'reference': dict|None, 'score': float, 'reason': str}
+        """
+        normalized = normalize_name(club.get('name', ''))
+        if len(normalized.replace(' ', '')) < 3:
+            return {'decision': 'reject', 'reference': None, 'score': 0.0, 'reason': 'no usable name'}
+
+        reference, match_score = self.best_match(club['name'])
+        signals = self.signals(club)
+        multi_word = ' ' in normalized
+
+        if match_score >= ACCEPT_SCORE:
+            if signals['gaa']:
+                return {'decision': 'accept', 'reference': reference, 'score': match_score, 'reason': 'name match + GAA identifier'}
+            if signals['place'] and multi_word and not (signals['non_gaa'] or signals['football']):
+                return {'decision': 'accept', 'reference': reference, 'score': match_score, 'reason': 'name match + place name'}
+        elif signals['hard_non_gaa']:
+            return {'decision': 'reject', 'reference': reference, 'score': match_score, 'reason': 'non-GAA sport'}
+
+        if not (signals['gaa'] or signals['irish']):
+            if len(normalized.replace(' ', '')) <= 4:
+                return {'decision': 'reject', 'reference': reference, 'score': match_score, 'reason': 'short name / acronym'}
+            soft_non_gaa = signals['non_gaa'] or signals['football']
+            if soft_non_gaa and match_score < ACCEPT_SCORE and (match_score < REVIEW_SCORE or not signals['place']):
+                return {'decision': 'reject', 'reference': reference, 'score': match_score, 'reason': 'non-GAA sport'}
+            if match_score < REVIEW_SCORE and not signals['place'] and not self.contained_in_reference(club['name']):
+                return {'decision': 'reject', 'reference': reference, 'score': match_score, 'reason': 'no GAA or Irish signal'}
+
+        if signals['gaa']:
+            reason = 'GAA identifier, no close reference' if match_score < ACCEPT_SCORE else 'GAA identifier'
+        else:
+            reason = 'generic name' if match_score >= ACCEPT_SCORE else 'partial match'
+        return {'decision': 'ambiguous', 'reference': reference, 'score': match_score, 'reason': reason}
+
+    def partition(self, veo_clubs: List[Dict]) -> Tuple[List[Dict], List[Dict], List[Dict]]:
+        """
+        Split VEO clubs into (accepted, ambiguous, rejected)
+
+        Each club dict is copied with 'match' (classify() result) added.
+        """
+        accepted, ambiguous, rejected = [], [], []
+        for club in veo_clubs:
+            result = self.classify(club)
+            entry = dict(club, match=result)
+            {'accept': accepted, 'ambiguous': ambiguous, 'reject': rejected}[result['decision']].append(entry)
+        return accepted, ambiguous, rejected
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+SQLite-backed access to the CRM club CSVs (crm-data/veo/*.csv)
+
+The CSVs stay the source of truth (the scripts still write them); each one is
+imported once into its own table in a SQLite file and re-imported only when
+its size or mtime changes. Every table gets:
+  - one TEXT column per CSV header (snake_case: 'Club Name' -> club_name)
+  - norm_name: club_matcher.normalize_name() of the 'Club Name' / 'Club' column
+  - indexes on norm_name and on any county / *identifier column
+
+Reads stream from a cursor and only select the requested columns; filters run
+as SQL WHERE clauses, so nothing is loaded into Python that isn't used. Rows
+come back as dicts keyed by the original CSV headers, the same shape as
+csv.DictReader, so callers swap in without changing their field access.
+
+Usage:
+    store = ClubStore(DATA_DIR / 'club_store.sqlite')
+    for row in store.rows(VEO_CLUBS_CSV, columns=['Club Name', 'Recordings']):
+        ...
+    store.rows(REFERENCE_CSV, filters={'County': 'Kerry'})
+    store.find(REFERENCE_CSV, "St. John's GAA")  # Indexed normalized-name lookup
+"""
+
+import csv
+import re
+import sqlite3
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+from club_matcher import normalize_name
+
+NAME_HEADERS = ('Club Name', 'club_name', 'Club')  # First one present feeds norm_name
+IMPORT_CHUNK = 5000  # Rows per executemany during import
+
+
+def column_name(header: str) -> str:
+    """SQL-safe snake_case column for a CSV header ('Number of Videos' -> number_of_videos)"""
+    name = re.sub(r'[^0-9a-z]+', '_', header.strip().lower()).strip('_') or 'column'
+    return f"c_{name}" if name[0].isdigit() else name
+
+
+def table_name(csv_path: Path) -> str:
+    return 't_' + re.sub(r'[^0-9a-z]+', '_', Path(csv_path).stem.lower()).strip('_')
+
+
+class ClubStore:
+    """Lazy, indexed SQLite mirror of CSV files"""
+
+    def __init__(self, db_path: Path):
+        self.path = Path(db_path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.path, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS sources (
+                tbl TEXT PRIMARY KEY,
+                csv_path TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                rows INTEGER NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS headers (
+                tbl TEXT NOT NULL,
+                position INTEGER NOT NULL,
+                header TEXT NOT NULL,
+                col TEXT NOT NULL,
+                PRIMARY KEY (tbl, position)
+            );
+        """)
+        self._headers: Dict[str, Dict[str, str]] = {}
+
+    def table(self, csv_path: Path) -> str:
+        """Table for csv_path, importing it first if it is new or has changed"""
+        csv_path = Path(csv_path)
+        tbl = table_name(csv_path)
+        stat = csv_path.stat()
+        source = self.conn.execute("SELECT size, mtime_ns FROM sources WHERE tbl = ?", (tbl,)).fetchone()
+        if source != (stat.st_size, stat.st_mtime_ns):
+            self._import(csv_path, tbl, stat)
+        return tbl
+
+    def _import(self, csv_path: Path, tbl: str, stat):
+        with open(csv_path, 'r', encoding='utf-8-sig', newline='') as f:
+            reader = csv.reader(f)
+            headers = next(reader, [])
+            columns: List[str] = []
+            for header in headers:
+                col = column_name(header)
+                while col in columns or col in ('_row', 'norm_name'):
+                    col += '_'
+                columns.append(col)
+            name_pos = next((headers.index(h) for h in NAME_HEADERS if h in headers), None)
+
+            with self.conn:
+                self.conn.execute(f'DROP TABLE IF EXISTS "{tbl}"')
+                column_sql = ''.join(f', "{col}" TEXT' for col in columns)
+                self.conn.execute(f'CREATE TABLE "{tbl}" (_row INTEGER PRIMARY KEY, norm_name TEXT{column_sql})')
+                quoted = ''.join(f', "{col}"' for col in columns)
+                placeholders = ', '.join('?' * (len(columns) + 1))
+                insert = f'INSERT INTO "{tbl}" (norm_name{quoted}) VALUES ({placeholders})'
+                count = 0
+                chunk = []
+                for record in reader:
+                    if not any(record):
+                        continue
+                    values = (record + [''] * len(columns))[:len(columns)]
+                    norm = normalize_name(values[name_pos]) if name_pos is not None else ''
+                    chunk.append([norm] + values)
+                    if len(chunk) >= IMPORT_CHUNK:
+                        self.conn.executemany(insert, chunk)
+                        count += len(chunk)
+                        chunk = []
+                self.conn.executemany(insert, chunk)
+                count += len(chunk)
+
+                for col in ['norm_name'] + [c for c in columns if c == 'county' or c.endswith('identifier')]:
+                    self.conn.execute(f'CREATE INDEX "{tbl}_{col}" ON "{tbl}" ("{col}")')
+                self.conn.execute("DELETE FROM headers WHERE tbl = ?", (tbl,))
+                self.conn.executemany("INSERT INTO headers VALUES (?, ?, ?, ?)",
+                                      [(tbl, i, h, c) for i, (h, c) in enumerate(zip(headers, columns))])
+                self.conn.execute("INSERT OR REPLACE INTO sources VALUES (?, ?, ?, ?, ?)",
+                                  (tbl, str(csv_path), stat.st_size, stat.st_mtime_ns, count))
+        self._headers.pop(tbl, None)
+
+    def headers(self, csv_path: Path) -> Dict[str, str]:
+        """{CSV header: column} in file order"""
+        tbl = self.table(csv_path)
+        if tbl not in self._headers:
+            cursor = self.conn.execute("SELECT header, col FROM headers WHERE tbl = ? ORDER BY position", (tbl,))
+            self._headers[tbl] = dict(cursor.fetchall())
+        return self._headers[tbl]
+
+    def _select(self, csv_path: Path, columns: Optional[List[str]], filters: Optional[Dict[str, str]],
+                select: Optional[str] = None):
+        tbl = self.table(csv_path)
+        header_map = self.headers(csv_path)
+        wanted = list(header_map) if columns is None else [h for h in columns if h in header_map]
+        select = select or ', '.join(f'"{header_map[h]}"' for h in wanted) or 'norm_name'
+        clauses, params = [], []
+        for header, value in (filters or {}).items():
+            col = 'norm_name' if header == 'norm_name' else header_map.get(header)
+            if col is None:
+                raise KeyError(f"{Path(csv_path).name} has no column '{header}'")
+            clauses.append(f'"{col}" = ?')
+            params.append(value)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ''
+        return wanted, f'SELECT {select} FROM "{tbl}"{where}', params
+
+    def rows(self, csv_path: Path, columns: Optional[List[str]] = None,
+             filters: Optional[Dict[str, str]] = None, limit: Optional[int] = None) -> Iterator[Dict[str, str]]:
+        """
+        Stream rows as {header: value} dicts, in file order
+
+        Args:
+            columns: CSV headers to read (missing ones are skipped; default: all)
+            filters: {header: value} equality filters, evaluated in SQLite
+            limit: Stop after this many rows
+        """
+        wanted, sql, params = self._select(csv_path, columns, filters)
+        sql += ' ORDER BY _row'
+        if limit is not None:
+            sql += ' LIMIT ?'
+            params.append(limit)
+        for record in self.conn.execute(sql, params):
+            yield dict(zip(wanted, record))
+
+    def find(self, csv_path: Path, name: str, columns: Optional[List[str]] = None) -> List[Dict[str, str]]:
+        """Rows whose club name normalizes to the same as name (uses the norm_name index)"""
+        return list(self.rows(csv_path, columns, filters={'norm_name': normalize_name(name)}))
+
+    def count(self, csv_path: Path, filters: Optional[Dict[str, str]] = None) -> int:
+        _, sql, params = self._select(csv_path, [], filters, select='COUNT(*)')
+        return self.conn.execute(sql, params).fetchone()[0]
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
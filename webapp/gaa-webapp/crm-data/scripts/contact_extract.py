@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Single-parse contact scan for scrape-club-contacts.py
+
+The original path builds a BeautifulSoup tree with html.parser, serialises
+it back to HTML (str(soup)), glues that onto get_text() and runs the email
+regex plus four phone regexes over the doubled text. This module instead:
+  - parses once with lxml (C parser), dropping script/style/comments
+  - walks text nodes with itertext() and mailto:/tel: hrefs from <a> tags
+  - runs ONE compiled alternation (email | any phone format) over the text
+
+scan_page() returns raw matches; cleaning and name extraction stay in the
+scraper (clean_emails / format_phone_numbers / extract_contact_name).
+
+Usage:
+    from contact_extract import HAS_LXML, scan_page
+    page = scan_page(html)
+    page.text, page.emails, page.phones
+"""
+
+import re
+from typing import List, NamedTuple
+from urllib.parse import unquote
+
+try:
+    import lxml.html
+    from lxml import etree
+    HAS_LXML = True
+except ImportError:
+    HAS_LXML = False  # pip install lxml (falls back to BeautifulSoup html.parser)
+
+EMAIL_REGEX = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
+
+# Irish formats: +353, 00353, 0 + area code, (0XX) XXXXXX
+PHONE_REGEXES = [
+    r'\+353\s?[1-9]\d{8,9}',
+    r'00353\s?[1-9]\d{8,9}',
+    r'0[1-9]\d{8,9}',
+    r'\(0[1-9]\d{1,2}\)\s?\d{6,7}',
+]
+
+CONTACT_PATTERN = re.compile(f"(?P<email>{EMAIL_REGEX})|(?P<phone>{'|'.join(PHONE_REGEXES)})")
+
+
+class PageScan(NamedTuple):
+    text: str  # Visible text, nodes joined with spaces
+    emails: List[str]  # Raw email matches (text + mailto:), document order
+    phones: List[str]  # Raw phone matches (text + tel:), document order
+
+
+def find_contacts(text: str):
+    """(emails, phones) raw matches from one pass of CONTACT_PATTERN"""
+    emails, phones = [], []
+    for match in CONTACT_PATTERN.finditer(text):
+        if match.lastgroup == 'email':
+            emails.append(match.group())
+        else:
+            phones.append(match.group())
+    return emails, phones
+
+
+def scan_page(html: str) -> PageScan:
+    """Parse html once and pull out visible text plus raw email / phone matches"""
+    if not HAS_LXML:
+        raise RuntimeError("lxml not installed (pip install lxml)")
+    root = lxml.html.fromstring(html)
+    etree.strip_elements(root, 'script', 'style', etree.Comment, with_tail=False)
+
+    text = ' '.join(root.itertext())
+    emails, phones = find_contacts(text)
+
+    for href in root.xpath('//a/@href'):
+        scheme, _, target = href.strip().partition(':')
+        scheme = scheme.lower()
+        if scheme == 'mailto':
+            link_emails, _ = find_contacts(unquote(target.split('?', 1)[0]))
+            emails.extend(link_emails)
+        elif scheme == 'tel':
+            _, link_phones = find_contacts(re.sub(r'[\s\-.]', '', unquote(target)))  # tel:+353-87-123 4567
+            phones.extend(link_phones)
+
+    return PageScan(text, emails, phones)
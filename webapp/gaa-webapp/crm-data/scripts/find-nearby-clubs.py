@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Regional prospect lists: clubs within N km of a club / point, or the nearest VEO clubs
+
+Reads the club_locations.npz artifact written by add-locations-to-matched-clubs.py
+(falls back to the CSVs when it is missing).
+
+Examples:
+    python find-nearby-clubs.py --club "Eastern Harps" --radius-km 30 --prospects
+    python find-nearby-clubs.py --lat 53.35 --lon -6.26 --nearest 10 --veo
+    python find-nearby-clubs.py --club Abbeydorney --radius-km 40 --csv kerry_prospects.csv
+"""
+
+import argparse
+import csv
+import sys
+import time
+from pathlib import Path
+
+from club_locations import ClubLocations
+from club_matcher import ClubMatcher
+
+# Fix Windows console encoding
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8')
+
+SCRIPT_DIR = Path(__file__).parent
+DATA_DIR = SCRIPT_DIR.parent / 'veo'
+
+LOCATIONS_NPZ = DATA_DIR / 'club_locations.npz'
+REFERENCE_CSV = DATA_DIR / 'clubs_not_using_veo.csv'
+MATCHED_LOCATIONS_CSV = DATA_DIR / 'irish_veo_clubs_matched_with_locations.csv'
+
+
+def load_locations() -> ClubLocations:
+    if LOCATIONS_NPZ.exists():
+        return ClubLocations.load(LOCATIONS_NPZ)
+    print(f"⚠️  {LOCATIONS_NPZ.name} not found, loading CSVs (run add-locations-to-matched-clubs.py to build it)")
+    return ClubLocations.from_csvs(REFERENCE_CSV, MATCHED_LOCATIONS_CSV)
+
+
+def resolve_club(locations: ClubLocations, name: str) -> int:
+    """Position of a club by exact name, else the closest fuzzy name"""
+    position = locations.find(name)
+    if position is not None:
+        return position
+    matcher = ClubMatcher([{'name': n} for n in locations.columns['name']])
+    reference, score = matcher.best_match(name)
+    if reference is None:
+        raise SystemExit(f"❌ No club found matching '{name}'")
+    print(f"🔎 Using '{reference['name']}' for '{name}' (score {score:.0f})")
+    return locations.find(reference['name'])
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Clubs near a club or point')
+    parser.add_argument('--club', help='Centre on this club (exact or fuzzy name)')
+    parser.add_argument('--lat', type=float, help='Centre latitude')
+    parser.add_argument('--lon', type=float, help='Centre longitude')
+    parser.add_argument('--radius-km', type=float, help='Every club within this radius')
+    parser.add_argument('--nearest', type=int, default=10, help='Nearest N clubs (when --radius-km is not given)')
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument('--prospects', action='store_true', help='Only clubs not using VEO')
+    group.add_argument('--veo', action='store_true', help='Only clubs using VEO')
+    parser.add_argument('--csv', help='Also write the list to this CSV file')
+    args = parser.parse_args()
+
+    locations = load_locations()
+    if args.club:
+        centre = resolve_club(locations, args.club)
+        lat, lon = locations.lats[centre], locations.lons[centre]
+    elif args.lat is not None and args.lon is not None:
+        lat, lon = args.lat, args.lon
+    else:
+        parser.error('give --club or --lat/--lon')
+
+    uses_veo = False if args.prospects else True if args.veo else None
+    start = time.perf_counter()
+    if args.radius_km is not None:
+        positions, km = locations.within(lat, lon, args.radius_km, uses_veo=uses_veo)
+    else:
+        positions, km = locations.nearest(lat, lon, args.nearest + (1 if args.club else 0), uses_veo=uses_veo)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    rows = [row for row in locations.rows(positions, km) if not (args.club and row['name'] == locations.columns['name'][centre])]
+    if args.radius_km is None:
+        rows = rows[:args.nearest]
+
+    print(f"📍 {len(rows)} club(s) around ({lat:.4f}, {lon:.4f}) from {len(locations)} located clubs ({elapsed_ms:.2f} ms)\n")
+    for row in rows:
+        veo = f"VEO, {row['videos']} videos" if row['uses_veo'] else 'prospect'
+        print(f"   {row['distance_km']:7.1f} km  {row['name']} ({row['county'] or '?'}) - {veo}")
+
+    if args.csv:
+        with open(args.csv, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=['name', 'county', 'province', 'country', 'latitude', 'longitude',
+                                                   'uses_veo', 'videos', 'distance_km'])
+            writer.writeheader()
+            writer.writerows(rows)
+        print(f"\n✅ Saved {len(rows)} clubs to: {args.csv}")
+
+
+if __name__ == '__main__':
+    main()
@@ -4,8 +4,10 @@ Match VEO clubs with Irish GAA clubs using Gemini API - Parallel Processing Vers
 
 This script:
 1. Reads VEO club files (veo_clubs_27k_part*.csv)
-2. Uses Gemini API to identify Irish GAA clubs (Gemini has knowledge of all GAA clubs)
-3. Processes in parallel for speed
+2. Matches them locally against clubs_not_using_veo.csv (club_matcher.py) -
+   confident matches are accepted and obvious non-GAA clubs dropped
+3. Uses Gemini API only for the ambiguous remainder (Gemini has knowledge of all GAA clubs),
+   processed in parallel for speed
 4. Outputs matches to a CSV file with club name and number of videos
 """
 
@@ -14,13 +16,17 @@ import csv
 import json
 import sys
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import List, Dict
 import google.generativeai as genai
 from dotenv import load_dotenv
 from tqdm import tqdm
 import time
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from threading import Lock
+
+from batch_ledger import BatchLedger
+from club_matcher import ClubMatcher
+from club_store import ClubStore
+from token_batcher import TokenEstimator, is_truncated, pack
 
 # Fix Windows console encoding for emojis
 if sys.platform == 'win32':
@@ -33,21 +39,31 @@ load_dotenv(SCRIPT_DIR / '.env')
 
 # Configuration
 GEMINI_API_KEY = os.getenv('GEMINI_API_KEY')
-BATCH_SIZE = int(os.getenv('BATCH_SIZE', '1000'))  # 1000 clubs per API call
+BATCH_SIZE = int(os.getenv('BATCH_SIZE', '1000'))  # Max clubs per API call (batches are packed by tokens below)
+BATCH_INPUT_TOKENS = int(os.getenv('BATCH_INPUT_TOKENS', '40000'))  # Prompt token budget per API call
+BATCH_OUTPUT_TOKENS = int(os.getenv('BATCH_OUTPUT_TOKENS', '6000'))  # Expected response tokens per call, kept under max output
 MAX_WORKERS = int(os.getenv('MAX_WORKERS', '50'))  # Fully parallel - high number for all batches
 MAX_FILES = int(os.getenv('MAX_FILES', '999'))  # Process all files (999 = all)
 START_FILE = int(os.getenv('START_FILE', '1'))  # Start from file number (1-indexed)
 USE_REFERENCE_MATCHING = os.getenv('USE_REFERENCE_MATCHING', 'false').lower() == 'true'
+MAX_RETRIES = int(os.getenv('GEMINI_MAX_RETRIES', '3'))  # Retries per batch on API / quota errors
+RETRY_DELAY = float(os.getenv('GEMINI_RETRY_DELAY', '30'))  # Seconds, doubled on each retry
+MIN_SPLIT_SIZE = int(os.getenv('MIN_SPLIT_SIZE', '25'))  # Smallest sub-batch when splitting truncated output
+LOCAL_PREFILTER = os.getenv('LOCAL_PREFILTER', 'true').lower() == 'true'  # club_matcher.py first; Gemini only for the ambiguous tail
+# Share of clubs Gemini is expected to return (sizes the output budget): ~23% of the ambiguous tail
+# were matched (club_matcher.py, 540 clubs), ~1% of the raw list
+EXPECTED_MATCH_RATE = float(os.getenv('EXPECTED_MATCH_RATE', '0.25' if LOCAL_PREFILTER else '0.05'))
 
 # File paths
 CLUBS_IRELAND_CSV = DATA_DIR / 'clubs_not_using_veo.csv'
 VEO_CLUBS_PATTERN = DATA_DIR / 'veo_clubs_27k_part*.csv'
+VEO_CLUBS_CSV = DATA_DIR / 'veo_clubs_27k.csv'  # Unsplit file, used when no part files exist
 OUTPUT_CSV = DATA_DIR / 'irish_veo_clubs_matched.csv'
+STORE_PATH = DATA_DIR / 'club_store.sqlite'  # Indexed SQLite mirror of the CSVs (club_store.py)
+LEDGER_DIR = SCRIPT_DIR / '.match-ledger'  # One result file per completed batch (resume)
 
-# Thread-safe lock for writing results
-results_lock = Lock()
-all_matches = []
-
+TOKEN_ESTIMATE = TokenEstimator()  # Calibrated against count_tokens / usage_metadata at run time
+CALIBRATION_FILE = LEDGER_DIR / 'chars_per_token.json'  # Rate batches were packed with (ledger keys depend on it)
 
 def setup_gemini():
     """Setup Gemini API client - use Flash model for speed"""
@@ -78,7 +94,7 @@ def setup_gemini():
         return model
 
 
-def load_irish_clubs() -> List[Dict]:
+def load_irish_clubs(store: ClubStore) -> List[Dict]:
     """Load the reference list of Irish GAA clubs (optional, for validation)"""
     if not USE_REFERENCE_MATCHING:
         return []
@@ -87,48 +103,53 @@ def load_irish_clubs() -> List[Dict]:
     if not CLUBS_IRELAND_CSV.exists():
         return []
     
-    with open(CLUBS_IRELAND_CSV, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            club_name = row.get('Club Name', '').strip()
-            if club_name:
-                clubs.append({
-                    'name': club_name,
-                    'recordings': row.get('Recordings', row.get('VEO Recordings', '0')),
-                    'identifier': row.get('Club Identifier', row.get('VEO Club Identifier', ''))
-                })
+    columns = ['Club Name', 'Recordings', 'VEO Recordings', 'Club Identifier', 'VEO Club Identifier']
+    for row in store.rows(CLUBS_IRELAND_CSV, columns=columns):
+        club_name = row.get('Club Name', '').strip()
+        if club_name:
+            clubs.append({
+                'name': club_name,
+                'recordings': row.get('Recordings', row.get('VEO Recordings', '0')),
+                'identifier': row.get('Club Identifier', row.get('VEO Club Identifier', ''))
+            })
     return clubs
 
 
 def load_veo_clubs_files() -> List[Path]:
     """Find all VEO club part files"""
     veo_files = sorted(DATA_DIR.glob('veo_clubs_27k_part*.csv'))
+    if not veo_files and VEO_CLUBS_CSV.exists():
+        veo_files = [VEO_CLUBS_CSV]
     return veo_files
 
 
-def load_veo_clubs_from_file(file_path: Path) -> List[Dict]:
+def load_veo_clubs_from_file(store: ClubStore, file_path: Path) -> List[Dict]:
     """Load all VEO clubs from a single file"""
     clubs = []
-    with open(file_path, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            clubs.append({
-                'name': row['Club Name'].strip(),
-                'recordings': row.get('Recordings', '0'),
-                'identifier': row.get('Club Identifier', '').strip()
-            })
+    for row in store.rows(file_path, columns=['Club Name', 'Recordings', 'Club Identifier']):
+        clubs.append({
+            'name': row['Club Name'].strip(),
+            'recordings': row.get('Recordings', '0'),
+            'identifier': row.get('Club Identifier', '').strip()
+        })
     return clubs
 
 
+def format_club_line(club: Dict) -> str:
+    """One prompt line per VEO club"""
+    return (
+        f"- {club['name']} ({club['recordings']} recordings" +
+        (f", identifier: {club['identifier']}" if club.get('identifier') else "") +
+        (f", closest known GAA club: {club['match']['reference']['name']}" if club.get('match', {}).get('reference') else "") +
+        ")"
+    )
+
+
 def create_gemini_prompt(veo_clubs_batch: List[Dict]) -> str:
     """Create prompt for Gemini API to identify Irish GAA clubs"""
     
     # Format VEO clubs batch for the prompt
-    veo_clubs_text = "\n".join([
-        f"- {club['name']} ({club['recordings']} recordings" + 
-        (f", identifier: {club['identifier']})" if club.get('identifier') else ")")
-        for club in veo_clubs_batch
-    ])
+    veo_clubs_text = "\n".join(format_club_line(club) for club in veo_clubs_batch)
     
     prompt = f"""Identify Irish GAA (Gaelic Athletic Association) clubs from this list of sports clubs.
 
@@ -162,68 +183,146 @@ If none are GAA clubs, return: []
     return prompt
 
 
-def call_gemini_api(model, prompt: str, batch_num: int, total_batches: int) -> Optional[List[Dict]]:
-    """Call Gemini API and parse the response"""
+class BatchError(Exception):
+    """A Gemini batch that produced no usable result (kind: 'truncated', 'unparsable' or 'api')"""
+
+    def __init__(self, kind: str, message: str):
+        super().__init__(message)
+        self.kind = kind
+
+
+def call_gemini_api(model, prompt: str, label: str) -> List[Dict]:
+    """Call Gemini API and parse the response; raises BatchError if there is no usable result"""
     try:
         start_time = time.time()
         response = model.generate_content(prompt)
         elapsed = time.time() - start_time
-        
+    except Exception as e:
+        print(f"  ❌ Batch {label}: API error: {e}")
+        raise BatchError('api', str(e))
+    
+    usage = getattr(response, 'usage_metadata', None)
+    if usage is not None:
+        TOKEN_ESTIMATE.observe(prompt, getattr(usage, 'prompt_token_count', 0))
+    
+    # Output cut off at the token limit -> JSON array is incomplete
+    if is_truncated(response):
+        print(f"  ⚠️  Batch {label}: response truncated at max output tokens")
+        raise BatchError('truncated', 'response hit max output tokens')
+    
+    try:
         response_text = response.text.strip()
-        
-        # Extract JSON from markdown code blocks if present
-        if '```json' in response_text:
-            response_text = response_text.split('```json')[1].split('```')[0].strip()
-        elif '```' in response_text:
-            response_text = response_text.split('```')[1].split('```')[0].strip()
-        
-        # Parse JSON
+    except ValueError as e:  # No text parts (blocked / empty candidate)
+        print(f"  ⚠️  Batch {label}: empty response: {e}")
+        raise BatchError('unparsable', str(e))
+    
+    # Extract JSON from markdown code blocks if present
+    if '```json' in response_text:
+        response_text = response_text.split('```json')[1].split('```')[0].strip()
+    elif '```' in response_text:
+        response_text = response_text.split('```')[1].split('```')[0].strip()
+    
+    # Parse JSON
+    try:
         matches = json.loads(response_text)
-        result = matches if isinstance(matches, list) else []
-        
-        print(f"  Batch {batch_num}/{total_batches}: Found {len(result)} GAA clubs ({elapsed:.1f}s)")
-        return result
-        
     except json.JSONDecodeError as e:
-        print(f"  ⚠️  Batch {batch_num}: JSON parse error: {e}")
+        print(f"  ⚠️  Batch {label}: JSON parse error: {e}")
         print(f"     Response preview: {response_text[:200]}...")
-        return []
-    except Exception as e:
-        print(f"  ❌ Batch {batch_num}: API error: {e}")
-        return []
+        raise BatchError('unparsable', str(e))
+    result = matches if isinstance(matches, list) else []
+    
+    print(f"  Batch {label}: Found {len(result)} GAA clubs ({elapsed:.1f}s)")
+    return result
 
 
-def process_batch(model, batch: List[Dict], batch_num: int, total_batches: int) -> List[Dict]:
-    """Process a single batch of clubs"""
+def process_batch(model, ledger: BatchLedger, batch: List[Dict], label: str) -> List[Dict]:
+    """
+    Process a single batch of clubs, reusing the ledger when it already completed
+    
+    API errors are retried with backoff; truncated or unparsable output is retried
+    as two half-size sub-batches (each with its own ledger entry).
+    """
     prompt = create_gemini_prompt(batch)
-    matches = call_gemini_api(model, prompt, batch_num, total_batches)
+    key = ledger.key(prompt, getattr(model, 'model_name', ''))
+    cached = ledger.get(key)
+    if cached is not None:
+        return cached
     
-    if matches:
-        # Thread-safe append
-        with results_lock:
-            all_matches.extend(matches)
+    def split():
+        half = len(batch) // 2
+        return (process_batch(model, ledger, batch[:half], f"{label}a") +
+                process_batch(model, ledger, batch[half:], f"{label}b"))
     
-    return matches
+    if ledger.is_split(key):
+        return split()
+    
+    for attempt in range(MAX_RETRIES + 1):
+        try:
+            matches = call_gemini_api(model, prompt, label)
+            ledger.put(key, matches, label=label, size=len(batch))
+            return matches
+        except BatchError as e:
+            if e.kind in ('truncated', 'unparsable') and len(batch) >= 2 * MIN_SPLIT_SIZE:
+                print(f"  ✂️  Batch {label}: retrying as 2 sub-batches of ~{len(batch) // 2} clubs")
+                ledger.mark_split(key, e.kind, label=label, size=len(batch))
+                return split()
+            if e.kind == 'api' and attempt < MAX_RETRIES:
+                time.sleep(RETRY_DELAY * (2 ** attempt))
+                continue
+            ledger.mark_failed(key, f"{e.kind}: {e}", label=label, size=len(batch))
+            raise
+
+
+def expected_output_tokens(club: Dict) -> float:
+    """Expected response tokens for one club: its JSON entry times the chance it is returned"""
+    entry = json.dumps({'club_name': club['name'], 'recordings': str(club['recordings'])}, ensure_ascii=False)
+    return EXPECTED_MATCH_RATE * TOKEN_ESTIMATE(entry + ',\n')
+
+
+def make_batches(model, veo_clubs: List[Dict]) -> List[List[Dict]]:
+    """
+    Pack clubs into batches by prompt tokens and expected response tokens
+    
+    Token counts are estimated locally (calibrated with one count_tokens call);
+    a batch whose response still hits max output tokens is split in process_batch.
+    The rate is saved in the ledger, so a resumed run packs the same batches.
+    """
+    if not veo_clubs:
+        return []
+    overhead = create_gemini_prompt([])
+    TOKEN_ESTIMATE.calibrate(model, create_gemini_prompt(veo_clubs[:200]), cache_file=CALIBRATION_FILE)
+    return pack(
+        veo_clubs,
+        input_tokens=lambda club: TOKEN_ESTIMATE(format_club_line(club) + '\n'),
+        input_budget=BATCH_INPUT_TOKENS - TOKEN_ESTIMATE(overhead),
+        output_tokens=expected_output_tokens,
+        output_budget=BATCH_OUTPUT_TOKENS,
+        max_items=BATCH_SIZE,
+    )
 
 
 def process_veo_clubs_parallel(model, veo_clubs: List[Dict]) -> List[Dict]:
-    """Process VEO clubs in parallel batches"""
-    # Create batches
-    batches = []
-    for i in range(0, len(veo_clubs), BATCH_SIZE):
-        batches.append(veo_clubs[i:i + BATCH_SIZE])
+    """Process VEO clubs in parallel batches (completed batches are reused from the ledger)"""
+    batches = make_batches(model, veo_clubs)
     
     total_batches = len(batches)
-    print(f"\n📊 Processing {len(veo_clubs)} clubs in {total_batches} batches of ~{BATCH_SIZE}")
-    print(f"🚀 Using {MAX_WORKERS} parallel workers\n")
+    if not total_batches:
+        return []
+    ledger = BatchLedger(LEDGER_DIR)
+    print(f"\n📊 Processing {len(veo_clubs)} clubs in {total_batches} batches of ~{len(veo_clubs) // total_batches} "
+          f"(≤{BATCH_INPUT_TOKENS} prompt / ~{BATCH_OUTPUT_TOKENS} response tokens, "
+          f"{TOKEN_ESTIMATE.chars_per_token:.2f} chars/token)")
+    print(f"🚀 Using {MAX_WORKERS} parallel workers (ledger: {LEDGER_DIR})\n")
     
     # Process batches in parallel
     start_time = time.time()
+    matches = []
+    failed = []
     
     with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
         # Submit all batches
         future_to_batch = {
-            executor.submit(process_batch, model, batch, i+1, total_batches): i+1
+            executor.submit(process_batch, model, ledger, batch, f"{i+1}/{total_batches}"): i+1
             for i, batch in enumerate(batches)
         }
         
@@ -231,15 +330,19 @@ def process_veo_clubs_parallel(model, veo_clubs: List[Dict]) -> List[Dict]:
         for future in tqdm(as_completed(future_to_batch), total=total_batches, desc="Processing batches"):
             batch_num = future_to_batch[future]
             try:
-                future.result()
+                matches.extend(future.result())
             except Exception as e:
+                failed.append(batch_num)
                 print(f"  ❌ Batch {batch_num} failed: {e}")
     
     elapsed = time.time() - start_time
     print(f"\n⏱️  Total processing time: {elapsed:.1f}s ({elapsed/60:.1f} minutes)")
     print(f"📈 Average: {elapsed/total_batches:.2f}s per batch")
+    if failed:
+        print(f"⚠️  {len(failed)} batch(es) failed: {sorted(failed)} - re-run to retry only those "
+              f"(completed batches are reused from the ledger)")
     
-    return all_matches.copy()
+    return matches
 
 
 def save_matches(matches: List[Dict], output_path: Path, append: bool = False):
@@ -283,18 +386,13 @@ def main():
     print("=" * 60)
     print()
     
-    # Setup Gemini
-    try:
-        model = setup_gemini()
-    except Exception as e:
-        print(f"❌ Failed to setup Gemini: {e}")
-        return
+    store = ClubStore(STORE_PATH)
     
     # Load reference list (optional)
     irish_clubs = []
     if USE_REFERENCE_MATCHING:
         try:
-            irish_clubs = load_irish_clubs()
+            irish_clubs = load_irish_clubs(store)
             print(f"✅ Loaded {len(irish_clubs)} reference clubs for validation")
         except Exception as e:
             print(f"⚠️  Could not load reference clubs: {e}")
@@ -317,13 +415,31 @@ def main():
     print(f"\n📂 Loading all VEO clubs from {len(veo_files)} files...")
     veo_clubs = []
     for file_path in tqdm(veo_files, desc="Loading files"):
-        clubs = load_veo_clubs_from_file(file_path)
+        clubs = load_veo_clubs_from_file(store, file_path)
         veo_clubs.extend(clubs)
     
     print(f"✅ Loaded {len(veo_clubs)} total VEO clubs")
     
+    # Local pre-filter: auto-accept confident matches, drop obvious non-GAA clubs
+    matches = []
+    to_classify = veo_clubs
+    if LOCAL_PREFILTER:
+        print(f"\n🔎 Local matching against {CLUBS_IRELAND_CSV.name}...")
+        start_time = time.time()
+        matcher = ClubMatcher.from_rows(store.rows(CLUBS_IRELAND_CSV, columns=['Club Name', 'County', 'Province', 'Country', 'Latitude', 'Longitude']))
+        accepted, to_classify, rejected = matcher.partition(veo_clubs)
+        matches = [{'club_name': club['name'], 'recordings': club['recordings']} for club in accepted]
+        print(f"✅ Local matcher ({time.time() - start_time:.1f}s): {len(accepted)} accepted, "
+              f"{len(to_classify)} ambiguous -> Gemini, {len(rejected)} rejected")
+    
     # Process with Gemini (parallel)
-    matches = process_veo_clubs_parallel(model, veo_clubs)
+    if to_classify:
+        try:
+            model = setup_gemini()
+        except Exception as e:
+            print(f"❌ Failed to setup Gemini: {e}")
+            return
+        matches += process_veo_clubs_parallel(model, to_classify)
     
     # Save results (append if not starting from file 1)
     append_mode = START_FILE > 1
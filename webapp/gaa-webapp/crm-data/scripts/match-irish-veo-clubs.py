@@ -19,6 +19,10 @@ import google.generativeai as genai
 from dotenv import load_dotenv
 from tqdm import tqdm
 import time
+from collections import deque
+
+from club_store import ClubStore
+from token_batcher import TokenEstimator, is_truncated, pack
 
 # Fix Windows console encoding for emojis
 if sys.platform == 'win32':
@@ -32,7 +36,10 @@ load_dotenv(SCRIPT_DIR / '.env')
 # Configuration
 GEMINI_API_KEY = os.getenv('GEMINI_API_KEY')
 GEMINI_MODEL = os.getenv('GEMINI_MODEL', 'gemini-1.5-flash')
-BATCH_SIZE = int(os.getenv('BATCH_SIZE', '50'))  # Number of clubs to send to Gemini at once
+BATCH_SIZE = int(os.getenv('BATCH_SIZE', '50'))  # Max clubs to send to Gemini at once (batches are packed by tokens)
+BATCH_INPUT_TOKENS = int(os.getenv('BATCH_INPUT_TOKENS', '40000'))  # Prompt token budget per API call
+BATCH_OUTPUT_TOKENS = int(os.getenv('BATCH_OUTPUT_TOKENS', '6000'))  # Expected response tokens per call, kept under max output
+EXPECTED_MATCH_RATE = float(os.getenv('EXPECTED_MATCH_RATE', '0.05'))  # Share of clubs Gemini is expected to return
 TEST_MODE = False  # Set to False to process all files
 TEST_LIMIT = 1000  # Number of clubs to process in test mode (entire first file)
 
@@ -40,6 +47,8 @@ TEST_LIMIT = 1000  # Number of clubs to process in test mode (entire first file)
 CLUBS_IRELAND_CSV = DATA_DIR / 'clubs_not_using_veo.csv'  # Using clubs_not_using_veo.csv as reference
 VEO_CLUBS_PATTERN = DATA_DIR / 'veo_clubs_27k_part*.csv'
 OUTPUT_CSV = DATA_DIR / 'irish_veo_clubs_matched.csv'
+STORE_PATH = DATA_DIR / 'club_store.sqlite'  # Indexed SQLite mirror of the CSVs (club_store.py)
+CALIBRATION_FILE = SCRIPT_DIR / '.match-chars-per-token.json'  # Chars/token batches are packed with (same batches every run)
 
 
 def setup_gemini():
@@ -73,21 +82,20 @@ def setup_gemini():
         return model
 
 
-def load_irish_clubs() -> List[Dict]:
+def load_irish_clubs(store: ClubStore) -> List[Dict]:
     """Load the reference list of Irish GAA clubs"""
     clubs = []
-    with open(CLUBS_IRELAND_CSV, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            # Handle both clubs_ireland.csv and clubs_not_using_veo.csv structures
-            club_name = row.get('Club Name', '').strip()
-            if not club_name:
-                continue
-            clubs.append({
-                'name': club_name,
-                'recordings': row.get('Recordings', row.get('VEO Recordings', '0')),
-                'identifier': row.get('Club Identifier', row.get('VEO Club Identifier', ''))
-            })
+    columns = ['Club Name', 'Recordings', 'VEO Recordings', 'Club Identifier', 'VEO Club Identifier']
+    for row in store.rows(CLUBS_IRELAND_CSV, columns=columns):
+        # Handle both clubs_ireland.csv and clubs_not_using_veo.csv structures
+        club_name = row.get('Club Name', '').strip()
+        if not club_name:
+            continue
+        clubs.append({
+            'name': club_name,
+            'recordings': row.get('Recordings', row.get('VEO Recordings', '0')),
+            'identifier': row.get('Club Identifier', row.get('VEO Club Identifier', ''))
+        })
     print(f"✅ Loaded {len(clubs)} Irish GAA clubs from reference list")
     return clubs
 
@@ -99,31 +107,29 @@ def load_veo_clubs_files() -> List[Path]:
     return veo_files
 
 
-def load_veo_clubs_from_file(file_path: Path, limit: Optional[int] = None) -> List[Dict]:
+def load_veo_clubs_from_file(store: ClubStore, file_path: Path, limit: Optional[int] = None) -> List[Dict]:
     """Load VEO clubs from a single file"""
     clubs = []
-    with open(file_path, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for i, row in enumerate(reader):
-            if limit and i >= limit:
-                break
-            clubs.append({
-                'name': row['Club Name'].strip(),
-                'recordings': row.get('Recordings', '0'),
-                'identifier': row.get('Club Identifier', '').strip()
-            })
+    for row in store.rows(file_path, columns=['Club Name', 'Recordings', 'Club Identifier'], limit=limit or None):
+        clubs.append({
+            'name': row['Club Name'].strip(),
+            'recordings': row.get('Recordings', '0'),
+            'identifier': row.get('Club Identifier', '').strip()
+        })
     return clubs
 
 
+def format_club_line(club: Dict) -> str:
+    """One prompt line per VEO club"""
+    return (f"- {club['name']} ({club['recordings']} recordings" +
+            (f", identifier: {club['identifier']})" if club.get('identifier') else ")"))
+
+
 def create_gemini_prompt(veo_clubs_batch: List[Dict]) -> str:
     """Create prompt for Gemini API to identify Irish GAA clubs"""
     
     # Format VEO clubs batch for the prompt, including identifier if available
-    veo_clubs_text = "\n".join([
-        f"- {club['name']} ({club['recordings']} recordings" + 
-        (f", identifier: {club['identifier']})" if club.get('identifier') else ")")
-        for club in veo_clubs_batch
-    ])
+    veo_clubs_text = "\n".join(format_club_line(club) for club in veo_clubs_batch)
     
     prompt = f"""You are analyzing a list of sports clubs to identify Irish GAA (Gaelic Athletic Association) clubs.
 
@@ -162,9 +168,12 @@ If no clubs are Irish GAA clubs, return an empty array: []
 
 
 def call_gemini_api(model, prompt: str) -> Optional[List[Dict]]:
-    """Call Gemini API and parse the response"""
+    """Call Gemini API and parse the response (None if it was cut off at max output tokens)"""
     try:
         response = model.generate_content(prompt)
+        if is_truncated(response):
+            print(f"   ⚠️  Response truncated at max output tokens")
+            return None
         response_text = response.text.strip()
         
         # Debug: Show first 300 chars of response
@@ -243,14 +252,25 @@ def process_veo_clubs(model, veo_clubs: List[Dict], irish_clubs: List[Dict]) ->
     """Process VEO clubs in batches using Gemini API"""
     all_matches = []
     
-    # Process in batches
-    total_batches = (len(veo_clubs) + BATCH_SIZE - 1) // BATCH_SIZE
+    # Pack batches by estimated prompt / response tokens rather than a fixed club count
+    estimate = TokenEstimator()
+    estimate.calibrate(model, create_gemini_prompt(veo_clubs[:200]), cache_file=CALIBRATION_FILE)
+    queue = deque(pack(
+        veo_clubs,
+        input_tokens=lambda club: estimate(format_club_line(club) + '\n'),
+        input_budget=BATCH_INPUT_TOKENS - estimate(create_gemini_prompt([])),
+        output_tokens=lambda club: EXPECTED_MATCH_RATE * estimate(f'{{"club_name": "{club["name"]}", "recordings": "{club["recordings"]}"}},\n'),
+        output_budget=BATCH_OUTPUT_TOKENS,
+        max_items=BATCH_SIZE,
+    ))
     
-    print(f"\n📊 Processing {len(veo_clubs)} VEO clubs in {total_batches} batches...")
+    print(f"\n📊 Processing {len(veo_clubs)} VEO clubs in {len(queue)} batches...")
     
-    for i in range(0, len(veo_clubs), BATCH_SIZE):
-        batch = veo_clubs[i:i + BATCH_SIZE]
-        batch_num = (i // BATCH_SIZE) + 1
+    batch_num = 0
+    while queue:
+        batch = queue.popleft()
+        batch_num += 1
+        total_batches = batch_num + len(queue)
         
         print(f"\n🔄 Processing batch {batch_num}/{total_batches} ({len(batch)} clubs)...")
         
@@ -260,6 +280,13 @@ def process_veo_clubs(model, veo_clubs: List[Dict], irish_clubs: List[Dict]) ->
         # Call Gemini API
         gemini_matches = call_gemini_api(model, prompt)
         
+        if gemini_matches is None and len(batch) > 1:
+            # Response hit max output tokens: retry the same clubs as two smaller batches
+            half = len(batch) // 2
+            queue.extendleft([batch[half:], batch[:half]])
+            print(f"   ✂️  Re-queued as 2 batches of ~{half} clubs")
+            continue
+        
         if gemini_matches:
             print(f"   📋 Gemini identified {len(gemini_matches)} Irish GAA clubs")
             for gm in gemini_matches:
@@ -325,8 +352,9 @@ def main():
         return
     
     # Load reference list
+    store = ClubStore(STORE_PATH)
     try:
-        irish_clubs = load_irish_clubs()
+        irish_clubs = load_irish_clubs(store)
     except Exception as e:
         print(f"❌ Failed to load Irish clubs: {e}")
         return
@@ -340,12 +368,12 @@ def main():
     # Load VEO clubs (test mode: just first file with limit)
     if TEST_MODE:
         print(f"\n🧪 TEST MODE: Processing first file with limit of {TEST_LIMIT} clubs")
-        veo_clubs = load_veo_clubs_from_file(veo_files[0], limit=TEST_LIMIT)
+        veo_clubs = load_veo_clubs_from_file(store, veo_files[0], limit=TEST_LIMIT)
     else:
         print(f"\n📂 Loading all VEO clubs from {len(veo_files)} files...")
         veo_clubs = []
         for file_path in tqdm(veo_files, desc="Loading files"):
-            clubs = load_veo_clubs_from_file(file_path)
+            clubs = load_veo_clubs_from_file(store, file_path)
             veo_clubs.extend(clubs)
     
     print(f"✅ Loaded {len(veo_clubs)} VEO clubs to analyze")
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Persistent page cache for scrape-club-contacts.py
+
+Two SQLite tables in one file:
+  pages   - URL -> response body (zlib), ETag / Last-Modified, fetch and access times
+  scans   - (content hash, parser version) -> visible text, emails, phones (zlib)
+
+A page younger than the TTL is served without touching the network. An older
+page is revalidated with If-None-Match / If-Modified-Since; a 304 refreshes it.
+If the network fails, a stale copy is still used. Bodies are capped at
+max_bytes in total, evicting least-recently-used pages first.
+
+Page scans are keyed by the SHA-256 of the page body alone, so the same county
+board page found for another club, under another URL, or re-downloaded
+unchanged skips the HTML parse. Only the contact-name step runs per club (it
+rejects names that look like the club's own name), on top of the cached scan.
+
+Usage:
+    cache = PageCache(CACHE_PATH)
+    entry = cache.lookup(url)
+    if entry and entry.fresh: html = entry.body
+    else: headers = cache.conditional_headers(entry) ... cache.store(url, body, etag, last_modified)
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional
+
+TTL_SECONDS = 7 * 24 * 3600  # Serve without revalidating for a week
+MAX_BYTES = 500 * 1024 * 1024  # Compressed bodies kept on disk
+
+
+@dataclass
+class CachedPage:
+    url: str
+    body: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+    content_hash: str
+    fresh: bool
+
+
+def content_hash(body: str) -> str:
+    return hashlib.sha256(body.encode('utf-8', 'replace')).hexdigest()
+
+
+class PageCache:
+    """URL response cache with conditional revalidation, TTL and LRU eviction"""
+
+    def __init__(self, path: Path, ttl: float = TTL_SECONDS, max_bytes: int = MAX_BYTES):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.stats = {'fresh': 0, 'revalidated': 0, 'stale': 0, 'stored': 0, 'evicted': 0,
+                      'parsed_hits': 0, 'parsed_misses': 0}
+        # Only the main thread (sync engine) or the event loop (async engine) touches the cache -
+        # parsing runs in worker processes and gets plain arguments - so this is a cheap safeguard
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._db.executescript("""
+            PRAGMA journal_mode=WAL;
+            PRAGMA synchronous=NORMAL;
+            CREATE TABLE IF NOT EXISTS pages (
+                url TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                fetched_at REAL,
+                accessed_at REAL,
+                size INTEGER,
+                content_hash TEXT,
+                body BLOB
+            );
+            CREATE INDEX IF NOT EXISTS pages_accessed ON pages(accessed_at);
+            DROP TABLE IF EXISTS parsed;
+            CREATE TABLE IF NOT EXISTS scans (
+                content_hash TEXT,
+                version TEXT,
+                result BLOB,
+                PRIMARY KEY (content_hash, version)
+            );
+        """)
+
+    # ---- pages -------------------------------------------------------------
+
+    def lookup(self, url: str) -> Optional[CachedPage]:
+        """Cached copy of url (fresh=False means it should be revalidated), or None"""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT etag, last_modified, fetched_at, content_hash, body FROM pages WHERE url = ?", (url,)
+            ).fetchone()
+            if row is None:
+                return None
+            now = time.time()
+            self._db.execute("UPDATE pages SET accessed_at = ? WHERE url = ?", (now, url))
+            self._db.commit()
+        etag, last_modified, fetched_at, digest, body = row
+        fresh = now - fetched_at < self.ttl
+        if fresh:
+            self.stats['fresh'] += 1
+        return CachedPage(url, zlib.decompress(body).decode('utf-8'), etag, last_modified, digest, fresh)
+
+    @staticmethod
+    def conditional_headers(entry: Optional[CachedPage]) -> Dict[str, str]:
+        """If-None-Match / If-Modified-Since headers for revalidating entry"""
+        headers = {}
+        if entry is not None:
+            if entry.etag:
+                headers['If-None-Match'] = entry.etag
+            if entry.last_modified:
+                headers['If-Modified-Since'] = entry.last_modified
+        return headers
+
+    def revalidated(self, entry: CachedPage) -> str:
+        """Server answered 304 - restart the entry's TTL and return its body"""
+        with self._lock:
+            self._db.execute("UPDATE pages SET fetched_at = ? WHERE url = ?", (time.time(), entry.url))
+            self._db.commit()
+        self.stats['revalidated'] += 1
+        return entry.body
+
+    def stale(self, entry: CachedPage) -> str:
+        """Network failed - fall back to the stale body"""
+        self.stats['stale'] += 1
+        return entry.body
+
+    def store(self, url: str, body: str, etag: Optional[str] = None, last_modified: Optional[str] = None):
+        """Cache a 200 response, then evict least-recently-used pages over max_bytes"""
+        blob = zlib.compress(body.encode('utf-8', 'replace'), 6)
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (url, etag, last_modified, now, now, len(blob), content_hash(body), blob)
+            )
+            self._evict()
+            self._db.commit()
+        self.stats['stored'] += 1
+
+    def _evict(self):
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM pages").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for url, size in self._db.execute("SELECT url, size FROM pages ORDER BY accessed_at").fetchall():
+            if total <= self.max_bytes:
+                break
+            self._db.execute("DELETE FROM pages WHERE url = ?", (url,))
+            total -= size
+            self.stats['evicted'] += 1
+        # Scans whose page body is no longer cached anywhere
+        self._db.execute("DELETE FROM scans WHERE content_hash NOT IN (SELECT content_hash FROM pages)")
+
+    # ---- page scans --------------------------------------------------------
+
+    def get_scan(self, digest: str, version: str):
+        """Cached club-independent (text, emails, phones) for a page body, or None"""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT result FROM scans WHERE content_hash = ? AND version = ?", (digest, version)
+            ).fetchone()
+        if row is None:
+            self.stats['parsed_misses'] += 1
+            return None
+        self.stats['parsed_hits'] += 1
+        text, emails, phones = json.loads(zlib.decompress(row[0]).decode('utf-8'))
+        return text, emails, phones
+
+    def put_scan(self, digest: str, version: str, scan):
+        blob = zlib.compress(json.dumps(list(scan)).encode('utf-8'), 6)
+        with self._lock:
+            self._db.execute("INSERT OR REPLACE INTO scans VALUES (?, ?, ?)", (digest, version, blob))
+            self._db.commit()
+
+    def summary(self) -> str:
+        s = self.stats
+        return (f"{s['fresh']} fresh, {s['revalidated']} revalidated (304), {s['stale']} stale fallbacks, "
+                f"{s['stored']} downloaded, {s['evicted']} evicted; parsed {s['parsed_hits']} hits / "
+                f"{s['parsed_misses']} misses")
+
+    def close(self):
+        with self._lock:
+            self._db.close()
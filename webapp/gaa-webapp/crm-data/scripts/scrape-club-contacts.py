@@ -4,7 +4,7 @@ Scrape contact information (coach/secretary name and email) for GAA clubs
 by searching Google for each club
 """
 
-import csv
+import asyncio
 import re
 import sys
 import time
@@ -16,6 +16,13 @@ from bs4 import BeautifulSoup
 from tqdm import tqdm
 from dotenv import load_dotenv
 import os
+from concurrent.futures import ProcessPoolExecutor
+
+from scrape_engine import AsyncFetcher, HAS_AIOHTTP
+from scrape_journal import ContactJournal
+from page_cache import PageCache, content_hash
+from contact_extract import HAS_LXML, scan_page
+from club_store import ClubStore
 
 # Fix Windows console encoding
 if sys.platform == 'win32':
@@ -31,6 +38,9 @@ INPUT_CSV = DATA_DIR / 'irish_veo_clubs_matched_with_locations.csv'
 # Optionally use a filtered CSV for clubs without contacts
 FILTERED_INPUT_CSV = SCRIPT_DIR / 'clubs_without_contacts.csv'
 OUTPUT_CSV = DATA_DIR / 'irish_veo_clubs_contacts.csv'
+OUTPUT_FIELDS = ['Club', 'Contact Name', 'Contact Email', 'Contact Phone']
+JOURNAL_PATH = DATA_DIR / 'irish_veo_clubs_contacts.jsonl'  # Append-only per-club results; OUTPUT_CSV is compacted from it
+STORE_PATH = DATA_DIR / 'club_store.sqlite'  # Indexed SQLite mirror of the CSVs (club_store.py)
 
 # Apify API Configuration
 # Use the full token from the URL you provided
@@ -41,6 +51,19 @@ APIFY_API_URL = "https://api.apify.com/v2/acts/apify~google-search-scraper/run-s
 TEST_MODE = False  # Set to False to process all clubs
 TEST_LIMIT = 10  # Number of clubs to process in test mode
 RESULTS_PER_PAGE = 10  # Number of search results per query
+SCRAPE_ENGINE = os.getenv('SCRAPE_ENGINE', 'async')  # 'async' (concurrent, per-site politeness) or 'sync' (serial)
+SCRAPE_CONCURRENCY = int(os.getenv('SCRAPE_CONCURRENCY', '32'))  # Open connections across all sites
+SCRAPE_PER_DOMAIN = int(os.getenv('SCRAPE_PER_DOMAIN', '2'))  # In-flight requests per site
+SCRAPE_DOMAIN_INTERVAL = float(os.getenv('SCRAPE_DOMAIN_INTERVAL', '1.0'))  # Seconds between request starts per site
+SEARCH_CONCURRENCY = int(os.getenv('SEARCH_CONCURRENCY', '8'))  # Parallel Apify searches
+PARSE_WORKERS = int(os.getenv('PARSE_WORKERS', str(os.cpu_count() or 4)))  # Processes parsing HTML (async engine)
+
+# Page cache (re-runs and clubs sharing county board pages skip the network and the HTML parse)
+PAGE_CACHE_ENABLED = os.getenv('PAGE_CACHE', 'true').lower() == 'true'
+PAGE_CACHE_PATH = SCRIPT_DIR / '.scrape-cache' / 'pages.sqlite'
+PAGE_CACHE_TTL_DAYS = float(os.getenv('PAGE_CACHE_TTL_DAYS', '7'))  # Revalidate (ETag/Last-Modified) after this
+PAGE_CACHE_MAX_MB = int(os.getenv('PAGE_CACHE_MAX_MB', '500'))  # LRU eviction above this
+PARSER_VERSION = '3'  # Bump when extraction changes to invalidate cached page scans
 
 # Email pattern
 EMAIL_PATTERN = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
@@ -62,7 +85,11 @@ HEADERS = {
 
 def extract_emails(text):
     """Extract email addresses from text"""
-    emails = EMAIL_PATTERN.findall(text)
+    return clean_emails(EMAIL_PATTERN.findall(text))
+
+
+def clean_emails(emails):
+    """Filter and tidy raw email matches"""
     # Filter out common non-contact emails
     filtered = [e for e in emails if not any(x in e.lower() for x in ['noreply', 'no-reply', 'donotreply', 'example.com', 'test.com'])]
     
@@ -87,43 +114,46 @@ def extract_emails(text):
 
 def extract_phone_numbers(text):
     """Extract phone numbers from text (Irish formats)"""
+    return format_phone_numbers(match for pattern in PHONE_PATTERNS for match in pattern.findall(text))
+
+
+def format_phone_numbers(matches):
+    """Normalise and filter raw phone matches (Irish formats)"""
     phones = []
     
-    for pattern in PHONE_PATTERNS:
-        matches = pattern.findall(text)
-        for match in matches:
-            # Clean up the phone number
-            phone = re.sub(r'[\s\-\(\)]', '', match)  # Remove spaces, dashes, parentheses
-            digits_only = re.sub(r'[^\d]', '', phone)
-            
-            # Validate it's a reasonable length (9-12 digits)
-            if 9 <= len(digits_only) <= 12:
-                # Format nicely
-                if phone.startswith('+353'):
-                    clean_num = phone[4:].replace('+', '').replace(' ', '')
-                    if len(clean_num) >= 9:
-                        formatted = f"+353 {clean_num}"
-                    else:
-                        continue
-                elif phone.startswith('00353'):
-                    clean_num = phone[5:].replace(' ', '')
-                    if len(clean_num) >= 9:
-                        formatted = f"+353 {clean_num}"
-                    else:
-                        continue
-                elif phone.startswith('0') and len(digits_only) >= 9:
-                    # Irish format: keep as is but ensure it starts with 0
-                    formatted = '0' + digits_only[1:] if not phone.startswith('0') else phone
+    for match in matches:
+        # Clean up the phone number
+        phone = re.sub(r'[\s\-\(\)]', '', match)  # Remove spaces, dashes, parentheses
+        digits_only = re.sub(r'[^\d]', '', phone)
+        
+        # Validate it's a reasonable length (9-12 digits)
+        if 9 <= len(digits_only) <= 12:
+            # Format nicely
+            if phone.startswith('+353'):
+                clean_num = phone[4:].replace('+', '').replace(' ', '')
+                if len(clean_num) >= 9:
+                    formatted = f"+353 {clean_num}"
                 else:
                     continue
-                
-                # Additional validation - check it's not all same digits
-                if len(set(digits_only)) < 3:
+            elif phone.startswith('00353'):
+                clean_num = phone[5:].replace(' ', '')
+                if len(clean_num) >= 9:
+                    formatted = f"+353 {clean_num}"
+                else:
                     continue
-                
-                if formatted not in phones:
-                    phones.append(formatted)
-    
+            elif phone.startswith('0') and len(digits_only) >= 9:
+                # Irish format: keep as is but ensure it starts with 0
+                formatted = '0' + digits_only[1:] if not phone.startswith('0') else phone
+            else:
+                continue
+            
+            # Additional validation - check it's not all same digits
+            if len(set(digits_only)) < 3:
+                continue
+            
+            if formatted not in phones:
+                phones.append(formatted)
+
     # Filter out common fake/test numbers and invalid patterns
     filtered = []
     for p in phones:
@@ -138,9 +168,11 @@ def extract_phone_numbers(text):
     return filtered[:3]  # Return max 3 phone numbers
 
 
-def extract_contact_name(soup, text, club_name, emails=None):
+def extract_contact_name(soup, text, club_name, emails=None, html=None):
     """Try to extract contact name from HTML and text using multiple strategies
-    Prioritizes names extracted from email addresses as they're most reliable"""
+    Prioritizes names extracted from email addresses as they're most reliable
+    
+    With soup=None and html given, the soup is only built if the email strategy finds nothing"""
     names_found = []
     
     # Common Irish first names and titles to look for
@@ -293,6 +325,9 @@ def extract_contact_name(soup, text, club_name, emails=None):
         # Add email-extracted names first (highest priority)
         names_found.extend(email_names)
     
+    if not names_found and soup is None and html is not None:
+        soup = make_soup(html)
+    
     # Strategy 2: Look for names in proximity to email addresses in HTML (only if no email names found)
     if not names_found and emails and soup:
         for email in emails[:3]:  # Check first 3 emails
@@ -502,25 +537,75 @@ def validate_name(name, skip_words, irish_names, club_name):
     return None
 
 
+def extract_search_links(data, num_results=5):
+    """Pull organic result URLs out of an Apify google-search-scraper response"""
+    links = []
+    
+    # Apify returns a list where each item is a search result page
+    # Each page contains organicResults with the actual URLs
+    if isinstance(data, list) and len(data) > 0:
+        # Get the first (and likely only) search result page
+        page = data[0] if isinstance(data[0], dict) else {}
+
+        # Look for organic results - the actual search result URLs
+        organic_results = (page.get('organicResults') or page.get('organic') or 
+                          page.get('results') or page.get('items') or [])
+
+        # If no organic results, check if the page itself has URL fields
+        if not organic_results and isinstance(page, dict):
+            # Try to find any nested results
+            for key in ['organicResults', 'organic', 'results', 'items', 'organicResultsList']:
+                if key in page and isinstance(page[key], list):
+                    organic_results = page[key]
+                    break
+
+        # Extract URLs from organic results
+        for result in organic_results[:num_results]:
+            if isinstance(result, dict):
+                # Common field names for the result URL
+                url = (result.get('url') or result.get('link') or result.get('href') or 
+                      result.get('resultUrl') or result.get('website') or result.get('organicUrl') or
+                      result.get('titleUrl') or result.get('displayUrl'))
+
+                # Filter out Google search pages and other unwanted URLs
+                if url and url.startswith('http'):
+                    url_lower = url.lower()
+                    # Skip Google search pages, Google domains, and other search engines
+                    if not any(skip in url_lower for skip in ['google.com/search', 'google.ie/search', 
+                                                              'bing.com', 'duckduckgo.com']):
+                        links.append(url)
+    
+    return links
+
+
+def search_payload(query):
+    """Apify google-search-scraper input for one query"""
+    # Payload format - queries must be a string, not array
+    return {
+        "queries": query,  # String, not array
+        "resultsPerPage": RESULTS_PER_PAGE,
+        "maxPagesPerQuery": 1,
+        "countryCode": "ie"  # Ireland for GAA clubs
+    }
+
+
 def search_google_apify(query, num_results=5):
-    """Search Google using Apify API and return result URLs"""
+    """
+    Search Google using Apify API and return result URLs
+    
+    Returns [] only when the search ran and found nothing; API failures (quota, 5xx,
+    timeout, bad response) raise, so the club is not journalled and is retried next run
+    """
     links = []
     
     if not APIFY_API_TOKEN:
-        print(f"   ⚠️  APIFY_API_TOKEN not set in environment")
-        return []
+        raise RuntimeError("APIFY_API_TOKEN not set in environment")
     
     try:
         # Prepare Apify API request - try token in URL first (as per Apify docs for run-sync)
         url = f"{APIFY_API_URL}?token={APIFY_API_TOKEN}"
         
-        # Payload format - queries must be a string, not array
-        payload = {
-            "queries": query,  # String, not array
-            "resultsPerPage": RESULTS_PER_PAGE,
-            "maxPagesPerQuery": 1,
-            "countryCode": "ie"  # Ireland for GAA clubs
-        }
+        payload = search_payload(query)
         
         headers = {
             "Content-Type": "application/json"
@@ -541,39 +626,7 @@ def search_google_apify(query, num_results=5):
         # Parse response
         data = response.json()
         
-        # Apify returns a list where each item is a search result page
-        # Each page contains organicResults with the actual URLs
-        if isinstance(data, list) and len(data) > 0:
-            # Get the first (and likely only) search result page
-            page = data[0] if isinstance(data[0], dict) else {}
-            
-            # Look for organic results - the actual search result URLs
-            organic_results = (page.get('organicResults') or page.get('organic') or 
-                              page.get('results') or page.get('items') or [])
-            
-            # If no organic results, check if the page itself has URL fields
-            if not organic_results and isinstance(page, dict):
-                # Try to find any nested results
-                for key in ['organicResults', 'organic', 'results', 'items', 'organicResultsList']:
-                    if key in page and isinstance(page[key], list):
-                        organic_results = page[key]
-                        break
-            
-            # Extract URLs from organic results
-            for result in organic_results[:num_results]:
-                if isinstance(result, dict):
-                    # Common field names for the result URL
-                    url = (result.get('url') or result.get('link') or result.get('href') or 
-                          result.get('resultUrl') or result.get('website') or result.get('organicUrl') or
-                          result.get('titleUrl') or result.get('displayUrl'))
-                    
-                    # Filter out Google search pages and other unwanted URLs
-                    if url and url.startswith('http'):
-                        url_lower = url.lower()
-                        # Skip Google search pages, Google domains, and other search engines
-                        if not any(skip in url_lower for skip in ['google.com/search', 'google.ie/search', 
-                                                                  'bing.com', 'duckduckgo.com']):
-                            links.append(url)
+        links = extract_search_links(data, num_results)
         
         # Debug: if no links found, show what we got
         if not links and isinstance(data, list) and len(data) > 0:
@@ -593,105 +646,144 @@ def search_google_apify(query, num_results=5):
         else:
             print(f"   ⚠️  No URLs found in Apify response")
             # Debug: show response structure
-            if isinstance(results, dict):
-                print(f"   Response keys: {list(results.keys())[:10]}")
-            elif isinstance(results, list) and len(results) > 0:
-                print(f"   Results count: {len(results)}, First result type: {type(results[0])}")
-                if isinstance(results[0], dict):
-                    print(f"   First result keys: {list(results[0].keys())[:10]}")
+            if isinstance(data, dict):
+                print(f"   Response keys: {list(data.keys())[:10]}")
+            elif isinstance(data, list) and len(data) > 0:
+                print(f"   Results count: {len(data)}, First result type: {type(data[0])}")
+                if isinstance(data[0], dict):
+                    print(f"   First result keys: {list(data[0].keys())[:10]}")
                     # Show first result for debugging
-                    print(f"   First result sample: {str(results[0])[:200]}...")
+                    print(f"   First result sample: {str(data[0])[:200]}...")
             return []
             
     except requests.exceptions.RequestException as e:
         print(f"   ⚠️  Apify API error: {e}")
         if hasattr(e, 'response') and e.response is not None:
             print(f"   Response: {e.response.text[:300]}...")
-        return []
+        raise
     except json.JSONDecodeError as e:
         print(f"   ⚠️  Failed to parse Apify response: {e}")
         print(f"   Response: {response.text[:500]}...")
-        return []
+        raise
     except Exception as e:
         print(f"   ⚠️  Unexpected error: {e}")
         import traceback
         print(f"   Traceback: {traceback.format_exc()[:200]}...")
-        return []
+        raise
+
+
+SKIP_DOMAINS = ['facebook.com', 'twitter.com', 'instagram.com', 'youtube.com',
+                'linkedin.com', 'wikipedia.org', 'gaa.ie']  # gaa.ie might have contacts but often generic
 
 
-def scrape_page_for_contacts(url, club_name):
+def should_skip_url(url):
+    """Skip certain domains that are unlikely to have contact info"""
+    domain = urlparse(url).netloc.lower()
+    return any(skip in domain for skip in SKIP_DOMAINS)
+
+
+def make_soup(html):
+    """BeautifulSoup tree with script and style elements removed"""
+    soup = BeautifulSoup(html, 'lxml' if HAS_LXML else 'html.parser')
+    
+    # Remove script and style elements
+    for script in soup(["script", "style"]):
+        script.decompose()
+    
+    return soup
+
+
+def scan_page_contacts(html):
+    """Club-independent part of parsing: (visible text, emails, phone_numbers) from a downloaded page"""
+    if HAS_LXML:
+        # One lxml parse + one combined regex
+        try:
+            page = scan_page(html)
+        except Exception:
+            # lxml rejects some pages (a str with an XML encoding declaration, empty documents);
+            # BeautifulSoup below still parses them
+            page = None
+        if page is not None:
+            return page.text, clean_emails(page.emails), format_phone_numbers(page.phones)
+    
+    soup = make_soup(html)
+    
+    text = soup.get_text()
+    
+    # Also check HTML for email links and phone numbers
+    full_text = text + ' ' + str(soup)
+    
+    return text, extract_emails(full_text), extract_phone_numbers(full_text)
+
+
+def parse_page_for_contacts(html, club_name, scan=None):
+    """Extract (emails, contact_name, phone_numbers) from a downloaded page (scan: its scan_page_contacts)"""
+    text, emails, phone_numbers = scan if scan is not None else scan_page_contacts(html)
+    # BeautifulSoup is only built if the email strategy finds no name
+    contact_name = extract_contact_name(None, text, club_name, emails, html=html)
+    return emails, contact_name, phone_numbers
+
+
+def parse_page_cached(html, club_name, cache=None):
+    """parse_page_for_contacts with the page scan memoised on its content hash (shared by every club)"""
+    if cache is None:
+        return parse_page_for_contacts(html, club_name)
+    digest = content_hash(html)
+    scan = cache.get_scan(digest, PARSER_VERSION)
+    if scan is None:
+        scan = scan_page_contacts(html)
+        cache.put_scan(digest, PARSER_VERSION, scan)
+    return parse_page_for_contacts(html, club_name, scan)
+
+
+def fetch_page(url, cache=None):
+    """GET a page, serving/revalidating through the page cache when given one; None on error"""
+    entry = cache.lookup(url) if cache else None
+    if entry is not None and entry.fresh:
+        return entry.body
+    try:
+        headers = dict(HEADERS, **(cache.conditional_headers(entry) if cache else {}))
+        response = requests.get(url, headers=headers, timeout=10)
+        if response.status_code == 304 and entry is not None:
+            return cache.revalidated(entry)
+        response.raise_for_status()
+        if cache:
+            cache.store(url, response.text, response.headers.get('ETag'), response.headers.get('Last-Modified'))
+        return response.text
+    except Exception:
+        return cache.stale(entry) if entry is not None else None
+
+
+def scrape_page_for_contacts(url, club_name, cache=None):
     """Scrape a webpage for contact information"""
     try:
-        # Skip certain domains that are unlikely to have contact info
-        domain = urlparse(url).netloc.lower()
-        skip_domains = ['facebook.com', 'twitter.com', 'instagram.com', 'youtube.com', 
-                       'linkedin.com', 'wikipedia.org', 'gaa.ie']  # gaa.ie might have contacts but often generic
-        
-        if any(skip in domain for skip in skip_domains):
+        if should_skip_url(url):
             return [], None, []
         
-        response = requests.get(url, headers=HEADERS, timeout=10)
-        response.raise_for_status()
-        
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        # Remove script and style elements
-        for script in soup(["script", "style"]):
-            script.decompose()
-        
-        text = soup.get_text()
-        
-        # Also check HTML for email links and phone numbers
-        html_text = str(soup)
-        full_text = text + ' ' + html_text
-        
-        # Extract emails from both text and HTML
-        emails = extract_emails(full_text)
-        
-        # Extract phone numbers
-        phone_numbers = extract_phone_numbers(full_text)
-        
-        # Extract contact name using improved method
-        contact_name = extract_contact_name(soup, text, club_name, emails)
+        html = fetch_page(url, cache)
+        if html is None:
+            return [], None, []
         
-        return emails, contact_name, phone_numbers
+        return parse_page_cached(html, club_name, cache)
     except Exception as e:
         return [], None, []
 
 
-def find_club_contacts(club_name):
-    """Find contact information for a club - returns list of contacts"""
-    # Build search query
-    query = f"{club_name} gaa coach secretary email contact phone"
-    
-    # Search Google using Apify
-    search_results = search_google_apify(query, num_results=5)
-    
-    if not search_results:
-        return []
-    
-    # Collect all contacts from all pages
+def club_search_query(club_name):
+    """Google query used to find a club's contact pages"""
+    return f"{club_name} gaa coach secretary email contact phone"
+
+
+def merge_page_contacts(page_results):
+    """Combine (emails, name, phones) from each scraped page into a de-duplicated contact list"""
     all_contacts = []  # List of {name, email, phone} dicts
     seen_emails = set()  # Track to avoid duplicates
     seen_phones = set()
-    all_names = []  # Collect all names found
     
-    for i, url in enumerate(search_results[:3], 1):  # Check first 3 results
-        print(f"   Scraping URL {i}/{min(3, len(search_results))}: {url[:60]}...")
-        emails, name, phones = scrape_page_for_contacts(url, club_name)
-        
-        if emails:
-            print(f"   Found {len(emails)} emails: {emails}")
-        if phones:
-            print(f"   Found {len(phones)} phone numbers: {phones}")
-        if name:
-            print(f"   Found contact name: {name}")
-            if name not in all_names:
-                all_names.append(name)
-        
+    for emails, name, phones in page_results:
         # Create contact entries - try to pair names with specific emails/phones
         # Strategy: Create one contact per unique email/phone combination
-        
+
         # First, if we have a name, create contacts with that name
         if name:
             # Pair name with each email (one contact per email)
@@ -704,14 +796,14 @@ def find_club_contacts(club_name):
                             phone = p
                             seen_phones.add(p)
                             break
-                    
+
                     all_contacts.append({
                         'name': name,
                         'email': email,
                         'phone': phone
                     })
                     seen_emails.add(email)
-            
+
             # Add remaining phones with this name
             for phone in phones:
                 if phone not in seen_phones:
@@ -734,7 +826,7 @@ def find_club_contacts(club_name):
                     seen_emails.add(email)
                     if phone:
                         seen_phones.add(phone)
-            
+
             # Add remaining phones
             for phone in phones:
                 if phone not in seen_phones:
@@ -744,9 +836,6 @@ def find_club_contacts(club_name):
                         'phone': phone
                     })
                     seen_phones.add(phone)
-        
-        # Small delay to avoid rate limiting
-        time.sleep(2)
     
     # Remove duplicates and empty contacts
     unique_contacts = []
@@ -771,6 +860,122 @@ def find_club_contacts(club_name):
     return unique_contacts
 
 
+def find_club_contacts(club_name, cache=None):
+    """Find contact information for a club - returns list of contacts"""
+    # Build search query
+    query = club_search_query(club_name)
+    
+    # Search Google using Apify
+    search_results = search_google_apify(query, num_results=5)
+    
+    if not search_results:
+        return []
+    
+    # Collect all contacts from all pages
+    page_results = []
+    all_names = []  # Collect all names found
+    
+    for i, url in enumerate(search_results[:3], 1):  # Check first 3 results
+        print(f"   Scraping URL {i}/{min(3, len(search_results))}: {url[:60]}...")
+        emails, name, phones = scrape_page_for_contacts(url, club_name, cache)
+        
+        if emails:
+            print(f"   Found {len(emails)} emails: {emails}")
+        if phones:
+            print(f"   Found {len(phones)} phone numbers: {phones}")
+        if name:
+            print(f"   Found contact name: {name}")
+            if name not in all_names:
+                all_names.append(name)
+        
+        page_results.append((emails, name, phones))
+        
+        # Small delay to avoid rate limiting
+        time.sleep(2)
+    
+    return merge_page_contacts(page_results)
+
+
+async def parse_page_async(pool, html, club_name, cache=None):
+    """parse_page_cached with the parsing in worker processes, so CPU work never blocks fetching"""
+    loop = asyncio.get_running_loop()
+    digest = content_hash(html) if cache else None
+    scan = cache.get_scan(digest, PARSER_VERSION) if cache else None
+    if scan is None:
+        scan = await loop.run_in_executor(pool, scan_page_contacts, html)
+        if cache:
+            cache.put_scan(digest, PARSER_VERSION, scan)
+    return await loop.run_in_executor(pool, parse_page_for_contacts, html, club_name, scan)
+
+
+async def find_club_contacts_async(fetcher, club_name, pool=None):
+    """
+    find_club_contacts on the async engine - search, page fetches and parsing overlap across clubs
+    
+    Search failures raise (like search_google_apify), so record() doesn't journal the club
+    """
+    if not APIFY_API_TOKEN:
+        raise RuntimeError("APIFY_API_TOKEN not set in environment")
+    
+    try:
+        data = await fetcher.post_json(APIFY_API_URL, search_payload(club_search_query(club_name)), token=APIFY_API_TOKEN)
+    except Exception as e:
+        print(f"   ⚠️  Apify API error for {club_name}: {e}")
+        raise
+    
+    urls = [url for url in extract_search_links(data, num_results=5)[:3] if not should_skip_url(url)]  # Check first 3 results
+    pages = await asyncio.gather(*(fetcher.get_text(url) for url in urls))
+    
+    async def parse(html):
+        try:
+            return await parse_page_async(pool, html, club_name, fetcher.cache)
+        except Exception:
+            return [], None, []
+    
+    page_results = await asyncio.gather(*(parse(html) for html in pages if html))
+    return merge_page_contacts(page_results)
+
+
+async def process_clubs_async(pending, record, cache=None):
+    """Run every pending (index, club_name) concurrently, calling record() as each club finishes"""
+    with ProcessPoolExecutor(max_workers=PARSE_WORKERS) as pool:
+        async with AsyncFetcher(headers=HEADERS, concurrency=SCRAPE_CONCURRENCY, per_domain=SCRAPE_PER_DOMAIN,
+                                interval=SCRAPE_DOMAIN_INTERVAL, search_concurrency=SEARCH_CONCURRENCY,
+                                cache=cache) as fetcher:
+            async def run(i, club_name):
+                try:
+                    return i, club_name, await find_club_contacts_async(fetcher, club_name, pool), None
+                except Exception as e:
+                    return i, club_name, [], e
+            
+            tasks = [run(i, club_name) for i, club_name in pending]
+            for done in tqdm(asyncio.as_completed(tasks), total=len(tasks), desc="Processing clubs"):
+                record(*await done)
+
+
+def contact_rows(club_name, contacts):
+    """Output CSV rows for a club - one per contact, or one empty row if none were found"""
+    rows = []
+    for contact in contacts:
+        # Ensure contact is a dict
+        if isinstance(contact, dict):
+            rows.append({
+                'Club': club_name,
+                'Contact Name': contact.get('name', '') or '',
+                'Contact Email': contact.get('email', '') or '',
+                'Contact Phone': contact.get('phone', '') or ''
+            })
+    if not rows:
+        # Add one row with empty contacts
+        rows.append({
+            'Club': club_name,
+            'Contact Name': '',
+            'Contact Email': '',
+            'Contact Phone': ''
+        })
+    return rows
+
+
 def main():
     """Main execution"""
     print("=" * 60)
@@ -784,19 +989,35 @@ def main():
         print("   Please set APIFY_API_TOKEN in .env file with your actual token.")
         print()
     
+    engine = SCRAPE_ENGINE
+    if engine == 'async' and not HAS_AIOHTTP:
+        print("⚠️  aiohttp not installed - falling back to the serial engine (pip install aiohttp)")
+        engine = 'sync'
+    if engine == 'async':
+        print(f"⚡ Async engine: {SCRAPE_CONCURRENCY} connections, {SCRAPE_PER_DOMAIN}/site, "
+              f"{SCRAPE_DOMAIN_INTERVAL:.1f}s between requests per site, {SEARCH_CONCURRENCY} parallel searches, "
+              f"{PARSE_WORKERS} parse workers ({'lxml' if HAS_LXML else 'html.parser'})")
+        print()
+    
+    cache = None
+    if PAGE_CACHE_ENABLED:
+        cache = PageCache(PAGE_CACHE_PATH, ttl=PAGE_CACHE_TTL_DAYS * 86400, max_bytes=PAGE_CACHE_MAX_MB * 1024 * 1024)
+        print(f"🗄️  Page cache: {PAGE_CACHE_PATH} (TTL {PAGE_CACHE_TTL_DAYS:g} days, max {PAGE_CACHE_MAX_MB} MB)")
+        print()
+    
     # Load clubs - use filtered CSV if it exists (clubs without contacts)
     input_file = FILTERED_INPUT_CSV if FILTERED_INPUT_CSV.exists() else INPUT_CSV
     if FILTERED_INPUT_CSV.exists():
         print(f"📋 Using filtered input: {FILTERED_INPUT_CSV.name} (clubs without contacts)")
     
     clubs = []
-    with open(input_file, 'r', encoding='utf-8-sig') as f:  # utf-8-sig handles BOM
-        reader = csv.DictReader(f)
-        for row in reader:
-            # Try different possible column names
-            club_name = row.get('Club Name', '').strip() or row.get('club_name', '').strip() or row.get('Club', '').strip()
-            if club_name:
-                clubs.append(club_name)
+    store = ClubStore(STORE_PATH)
+    for row in store.rows(input_file, columns=['Club Name', 'club_name', 'Club']):
+        # Try different possible column names
+        club_name = row.get('Club Name', '').strip() or row.get('club_name', '').strip() or row.get('Club', '').strip()
+        if club_name:
+            clubs.append(club_name)
+    store.close()
     
     # Limit to test mode if enabled
     if TEST_MODE:
@@ -806,102 +1027,80 @@ def main():
     print(f"✅ Loaded {len(clubs)} clubs from {input_file.name}")
     print(f"📊 Processing clubs...\n")
     
-    # Check if output file exists (for resuming)
-    existing_results = {}  # Dict of club_name -> list of rows
-    processed_clubs = set()
-    if OUTPUT_CSV.exists():
-        with open(OUTPUT_CSV, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                club_name = row.get('Club', '')
-                # Handle old format without phone column
-                if 'Contact Phone' not in row:
-                    row['Contact Phone'] = ''
-                
-                if club_name:
-                    if club_name not in existing_results:
-                        existing_results[club_name] = []
-                    existing_results[club_name].append(row)
-                    processed_clubs.add(club_name)
+    # Resume from the journal; a legacy OUTPUT_CSV without a journal is imported once
+    journal = ContactJournal(JOURNAL_PATH)
+    if journal.skipped_lines:
+        print(f"⚠️  Skipped {journal.skipped_lines} torn journal line(s) from an interrupted run")
+    if not len(journal) and OUTPUT_CSV.exists():
+        imported = journal.import_csv(OUTPUT_CSV)
+        print(f"📥 Imported {imported} already processed clubs from {OUTPUT_CSV.name} into {JOURNAL_PATH.name}")
     
     # Process clubs
-    results = []
     found_count = 0
     skipped_count = 0
+    already_processed = 0
+    pending = []
     
-    for i, club_name in enumerate(tqdm(clubs, desc="Processing clubs"), 1):
+    for i, club_name in enumerate(clubs, 1):
         # Skip if already processed
-        if club_name in processed_clubs:
-            club_rows = existing_results.get(club_name, [])
-            if club_rows:
-                results.extend(club_rows)
-                # Check if any have contact info
-                if any(row.get('Contact Name') or row.get('Contact Email') or row.get('Contact Phone') for row in club_rows):
-                    found_count += 1
-                skipped_count += len(club_rows)
+        rows = journal.get(club_name)
+        if rows is not None:
+            already_processed += 1
+            # Check if any have contact info
+            if any(row.get('Contact Name') or row.get('Contact Email') or row.get('Contact Phone') for row in rows):
+                found_count += 1
+            skipped_count += len(rows)
             continue
+        pending.append((i, club_name))
+    
+    def record(i, club_name, contacts, error=None):
+        """Print and journal one club's outcome"""
+        nonlocal found_count
+        if error is not None:
+            # Not journalled, so the club is retried on the next run
+            print(f"   ❌ Error processing {club_name}: {error}")
+            return
         
-        print(f"\n[{i}/{len(clubs)}] Searching for: {club_name}")
+        # Ensure contacts is a list
+        if not isinstance(contacts, list):
+            contacts = []
         
-        try:
-            contacts = find_club_contacts(club_name)
-            
-            # Ensure contacts is a list
-            if not isinstance(contacts, list):
-                contacts = []
-            
-            if contacts and len(contacts) > 0:
-                found_count += 1
-                status = f"✅ Found {len(contacts)} contact(s)"
-                print(f"   {status}")
-                for j, contact in enumerate(contacts, 1):
-                    # Ensure contact is a dict
-                    if isinstance(contact, dict):
-                        name = contact.get('name', '') or ''
-                        email = contact.get('email', '') or ''
-                        phone = contact.get('phone', '') or ''
-                        print(f"      Contact {j}: {name or 'N/A'} | {email or 'N/A'} | {phone or 'N/A'}")
-            else:
-                status = "❌ Not found"
-                print(f"   {status}")
-            
-            # Add each contact as a separate row
-            if contacts and len(contacts) > 0:
-                for contact in contacts:
-                    # Ensure contact is a dict
-                    if isinstance(contact, dict):
-                        results.append({
-                            'Club': club_name,
-                            'Contact Name': contact.get('name', '') or '',
-                            'Contact Email': contact.get('email', '') or '',
-                            'Contact Phone': contact.get('phone', '') or ''
-                        })
-            else:
-                # Add one row with empty contacts
-                results.append({
-                    'Club': club_name,
-                    'Contact Name': '',
-                    'Contact Email': '',
-                    'Contact Phone': ''
-                })
-            
-            # Save incrementally after each club
-            with open(OUTPUT_CSV, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.DictWriter(f, fieldnames=['Club', 'Contact Name', 'Contact Email', 'Contact Phone'])
-                writer.writeheader()
-                writer.writerows(results)
-            
-        except Exception as e:
-            print(f"   ❌ Error processing {club_name}: {e}")
-            results.append({
-                'Club': club_name,
-                'Contact Name': '',
-                'Contact Email': '',
-                'Contact Phone': ''
-            })
+        if contacts:
+            found_count += 1
+            print(f"   ✅ [{i}/{len(clubs)}] {club_name}: Found {len(contacts)} contact(s)")
+            for j, contact in enumerate(contacts, 1):
+                # Ensure contact is a dict
+                if isinstance(contact, dict):
+                    name = contact.get('name', '') or ''
+                    email = contact.get('email', '') or ''
+                    phone = contact.get('phone', '') or ''
+                    print(f"      Contact {j}: {name or 'N/A'} | {email or 'N/A'} | {phone or 'N/A'}")
+        else:
+            print(f"   ❌ [{i}/{len(clubs)}] {club_name}: Not found")
         
-        # Delay between searches to avoid rate limiting
-        time.sleep(3)  # Increased delay to be more respectful
+        # Append-only: one journal line per club, fsync'd in batches
+        journal.record(club_name, contact_rows(club_name, contacts))
+    
+    try:
+        if engine == 'async':
+            asyncio.run(process_clubs_async(pending, record, cache))
+        else:
+            for i, club_name in tqdm(pending, desc="Processing clubs"):
+                print(f"\n[{i}/{len(clubs)}] Searching for: {club_name}")
+                try:
+                    record(i, club_name, find_club_contacts(club_name, cache))
+                except Exception as e:
+                    record(i, club_name, [], e)
+                
+                # Delay between searches to avoid rate limiting
+                time.sleep(3)  # Increased delay to be more respectful
+    finally:
+        # Materialise the CSV once from the journal (also on Ctrl+C)
+        results = journal.compact(OUTPUT_CSV, OUTPUT_FIELDS, order=clubs)
+        journal.close()
+        if cache:
+            print(f"\n🗄️  Page cache: {cache.summary()}")
+            cache.close()
     
     # Count unique clubs and total contacts
     unique_clubs = len(set(r['Club'] for r in results))
@@ -910,7 +1109,7 @@ def main():
     print(f"\n✅ Saved {len(results)} contact rows ({unique_clubs} unique clubs) to: {OUTPUT_CSV}")
     if skipped_count > 0:
         print(f"   (Skipped {skipped_count} already processed contact rows)")
-    processed = len(clubs) - len(processed_clubs)
+    processed = len(clubs) - already_processed
     if processed > 0:
         print(f"📊 Summary: Found contacts for {found_count}/{processed} newly processed clubs ({found_count/processed*100:.1f}%)")
         print(f"📊 Total contacts found: {total_contacts}")
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Async HTTP engine for scrape-club-contacts.py
+
+One aiohttp session (shared connection pool) serves every club. Politeness is
+enforced per domain rather than with a global sleep:
+  - a global cap on open connections (concurrency)
+  - at most per_domain requests in flight to any one site
+  - at least interval seconds between request starts on a site
+  - at most search_concurrency Apify searches running at once
+
+scrape-club-contacts.py reads these from SCRAPE_CONCURRENCY, SCRAPE_PER_DOMAIN,
+SCRAPE_DOMAIN_INTERVAL and SEARCH_CONCURRENCY in .env.
+
+Usage:
+    async with AsyncFetcher(headers=HEADERS) as fetcher:
+        data = await fetcher.post_json(APIFY_API_URL, payload, token=APIFY_API_TOKEN)
+        html = await fetcher.get_text(url)
+
+Pass cache=PageCache(...) to serve and revalidate pages from disk.
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+try:
+    import aiohttp
+    HAS_AIOHTTP = True
+except ImportError:
+    HAS_AIOHTTP = False  # pip install aiohttp (falls back to the serial requests engine)
+
+CONCURRENCY = 32  # Open connections across all sites
+PER_DOMAIN = 2  # In-flight requests per site
+DOMAIN_INTERVAL = 1.0  # Seconds between request starts per site
+SEARCH_CONCURRENCY = 8  # Parallel Apify run-sync calls
+PAGE_TIMEOUT = 10
+SEARCH_TIMEOUT = 60
+
+
+def domain_of(url: str) -> str:
+    """Politeness key for a URL: lowercase host without 'www.'"""
+    netloc = urlparse(url).netloc.lower()
+    return netloc[4:] if netloc.startswith('www.') else netloc
+
+
+class DomainLimiter:
+    """Per-domain concurrency cap plus a minimum spacing between request starts"""
+
+    def __init__(self, per_domain: int = PER_DOMAIN, interval: float = DOMAIN_INTERVAL):
+        self.per_domain = per_domain
+        self.interval = interval
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._next_start: Dict[str, float] = {}
+
+    @asynccontextmanager
+    async def slot(self, url: str):
+        domain = domain_of(url)
+        semaphore = self._semaphores.setdefault(domain, asyncio.Semaphore(self.per_domain))
+        async with semaphore:
+            # Reserve the next start time before awaiting, so waiters queue in order
+            now = asyncio.get_running_loop().time()
+            start = max(now, self._next_start.get(domain, now))
+            self._next_start[domain] = start + self.interval
+            if start > now:
+                await asyncio.sleep(start - now)
+            yield
+
+
+class AsyncFetcher:
+    """Shared aiohttp session with global, per-domain and search concurrency limits"""
+
+    def __init__(self, headers: Optional[Dict] = None, concurrency: int = CONCURRENCY,
+                 per_domain: int = PER_DOMAIN, interval: float = DOMAIN_INTERVAL,
+                 search_concurrency: int = SEARCH_CONCURRENCY, cache=None):
+        if not HAS_AIOHTTP:
+            raise RuntimeError("aiohttp not installed (pip install aiohttp)")
+        self.headers = headers or {}
+        self.concurrency = concurrency
+        self.limiter = DomainLimiter(per_domain, interval)
+        self.search_slots = asyncio.Semaphore(search_concurrency)
+        self.cache = cache  # Optional page_cache.PageCache
+        self.session = None
+
+    async def __aenter__(self):
+        connector = aiohttp.TCPConnector(limit=self.concurrency, ttl_dns_cache=300)
+        self.session = aiohttp.ClientSession(connector=connector, headers=self.headers)
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.session.close()
+
+    async def get_text(self, url: str, timeout: float = PAGE_TIMEOUT) -> Optional[str]:
+        """
+        GET a page within the site's politeness limits; None on any error
+
+        With a PageCache, fresh pages skip the network and stale ones are revalidated.
+        """
+        entry = self.cache.lookup(url) if self.cache else None
+        if entry is not None and entry.fresh:
+            return entry.body
+        try:
+            async with self.limiter.slot(url):
+                headers = self.cache.conditional_headers(entry) if self.cache else {}
+                async with self.session.get(url, headers=headers, timeout=aiohttp.ClientTimeout(total=timeout)) as response:
+                    if response.status == 304 and entry is not None:
+                        return self.cache.revalidated(entry)
+                    response.raise_for_status()
+                    body = await response.text(errors='replace')
+            if self.cache:
+                self.cache.store(url, body, response.headers.get('ETag'), response.headers.get('Last-Modified'))
+            return body
+        except Exception:
+            return self.cache.stale(entry) if entry is not None else None
+
+    async def post_json(self, url: str, payload: Dict, token: str = '', timeout: float = SEARCH_TIMEOUT):
+        """
+        POST JSON to an Apify-style endpoint (token in the query string, then Bearer on 401)
+
+        Raises aiohttp.ClientError / asyncio.TimeoutError on failure
+        """
+        client_timeout = aiohttp.ClientTimeout(total=timeout)
+        async with self.search_slots:
+            async with self.session.post(url, params={'token': token}, json=payload, timeout=client_timeout) as response:
+                if response.status != 401:
+                    response.raise_for_status()
+                    return await response.json(content_type=None)
+            headers = {'Authorization': f'Bearer {token}'}
+            async with self.session.post(url, json=payload, headers=headers, timeout=client_timeout) as response:
+                response.raise_for_status()
+                return await response.json(content_type=None)
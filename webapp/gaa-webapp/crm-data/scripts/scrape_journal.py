@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Append-only result journal for scrape-club-contacts.py
+
+Each finished club is one JSON line: {"club": ..., "rows": [...], "ts": ...}.
+Lines are appended (never rewritten) and fsync'd in batches, so a crash loses
+at most the last unsynced batch. A club recorded twice keeps its latest line,
+which makes re-recording idempotent. On open the journal is indexed in memory
+(club -> rows), so resume is a dict lookup. compact() materialises the CSV
+once at the end of a run.
+
+Usage:
+    with ContactJournal(JOURNAL_PATH) as journal:
+        if club_name in journal: ...
+        journal.record(club_name, rows)
+        journal.compact(OUTPUT_CSV, fieldnames, order=clubs)
+"""
+
+import csv
+import json
+import os
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+FSYNC_EVERY = 10  # Records per fsync
+FSYNC_SECONDS = 5.0  # ...or at least this often
+
+
+class ContactJournal:
+    """JSONL journal of per-club contact rows with an in-memory index"""
+
+    def __init__(self, path: Path, fsync_every: int = FSYNC_EVERY, fsync_seconds: float = FSYNC_SECONDS):
+        self.path = Path(path)
+        self.fsync_every = fsync_every
+        self.fsync_seconds = fsync_seconds
+        self.index: Dict[str, List[Dict]] = {}
+        self.skipped_lines = 0
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+        self._load()
+        self._file = open(self.path, 'a', encoding='utf-8')
+
+    def _load(self):
+        if not self.path.exists():
+            return
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                    self.index[entry['club']] = entry['rows']
+                except (ValueError, KeyError, TypeError):
+                    self.skipped_lines += 1  # Torn final line from a crash
+        if self.skipped_lines:
+            # Make sure the next append starts on a fresh line
+            with open(self.path, 'rb+') as f:
+                if f.seek(0, os.SEEK_END) > 0:
+                    f.seek(-1, os.SEEK_END)
+                    if f.read(1) != b'\n':
+                        f.write(b'\n')
+
+    def __contains__(self, club_name: str) -> bool:
+        return club_name in self.index
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def get(self, club_name: str) -> Optional[List[Dict]]:
+        return self.index.get(club_name)
+
+    def record(self, club_name: str, rows: List[Dict]):
+        """Append one club's rows (replaces any earlier record for the club)"""
+        self._file.write(json.dumps({'club': club_name, 'rows': rows, 'ts': time.time()}, ensure_ascii=False) + '\n')
+        self.index[club_name] = rows
+        self._unsynced += 1
+        if self._unsynced >= self.fsync_every or time.monotonic() - self._last_sync >= self.fsync_seconds:
+            self.sync()
+
+    def sync(self):
+        """Flush and fsync pending records"""
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def import_csv(self, csv_path: Path) -> int:
+        """Seed the journal from an existing contacts CSV (one-time migration). Returns clubs imported"""
+        grouped: Dict[str, List[Dict]] = {}
+        with open(csv_path, 'r', encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                club_name = row.get('Club', '')
+                if club_name:
+                    # Handle old format without phone column
+                    row.setdefault('Contact Phone', '')
+                    grouped.setdefault(club_name, []).append(row)
+        for club_name, rows in grouped.items():
+            self.record(club_name, rows)
+        self.sync()
+        return len(grouped)
+
+    def compact(self, csv_path: Path, fieldnames: List[str], order: Optional[Iterable[str]] = None) -> List[Dict]:
+        """
+        Write the latest rows for every club to csv_path (atomically)
+
+        Clubs listed in order come first, in that order; any others follow in journal order.
+        """
+        self.sync()
+        clubs = list(dict.fromkeys(list(order or []) + list(self.index)))
+        rows = [row for club_name in clubs for row in self.index.get(club_name, [])]
+        tmp_path = Path(csv_path).with_suffix('.csv.tmp')
+        with open(tmp_path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=fieldnames, extrasaction='ignore')
+            writer.writeheader()
+            writer.writerows(rows)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, csv_path)
+        return rows
+
+    def close(self):
+        if not self._file.closed:
+            self.sync()
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Token Batcher - Pack prompt items into batches by token budget instead of fixed counts
+
+Fixed-size batches (N clubs per prompt, 10-minute windows) are either too big
+(the response hits the model's max output tokens and the JSON / narrative is
+cut off) or too small (per-request overhead dominates). This packs items in
+order until the next one would push the batch over an input or expected
+output budget.
+
+Token counts come from a local chars-per-token estimate, optionally
+calibrated once against the model's count_tokens and refined from the
+usage_metadata of real responses. Pass calibrate() a cache_file when batch
+boundaries must be reproducible (e.g. a resume ledger keyed by batch
+contents): the first run saves the rate it packed with, later runs reuse it.
+
+Usage:
+    from token_batcher import TokenEstimator, pack, is_truncated
+    estimate = TokenEstimator()
+    estimate.calibrate(model, sample_text, cache_file=LEDGER_DIR / 'chars_per_token.json')
+    batches = pack(items, input_tokens=lambda item: estimate(render(item)),
+                   output_tokens=lambda item: 20, input_budget=60_000, output_budget=8_000)
+    if is_truncated(response): ... split the batch and retry
+"""
+
+import json
+import math
+import threading
+from pathlib import Path
+from typing import Callable, List, Optional, Sequence, TypeVar
+
+T = TypeVar('T')
+
+CHARS_PER_TOKEN = 4.0  # English-ish text on Gemini tokenizers; calibrate() refines it
+
+
+class TokenEstimator:
+    """Local token estimate: ceil(len(text) / chars_per_token)"""
+
+    def __init__(self, chars_per_token: float = CHARS_PER_TOKEN):
+        self.chars_per_token = chars_per_token
+        self._lock = threading.Lock()
+
+    def __call__(self, text: str) -> int:
+        return math.ceil(len(text or '') / self.chars_per_token)
+
+    def calibrate(self, model, sample_text: str, cache_file: Optional[Path] = None) -> float:
+        """
+        Set chars/token from one model.count_tokens call (keeps the default if it fails)
+
+        Args:
+            model: Gemini model (count_tokens)
+            sample_text: Representative prompt text
+            cache_file: JSON file holding the rate of an earlier run; if it exists that
+                rate is used as-is, otherwise the rate used now (calibrated or default)
+                is written there, so packing doesn't change between runs
+        """
+        if cache_file and Path(cache_file).exists():
+            with open(cache_file, 'r') as f:
+                self.chars_per_token = float(json.load(f)['chars_per_token'])
+            return self.chars_per_token
+
+        source = 'default'
+        if sample_text:
+            try:
+                tokens = model.count_tokens(sample_text).total_tokens
+            except Exception:
+                tokens = 0
+            if tokens:
+                self.chars_per_token = len(sample_text) / tokens
+                source = 'count_tokens'
+
+        if cache_file:
+            Path(cache_file).parent.mkdir(parents=True, exist_ok=True)
+            with open(cache_file, 'w') as f:
+                json.dump({'chars_per_token': self.chars_per_token, 'source': source}, f, indent=2)
+        return self.chars_per_token
+
+    def observe(self, text: str, actual_tokens: int, weight: float = 0.3):
+        """Blend in a real prompt_token_count (moving average; safe from worker threads)"""
+        if text and actual_tokens:
+            with self._lock:
+                self.chars_per_token = (1 - weight) * self.chars_per_token + weight * (len(text) / actual_tokens)
+
+
+def pack(items: Sequence[T], input_tokens: Callable[[T], int], input_budget: int,
+         output_tokens: Optional[Callable[[T], float]] = None, output_budget: Optional[float] = None,
+         max_items: Optional[int] = None,
+         can_join: Optional[Callable[[List[T], T], bool]] = None) -> List[List[T]]:
+    """
+    Greedy in-order packing
+
+    A batch is closed when adding the next item would exceed input_budget, the
+    expected output_budget, max_items, or can_join(batch, item) says no. An item
+    larger than a budget on its own still gets a batch to itself.
+    """
+    batches: List[List[T]] = []
+    batch: List[T] = []
+    batch_in = 0
+    batch_out = 0.0
+    for item in items:
+        item_in = input_tokens(item)
+        item_out = output_tokens(item) if output_tokens else 0.0
+        full = batch and (
+            batch_in + item_in > input_budget
+            or (output_budget is not None and batch_out + item_out > output_budget)
+            or (max_items is not None and len(batch) >= max_items)
+            or (can_join is not None and not can_join(batch, item))
+        )
+        if full:
+            batches.append(batch)
+            batch, batch_in, batch_out = [], 0, 0.0
+        batch.append(item)
+        batch_in += item_in
+        batch_out += item_out
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+def is_truncated(response) -> bool:
+    """True if a Gemini response stopped at the max output token limit"""
+    try:
+        finish_reason = response.candidates[0].finish_reason
+    except (AttributeError, IndexError, TypeError):
+        return False
+    return str(getattr(finish_reason, 'name', finish_reason)) in ('MAX_TOKENS', '2')
@@ -62,8 +62,8 @@ zip -r9 ../deployment.zip .
 cd ..
 
 # Add Lambda handler and stages
-zip -g deployment.zip lambda_handler_s3.py utils.py
-zip -g deployment.zip -r stages/
+zip -g deployment.zip lambda_handler_s3.py utils.py prompt_registry.py team_colors.py frame_sampler.py model_cascade.py
+zip -g deployment.zip -r stages/ prompts/
 
 echo "✅ Deployment package created: deployment.zip"
 echo ""
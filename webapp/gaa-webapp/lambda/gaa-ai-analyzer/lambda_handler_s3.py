@@ -10,6 +10,7 @@ import tempfile
 import requests
 import boto3
 from pathlib import Path
+from prompt_registry import validate_versions
 from utils import (
     update_video_status,
     update_processing_progress,
@@ -29,6 +30,12 @@ from stages import (
     stage_5_export_to_anadi_xml
 )
 
+try:
+    from team_colors import match_user_team
+    HAS_COLOR_MATCHING = True
+except ImportError:
+    HAS_COLOR_MATCHING = False  # team_colors needs numpy - fall back to name matching
+
 # Environment variables
 BACKEND_API_URL = os.environ.get('BACKEND_API_URL', 'http://localhost:4011')
 LAMBDA_API_KEY = os.environ.get('LAMBDA_API_KEY', 'gaa-lambda-secret-key-2024')
@@ -155,6 +162,14 @@ def lambda_handler(event, context):
             "primary": "white",
             "secondary": "black",
             "team_name": "Faughanvale GAA"
+        },
+        "prompt_versions": {  (optional - prompt registry versions, default from prompts/registry.json)
+            "stage1": "v1",
+            "stage3": "v1"
+        },
+        "stage1_cascade": {  (optional - Flash triage, Pro only where events are likely; true = defaults)
+            "threshold": 0.4,
+            "events": ["score", "shot", "kickout"]
         }
     }
     """
@@ -166,11 +181,18 @@ def lambda_handler(event, context):
     s3_key = event.get('s3_key')
     title = event.get('title', 'Unknown Match')
     team_colors = event.get('team_colors', {})  # {primary, secondary, team_name}
+    prompt_versions = event.get('prompt_versions', {})  # {stage: version} overrides
+    stage1_cascade = event.get('stage1_cascade')
+    if stage1_cascade is True:
+        stage1_cascade = {}
+    elif not stage1_cascade:
+        stage1_cascade = None
     
     print(f"🎨 User's team colors: {team_colors}")
     
     if not game_id or not s3_key:
         raise ValueError("Missing required fields: game_id, s3_key")
+    validate_versions(prompt_versions)  # Bare registry versions only - never file paths
     
     # Update status to 'processing' 
     update_video_status(game_id, 'processing')
@@ -208,7 +230,9 @@ def lambda_handler(event, context):
         game_profile = stage_0_5_calibrate_game.run(
             frames_dir=frames_dir,
             work_dir=work_dir,
-            api_key=GEMINI_API_KEY
+            api_key=GEMINI_API_KEY,
+            prompt_version=prompt_versions.get('calibration_frame'),
+            synthesis_prompt_version=prompt_versions.get('calibration_synthesis')
         )
         
         team_a_color = game_profile['team_a']['jersey_color']
@@ -230,7 +254,20 @@ def lambda_handler(event, context):
         team_a_is_user = False
         team_b_is_user = False
         
-        if user_primary:
+        # Colour distance against the measured palettes (deterministic); names only as fallback
+        matched_team = None
+        if HAS_COLOR_MATCHING and user_primary:
+            matched_team = match_user_team(
+                [user_primary, user_secondary],
+                team_a_color,
+                team_b_color,
+                analysis=game_profile.get('color_analysis')
+            )
+        
+        if matched_team:
+            team_a_is_user = matched_team == 'team_a'
+            team_b_is_user = matched_team == 'team_b'
+        elif user_primary:
             # Check if team_a matches user's colors
             if user_primary in team_a_color.lower():
                 team_a_is_user = True
@@ -286,7 +323,9 @@ def lambda_handler(event, context):
             clips_dir=clips_dir,
             game_profile=game_profile,
             work_dir=work_dir,
-            api_key=GEMINI_API_KEY
+            api_key=GEMINI_API_KEY,
+            prompt_version=prompt_versions.get('stage1'),
+            cascade=stage1_cascade
         )
         
         # Stage 2: Create coherent narrative
@@ -298,7 +337,8 @@ def lambda_handler(event, context):
             descriptions=descriptions,
             game_profile=game_profile,
             work_dir=work_dir,
-            api_key=GEMINI_API_KEY
+            api_key=GEMINI_API_KEY,
+            prompt_version=prompt_versions.get('stage2')
         )
         
         # Stage 3: Event classification
@@ -310,7 +350,8 @@ def lambda_handler(event, context):
             narrative=narrative,
             game_profile=game_profile,
             work_dir=work_dir,
-            api_key=GEMINI_API_KEY
+            api_key=GEMINI_API_KEY,
+            prompt_version=prompt_versions.get('stage3')
         )
         
         # Stage 4: Extract JSON
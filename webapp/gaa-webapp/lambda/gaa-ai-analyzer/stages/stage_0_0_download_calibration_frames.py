@@ -2,10 +2,12 @@
 """
 Stage 0.0: Download Calibration Frames
 Extracts a few frames from the video for team detection and half identification
+(one ffmpeg process for all timestamps - see frame_sampler.py)
 """
 
 import subprocess
 from pathlib import Path
+from frame_sampler import sample_frames
 
 
 def run(video_url, work_dir):
@@ -35,27 +37,32 @@ def run(video_url, work_dir):
         (1500, "25m00s"),    # 25 minutes
     ]
     
+    # One process, one seek per timestamp: only the bytes around each frame are fetched
+    print(f"   Extracting frames at {', '.join(label for _, label in timestamps)}...")
+    try:
+        extracted = sample_frames(
+            video_url,
+            [seconds for seconds, _ in timestamps],
+            frames_dir,
+            filename="frame_{seconds:05d}s.jpg",
+            mode='seek',
+            quality=2,  # High quality
+            timeout=30 * len(timestamps)
+        )
+    except subprocess.TimeoutExpired:
+        print(f"   ⚠️  Timeout extracting calibration frames")
+        extracted = {}
+    except subprocess.CalledProcessError as e:
+        print(f"   ⚠️  Failed to extract calibration frames: {e}")
+        extracted = {}
+    
     for seconds, label in timestamps:
+        if seconds not in extracted:
+            print(f"   ⚠️  No frame at {label}, skipping")
+            continue
         output_path = frames_dir / f"frame_{label}.jpg"
-        
-        cmd = [
-            'ffmpeg',
-            '-ss', str(seconds),
-            '-i', video_url,
-            '-frames:v', '1',
-            '-q:v', '2',  # High quality
-            '-y',
-            str(output_path)
-        ]
-        
-        try:
-            print(f"   Extracting frame at {label}...")
-            subprocess.run(cmd, capture_output=True, check=True, timeout=30)
-            print(f"   ✅ Saved {output_path.name}")
-        except subprocess.TimeoutExpired:
-            print(f"   ⚠️  Timeout extracting frame at {label}, skipping")
-        except subprocess.CalledProcessError as e:
-            print(f"   ⚠️  Failed to extract frame at {label}: {e}")
+        extracted[seconds].replace(output_path)
+        print(f"   ✅ Saved {output_path.name}")
     
     # Verify we got at least one frame
     frames = list(frames_dir.glob("*.jpg"))
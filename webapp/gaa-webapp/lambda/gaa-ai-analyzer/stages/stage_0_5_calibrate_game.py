@@ -7,30 +7,27 @@ Analyzes frames in parallel to identify teams, colors, halves, and attacking dir
 import json
 import google.generativeai as genai
 from pathlib import Path
+from prompt_registry import load_template
+
+try:
+    from team_colors import analyze_frames, color_hint
+    HAS_COLOR_ANALYSIS = True
+except ImportError:
+    HAS_COLOR_ANALYSIS = False  # team_colors needs numpy
+
+# Minimum local colour-analysis confidence to hint the synthesis prompt
+COLOR_CONFIDENCE = 0.5
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
 
-def describe_single_frame(frame_path, timestamp_seconds, api_key):
+def describe_single_frame(frame_path, timestamp_seconds, api_key, prompt_version=None):
     """Describe a single frame using Gemini Flash"""
     try:
         genai.configure(api_key=api_key)
         
-        prompt = f"""Frame at {timestamp_seconds}s. Report:
-
-1. Teams: [color] jerseys vs [color] jerseys
-2. Keepers (if visible): [color] keeper LEFT goal, [color] keeper RIGHT goal
-3. Game state - choose ONE:
-   - "THROW-UP" - referee throws up ball, players contesting
-   - "IN-PLAY" - active match, players in motion
-   - "HALFTIME" - players walking off field, leaving pitch
-   - "WARMUP" - players standing around, no organized play
-   - "END" - players shaking hands, celebrating, leaving field
-4. Ball location: where is it? (center, penalty area, midfield, sideline, etc.)
-5. Activity level: active play / slow / stopped / players resting
-
-Format example: "Blue vs White. Pink LEFT, Green RIGHT. THROW-UP - referee throws up ball, teams contesting. Active."
-
-Be concise (2-3 lines)."""
+        prompt = load_template('calibration_frame', prompt_version).render(
+            timestamp_seconds=timestamp_seconds
+        )
 
         with open(frame_path, 'rb') as f:
             frame_data = f.read()
@@ -55,7 +52,7 @@ Be concise (2-3 lines)."""
         }
 
 
-def run(frames_dir, work_dir, api_key):
+def run(frames_dir, work_dir, api_key, prompt_version=None, synthesis_prompt_version=None):
     """
     Calibrate game profile from extracted frames
     
@@ -63,6 +60,8 @@ def run(frames_dir, work_dir, api_key):
         frames_dir: Directory containing calibration frames
         work_dir: Working directory
         api_key: Gemini API key
+        prompt_version: Frame prompt registry version (None = default from prompts/registry.json)
+        synthesis_prompt_version: Synthesis prompt registry version (None = default)
         
     Returns:
         game_profile: Dict with team info, match times, attacking directions
@@ -75,6 +74,19 @@ def run(frames_dir, work_dir, api_key):
         raise RuntimeError(f"No calibration frames found in {frames_dir}")
     
     print(f"📸 Found {len(frames)} calibration frames")
+    
+    # STEP 0: Local jersey colour clustering (no API calls)
+    color_analysis = None
+    if HAS_COLOR_ANALYSIS:
+        try:
+            color_analysis = analyze_frames(frames)
+        except Exception as e:
+            print(f"⚠️  Colour analysis failed: {e}")
+        if color_analysis:
+            teams = color_analysis['teams']
+            print(f"🎨 Local colours: {teams[0]['color_name']} vs {teams[1]['color_name']} "
+                  f"(confidence {color_analysis['confidence']:.2f})")
+    
     print(f"⚡ Analyzing in parallel with Gemini 2.5 Flash...")
     
     # STEP 1: Parallel frame descriptions
@@ -97,7 +109,7 @@ def run(frames_dir, work_dir, api_key):
             else:
                 timestamp_seconds = 0
             
-            future_to_frame[executor.submit(describe_single_frame, frame_path, timestamp_seconds, api_key)] = frame_path
+            future_to_frame[executor.submit(describe_single_frame, frame_path, timestamp_seconds, api_key, prompt_version)] = frame_path
         
         # Collect results
         for future in as_completed(future_to_frame):
@@ -118,52 +130,15 @@ def run(frames_dir, work_dir, api_key):
         for d in frame_descriptions
     ])
     
-    synthesis_prompt = f"""Based on these frame descriptions from a GAA (Gaelic Athletic Association) match, create a game profile.
-
-**FRAME DESCRIPTIONS WITH TIMESTAMPS:**
-
-{descriptions_text}
-
-**YOUR TASK:**
-Extract the following information:
-
-1. **TEAM IDENTIFICATION:**
-   - Identify Team A: What jersey color? What goalkeeper color?
-   - Identify Team B: What jersey color? What goalkeeper color?
-   
-2. **MATCH TIMES:**
-   - Match START: Find the FIRST timestamp with "THROW-UP" or "IN-PLAY" state
-   - Estimate when first half ends (around 30-35 minutes typically)
-   
-3. **ATTACKING DIRECTIONS:**
-   - In 1st half: Which team attacks left-to-right? Which attacks right-to-left?
-
-**RULES:**
-- Use the timestamps from the descriptions
-- Be specific about colors (exact shades like "Light blue", "Dark blue", "White")
-- Times should be in SECONDS (integer)
-- For first 10 minutes analysis, we need accurate start time
-
-**OUTPUT FORMAT (JSON only, no markdown, no code blocks):**
-{{
-  "team_a": {{
-    "jersey_color": "Exact color description",
-    "keeper_color": "Exact color description",
-    "attack_direction_1st_half": "left-to-right" or "right-to-left"
-  }},
-  "team_b": {{
-    "jersey_color": "Exact color description",
-    "keeper_color": "Exact color description",
-    "attack_direction_1st_half": "right-to-left" or "left-to-right"
-  }},
-  "match_times": {{
-    "start": integer,
-    "first_half_end_estimate": integer
-  }},
-  "notes": "Any additional observations"
-}}
-
-Provide ONLY the JSON object:"""
+    color_block = ""
+    if color_analysis and color_analysis['confidence'] >= COLOR_CONFIDENCE:
+        color_block = (f"{color_hint(color_analysis)}\n"
+                       f"Use these colours for the team jersey colours unless the descriptions clearly disagree.\n\n")
+    
+    synthesis_prompt = load_template('calibration_synthesis', synthesis_prompt_version).render(
+        descriptions_text=descriptions_text,
+        color_block=color_block
+    )
 
     genai.configure(api_key=api_key)
     model = genai.GenerativeModel(
@@ -183,6 +158,10 @@ Provide ONLY the JSON object:"""
         
         game_profile = json.loads(result_text)
         
+        # Keep the measured palettes (lambda_handler_s3 uses them for home/away matching)
+        if color_analysis:
+            game_profile['color_analysis'] = color_analysis
+        
         # Save profile
         profile_path = work_dir / "game_profile.json"
         with open(profile_path, 'w') as f:
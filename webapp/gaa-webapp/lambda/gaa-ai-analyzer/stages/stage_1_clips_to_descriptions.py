@@ -2,16 +2,55 @@
 """
 Stage 1: Clips to Descriptions
 Analyzes video clips in PARALLEL using Gemini AI
+(optional cascade: Flash triage of every clip, Pro only where events are likely)
 """
 
 import json
+import time
 import google.generativeai as genai
 from pathlib import Path
+from prompt_registry import load_template
+from model_cascade import TRIAGE_MODEL, DEFAULT_THRESHOLD, ESCALATE_EVENTS, parse_triage, should_escalate, percentile
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
 
-def analyze_single_clip(clip_path, game_profile, api_key):
+def triage_clip(video_data, team_context, clip_start_time, clip_end_time, cascade):
+    """Cascade step 1: coarse event likelihood from the cheap triage model"""
+    try:
+        model = genai.GenerativeModel(
+            cascade.get('model', TRIAGE_MODEL),
+            generation_config={"temperature": 0, "top_p": 0.1, "response_mime_type": "application/json"}
+        )
+        triage_prompt = load_template('stage1_triage').render(
+            team_context=team_context,
+            clip_start_time=clip_start_time,
+            clip_end_time=clip_end_time
+        )
+        response = model.generate_content([
+            {"mime_type": "video/mp4", "data": video_data},
+            triage_prompt
+        ])
+        triage = parse_triage(response.text)
+        escalate, reason = should_escalate(
+            triage,
+            cascade.get('threshold', DEFAULT_THRESHOLD),
+            cascade.get('events', ESCALATE_EVENTS)
+        )
+        return {
+            'event_likelihood': triage['event_likelihood'] if triage else None,
+            'summary': triage['summary'] if triage else '',
+            'escalated': escalate,
+            'reason': reason
+        }
+    except Exception as e:
+        # A failed triage must not drop the clip: send it to the full model
+        print(f"⚠️  Triage failed ({e}), escalating")
+        return {'event_likelihood': None, 'summary': '', 'escalated': True, 'reason': 'triage failed'}
+
+
+def analyze_single_clip(clip_path, game_profile, api_key, prompt_version=None, cascade=None):
     """Analyze a single 60s clip and return description"""
+    clip_started = time.time()
     try:
         genai.configure(api_key=api_key)
         
@@ -43,39 +82,12 @@ TEAMS (refer to them ONLY by jersey color):
         clip_end_time = f"{clip_end_ts//60}:{clip_end_ts%60:02d}"
         example_mid_time = f"{(timestamp + 30)//60}:{(timestamp + 30)%60:02d}"
 
-        prompt = f"""You are analyzing a GAA (Gaelic Athletic Association) match clip.
-
-{team_context}
-
-**CLIP TIMING:**
-This clip shows {clip_start_time} to {clip_end_time}.
-
-**YOUR TASK:**
-Describe what happens using absolute game time (e.g., {clip_start_time}, {example_mid_time}).
-
-What to describe:
-- Possession changes (tackles, interceptions, who wins the ball)
-- Shots at goal (points, goals, wides)
-- Attacks and build-up play
-- Kickouts (restarts after scores)
-- Throw-ups (restarts from referee)
-- Fouls and referee decisions
-- Turnovers (possession changes)
-- Scores: Points (over the bar) and Goals (into net) - BE VERY CAREFUL - only if you see ball clearly score AND celebrations/restart
-
-**Important:**
-- Use absolute timestamps like {clip_start_time} (NOT 0:05)
-- Only describe what you're confident about
-- Refer to teams ONLY by jersey color
-- GAA scoring: Points (over crossbar) and Goals (into net)
-
-**Example:**
-{clip_start_time} - Blue goalkeeper takes kickout from goal area
-{clip_start_time} - White player wins possession in midfield
-{example_mid_time} - Blue intercepts pass and attacks
-{clip_end_time} - Blue player scores a point over the bar
-
-Just describe what happens:"""
+        prompt = load_template('stage1', prompt_version).render(
+            team_context=team_context,
+            clip_start_time=clip_start_time,
+            clip_end_time=clip_end_time,
+            example_mid_time=example_mid_time
+        )
 
         # Read video data
         with open(clip_path, 'rb') as f:
@@ -83,6 +95,21 @@ Just describe what happens:"""
         
         print(f"   🎬 Analyzing clip {clip_num:02d} at {clip_start_time}...")
         
+        # Cascade: clips the triage model finds quiet keep its one-line summary
+        triage = None
+        if cascade is not None:
+            triage = triage_clip(video_data, team_context, clip_start_time, clip_end_time, cascade)
+            if not triage['escalated']:
+                print(f"   🪶 Clip {clip_num:02d}: triage only - {triage['reason']}")
+                return {
+                    'clip_number': clip_num,
+                    'timestamp': timestamp,
+                    'clip_name': clip_path.name,
+                    'description': f"TRIAGE ONLY ({triage['reason']}): {triage['summary'] or 'no notable events'}",
+                    'triage': triage,
+                    'seconds': round(time.time() - clip_started, 2)
+                }
+        
         # Send to Gemini Pro
         model = genai.GenerativeModel(
             'gemini-2.5-pro',
@@ -100,7 +127,9 @@ Just describe what happens:"""
             'clip_number': clip_num,
             'timestamp': timestamp,
             'clip_name': clip_path.name,
-            'description': description
+            'description': description,
+            'triage': triage,
+            'seconds': round(time.time() - clip_started, 2)
         }
         
     except Exception as e:
@@ -109,11 +138,12 @@ Just describe what happens:"""
             'clip_number': clip_num,
             'timestamp': timestamp,
             'clip_name': clip_path.name,
-            'description': f"Error: {str(e)}"
+            'description': f"Error: {str(e)}",
+            'seconds': round(time.time() - clip_started, 2)
         }
 
 
-def run(clips_dir, game_profile, work_dir, api_key):
+def run(clips_dir, game_profile, work_dir, api_key, prompt_version=None, cascade=None):
     """
     Analyze all clips in PARALLEL using Gemini
     
@@ -122,6 +152,9 @@ def run(clips_dir, game_profile, work_dir, api_key):
         game_profile: Calibrated game profile
         work_dir: Working directory
         api_key: Gemini API key
+        prompt_version: Prompt registry version (None = default from prompts/registry.json)
+        cascade: None (every clip to Pro) or triage options
+                 {'threshold': 0.4, 'events': ['score', 'shot', 'kickout'], 'model': 'gemini-2.5-flash'}
         
     Returns:
         descriptions: List of clip descriptions
@@ -132,6 +165,9 @@ def run(clips_dir, game_profile, work_dir, api_key):
         raise RuntimeError(f"No clips found in {clips_dir}")
     
     print(f"🎬 Analyzing {len(clips)} clips in PARALLEL with Gemini 2.5 Pro")
+    if cascade is not None:
+        print(f"🪜 Cascade: {cascade.get('model', TRIAGE_MODEL)} triage first, "
+              f"Pro if likelihood ≥ {cascade.get('threshold', DEFAULT_THRESHOLD)}")
     
     descriptions = []
     
@@ -139,7 +175,7 @@ def run(clips_dir, game_profile, work_dir, api_key):
     with ThreadPoolExecutor(max_workers=10) as executor:
         # Submit all clips for analysis
         future_to_clip = {
-            executor.submit(analyze_single_clip, clip, game_profile, api_key): clip
+            executor.submit(analyze_single_clip, clip, game_profile, api_key, prompt_version, cascade): clip
             for clip in clips
         }
         
@@ -160,6 +196,11 @@ def run(clips_dir, game_profile, work_dir, api_key):
         json.dump(descriptions, f, indent=2)
     
     print(f"✅ Analyzed {len(descriptions)} clips")
+    if cascade is not None:
+        escalated = sum(1 for d in descriptions if d.get('triage') and d['triage']['escalated'])
+        print(f"   🪜 {escalated}/{len(descriptions)} clips escalated to Pro")
+    clip_seconds = [d['seconds'] for d in descriptions]
+    print(f"   ⏱️  Per-clip latency: p50 {percentile(clip_seconds, 50):.1f}s, p95 {percentile(clip_seconds, 95):.1f}s")
     print(f"💾 Saved to {output_file.name}")
     
     return descriptions
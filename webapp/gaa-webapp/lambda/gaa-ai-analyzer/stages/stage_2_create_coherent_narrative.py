@@ -7,8 +7,10 @@ Stitches clip descriptions into a coherent narrative
 import json
 import google.generativeai as genai
 
+from prompt_registry import load_template
 
-def run(descriptions, game_profile, work_dir, api_key):
+
+def run(descriptions, game_profile, work_dir, api_key, prompt_version=None):
     """
     Create coherent narrative from clip descriptions
     
@@ -17,6 +19,7 @@ def run(descriptions, game_profile, work_dir, api_key):
         game_profile: Calibrated game profile
         work_dir: Working directory
         api_key: Gemini API key
+        prompt_version: Prompt registry version (None = default from prompts/registry.json)
         
     Returns:
         narrative: Coherent narrative text
@@ -32,37 +35,13 @@ def run(descriptions, game_profile, work_dir, api_key):
     team_a = game_profile['team_a']
     team_b = game_profile['team_b']
     
-    prompt = f"""You are creating a coherent narrative from GAA match observations.
-
-**TEAMS:**
-- {team_a['jersey_color']} ({team_a['keeper_color']} keeper)
-- {team_b['jersey_color']} ({team_b['keeper_color']} keeper)
-
-**TIME RANGE:** 0:00 to 10:00 (first 10 minutes)
-
-**OBSERVATIONS FROM VIDEO CLIPS:**
-
-{observations}
-
-**YOUR TASK:**
-Create a coherent play-by-play narrative of the first 10 minutes.
-
-**Guidelines:**
-1. Maintain absolute timestamps (MM:SS format)
-2. Refer to teams ONLY by jersey color
-3. Fix any logic errors or contradictions in observations
-4. Include all significant events: kickouts, attacks, turnovers, fouls, scores
-5. Be concise but complete
-6. Focus on possession changes and scoring opportunities
-
-**Example format:**
-0:00 - Blue goalkeeper takes kickout from goal area
-0:15 - White player wins possession in midfield
-0:32 - Blue intercepts pass and attacks down left side
-1:05 - White defender tackles, turnover
-...
-
-Provide the narrative:"""
+    prompt = load_template('stage2', prompt_version).render(
+        team_a_color=team_a['jersey_color'],
+        team_a_keeper=team_a['keeper_color'],
+        team_b_color=team_b['jersey_color'],
+        team_b_keeper=team_b['keeper_color'],
+        observations=observations
+    )
 
     genai.configure(api_key=api_key)
     model = genai.GenerativeModel(
@@ -7,8 +7,10 @@ Classifies GAA events from narrative
 import json
 import google.generativeai as genai
 
+from prompt_registry import load_template
 
-def run(narrative, game_profile, work_dir, api_key):
+
+def run(narrative, game_profile, work_dir, api_key, prompt_version=None):
     """
     Classify GAA events from narrative
     
@@ -17,6 +19,7 @@ def run(narrative, game_profile, work_dir, api_key):
         game_profile: Calibrated game profile
         work_dir: Working directory
         api_key: Gemini API key
+        prompt_version: Prompt registry version (None = default from prompts/registry.json)
         
     Returns:
         classified_events: Text with classified events
@@ -26,47 +29,13 @@ def run(narrative, game_profile, work_dir, api_key):
     team_a = game_profile['team_a']
     team_b = game_profile['team_b']
     
-    prompt = f"""You are a GAA (Gaelic Athletic Association) expert classifying match events.
-
-**TEAMS:**
-- {team_a['jersey_color']} ({team_a['keeper_color']} keeper)
-- {team_b['jersey_color']} ({team_b['keeper_color']} keeper)
-
-**NARRATIVE:**
-
-{narrative}
-
-**YOUR TASK:**
-Classify each event in the narrative into GAA event types.
-
-**GAA EVENT TYPES:**
-- KICKOUT: Goalkeeper restarts play from goal area (after point/goal/wide)
-- SHOT - POINT: Ball goes over the crossbar (1 point)
-- SHOT - GOAL: Ball goes into the net (3 points)
-- SHOT - WIDE: Shot misses target
-- SHOT - SAVED: Goalkeeper saves shot
-- TURNOVER: Possession changes (tackle, interception, loose ball)
-- FOUL: Referee calls foul
-- THROW-UP: Referee throws ball between players (restart)
-- MARK: Player catches clean ball from kick 
-- FREE: Free kick awarded
-- 45: 45-meter free kick awarded
-- PENALTY: Penalty awarded
-
-**OUTPUT FORMAT:**
-For each event, provide:
-- Timestamp (MM:SS)
-- Event Type
-- Team (by jersey color)
-- Description (1 line)
-
-Example:
-0:00 - KICKOUT - Blue - Goalkeeper takes kickout from goal area
-0:15 - TURNOVER - White - White player intercepts pass
-1:05 - SHOT - POINT - Blue - Blue scores point over the bar
-...
-
-Classify all events:"""
+    prompt = load_template('stage3', prompt_version).render(
+        team_a_color=team_a['jersey_color'],
+        team_a_keeper=team_a['keeper_color'],
+        team_b_color=team_b['jersey_color'],
+        team_b_keeper=team_b['keeper_color'],
+        narrative=narrative
+    )
 
     genai.configure(api_key=api_key)
     model = genai.GenerativeModel(
@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+"""
+Team Colors - Local jersey-colour clustering for calibration frames
+
+No API calls: each frame is decoded by ffmpeg into raw RGB, the pitch green
+is masked out, and the remaining "on-pitch" pixels (non-green pixels whose
+neighbourhood is mostly grass = players) are k-means clustered in NumPy.
+The pitch is the dominant green hue of each frame (not a fixed hue range), so
+a green jersey only disappears into the grass mask if it is the pitch's own
+shade. When a team palette still lands near the pitch hue, the analysis is
+flagged ('grass_like_team') with reduced confidence and color_hint() is empty.
+The two biggest clusters are the team palettes (biggest first - not tied to
+the team_a/team_b labels Gemini assigns; match_user_team() relates them).
+
+Output (stored as game_profile['color_analysis']):
+    {
+      "teams": [{"rgb": [r, g, b], "hex": "#rrggbb", "color_name": "White", "pixel_share": 0.41},
+                {...}],
+      "confidence": 0.0-1.0,
+      "frames_analyzed": 24,
+      "pitch_hue": 105.0,
+      "grass_like_team": false
+    }
+
+Usage:
+    from team_colors import analyze_frames
+    analysis = analyze_frames(sorted(FRAMES_DIR.glob('frame_*.jpg')))
+"""
+
+import subprocess
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+# Decoded frame size (colour analysis doesn't need full resolution)
+FRAME_WIDTH = 320
+FRAME_HEIGHT = 180
+
+# Pitch detection: hues a pitch can have, and how far from a frame's dominant hue still counts as grass
+GRASS_HUE_RANGE = (60, 170)
+GRASS_HUE_TOLERANCE = 15  # degrees
+GRASS_MIN_SATURATION = 0.15
+GRASS_CONFIDENCE_PENALTY = 0.5  # Confidence multiplier when a team colour looks like the pitch
+
+# Named jersey colours (names match what the calibration prompts produce)
+NAMED_COLORS = {
+    'White': (240, 240, 240),
+    'Black': (25, 25, 25),
+    'Grey': (128, 128, 128),
+    'Red': (200, 30, 35),
+    'Maroon': (110, 25, 40),
+    'Orange': (240, 130, 25),
+    'Yellow': (240, 210, 30),
+    'Amber': (220, 160, 30),
+    'Green': (30, 140, 60),
+    'Light Blue': (120, 180, 230),
+    'Blue': (30, 80, 200),
+    'Dark Blue': (20, 30, 85),
+    'Purple': (100, 40, 140),
+    'Pink': (240, 130, 180),
+}
+
+
+def decode_frame(frame_path: Path) -> np.ndarray:
+    """Decode an image with ffmpeg into a (FRAME_HEIGHT, FRAME_WIDTH, 3) uint8 RGB array"""
+    cmd = [
+        'ffmpeg', '-v', 'error',
+        '-i', str(frame_path),
+        '-vf', f'scale={FRAME_WIDTH}:{FRAME_HEIGHT}',
+        '-f', 'rawvideo', '-pix_fmt', 'rgb24',
+        'pipe:1'
+    ]
+    result = subprocess.run(cmd, capture_output=True, check=True, timeout=30)
+    return np.frombuffer(result.stdout, dtype=np.uint8).reshape(FRAME_HEIGHT, FRAME_WIDTH, 3)
+
+
+def _rgb_to_hsv(rgb: np.ndarray):
+    """Vectorised RGB (0-255) → hue (degrees), saturation, value (0-1)"""
+    rgb = rgb.astype(np.float32) / 255.0
+    r, g, b = rgb[..., 0], rgb[..., 1], rgb[..., 2]
+    v = rgb.max(axis=-1)
+    c = v - rgb.min(axis=-1)
+    s = np.where(v > 0, c / np.maximum(v, 1e-6), 0.0)
+
+    safe_c = np.maximum(c, 1e-6)
+    h = np.where(v == r, ((g - b) / safe_c) % 6,
+                 np.where(v == g, (b - r) / safe_c + 2, (r - g) / safe_c + 4)) * 60.0
+    h = np.where(c > 0, h, 0.0)
+    return h, s, v
+
+
+def _box_mean(mask: np.ndarray, radius: int) -> np.ndarray:
+    """Mean of a 2D mask over a (2r+1)² window (integral image, edges clamped)"""
+    padded = np.pad(mask.astype(np.float32), radius + 1, mode='edge')
+    integral = padded.cumsum(axis=0).cumsum(axis=1)
+    size = 2 * radius + 1
+    h, w = mask.shape
+    total = (integral[size:size + h, size:size + w] - integral[:h, size:size + w]
+             - integral[size:size + h, :w] + integral[:h, :w])
+    return total / (size * size)
+
+
+def pitch_hue(h: np.ndarray, s: np.ndarray, v: np.ndarray) -> Optional[float]:
+    """Dominant hue (degrees) of the green pixels in a frame, or None if there is no pitch"""
+    low, high = GRASS_HUE_RANGE
+    green = (h >= low) & (h <= high) & (s >= GRASS_MIN_SATURATION) & (v >= 0.15)
+    if green.mean() < 0.2:
+        return None
+    hist, edges = np.histogram(h[green], bins=(high - low) // 5, range=(low, high))
+    peak = int(hist.argmax())
+    return float((edges[peak] + edges[peak + 1]) / 2)
+
+
+def is_grass_like(rgb, hue: Optional[float]) -> bool:
+    """True if an RGB colour would be masked as grass on a pitch of the given hue"""
+    h, s, v = _rgb_to_hsv(np.asarray(rgb, dtype=np.float32).reshape(1, 3))
+    if hue is None:
+        low, high = GRASS_HUE_RANGE
+        in_band = low <= h[0] <= high
+    else:
+        in_band = abs(h[0] - hue) <= GRASS_HUE_TOLERANCE
+    return bool(in_band and s[0] >= GRASS_MIN_SATURATION and v[0] >= 0.15)
+
+
+def player_pixels(rgb: np.ndarray, radius: int = 8):
+    """
+    Pixels that are probably players: not grass, but surrounded by grass
+
+    Grass is the frame's dominant green hue ± GRASS_HUE_TOLERANCE, so green
+    jerseys of another shade stay in as player pixels.
+
+    Args:
+        rgb: (H, W, 3) uint8 frame
+        radius: Neighbourhood radius (pixels) used to decide "on the pitch"
+
+    Returns:
+        ((N, 3) float32 RGB values, pitch hue or None)
+    """
+    h, s, v = _rgb_to_hsv(rgb)
+    hue = pitch_hue(h, s, v)
+    if hue is None:
+        low, high = GRASS_HUE_RANGE
+        in_band = (h >= low) & (h <= high)
+    else:
+        in_band = np.abs(h - hue) <= GRASS_HUE_TOLERANCE
+    grass = in_band & (s >= GRASS_MIN_SATURATION) & (v >= 0.15)
+    on_pitch = _box_mean(grass, radius) >= 0.5
+    candidates = ~grass & on_pitch & (v >= 0.08)
+    return rgb[candidates].astype(np.float32), hue
+
+
+def kmeans(pixels: np.ndarray, k: int, iterations: int = 20, seed: int = 0):
+    """
+    Plain NumPy k-means with k-means++ initialisation
+
+    Returns:
+        (centers (k, 3), labels (N,))
+    """
+    rng = np.random.default_rng(seed)
+    centers = [pixels[rng.integers(len(pixels))]]
+    for _ in range(1, k):
+        dist = np.min(((pixels[:, None, :] - np.array(centers)[None]) ** 2).sum(-1), axis=1)
+        probs = dist / dist.sum() if dist.sum() > 0 else np.full(len(pixels), 1 / len(pixels))
+        centers.append(pixels[rng.choice(len(pixels), p=probs)])
+    centers = np.array(centers, dtype=np.float32)
+
+    for _ in range(iterations):
+        labels = ((pixels[:, None, :] - centers[None]) ** 2).sum(-1).argmin(axis=1)
+        new_centers = np.array([pixels[labels == i].mean(axis=0) if np.any(labels == i) else centers[i]
+                                for i in range(k)], dtype=np.float32)
+        if np.allclose(new_centers, centers, atol=0.5):
+            break
+        centers = new_centers
+    return centers, labels
+
+
+def color_name(rgb) -> str:
+    """Nearest named jersey colour"""
+    rgb = np.asarray(rgb, dtype=np.float32)
+    return min(NAMED_COLORS, key=lambda name: float(((np.array(NAMED_COLORS[name]) - rgb) ** 2).sum()))
+
+
+def parse_color(text: str) -> Optional[np.ndarray]:
+    """User colour ('white', 'Dark Blue', '#1e3a8a') → RGB, or None if unknown"""
+    if not text:
+        return None
+    text = text.strip()
+    if text.startswith('#') and len(text) == 7:
+        return np.array([int(text[i:i + 2], 16) for i in (1, 3, 5)], dtype=np.float32)
+    # Longest name first so "dark blue" doesn't match "blue"
+    for name in sorted(NAMED_COLORS, key=len, reverse=True):
+        if name.lower() in text.lower():
+            return np.array(NAMED_COLORS[name], dtype=np.float32)
+    return None
+
+
+def analyze_frames(frame_paths: List[Path], k: int = 4, max_frames: int = 24,
+                   pixels_per_frame: int = 4000, seed: int = 0) -> Optional[Dict]:
+    """
+    Find the two team palettes in a set of calibration frames
+
+    Args:
+        frame_paths: Frame images (any format ffmpeg reads)
+        k: Clusters (2 teams + keepers/referee/lines)
+        max_frames: Evenly sample at most this many frames
+        pixels_per_frame: Random sample of player pixels per frame
+        seed: RNG seed (results are deterministic for a given seed)
+
+    Returns:
+        Analysis dict (see module docstring), or None if no player pixels were found
+    """
+    frame_paths = list(frame_paths)
+    if len(frame_paths) > max_frames:
+        step = len(frame_paths) / max_frames
+        frame_paths = [frame_paths[int(i * step)] for i in range(max_frames)]
+
+    rng = np.random.default_rng(seed)
+    samples = []
+    hues = []
+    for frame_path in frame_paths:
+        try:
+            pixels, hue = player_pixels(decode_frame(frame_path))
+        except (subprocess.SubprocessError, ValueError) as e:
+            print(f"⚠️  Could not decode {Path(frame_path).name}: {e}")
+            continue
+        if hue is not None:
+            hues.append(hue)
+        if len(pixels) > pixels_per_frame:
+            pixels = pixels[rng.choice(len(pixels), pixels_per_frame, replace=False)]
+        samples.append(pixels)
+
+    if not samples or sum(len(p) for p in samples) < k * 50:
+        return None
+
+    pixels = np.concatenate(samples)
+    centers, labels = kmeans(pixels, k, seed=seed)
+    counts = np.bincount(labels, minlength=k)
+
+    # Two biggest clusters = the teams (biggest first)
+    order = np.argsort(counts)[::-1]
+    teams = []
+    for idx in order[:2]:
+        rgb = [int(round(c)) for c in centers[idx]]
+        teams.append({
+            'rgb': rgb,
+            'hex': '#{:02x}{:02x}{:02x}'.format(*rgb),
+            'color_name': color_name(rgb),
+            'pixel_share': round(float(counts[idx] / counts.sum()), 3)
+        })
+
+    # Confidence: distinct colours, balanced sizes, and the two teams dominate the player pixels
+    separation = float(np.linalg.norm(centers[order[0]] - centers[order[1]])) / np.sqrt(3 * 255 ** 2)
+    balance = float(counts[order[1]] / counts[order[0]])
+    coverage = float((counts[order[0]] + counts[order[1]]) / counts.sum())
+    confidence = min(1.0, separation * 2.5) * np.sqrt(balance) * coverage
+
+    # A team in the pitch's own shade is partly masked as grass - its palette can't be trusted
+    median_hue = float(np.median(hues)) if hues else None
+    grass_like = any(is_grass_like(team['rgb'], median_hue) for team in teams)
+    if grass_like:
+        confidence *= GRASS_CONFIDENCE_PENALTY
+
+    return {
+        'teams': teams,
+        'confidence': round(float(confidence), 3),
+        'frames_analyzed': len(samples),
+        'pitch_hue': round(median_hue, 1) if median_hue is not None else None,
+        'grass_like_team': grass_like
+    }
+
+
+def color_hint(analysis: Optional[Dict]) -> str:
+    """One-line summary for calibration prompts (empty if there is no analysis or a team looks like grass)"""
+    if not analysis or analysis.get('grass_like_team'):
+        return ""
+    first, second = analysis['teams']
+    return (f"LOCAL COLOUR ANALYSIS (pixel clustering, confidence {analysis['confidence']:.2f}): "
+            f"the two team jersey colours are {first['color_name']} ({first['hex']}) "
+            f"and {second['color_name']} ({second['hex']}).")
+
+
+def match_user_team(user_colors: List[str], team_a_color: str, team_b_color: str,
+                    analysis: Optional[Dict] = None, min_confidence: float = 0.5) -> Optional[str]:
+    """
+    Decide which calibrated team wears the user's colours (by RGB distance, not substrings)
+
+    Args:
+        user_colors: User's team colours, most important first (e.g. [primary, secondary])
+        team_a_color: Calibrated team_a jersey colour text
+        team_b_color: Calibrated team_b jersey colour text
+        analysis: Output of analyze_frames (used when confident)
+        min_confidence: Minimum analysis confidence to trust the measured palettes
+
+    Returns:
+        'team_a', 'team_b', or None if the colours don't separate the teams
+    """
+    team_rgbs = [parse_color(team_a_color), parse_color(team_b_color)]
+
+    # Measured palettes are more precise than colour names: snap each team to its nearest cluster
+    if analysis and analysis.get('confidence', 0) >= min_confidence:
+        palettes = [np.array(team['rgb'], dtype=np.float32) for team in analysis['teams']]
+        if all(rgb is not None for rgb in team_rgbs):
+            a_to_first = np.linalg.norm(team_rgbs[0] - palettes[0]) + np.linalg.norm(team_rgbs[1] - palettes[1])
+            a_to_second = np.linalg.norm(team_rgbs[0] - palettes[1]) + np.linalg.norm(team_rgbs[1] - palettes[0])
+            team_rgbs = palettes if a_to_first <= a_to_second else palettes[::-1]
+
+    if any(rgb is None for rgb in team_rgbs):
+        return None
+
+    for user_color in user_colors:
+        user_rgb = parse_color(user_color)
+        if user_rgb is None:
+            continue
+        dist_a = float(np.linalg.norm(user_rgb - team_rgbs[0]))
+        dist_b = float(np.linalg.norm(user_rgb - team_rgbs[1]))
+        # Require a clear margin, otherwise try the next colour
+        if dist_a < 0.8 * dist_b:
+            return 'team_a'
+        if dist_b < 0.8 * dist_a:
+            return 'team_b'
+    return None